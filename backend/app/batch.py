@@ -0,0 +1,61 @@
+"""
+Cohort batch matching from the command line
+
+Scores every profile of a JSONL file (one UserProfile per line) against the
+job dataset and writes one JSON line per profile: its decision counts and
+top-K matches. Same computation as POST /api/batch/match, without a server.
+
+Usage (from backend/):
+    python -m app.batch cohort.jsonl --top-k 10 --output results.jsonl
+    python -m app.batch cohort.jsonl --workers 4 --dataset data/jobs_dataset.json
+"""
+import argparse
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+from app.config import BATCH_JOB_CHUNK, BATCH_PROFILE_CHUNK, BATCH_WORKERS, DATASET_PATH
+from app.services.catalog import JobCatalog, load_dataset
+from app.services.cohort import match_cohort, parse_profiles
+from app.services.matching import get_matcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("profiles", help="JSONL file, one UserProfile per line")
+    parser.add_argument("--dataset", default=str(DATASET_PATH), help="jobs dataset (default: OBLIQO_DATASET_PATH)")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--collapse-duplicates", action="store_true", help="leave reposts out of the results")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--profile-chunk", type=int, default=BATCH_PROFILE_CHUNK)
+    parser.add_argument("--job-chunk", type=int, default=BATCH_JOB_CHUNK)
+    parser.add_argument("--output", help="write the results here instead of stdout")
+    args = parser.parse_args()
+
+    with open(args.profiles, "r", encoding="utf-8") as f:
+        profiles, errors = parse_profiles(f)
+    for error in errors:
+        print(f"[WARNING] Skipping line {error['line']}: {error['error']}", file=sys.stderr)
+
+    # Progress messages go to stderr, so stdout holds only the results
+    with contextlib.redirect_stdout(sys.stderr):
+        matcher = get_matcher()
+        catalog = JobCatalog.build(load_dataset(Path(args.dataset)), matcher)
+
+        start = time.perf_counter()
+        results = match_cohort(catalog, matcher, profiles, args.top_k, args.collapse_duplicates,
+                               args.workers, args.profile_chunk, args.job_chunk)
+        seconds = time.perf_counter() - start
+
+    lines = "".join(result.model_dump_json() + "\n" for result in results)
+    if args.output:
+        Path(args.output).write_text(lines, encoding="utf-8")
+    else:
+        sys.stdout.write(lines)
+    print(f"[SUCCESS] Matched {len(results)} profiles x {len(catalog.jobs)} jobs in {seconds:.2f}s "
+          f"({args.workers} workers)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Runtime configuration
+Values come from environment variables (or a local .env file)
+"""
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# Job dataset loaded at startup
+DATASET_PATH = Path(os.getenv(
+    "OBLIQO_DATASET_PATH", Path(__file__).parent.parent / "data" / "jobs_dataset.json"
+))
+
+# Where uploaded CVs are stored (served under /uploads)
+UPLOAD_DIR = Path(os.getenv("OBLIQO_UPLOAD_DIR", Path(__file__).parent.parent / "uploads"))
+
+
+# How often the job priors sweep refreshes age-based penalties (seconds)
+PRIORS_REFRESH_SECONDS = int(os.getenv("OBLIQO_PRIORS_REFRESH_SECONDS", "3600"))
+
+# File-watch mode: re-read the dataset file when it changes and apply the diff
+WATCH_DATASET = os.getenv("OBLIQO_WATCH_DATASET", "false").lower() in ("1", "true", "yes")
+WATCH_INTERVAL_SECONDS = float(os.getenv("OBLIQO_WATCH_INTERVAL_SECONDS", "2"))
+
+# Most job IDs accepted by one POST /api/jobs/details call
+MAX_DETAIL_BATCH = int(os.getenv("OBLIQO_MAX_DETAIL_BATCH", "100"))
+
+# Where /api/jobs, /api/jobs/{id} and /api/stats rank and score: "thread" or
+# "process" pool of RANKING_WORKERS, "sharded" (the job table split across
+# RANKING_SHARDS worker processes), or "inline" on the event loop
+RANKING_EXECUTOR = os.getenv("OBLIQO_RANKING_EXECUTOR", "thread").strip().lower()
+RANKING_WORKERS = int(os.getenv("OBLIQO_RANKING_WORKERS", "4"))
+RANKING_SHARDS = int(os.getenv("OBLIQO_RANKING_SHARDS", "0")) or os.cpu_count() or 1  # 0 = one per CPU
+# Scored feeds kept in memory (one per profile version, dataset version and
+# collapse_duplicates), computed in the background when a profile is saved
+FEED_CACHE_SIZE = int(os.getenv("OBLIQO_FEED_CACHE_SIZE", "8"))
+
+# Cohort batch matching (POST /api/batch/match, python -m app.batch): worker
+# processes (0 = one per CPU), profiles per task and jobs per profile x job block
+BATCH_WORKERS = int(os.getenv("OBLIQO_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+BATCH_PROFILE_CHUNK = int(os.getenv("OBLIQO_BATCH_PROFILE_CHUNK", "32"))
+BATCH_JOB_CHUNK = int(os.getenv("OBLIQO_BATCH_JOB_CHUNK", "2048"))
+MAX_BATCH_PROFILES = int(os.getenv("OBLIQO_MAX_BATCH_PROFILES", "10000"))
+
+# Semantic matcher: "keyword" (skill/title keyword overlap) or "tfidf" (hashed TF-IDF vectors)
+MATCHER = os.getenv("OBLIQO_MATCHER", "keyword").strip().lower()
+
+# Approximate nearest-neighbour retrieval for the tfidf matcher: rank_jobs puts the
+# ANN_CANDIDATES best candidates first, every job keeps its exact score
+# (0 = always exact). Used from ANN_MIN_JOBS jobs on.
+ANN_CANDIDATES = int(os.getenv("OBLIQO_ANN_CANDIDATES", "0"))
+ANN_MIN_JOBS = int(os.getenv("OBLIQO_ANN_MIN_JOBS", "20000"))
+# Recall/latency knob: number of IVF lists scanned per query
+ANN_NPROBE = int(os.getenv("OBLIQO_ANN_NPROBE", "8"))
+
+# Multi-worker mode: a loader process (python -m app.loader) publishes job snapshots
+# to this directory (ideally on tmpfs, e.g. /dev/shm/obliqo) and every uvicorn worker
+# maps them read-only instead of loading the dataset itself. Empty = single process.
+SHARED_INDEX_DIR = os.getenv("OBLIQO_SHARED_INDEX_DIR", "")
+# How often workers check the generation counter for a new snapshot (seconds)
+SHARED_INDEX_POLL_SECONDS = float(os.getenv("OBLIQO_SHARED_INDEX_POLL_SECONDS", "0.5"))
+# How long a worker waits for the loader to apply a bulk update (seconds)
+SHARED_INDEX_UPDATE_TIMEOUT = float(os.getenv("OBLIQO_SHARED_INDEX_UPDATE_TIMEOUT", "30"))
+
+# Latency histograms and counters served on /metrics
+METRICS_ENABLED = os.getenv("OBLIQO_METRICS", "true").lower() in ("1", "true", "yes")
+# Job-level stages (fit score, explanation, ...) are timed on one job in this many
+METRICS_SAMPLE_EVERY = max(1, int(os.getenv("OBLIQO_METRICS_SAMPLE_EVERY", "16")))
+
+# Request profiling for /api/jobs, /api/stats and /api/upload-cv (off by default).
+# When on, a request sent with "X-Obliqo-Profile: 1" or "?profile=1" runs under
+# cProfile; the others are sampled and kept when slower than PROFILE_SLOW_MS.
+PROFILING_ENABLED = os.getenv("OBLIQO_PROFILING", "false").lower() in ("1", "true", "yes")
+PROFILE_SLOW_MS = float(os.getenv("OBLIQO_PROFILE_SLOW_MS", "1000"))  # 0 = no automatic capture
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("OBLIQO_PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_TOP_N = int(os.getenv("OBLIQO_PROFILE_TOP_N", "25"))
+PROFILE_RING_SIZE = int(os.getenv("OBLIQO_PROFILE_RING_SIZE", "20"))
@@ -0,0 +1,96 @@
+"""
+Shared index loader for multi-worker deployments
+
+Builds the job catalog once and publishes it to OBLIQO_SHARED_INDEX_DIR, then
+applies bulk updates submitted by the workers (and dataset file edits in
+watch mode) and the periodic priors refresh, publishing a new generation for
+each.
+
+Usage (from backend/):
+    OBLIQO_SHARED_INDEX_DIR=/dev/shm/obliqo python -m app.loader
+    OBLIQO_SHARED_INDEX_DIR=/dev/shm/obliqo uvicorn app.main:app --workers 4
+"""
+import sys
+import time
+from typing import List
+
+from app.config import (
+    DATASET_PATH, PRIORS_REFRESH_SECONDS, SHARED_INDEX_DIR, SHARED_INDEX_POLL_SECONDS,
+    WATCH_DATASET, WATCH_INTERVAL_SECONDS
+)
+from app.models import Job
+from app.services.catalog import JobCatalog, diff_jobs, load_dataset, load_valid_jobs
+from app.services.matching import get_matcher
+from app.services.shared_index import SharedIndexPublisher
+
+
+def apply_update(catalog: JobCatalog, payload: dict, matcher):
+    """Apply one worker request; returns the new catalog and the worker's result"""
+    upserts: List[Job] = [Job(**job) for job in payload.get("upserts", [])]
+    deleted_ids: List[str] = payload.get("deleted_ids", [])
+    catalog, not_found = catalog.apply(upserts, deleted_ids, matcher)
+    result = {
+        "dataset_version": catalog.version,
+        "total_jobs": len(catalog.jobs),
+        "upserted": [job.job_id for job in upserts],
+        "deleted": [job_id for job_id in dict.fromkeys(deleted_ids) if job_id not in not_found],
+        "not_found": not_found,
+    }
+    return catalog, result
+
+
+def main():
+    if not SHARED_INDEX_DIR:
+        print("[WARNING] OBLIQO_SHARED_INDEX_DIR is not set, nothing to publish to")
+        sys.exit(1)
+
+    matcher = get_matcher()
+    publisher = SharedIndexPublisher(SHARED_INDEX_DIR)
+
+    jobs = load_dataset(DATASET_PATH) if DATASET_PATH.exists() else []
+    print(f"[SUCCESS] Loaded {len(jobs)} jobs from dataset")
+    catalog = JobCatalog.build(jobs, matcher, version=publisher.generation() + 1)
+    publisher.publish(catalog, matcher)
+    print(f"[SUCCESS] Published generation {catalog.version} to {SHARED_INDEX_DIR}")
+
+    last_mtime = DATASET_PATH.stat().st_mtime if DATASET_PATH.exists() else None
+    last_check = last_refresh = time.monotonic()
+    while True:
+        time.sleep(SHARED_INDEX_POLL_SECONDS)
+        changed = False
+
+        for request_id, payload in publisher.pending_updates():
+            try:
+                catalog, result = apply_update(catalog, payload, matcher)
+                changed = True
+            except Exception as e:
+                result = {"error": str(e)}
+            publisher.complete_update(request_id, result)
+
+        if WATCH_DATASET and time.monotonic() - last_check >= WATCH_INTERVAL_SECONDS:
+            last_check = time.monotonic()
+            mtime = DATASET_PATH.stat().st_mtime if DATASET_PATH.exists() else None
+            if mtime is not None and mtime != last_mtime:
+                last_mtime = mtime
+                try:
+                    upserts, deleted_ids = diff_jobs(catalog, load_valid_jobs(DATASET_PATH))
+                except (OSError, ValueError) as e:
+                    print(f"[WARNING] Could not reload jobs dataset: {e}")
+                    upserts, deleted_ids = [], []
+                if upserts or deleted_ids:
+                    catalog, _ = catalog.apply(upserts, deleted_ids, matcher)
+                    changed = True
+
+        if time.monotonic() - last_refresh >= PRIORS_REFRESH_SECONDS:
+            last_refresh = time.monotonic()
+            catalog, ghost_count = catalog.refresh_priors()
+            print(f"Refreshed job priors ({ghost_count} likely ghost jobs)")
+            changed = True
+
+        if changed:
+            publisher.publish(catalog, matcher)
+            print(f"[SUCCESS] Published generation {catalog.version} ({len(catalog.jobs)} jobs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,54 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional, Dict
+from typing import List, NamedTuple, Optional, Dict, Sequence, Tuple
+import asyncio
 import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
+from app.config import (
+    DATASET_PATH, UPLOAD_DIR, PRIORS_REFRESH_SECONDS, WATCH_DATASET, WATCH_INTERVAL_SECONDS,
+    SHARED_INDEX_DIR, SHARED_INDEX_POLL_SECONDS, SHARED_INDEX_UPDATE_TIMEOUT,
+    PROFILING_ENABLED, MAX_DETAIL_BATCH, BATCH_WORKERS, BATCH_PROFILE_CHUNK, BATCH_JOB_CHUNK,
+    MAX_BATCH_PROFILES, RANKING_EXECUTOR, RANKING_WORKERS, RANKING_SHARDS, FEED_CACHE_SIZE
+)
 from app.models import (
     UserProfile, Job, JobMatch, JobFeedResponse,
-    ExplainabilityBreakdown
+    ExplainabilityBreakdown, JobUpsertRequest, JobDeleteRequest, JobIngestResponse,
+    JobDetailsRequest, JobDetailResult, JobDetailsResponse,
+    SimulationRequest, SimulatedJob, SimulationResponse, CohortMatchResponse,
+    CandidateMatch, CandidateRankingResponse, SkillDemand, SkillsToLearnResponse
 )
 from app.services.matching import get_matcher
-from app.services.scoring import calculate_fit_score
-from app.services.decision import make_decision, estimate_competition, assess_career_impact
+from app.services.decision import (
+    DECISIONS, Reason, count_decisions, decide, render_reason, estimate_competition, assess_career_impact
+)
 from app.services.explainer import generate_explanation
+from app.services.risks import RiskReport, assess_risks
 from app.services.detector import detect_ghost_job
+from app.services.context import ProfileContext, build_match_context
+from app.services.ingest import validate_job
+from app.services.catalog import JobCatalog, diff_jobs, load_dataset, load_valid_jobs
+from app.services.job_table import as_job
+from app.services.shared_index import SharedIndexReader
+from app.services.simulation import affected_rows, get_skill_index, hypothetical_profile
+from app.services.cohort import explain_match, match_cohort, parse_profiles
+from app.services.candidates import CandidateIndex, CandidatePool, get_candidate_index, rank_candidates
+from app.services.market import skills_to_learn
+from app.services.skill_catalog import get_skill_gap
+from app.services.warmup import WarmupProgress
+from app.services.executor import RankingExecutor
+from app.services.shards import CatalogShard, RankedMatches, ShardRanking, merge_rankings
+from app.services import metrics, profiling
+from app.services.skill_normalizer import get_skill_normalizer
 
 app = FastAPI(
     title="Obliqo API",
@@ -29,41 +64,202 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.MetricsMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
 
 # In-memory storage (for hackathon - replace with real DB later)
 current_profile: Optional[UserProfile] = None
-jobs_database: List[Job] = []
-job_embeddings_cache: Dict[str, object] = {}  # job_id -> numpy array
+current_profile_skill_ids: List[int] = []  # canonical skill IDs, set on save
+current_profile_vocabulary = 0  # skill vocabulary size the IDs were resolved against
+current_profile_version = 0  # bumped on every change; part of the ranking keys
+# Profiles recruiters can rank for a job: every saved profile plus bulk uploads
+candidate_pool = CandidatePool()
+# Current job snapshot (jobs, priors, embeddings). Replaced as a whole on every
+# update - handlers read the reference once and use that snapshot throughout.
+job_catalog: JobCatalog = JobCatalog.empty()
+catalog_lock = threading.Lock()  # serializes writers only
+
+# Multi-worker mode: jobs come from the loader process (app/loader.py)
+shared_index: Optional[SharedIndexReader] = SharedIndexReader(SHARED_INDEX_DIR) if SHARED_INDEX_DIR else None
+shared_profile_mtime = 0.0
+
+# Feed/detail/stats ranking runs here; identical concurrent requests share one run
+ranking_executor = RankingExecutor(RANKING_EXECUTOR, RANKING_WORKERS, RANKING_SHARDS)
+# Scored feeds by (user_id, profile version, dataset version, collapse_duplicates), LRU
+feed_cache: "OrderedDict[Tuple, FeedSnapshot]" = OrderedDict()
+feed_cache_lock = threading.Lock()
+precompute_tasks = set()  # keeps background precomputes referenced until done
+FEED_PAGE_SIZE = 20  # the default page, built ahead of time
+
+# Startup runs in the background (see warmup()); job endpoints answer 503 until ready
+warmup = WarmupProgress()
 
 # Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
-UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 @app.on_event("startup")
 async def load_jobs():
-    """Load jobs from dataset on startup"""
-    global jobs_database, job_embeddings_cache
+    """Start loading jobs in the background, so the server answers health checks right away"""
+    # Keep references so the tasks aren't garbage collected
+    app.state.warmup_task = asyncio.create_task(run_warmup())
+    app.state.priors_refresh_task = asyncio.create_task(refresh_priors_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_ranking_executor():
+    ranking_executor.shutdown()
+
+
+async def run_warmup():
+    """Load and index the jobs in a worker thread, then start the follow-up tasks"""
+    try:
+        await run_in_threadpool(build_initial_catalog)
+    except Exception as e:
+        warmup.fail(e)
+        return
     
-    data_path = Path(__file__).parent.parent / "data" / "jobs_dataset.json"
+    if shared_index:
+        # The loader owns the dataset and its watch mode
+        app.state.shared_index_task = asyncio.create_task(follow_shared_index())
+    elif WATCH_DATASET:
+        app.state.dataset_watch_task = asyncio.create_task(watch_dataset())
+    warmup.finish()
+
+
+def build_initial_catalog():
+    """Blocking part of startup: matcher, dataset, indexes (reports progress to `warmup`)"""
+    global job_catalog
     
     # Initialize the semantic matcher (loads the model)
+    warmup.advance("matcher")
     matcher = get_matcher()
     print("[SUCCESS] Semantic matcher initialized")
     
-    if data_path.exists():
-        with open(data_path, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f)
-            jobs_database = [Job(**job) for job in jobs_data]
-        print(f"[SUCCESS] Loaded {len(jobs_database)} jobs from dataset")
-        
-        # Pre-compute embeddings
-        print("Embeddings generation started...")
-        for job in jobs_database:
-            job_embeddings_cache[job.job_id] = matcher.create_job_embedding(job)
-        print(f"[SUCCESS] Pre-computed embeddings for {len(job_embeddings_cache)} jobs")
-        
+    warmup.advance("dataset")
+    if shared_index:
+        sync_shared_index()
+        warmup.jobs_total = len(job_catalog.jobs)
+        return
+    
+    if DATASET_PATH.exists():
+        jobs = load_dataset(DATASET_PATH)
+        warmup.jobs_total = len(jobs)
+        print(f"[SUCCESS] Loaded {len(jobs)} jobs from dataset")
+        job_catalog = JobCatalog.build(jobs, matcher, progress=warmup.advance)
     else:
         print("[WARNING] No jobs dataset found, using empty database")
+    
+    # A profile saved during warmup was resolved against a partial skill vocabulary
+    if current_profile:
+        set_current_profile(current_profile)
+
+
+def require_ready():
+    """Job endpoints need the catalog: 503 (with Retry-After) while warming up"""
+    if not warmup.ready:
+        detail = "Job index failed to load" if warmup.error else f"Warming up ({warmup.phase}), retry shortly"
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "5"})
+
+
+async def refresh_priors_periodically():
+    """Keep age-based ghost penalties current without recomputing them per request"""
+    while True:
+        await asyncio.sleep(PRIORS_REFRESH_SECONDS)
+        # The loader refreshes the shared index's priors
+        if warmup.ready and not shared_index:
+            catalog, ghost_count = await run_in_threadpool(refresh_catalog_priors)
+            print(f"Refreshed job priors ({ghost_count} likely ghost jobs, dataset version {catalog.version})")
+
+
+def refresh_catalog_priors(now: Optional[datetime] = None) -> Tuple[JobCatalog, int]:
+    """
+    Publish the next catalog version with refreshed priors. Runs in a worker
+    thread; readers keep the snapshot (and priors) they hold.
+    """
+    global job_catalog
+    with catalog_lock:
+        job_catalog, ghost_count = job_catalog.refresh_priors(now)
+        return job_catalog, ghost_count
+
+
+def update_catalog(upserts: List[Job], deleted_ids: List[str]) -> Tuple[JobCatalog, List[str]]:
+    """
+    Build the next catalog version and publish it. Runs in a worker thread:
+    readers keep using the snapshot they already hold and never wait.
+    """
+    global job_catalog
+    with catalog_lock:
+        catalog, not_found = job_catalog.apply(upserts, deleted_ids, get_matcher())
+        job_catalog = catalog
+    print(f"[SUCCESS] Dataset version {catalog.version}: "
+          f"{len(upserts)} upserted, {len(deleted_ids) - len(not_found)} deleted")
+    return catalog, not_found
+
+
+def sync_shared_index():
+    """Attach to the loader's current snapshot (and profile) if they changed"""
+    global job_catalog, shared_profile_mtime
+    with catalog_lock:
+        generation = shared_index.generation()
+        if generation and generation != job_catalog.version:
+            job_catalog = shared_index.load(get_matcher())
+            print(f"[SUCCESS] Attached shared job index generation {job_catalog.version} "
+                  f"({len(job_catalog.jobs)} jobs)")
+    
+    saved = shared_index.load_profile(shared_profile_mtime)
+    if saved:
+        shared_profile_mtime, profile = saved
+        set_current_profile(profile)
+
+
+async def follow_shared_index():
+    """Multi-worker mode: switch to new snapshots as the loader publishes them"""
+    while True:
+        await asyncio.sleep(SHARED_INDEX_POLL_SECONDS)
+        try:
+            await run_in_threadpool(sync_shared_index)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not attach shared job index: {e}")
+
+
+async def submit_shared_update(upserts: List[Job], deleted_ids: List[str]) -> JobIngestResponse:
+    """Multi-worker mode: hand a bulk update to the loader and wait until it is live here"""
+    request_id = shared_index.submit_update(upserts, deleted_ids)
+    deadline = time.monotonic() + SHARED_INDEX_UPDATE_TIMEOUT
+    result = shared_index.update_result(request_id)
+    while result is None:
+        if time.monotonic() > deadline:
+            raise HTTPException(status_code=504, detail="Job loader did not apply the update in time")
+        await asyncio.sleep(0.05)
+        result = shared_index.update_result(request_id)
+    
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    await run_in_threadpool(sync_shared_index)
+    return JobIngestResponse(**result)
+
+
+async def watch_dataset():
+    """File-watch mode: apply edits to the dataset file without a restart"""
+    last_mtime = DATASET_PATH.stat().st_mtime if DATASET_PATH.exists() else None
+    while True:
+        await asyncio.sleep(WATCH_INTERVAL_SECONDS)
+        mtime = DATASET_PATH.stat().st_mtime if DATASET_PATH.exists() else None
+        if mtime is None or mtime == last_mtime:
+            continue
+        last_mtime = mtime
+        
+        try:
+            jobs = await run_in_threadpool(load_valid_jobs, DATASET_PATH)
+        except (OSError, ValueError) as e:
+            # Half-written file or bad record: keep serving, retry on the next change
+            print(f"[WARNING] Could not reload jobs dataset: {e}")
+            continue
+        
+        upserts, deleted_ids = diff_jobs(job_catalog, jobs)
+        if upserts or deleted_ids:
+            await run_in_threadpool(update_catalog, upserts, deleted_ids)
 
 
 @app.get("/")
@@ -72,10 +268,27 @@ async def root():
     return {
         "message": "Obliqo API is running",
         "version": "1.0.0",
-        "jobs_loaded": len(jobs_database)
+        "ready": warmup.ready,
+        "jobs_loaded": len(job_catalog.jobs),
+        "dataset_version": job_catalog.version
     }
 
 
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving (whether or not warmup is done)"""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: 200 once the jobs are loaded and indexed, 503 with progress until then"""
+    status = warmup.to_dict()
+    status["jobs_loaded"] = len(job_catalog.jobs)
+    status["dataset_version"] = job_catalog.version
+    return JSONResponse(status, status_code=200 if warmup.ready else 503)
+
+
 @app.post("/api/upload-cv")
 async def upload_cv(file: UploadFile = File(...)):
     """Upload a CV/Resume file and parse it for autofill data"""
@@ -105,11 +318,16 @@ async def upload_cv(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
     
     # Parse CV to extract data
+    timer = metrics.stage_timer()
     try:
         extracted_data = parse_cv(file_path)
+        metrics.count("obliqo_cv_parse_total", label='result="ok"')
     except Exception as e:
         print(f"CV parsing error: {e}")
         extracted_data = {"error": str(e)}
+        metrics.count("obliqo_cv_parse_total", label='result="error"')
+    if timer:
+        timer.lap("parse_cv")
     
     # Return the URL and extracted data
     file_url = f"/uploads/{unique_filename}"
@@ -125,14 +343,28 @@ async def upload_cv(file: UploadFile = File(...)):
 @app.post("/api/profile")
 async def save_profile(profile: UserProfile):
     """Save or update user profile"""
-    global current_profile
-    current_profile = profile
+    set_current_profile(profile)
+    candidate_pool.upsert([profile])
+    if shared_index:
+        shared_index.save_profile(profile)
+    if warmup.ready and job_catalog.jobs:
+        # Score the feed now; a GET /api/jobs arriving meanwhile attaches to this run
+        task = asyncio.create_task(precompute_feed(job_catalog, current_profile_context(), current_profile_version))
+        precompute_tasks.add(task)
+        task.add_done_callback(precompute_tasks.discard)
     return {
         "message": "Profile saved successfully",
         "user_id": profile.user_id
     }
 
 
+def set_current_profile(profile: UserProfile):
+    global current_profile, current_profile_version
+    current_profile = profile
+    resolve_current_profile_skills()
+    current_profile_version += 1
+
+
 @app.get("/api/profile")
 async def get_profile():
     """Get current user profile"""
@@ -143,142 +375,883 @@ async def get_profile():
 
 @app.get("/api/jobs", response_model=JobFeedResponse)
 async def get_job_feed(
+    request: Request,
     page: int = 1,
-    page_size: int = 20,
-    decision_filter: Optional[str] = None  # Apply, Wait, Skip, Avoid
+    page_size: int = FEED_PAGE_SIZE,
+    decision_filter: Optional[str] = None,  # Apply, Wait, Skip, Avoid
+    collapse_duplicates: bool = False  # Hide reposts of jobs already in the feed
 ):
     """Get personalized job feed with rankings"""
+    require_ready()
     
     if not current_profile:
         raise HTTPException(status_code=400, detail="Please create a profile first")
     
-    if not jobs_database:
+    catalog = job_catalog
+    if not catalog.jobs:
         raise HTTPException(status_code=404, detail="No jobs available")
     
+    timer = metrics.stage_timer()
+    snapshot = await get_feed_snapshot(
+        catalog, current_profile_context(), current_profile_version, collapse_duplicates
+    )
+    if timer:
+        timer.lap("ranking")
+    
+    if page == 1 and page_size == FEED_PAGE_SIZE and not decision_filter:
+        total_count = len(snapshot.matches)
+        paginated_jobs = snapshot.first_page
+    else:
+        # Apply filter if specified (on the decision codes: matches are only read for the page)
+        positions = range(len(snapshot.matches))
+        if decision_filter:
+            positions = np.flatnonzero(snapshot.codes == DECISIONS.index(decision_filter)) \
+                if decision_filter in DECISIONS else []
+        
+        # Pagination
+        total_count = len(positions)
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+        paginated_jobs = [
+            snapshot.matches[position].to_match(snapshot.profile_ctx, catalog)
+            for position in positions[start_idx:end_idx]
+        ]
+    
+    if timer:
+        timer.lap("paginate")
+        request.scope["handler_done"] = timer.last
+    return JobFeedResponse(
+        jobs=paginated_jobs,
+        total_count=total_count,
+        page=page,
+        page_size=page_size
+    )
+
+
+async def get_feed_snapshot(
+    catalog: JobCatalog,
+    profile_ctx: ProfileContext,
+    profile_version: int,
+    collapse_duplicates: bool
+) -> "FeedSnapshot":
+    """
+    The profile's scored feed: from the cache, else from the computation
+    already running for it, else computed now on the ranking executor
+    """
+    key = (profile_ctx.profile.user_id, profile_version, catalog.version, collapse_duplicates)
+    snapshot = cached_feed_snapshot(key)
+    if snapshot is not None:
+        return snapshot
+    
+    detach = ranking_executor.kind == "process"
+    if ranking_executor.kind == "sharded":
+        snapshot = await ranking_executor.scatter(
+            ("feed",) + key, rank_feed_shard, merge_feed_shards, catalog, profile_ctx, collapse_duplicates
+        )
+    else:
+        snapshot = await ranking_executor.run(
+            ("feed",) + key, compute_feed_snapshot, catalog, profile_ctx, collapse_duplicates, detach
+        )
+    return cache_feed_snapshot(key, snapshot, catalog if detach else None)
+
+
+def cached_feed_snapshot(key: Tuple) -> Optional["FeedSnapshot"]:
+    with feed_cache_lock:
+        snapshot = feed_cache.get(key)
+        if snapshot is not None:
+            feed_cache.move_to_end(key)
+        return snapshot
+
+
+def cache_feed_snapshot(
+    key: Tuple,
+    snapshot: "FeedSnapshot",
+    attach_to: Optional[JobCatalog] = None
+) -> "FeedSnapshot":
+    """Cache a computed feed, unless another run cached it first; returns the cached one"""
+    with feed_cache_lock:
+        # Waiters of the same run resume one by one: the first one caches it
+        if key in feed_cache:
+            return feed_cache[key]
+        snapshot = snapshot.attached(attach_to) if attach_to is not None else snapshot
+        # Older dataset versions and older versions of this profile are superseded
+        for stale in [k for k in feed_cache if k[2] < key[2] or (k[0] == key[0] and k[1] < key[1])]:
+            del feed_cache[stale]
+        feed_cache[key] = snapshot
+        while len(feed_cache) > FEED_CACHE_SIZE:
+            feed_cache.popitem(last=False)
+    return snapshot
+
+
+async def precompute_feed(catalog: JobCatalog, profile_ctx: ProfileContext, profile_version: int):
+    """Background stage after a profile save: rank and score the default feed before it is asked for"""
+    try:
+        await get_feed_snapshot(catalog, profile_ctx, profile_version, False)
+    except Exception as e:
+        print(f"[WARNING] Feed precompute failed: {e}")
+
+
+def compute_feed_snapshot(
+    catalog: JobCatalog,
+    profile_ctx: ProfileContext,
+    collapse_duplicates: bool,
+    detach: bool = False
+) -> "FeedSnapshot":
+    """Rank and score the whole catalog for the profile (runs on the ranking executor)"""
     # Get semantic matcher
     matcher = get_matcher()
+    timer = metrics.stage_timer()
     
     # Rank all jobs using pre-computed embeddings
-    ranked_jobs = matcher.rank_jobs(current_profile, jobs_database, job_embeddings_cache)
+    jobs = catalog.feed_jobs(collapse_duplicates)
+    ranked_jobs = matcher.rank_jobs(profile_ctx.profile, jobs, catalog.embeddings)
+    if timer:
+        timer.lap("rank")
     
-    # Generate full match data for each job
+    # Score every job; JobMatch objects are only built for the first page
     job_matches = []
-    for job, semantic_score in ranked_jobs:
-        match = create_job_match(job, semantic_score)
-        job_matches.append(match)
+    sampler = metrics.JobSampler()
+    for (job, semantic_score), job_timer in zip(ranked_jobs, sampler):
+        job_matches.append(score_job(job, semantic_score, profile_ctx, catalog, job_timer))
+    sampler.flush()
+    metrics.count("obliqo_jobs_scored_total", len(job_matches))
+    codes = decision_codes_of(job_matches)
+    if timer:
+        timer.lap("match")
     
-    # Apply filter if specified
-    if decision_filter:
-        job_matches = [jm for jm in job_matches if jm.decision == decision_filter]
+    snapshot = FeedSnapshot(
+        matches=job_matches,
+        total_jobs=len(jobs),
+        decisions=count_decisions(codes),
+        first_page=[jm.to_match(profile_ctx, catalog) for jm in job_matches[:FEED_PAGE_SIZE]],
+        profile_ctx=profile_ctx,
+        codes=codes
+    )
+    return snapshot.detached() if detach else snapshot
+
+
+def rank_feed_shard(shard: CatalogShard, profile_ctx: ProfileContext, collapse_duplicates: bool) -> ShardRanking:
+    """Rank and score one catalog shard (runs in the shard's worker); the first page is sent in full"""
+    catalog = shard.catalog
+    ranked_jobs = get_matcher().rank_jobs(profile_ctx.profile, shard.feed_jobs(collapse_duplicates), catalog.embeddings)
+    job_matches = [score_job(job, semantic_score, profile_ctx, catalog) for job, semantic_score in ranked_jobs]
+    metrics.count("obliqo_jobs_scored_total", len(job_matches))
     
-    # Pagination
-    total_count = len(job_matches)
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_jobs = job_matches[start_idx:end_idx]
+    positions = shard.positions[collapse_duplicates]
+    return ShardRanking(
+        positions=np.fromiter((positions[job.row] for job, _ in ranked_jobs), dtype=np.int64, count=len(ranked_jobs)),
+        semantic_scores=np.fromiter((score for _, score in ranked_jobs), dtype=np.float64, count=len(ranked_jobs)),
+        codes=decision_codes_of(job_matches),
+        top=[jm._replace(job=jm.job.job_id) for jm in job_matches[:FEED_PAGE_SIZE]]
+    )
+
+
+def merge_feed_shards(
+    catalog: JobCatalog,
+    rankings: List[ShardRanking],
+    profile_ctx: ProfileContext,
+    collapse_duplicates: bool
+) -> "FeedSnapshot":
+    """The feed snapshot from every shard's ranking (runs on the coordinator's thread pool)"""
+    jobs = catalog.feed_jobs(collapse_duplicates)
+    positions, semantic, codes, top = merge_rankings(rankings)
+    job_matches = RankedMatches(
+        jobs, positions, semantic, top,
+        lambda job, semantic_score: score_job(job, semantic_score, profile_ctx, catalog)
+    )
+    return FeedSnapshot(
+        matches=job_matches,
+        total_jobs=len(jobs),
+        decisions=count_decisions(codes),
+        first_page=[jm.to_match(profile_ctx, catalog) for jm in job_matches[:FEED_PAGE_SIZE]],
+        profile_ctx=profile_ctx,
+        codes=codes
+    )
+
+
+def decision_codes_of(job_matches: List["ScoredJob"]) -> np.ndarray:
+    code_of = {decision: code for code, decision in enumerate(DECISIONS)}
+    return np.fromiter((code_of[jm.decision] for jm in job_matches), dtype=np.int8, count=len(job_matches))
+
+
+@app.get("/api/jobs/stream")
+async def stream_job_feed(
+    format: str = "ndjson",  # ndjson or sse
+    top_k: int = 20,
+    chunk_size: int = 200,
+    limit: Optional[int] = None,
+    decision_filter: Optional[str] = None,
+    collapse_duplicates: bool = False
+):
+    """
+    Job feed as a stream of JobMatch records (NDJSON lines or server-sent events).
+    The first top_k matches of the feed are sent first, best fit first; the
+    rest follow in feed order, in chunks, scored as they are sent.
+    Events: meta, match (repeated), end.
+    """
+    require_ready()
+    if not current_profile:
+        raise HTTPException(status_code=400, detail="Please create a profile first")
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
     
-    return JobFeedResponse(
-        jobs=paginated_jobs,
-        total_count=total_count,
-        page=page,
-        page_size=page_size
+    # Snapshot everything the stream reads: a profile save or catalog swap
+    # mid-stream must not mix two versions in one feed
+    catalog = job_catalog
+    profile_ctx = current_profile_context()
+    key = (profile_ctx.profile.user_id, current_profile_version, catalog.version, collapse_duplicates)
+    snapshot = cached_feed_snapshot(key)
+    if snapshot is not None:
+        matches = snapshot.matches
+        score = lambda start, end: matches[start:end]
+    else:
+        # Not scored yet: rank now, score as the stream goes
+        matches = await run_in_threadpool(rank_feed, catalog, profile_ctx, collapse_duplicates)
+        score = lambda start, end: score_feed_chunk(matches[start:end], profile_ctx, catalog)
+    
+    if format == "sse":
+        def encode(event: str, data: str) -> str:
+            return f"event: {event}\ndata: {data}\n\n"
+        media_type = "text/event-stream"
+    else:
+        def encode(event: str, data: str) -> str:
+            return f'{{"event":"{event}","data":{data}}}\n'
+        media_type = "application/x-ndjson"
+    
+    code = DECISIONS.index(decision_filter) if decision_filter in DECISIONS else None
+    keep = lambda match: not decision_filter or (code is not None and match.decision == decision_filter)
+    max_sent = len(matches) if limit is None else max(0, limit)
+    
+    def render(chunk: List[ScoredJob]) -> str:
+        return "".join(
+            encode("match", match.to_match(profile_ctx, catalog).model_dump_json()) for match in chunk
+        )
+    
+    def next_chunk(start: int, size: int) -> Tuple[List[ScoredJob], List[ScoredJob]]:
+        """Score the next feed positions; return them all, and the ones the filter keeps"""
+        chunk = list(score(start, start + size))
+        return chunk, [match for match in chunk if keep(match)]
+    
+    async def events():
+        yield encode("meta", json.dumps({"total_count": len(matches), "dataset_version": catalog.version}))
+        scored, sent = [], 0
+        
+        # Partial pass: score in feed order until top_k matches are found, send them best first
+        head = []
+        while len(head) < top_k and len(scored) < len(matches) and max_sent > 0:
+            chunk, kept = await run_in_threadpool(next_chunk, len(scored), max(1, top_k))
+            scored.extend(chunk)
+            head.extend(kept)
+        head, pending = head[:max(0, top_k)], head[max(0, top_k):]
+        head = sorted(head, key=lambda match: -match.fit_score)[:max_sent]
+        if head:
+            yield await run_in_threadpool(render, head)
+            sent += len(head)
+        
+        # The long tail, in feed order
+        while sent < max_sent and (pending or len(scored) < len(matches)):
+            if not pending:
+                chunk, pending = await run_in_threadpool(next_chunk, len(scored), max(1, chunk_size))
+                scored.extend(chunk)
+            batch, pending = pending[:max_sent - sent], []
+            if batch:
+                yield await run_in_threadpool(render, batch)
+                sent += len(batch)
+        yield encode("end", json.dumps({"sent": sent, "scored": len(scored)}))
+        
+        if snapshot is None and len(scored) == len(matches):
+            # The whole feed was scored: a later /api/jobs reads it from the cache
+            cache_feed_snapshot(key, await run_in_threadpool(stream_snapshot, scored, profile_ctx, catalog))
+    
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+def rank_feed(catalog: JobCatalog, profile_ctx: ProfileContext, collapse_duplicates: bool) -> List[Tuple[Job, float]]:
+    """Feed order without the scoring: (job, semantic score), best semantic match first"""
+    return get_matcher().rank_jobs(profile_ctx.profile, catalog.feed_jobs(collapse_duplicates), catalog.embeddings)
+
+
+def score_feed_chunk(
+    ranked_jobs: List[Tuple[Job, float]],
+    profile_ctx: ProfileContext,
+    catalog: JobCatalog
+) -> List["ScoredJob"]:
+    job_matches = [score_job(job, semantic_score, profile_ctx, catalog) for job, semantic_score in ranked_jobs]
+    metrics.count("obliqo_jobs_scored_total", len(job_matches))
+    return job_matches
+
+
+def stream_snapshot(
+    job_matches: List["ScoredJob"],
+    profile_ctx: ProfileContext,
+    catalog: JobCatalog
+) -> "FeedSnapshot":
+    """The feed snapshot of a stream that scored every job"""
+    codes = decision_codes_of(job_matches)
+    return FeedSnapshot(
+        matches=job_matches,
+        total_jobs=len(job_matches),
+        decisions=count_decisions(codes),
+        first_page=[jm.to_match(profile_ctx, catalog) for jm in job_matches[:FEED_PAGE_SIZE]],
+        profile_ctx=profile_ctx,
+        codes=codes
     )
 
 
+def semantic_scores(profile: UserProfile, jobs: List[Job], catalog: JobCatalog) -> List[float]:
+    """
+    Semantic score of each job against the profile, in the order of `jobs`.
+    The user embedding is computed once.
+    """
+    matcher = get_matcher()
+    user_embedding = matcher.create_user_embedding(profile)
+    
+    scores = []
+    misses = 0
+    for job in jobs:
+        if job.job_id in catalog.embeddings:
+            job_embedding = catalog.embeddings[job.job_id]
+        else:
+            job_embedding = matcher.create_job_embedding(job)
+            misses += 1
+        scores.append(matcher.calculate_similarity(user_embedding, job_embedding))
+    metrics.count_embedding_lookups(len(jobs), misses)
+    return scores
+
+
+@app.post("/api/jobs/details", response_model=JobDetailsResponse)
+async def get_job_details(request: JobDetailsRequest):
+    """
+    Detailed analysis for several jobs in one call. Results follow the order
+    of job_ids; unknown IDs get a found=false entry instead of failing the batch.
+    """
+    require_ready()
+    
+    if not current_profile:
+        raise HTTPException(status_code=400, detail="Please create a profile first")
+    if len(request.job_ids) > MAX_DETAIL_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DETAIL_BATCH} job IDs per request")
+    
+    catalog = job_catalog
+    # Each distinct job is scored once, even if requested more than once
+    job_ids = list(dict.fromkeys(job_id for job_id in request.job_ids if job_id in catalog.jobs_by_id))
+    key = ("details", current_profile_version, catalog.version, tuple(job_ids))
+    matches = await ranking_executor.run(key, compute_job_details, catalog, current_profile_context(), job_ids)
+    
+    results = [
+        JobDetailResult(job_id=job_id, found=True, match=matches[job_id]) if job_id in matches
+        else JobDetailResult(job_id=job_id, found=False, detail="Job not found")
+        for job_id in request.job_ids
+    ]
+    return JobDetailsResponse(results=results, dataset_version=catalog.version)
+
+
+def compute_job_details(catalog: JobCatalog, profile_ctx: ProfileContext, job_ids: List[str]) -> Dict[str, JobMatch]:
+    """Full match data for several jobs, by job ID (runs on the ranking executor)"""
+    jobs = [catalog.jobs_by_id[job_id] for job_id in job_ids]
+    scores = semantic_scores(profile_ctx.profile, jobs, catalog)
+    
+    timer = metrics.stage_timer()
+    matches = {
+        job.job_id: create_job_match(job, score, profile_ctx, catalog, timer)
+        for job, score in zip(jobs, scores)
+    }
+    metrics.count("obliqo_jobs_scored_total", len(matches))
+    return matches
+
+
 @app.get("/api/jobs/{job_id}", response_model=JobMatch)
 async def get_job_detail(job_id: str):
     """Get detailed analysis for a specific job"""
+    require_ready()
     
     if not current_profile:
         raise HTTPException(status_code=400, detail="Please create a profile first")
     
     # Find job
-    job = next((j for j in jobs_database if j.job_id == job_id), None)
+    catalog = job_catalog
+    job = catalog.jobs_by_id.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get semantic score
-    matcher = get_matcher()
-    user_embedding = matcher.create_user_embedding(current_profile)
-    
-    if job.job_id in job_embeddings_cache:
-        job_embedding = job_embeddings_cache[job.job_id]
-    else:
-        job_embedding = matcher.create_job_embedding(job)
-        
-    semantic_score = matcher.calculate_similarity(user_embedding, job_embedding)
+    key = ("detail", current_profile_version, catalog.version, job_id)
+    return await ranking_executor.run(key, compute_job_detail, catalog, current_profile_context(), job_id)
+
+
+def compute_job_detail(catalog: JobCatalog, profile_ctx: ProfileContext, job_id: str) -> JobMatch:
+    """Full match data for one job (runs on the ranking executor)"""
+    job = catalog.jobs_by_id[job_id]
+    semantic_score = semantic_scores(profile_ctx.profile, [job], catalog)[0]
     
     # Generate full match data
-    return create_job_match(job, semantic_score)
+    metrics.count("obliqo_jobs_scored_total")
+    return create_job_match(job, semantic_score, profile_ctx, catalog, metrics.stage_timer())
+
+
+def resolve_current_profile_skills():
+    """Map the saved profile's raw skill strings onto canonical IDs once, not per request"""
+    global current_profile_skill_ids, current_profile_vocabulary
+    normalizer = get_skill_normalizer()
+    current_profile_vocabulary = len(normalizer)
+    current_profile_skill_ids = normalizer.canonical_ids(current_profile.skills, add=False)
+
 
+def current_profile_context() -> ProfileContext:
+    """Context for the saved profile, reusing the skill IDs computed on save"""
+    if len(get_skill_normalizer()) != current_profile_vocabulary:
+        # Job updates added skills: ones the profile lacked IDs for may exist now
+        resolve_current_profile_skills()
+    return ProfileContext(current_profile, skill_ids=current_profile_skill_ids)
 
-def create_job_match(job: Job, semantic_score: float) -> JobMatch:
-    """Helper function to create a complete JobMatch object"""
+
+class ScoredJob(NamedTuple):
+    """
+    Fit score, decision and risk flags of one job; job may be a catalog JobRow.
+    The explanation and the texts are rendered by to_match(), only for the
+    jobs that are returned.
+    """
+    job: Job
+    semantic_score: float
+    fit_score: float
+    decision: str
+    reason: Reason
+    risks: RiskReport
+    competition_level: str
+    career_impact: str
     
-    # Calculate fit score
-    fit_score, score_breakdown = calculate_fit_score(
-        current_profile, job, semantic_score
-    )
+    def to_match(
+        self,
+        profile_ctx: ProfileContext,
+        catalog: JobCatalog,
+        timer: Optional[metrics.StageTimer] = None
+    ) -> JobMatch:
+        """Build the JobMatch (explanation, texts and the Job model)"""
+        job = self.job
+        if timer:
+            timer.restart()
+        ctx = build_match_context(profile_ctx, job, self.semantic_score, catalog.priors.get(job.job_id))
+        explanation = generate_explanation(
+            profile_ctx.profile, job, self.fit_score, ctx.score_breakdown, ctx, self.risks
+        )
+        if timer:
+            timer.lap("explanation")
+        
+        # Check for ghost job
+        is_ghost, ghost_warning, quality_score = detect_ghost_job(job, ctx)
+        if ghost_warning and ghost_warning not in explanation.risk_factors:
+            explanation.risk_factors.insert(0, ghost_warning)
+        if timer:
+            timer.lap("ghost_detection")
+        
+        return JobMatch(
+            job=as_job(job),
+            fit_score=self.fit_score,
+            decision=self.decision,
+            decision_reason=render_reason(self.reason, self.fit_score, explanation.missing_skills, self.risks),
+            explanation=explanation,
+            competition_level=self.competition_level,
+            career_impact=self.career_impact
+        )
+
+
+class FeedSnapshot(NamedTuple):
+    """A profile's ranked and scored feed for one dataset version"""
+    matches: Sequence[ScoredJob]  # in feed order (RankedMatches, scored on read, when sharded)
+    total_jobs: int
+    decisions: Dict[str, int]
+    first_page: List[JobMatch]  # the default page, already built
+    profile_ctx: ProfileContext  # the profile version the matches were scored for
+    codes: np.ndarray  # decision code of each match (index into DECISIONS), for filtering
     
-    # Generate explanation
-    explanation = generate_explanation(
-        current_profile, job, fit_score, score_breakdown
-    )
+    def detached(self) -> "FeedSnapshot":
+        """Job IDs instead of catalog rows, to send from a worker process without the job table"""
+        return self._replace(matches=[match._replace(job=match.job.job_id) for match in self.matches])
+    
+    def attached(self, catalog: JobCatalog) -> "FeedSnapshot":
+        jobs_by_id = catalog.jobs_by_id
+        return self._replace(matches=[match._replace(job=jobs_by_id[match.job]) for match in self.matches])
+
+
+def create_job_match(
+    job: Job,
+    semantic_score: float,
+    profile_ctx: Optional[ProfileContext] = None,
+    catalog: Optional[JobCatalog] = None,
+    timer: Optional[metrics.StageTimer] = None
+) -> JobMatch:
+    """Helper function to create a complete JobMatch object (timer: per-stage latency)"""
+    if profile_ctx is None:
+        profile_ctx = current_profile_context()
+    if catalog is None:
+        catalog = job_catalog
+    match = score_job(job, semantic_score, profile_ctx, catalog, timer).to_match(profile_ctx, catalog, timer)
+    if timer:
+        timer.lap("build_match")
+    return match
+
+
+def score_job(
+    job: Job,
+    semantic_score: float,
+    profile_ctx: Optional[ProfileContext] = None,
+    catalog: Optional[JobCatalog] = None,
+    timer: Optional[metrics.StageTimer] = None
+) -> ScoredJob:
+    """Fit score, risk flags and decision for one job; no text is rendered"""
+    if profile_ctx is None:
+        profile_ctx = current_profile_context()
+    if catalog is None:
+        catalog = job_catalog
+    if timer:
+        timer.restart()
+    profile = profile_ctx.profile
     
-    # Make decision
-    decision, decision_reason = make_decision(
-        fit_score,
-        current_profile,
-        job,
-        explanation.missing_skills,
-        explanation.risk_factors
+    # Overlap sets and fit score on top of the cached job priors
+    ctx = build_match_context(
+        profile_ctx, job, semantic_score, catalog.priors.get(job.job_id)
     )
+    fit_score = ctx.fit_score
+    if timer:
+        timer.lap("fit_score")
+    
+    # Make decision: risk flags and the decision table
+    risks = assess_risks(ctx, fit_score)
+    missing_count = len(ctx.priors.requirements_by_id) - len(ctx.matched_ids)  # distinct, as listed
+    decision, reason = decide(fit_score, missing_count, risks.flags)
     
     # Estimate competition
-    competition_level = estimate_competition(job, fit_score)
+    competition_level = estimate_competition(job, fit_score, ctx)
     
     # Assess career impact
-    career_impact = assess_career_impact(job, current_profile, fit_score)
-    
-    # Check for ghost job
-    is_ghost, ghost_warning, quality_score = detect_ghost_job(job)
-    if ghost_warning and ghost_warning not in explanation.risk_factors:
-        explanation.risk_factors.insert(0, ghost_warning)
-    
-    return JobMatch(
-        job=job,
-        fit_score=fit_score,
-        decision=decision,
-        decision_reason=decision_reason,
-        explanation=explanation,
-        competition_level=competition_level,
-        career_impact=career_impact
-    )
+    career_impact = assess_career_impact(job, profile, fit_score, ctx)
+    if timer:
+        timer.lap("decision")
+    
+    return ScoredJob(job, semantic_score, fit_score, DECISIONS[decision], reason, risks,
+                     competition_level, career_impact)
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(collapse_duplicates: bool = False):
     """Get statistics about job matches"""
+    require_ready()
     
     if not current_profile:
         raise HTTPException(status_code=400, detail="Please create a profile first")
     
-    matcher = get_matcher()
-    ranked_jobs = matcher.rank_jobs(current_profile, jobs_database, job_embeddings_cache)
-    
-    decisions = {"Apply": 0, "Wait": 0, "Skip": 0, "Avoid": 0}
-    
-    for job, semantic_score in ranked_jobs:
-        match = create_job_match(job, semantic_score)
-        decisions[match.decision] += 1
+    catalog = job_catalog
+    # Same ranking and scoring as the feed: usually precomputed on profile save
+    snapshot = await get_feed_snapshot(
+        catalog, current_profile_context(), current_profile_version, collapse_duplicates
+    )
+    decisions = dict(snapshot.decisions)
     
     return {
-        "total_jobs": len(jobs_database),
+        "total_jobs": snapshot.total_jobs,
+        "dataset_version": catalog.version,
         "decisions": decisions,
         "recommendation": f"Focus on the {decisions['Apply']} jobs marked 'Apply'"
     }
 
 
+@app.post("/api/simulate", response_model=SimulationResponse)
+async def simulate_profile_change(request: SimulationRequest):
+    """
+    What-if: how the feed would change with skills added/removed or another
+    experience level. Only the jobs the change can affect are scored (before
+    and after); the saved profile is left untouched.
+    """
+    require_ready()
+    
+    if not current_profile:
+        raise HTTPException(status_code=400, detail="Please create a profile first")
+    
+    catalog = job_catalog
+    before, profile_version = current_profile_context(), current_profile_version
+    after = ProfileContext(hypothetical_profile(
+        before.profile, request.add_skills, request.remove_skills, request.experience_level
+    ), now=before.now)
+    
+    # Built once per dataset version (a full pass), then a lookup per request
+    index = await run_in_threadpool(get_skill_index, catalog, get_matcher())
+    jobs = [catalog.jobs[int(row)] for row in affected_rows(index, before, after, get_matcher())]
+    if request.collapse_duplicates:
+        jobs = [job for job in jobs if not job.duplicate_of or job.duplicate_of not in catalog.jobs_by_id]
+    
+    key = (
+        "simulate", profile_version, catalog.version, tuple(request.add_skills),
+        tuple(request.remove_skills), request.experience_level, request.collapse_duplicates
+    )
+    changes = await ranking_executor.run(
+        key, compute_simulation, catalog, before, after, [job.job_id for job in jobs]
+    )
+    
+    decision_changes = {"Apply": 0, "Wait": 0, "Skip": 0, "Avoid": 0}
+    for change in changes:
+        decision_changes[change.decision_before] -= 1
+        decision_changes[change.decision_after] += 1
+    
+    newly_qualifying = sorted(
+        (c for c in changes if c.decision_after == "Apply" and c.decision_before != "Apply"),
+        key=lambda c: c.fit_after, reverse=True
+    )
+    fit_deltas = sorted((c for c in changes if c.fit_delta), key=lambda c: abs(c.fit_delta), reverse=True)
+    
+    return SimulationResponse(
+        skills=after.profile.skills,
+        experience_level=after.profile.experience_level,
+        affected_jobs=len(jobs),
+        total_jobs=len(catalog.jobs),
+        decision_changes=decision_changes,
+        newly_qualifying_count=len(newly_qualifying),
+        newly_qualifying=newly_qualifying[:request.limit],
+        fit_deltas=fit_deltas[:request.limit],
+        dataset_version=catalog.version
+    )
+
+
+def compute_simulation(
+    catalog: JobCatalog,
+    before: ProfileContext,
+    after: ProfileContext,
+    job_ids: List[str]
+) -> List[SimulatedJob]:
+    """Score the affected jobs for both profiles (runs on the ranking executor)"""
+    jobs = [catalog.jobs_by_id[job_id] for job_id in job_ids]
+    timer = metrics.stage_timer()
+    changes = []
+    for job, score_before, score_after in zip(
+        jobs, semantic_scores(before.profile, jobs, catalog), semantic_scores(after.profile, jobs, catalog)
+    ):
+        old = score_job(job, score_before, before, catalog)
+        new = score_job(job, score_after, after, catalog)
+        changes.append(SimulatedJob(
+            job_id=job.job_id,
+            title=job.normalized_title,
+            company=job.normalized_company,
+            fit_before=old.fit_score,
+            fit_after=new.fit_score,
+            fit_delta=round(new.fit_score - old.fit_score, 2),
+            decision_before=old.decision,
+            decision_after=new.decision
+        ))
+    metrics.count("obliqo_jobs_scored_total", 2 * len(jobs))
+    if timer:
+        timer.lap("simulate")
+    return changes
+
+
+@app.get("/api/skills/to-learn", response_model=SkillsToLearnResponse)
+async def get_skills_to_learn(limit: int = 20):
+    """
+    Skills the saved profile lacks, ranked by the jobs they would turn into
+    Apply/Wait, then by demand weighted by fit. Computed over every job in
+    one vectorized pass; no match is built or explained.
+    """
+    require_ready()
+    
+    if not current_profile:
+        raise HTTPException(status_code=400, detail="Please create a profile first")
+    
+    catalog = job_catalog
+    normalizer = get_skill_normalizer()
+    timer = metrics.stage_timer()
+    rows = await run_in_threadpool(
+        skills_to_learn, catalog, get_matcher(), current_profile_context(), max(1, limit)
+    )
+    if timer:
+        timer.lap("skills_to_learn")
+    metrics.count("obliqo_jobs_scored_total", len(catalog.jobs))
+    
+    skills = []
+    for row in rows:
+        name = normalizer.name(row.skill_id)
+        gap = get_skill_gap(name)
+        skills.append(SkillDemand(
+            skill=name,
+            jobs_requiring=row.jobs_requiring,
+            weighted_demand=row.weighted_demand,
+            to_apply=row.to_apply,
+            to_wait=row.to_wait,
+            upgrades=row.upgrades,
+            average_fit_gain=row.average_fit_gain,
+            importance=gap.importance,
+            estimated_learning_time=gap.estimated_learning_time
+        ))
+    
+    return SkillsToLearnResponse(total_jobs=len(catalog.jobs), skills=skills, dataset_version=catalog.version)
+
+
+@app.post("/api/batch/match", response_model=CohortMatchResponse)
+async def match_profile_cohort(request: Request, top_k: int = 10, collapse_duplicates: bool = False):
+    """
+    Cohort matching: the request body is JSONL, one UserProfile per line.
+    Every profile is scored against the whole catalog (the saved profile is
+    not used); each gets its decision counts and top_k matches.
+    """
+    require_ready()
+    
+    profiles, errors = parse_profiles((await request.body()).decode("utf-8").splitlines())
+    if len(profiles) > MAX_BATCH_PROFILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_PROFILES} profiles per request")
+    
+    catalog = job_catalog
+    timer = metrics.stage_timer()
+    results = await run_in_threadpool(
+        match_cohort, catalog, get_matcher(), profiles, max(1, top_k), collapse_duplicates,
+        BATCH_WORKERS, BATCH_PROFILE_CHUNK, BATCH_JOB_CHUNK
+    )
+    metrics.count("obliqo_jobs_scored_total", len(profiles) * len(catalog.jobs))
+    if timer:
+        timer.lap("cohort")
+    
+    return CohortMatchResponse(
+        profiles=results,
+        errors=errors,
+        total_jobs=len(catalog.jobs),
+        dataset_version=catalog.version
+    )
+
+
+@app.post("/api/candidates")
+async def store_candidates(request: Request):
+    """Add or replace stored profiles (JSONL body, one UserProfile per line) for candidate ranking"""
+    profiles, errors = parse_profiles((await request.body()).decode("utf-8").splitlines())
+    candidate_pool.upsert(profiles)
+    return {
+        "stored": [profile.user_id for profile in profiles],
+        "errors": errors,
+        "total_candidates": len(candidate_pool.profiles)
+    }
+
+
+@app.delete("/api/candidates/{user_id}")
+async def delete_candidate(user_id: str):
+    """Remove a stored profile from candidate ranking"""
+    if candidate_pool.delete([user_id]):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"deleted": user_id, "total_candidates": len(candidate_pool.profiles)}
+
+
+@app.get("/api/jobs/{job_id}/candidates", response_model=CandidateRankingResponse)
+async def rank_job_candidates(job_id: str, top_k: int = 20, decision_filter: Optional[str] = None):
+    """Stored profiles ranked by fit for one job (reverse matching)"""
+    require_ready()
+    
+    catalog = job_catalog
+    job = catalog.jobs_by_id.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    matcher = get_matcher()
+    timer = metrics.stage_timer()
+    # Indexed once per pool/catalog version, then one vectorized pass per job
+    index = await run_in_threadpool(get_candidate_index, candidate_pool, catalog, matcher)
+    candidates, decisions = await run_in_threadpool(
+        compute_candidate_matches, index, catalog, matcher, job, max(1, top_k), decision_filter
+    )
+    if timer:
+        timer.lap("rank_candidates")
+    metrics.count("obliqo_jobs_scored_total", len(index))
+    
+    return CandidateRankingResponse(
+        job_id=job_id,
+        total_candidates=len(index),
+        decisions=decisions,
+        candidates=candidates,
+        dataset_version=catalog.version
+    )
+
+
+def compute_candidate_matches(
+    index: CandidateIndex,
+    catalog: JobCatalog,
+    matcher,
+    job: Job,
+    top_k: int,
+    decision_filter: Optional[str]
+) -> Tuple[List[CandidateMatch], Dict[str, int]]:
+    """Score every indexed profile against the job and explain the top_k (runs on the thread pool)"""
+    top, decisions = rank_candidates(index, catalog, matcher, job, top_k, decision_filter)
+    candidates = []
+    for profile, semantic_score in top:
+        ctx, explanation, decision, decision_reason = explain_match(
+            catalog, job, semantic_score, ProfileContext(profile)
+        )
+        candidates.append(CandidateMatch(
+            user_id=profile.user_id,
+            full_name=profile.personal_info.full_name,
+            fit_score=ctx.fit_score,
+            decision=decision,
+            decision_reason=decision_reason,
+            matched_skills=explanation.matched_skills,
+            missing_skills=explanation.missing_skills
+        ))
+    return candidates, decisions
+
+
+@app.post("/api/jobs/bulk", response_model=JobIngestResponse)
+async def upsert_jobs(request: JobUpsertRequest):
+    """Add jobs, or replace existing ones with the same job_id, without a restart"""
+    require_ready()
+    errors = [
+        {"index": i, "job_id": job.job_id, "errors": job_errors}
+        for i, job in enumerate(request.jobs)
+        for job_errors in [validate_job(job)] if job_errors
+    ]
+    if errors:
+        # All-or-nothing: nothing is applied when any job in the batch is invalid
+        raise HTTPException(status_code=422, detail=errors)
+    
+    if shared_index:
+        return await submit_shared_update(request.jobs, [])
+    catalog, _ = await run_in_threadpool(update_catalog, request.jobs, [])
+    return JobIngestResponse(
+        dataset_version=catalog.version,
+        total_jobs=len(catalog.jobs),
+        upserted=[job.job_id for job in request.jobs]
+    )
+
+
+@app.post("/api/jobs/bulk-delete", response_model=JobIngestResponse)
+async def delete_jobs(request: JobDeleteRequest):
+    """Remove jobs by ID without a restart"""
+    require_ready()
+    if shared_index:
+        return await submit_shared_update([], request.job_ids)
+    catalog, not_found = await run_in_threadpool(update_catalog, [], request.job_ids)
+    return JobIngestResponse(
+        dataset_version=catalog.version,
+        total_jobs=len(catalog.jobs),
+        deleted=[job_id for job_id in dict.fromkeys(request.job_ids) if job_id not in not_found],
+        not_found=not_found
+    )
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Stage latency histograms and counters in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+if PROFILING_ENABLED:
+    @app.get("/debug/profiles")
+    async def list_profiles():
+        """Recent requested and slow-request profiles, newest first (without hot spots)"""
+        return [
+            {key: value for key, value in profile.items() if key != "top"}
+            for profile in reversed(profiling.recent_profiles)
+        ]
+
+    @app.get("/debug/profiles/{profile_id}")
+    async def get_request_profile(profile_id: int):
+        """One captured profile with its top-N hot spots by cumulative time"""
+        profile = profiling.get_profile(profile_id)
+        if not profile:
+            raise HTTPException(status_code=404, detail="Profile not found (it may have been evicted)")
+        return profile
+
+
 # Mount static files for serving uploaded CVs (mounted after all routes)
 app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -140,6 +140,9 @@ class Job(BaseModel):
     company_size: Optional[str] = None
     is_remote: bool = False
     
+    # Set at ingest when this posting is a near-duplicate repost of another job
+    duplicate_of: Optional[str] = None
+    
     # Helper properties to normalize field access
     @property
     def normalized_title(self) -> str:
@@ -192,9 +195,148 @@ class JobMatch(BaseModel):
     career_impact: str = Field(..., description="Positive, Neutral, Negative")
 
 
+class JobUpsertRequest(BaseModel):
+    """Batch of jobs to add, or replace when the job_id already exists"""
+    jobs: List[Job]
+
+
+class JobDeleteRequest(BaseModel):
+    """Batch of job IDs to remove"""
+    job_ids: List[str]
+
+
+class JobIngestResponse(BaseModel):
+    """Result of a bulk ingestion call"""
+    dataset_version: int
+    total_jobs: int
+    upserted: List[str] = []
+    deleted: List[str] = []
+    not_found: List[str] = []
+
+
+class JobDetailsRequest(BaseModel):
+    """Job IDs to analyse in one call"""
+    job_ids: List[str]
+
+
+class JobDetailResult(BaseModel):
+    """One entry of a batch detail response; match is None when the job was not found"""
+    job_id: str
+    found: bool
+    match: Optional[JobMatch] = None
+    detail: Optional[str] = None
+
+
+class JobDetailsResponse(BaseModel):
+    """Batch detail results, in the order the IDs were requested"""
+    results: List[JobDetailResult]
+    dataset_version: int
+
+
 class JobFeedResponse(BaseModel):
     """Response for job feed endpoint"""
     jobs: List[JobMatch]
     total_count: int
     page: int
     page_size: int
+
+
+class SimulationRequest(BaseModel):
+    """Hypothetical changes to the saved profile; the profile itself is not modified"""
+    add_skills: List[str] = []
+    remove_skills: List[str] = []
+    experience_level: Optional[str] = None
+    collapse_duplicates: bool = False
+    limit: int = Field(20, ge=1, le=500, description="Jobs returned per list")
+
+
+class SimulatedJob(BaseModel):
+    """Fit score and decision of one job before and after the simulated change"""
+    job_id: str
+    title: str
+    company: str
+    fit_before: float
+    fit_after: float
+    fit_delta: float
+    decision_before: str
+    decision_after: str
+
+
+class SimulationResponse(BaseModel):
+    """What a profile change would do to the feed, computed on the affected jobs only"""
+    skills: List[str]
+    experience_level: str
+    affected_jobs: int
+    total_jobs: int
+    decision_changes: Dict[str, int]
+    newly_qualifying_count: int
+    newly_qualifying: List[SimulatedJob]
+    fit_deltas: List[SimulatedJob]
+    dataset_version: int
+
+
+class CohortJobMatch(BaseModel):
+    """One of a profile's top matches in a cohort run"""
+    job_id: str
+    title: str
+    company: str
+    fit_score: float
+    decision: str
+    decision_reason: str
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class CohortProfileResult(BaseModel):
+    """Decision counts over the catalog and the best matches of one cohort profile"""
+    user_id: str
+    decisions: Dict[str, int]
+    top_matches: List[CohortJobMatch]
+
+
+class CohortMatchResponse(BaseModel):
+    """Cohort results in input order; lines that are not valid profiles are listed in errors"""
+    profiles: List[CohortProfileResult]
+    errors: List[Dict] = []
+    total_jobs: int
+    dataset_version: int
+
+
+class CandidateMatch(BaseModel):
+    """One stored profile ranked for a job"""
+    user_id: str
+    full_name: str
+    fit_score: float
+    decision: str
+    decision_reason: str
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class CandidateRankingResponse(BaseModel):
+    """Best-fitting stored profiles for a job, and the decisions over all of them"""
+    job_id: str
+    total_candidates: int
+    decisions: Dict[str, int]
+    candidates: List[CandidateMatch]
+    dataset_version: int
+
+
+class SkillDemand(BaseModel):
+    """A missing skill: its demand among the jobs and the decisions it would upgrade"""
+    skill: str
+    jobs_requiring: int
+    weighted_demand: float = Field(..., description="Sum of the profile's fit/100 over the jobs requiring it")
+    to_apply: int = Field(..., description="Jobs that would become Apply")
+    to_wait: int = Field(..., description="Jobs that would become Wait (from Skip/Avoid)")
+    upgrades: int = Field(..., description="Jobs whose decision would improve")
+    average_fit_gain: float = Field(..., description="Over the jobs the skill re-scores")
+    importance: str
+    estimated_learning_time: str
+
+
+class SkillsToLearnResponse(BaseModel):
+    """The saved profile's missing skills, ranked across the whole job market"""
+    total_jobs: int
+    skills: List[SkillDemand]
+    dataset_version: int
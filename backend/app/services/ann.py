@@ -0,0 +1,281 @@
+"""
+Approximate Nearest-Neighbour Index
+IVF (k-means coarse quantizer) over dense count-sketches of sparse job vectors, NumPy only
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+SKETCH_DIM = 128
+SKETCH_HASHES = 4  # sketch buckets per sparse feature
+
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 64
+ASSIGN_CHUNK = 65536
+
+
+class CountSketch:
+    """
+    Random projection of hashed sparse features onto a small dense space.
+    Each feature is added, with a random sign, to SKETCH_HASHES buckets;
+    inner products are preserved in expectation.
+    """
+
+    def __init__(self, num_features: int, dim: int = SKETCH_DIM, hashes: int = SKETCH_HASHES, seed: int = 3):
+        rng = np.random.RandomState(seed)
+        self.dim = dim
+        self.hashes = hashes
+        self.buckets = rng.randint(0, dim, size=(num_features, hashes)).astype(np.int32)
+        self.signs = (rng.randint(0, 2, size=(num_features, hashes)) * 2 - 1).astype(np.float32)
+        self.signs /= np.sqrt(hashes)
+
+    def project(self, features: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Dense, L2-normalized sketch of one sparse vector"""
+        dense = np.bincount(
+            self.buckets[features].ravel(),
+            weights=(self.signs[features] * values[:, None]).ravel(),
+            minlength=self.dim,
+        ).astype(np.float32)
+        return _normalize(dense)
+
+    def project_rows(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                     rows_per_chunk: int = 32768) -> np.ndarray:
+        """Dense, L2-normalized sketches of every CSR row, shape (rows, dim)"""
+        num_rows = len(indptr) - 1
+        result = np.empty((num_rows, self.dim), dtype=np.float32)
+
+        for start in range(0, num_rows, rows_per_chunk):
+            end = min(start + rows_per_chunk, num_rows)
+            lo, hi = indptr[start], indptr[end]
+            rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+            features = indices[lo:hi]
+            slots = (rows[:, None] * self.dim + self.buckets[features]).ravel()
+            weights = (self.signs[features] * data[lo:hi, None]).ravel()
+            dense = np.bincount(slots, weights=weights, minlength=(end - start) * self.dim)
+            result[start:end] = dense.reshape(end - start, self.dim)
+
+        return _normalize(result)
+
+
+class IVFIndex:
+    """
+    Inverted-file index: vectors are bucketed under their nearest k-means
+    centroid and a search scans only the nprobe closest buckets. nprobe is
+    the recall/latency knob. Keys are non-negative ints (matrix rows).
+    """
+
+    def __init__(self, dim: int = SKETCH_DIM, nlist: Optional[int] = None, nprobe: int = 8, seed: int = 5):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids = np.zeros((0, dim), dtype=np.float32)
+
+        # Per list: keys and vectors, with spare capacity for inserts
+        self._keys = []
+        self._vectors = []
+        self._sizes = np.zeros(0, dtype=np.int64)
+
+        # key -> (list, position), -1 when absent
+        self._list_of = np.full(0, -1, dtype=np.int32)
+        self._position_of = np.full(0, -1, dtype=np.int64)
+
+        # Lists whose arrays this index may modify in place (see copy())
+        self._owned = set()
+
+    def __len__(self) -> int:
+        return int(self._sizes.sum())
+
+    @property
+    def is_trained(self) -> bool:
+        return len(self.centroids) > 0
+
+    def train(self, vectors: np.ndarray):
+        """Spherical k-means on a sample of the vectors"""
+        nlist = self.nlist or int(np.clip(np.sqrt(len(vectors)), 1, 4096))
+        nlist = max(1, min(nlist, len(vectors)))
+        rng = np.random.RandomState(self.seed)
+
+        sample_size = min(len(vectors), nlist * KMEANS_SAMPLE_PER_LIST)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            # Empty clusters keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = _normalize(sums[filled])
+
+        self.nlist = nlist
+        self.centroids = centroids
+        self._keys = [np.zeros(0, dtype=np.int64) for _ in range(nlist)]
+        self._vectors = [np.zeros((0, self.dim), dtype=np.float32) for _ in range(nlist)]
+        self._sizes = np.zeros(nlist, dtype=np.int64)
+        self._owned = set(range(nlist))
+
+    def copy(self) -> "IVFIndex":
+        """
+        Copy-on-write clone: list arrays stay shared until either index
+        modifies a list, so readers of the original never see a partial update.
+        """
+        clone = IVFIndex.__new__(IVFIndex)
+        clone.__dict__.update(self.__dict__)
+        clone._keys = list(self._keys)
+        clone._vectors = list(self._vectors)
+        clone._sizes = self._sizes.copy()
+        clone._list_of = self._list_of.copy()
+        clone._position_of = self._position_of.copy()
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def export(self, key_map: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Flat arrays describing the index (for publishing to shared memory).
+        key_map optionally renumbers keys (old key -> new key).
+        """
+        sizes = self._sizes
+        keys = np.concatenate([self._keys[l][:sizes[l]] for l in range(self.nlist)])
+        if key_map is not None:
+            keys = key_map[keys]
+        return {
+            "ann_centroids": self.centroids,
+            "ann_list_offsets": np.concatenate(([0], np.cumsum(sizes))),
+            "ann_keys": keys,
+            "ann_vectors": np.concatenate([self._vectors[l][:sizes[l]] for l in range(self.nlist)]),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], nprobe: int = 8) -> "IVFIndex":
+        """
+        Index over exported arrays without copying them (they may be read-only
+        memory maps); lists are only copied if this index is modified.
+        """
+        centroids = arrays["ann_centroids"]
+        offsets = arrays["ann_list_offsets"]
+        keys, vectors = arrays["ann_keys"], arrays["ann_vectors"]
+
+        index = cls(dim=centroids.shape[1], nlist=len(centroids), nprobe=nprobe)
+        index.centroids = centroids
+        index._keys = [keys[offsets[l]:offsets[l + 1]] for l in range(index.nlist)]
+        index._vectors = [vectors[offsets[l]:offsets[l + 1]] for l in range(index.nlist)]
+        index._sizes = np.diff(offsets).astype(np.int64)
+
+        index._reserve_keys(int(keys.max()) + 1 if len(keys) else 0)
+        list_ids = np.repeat(np.arange(index.nlist, dtype=np.int32), index._sizes)
+        index._list_of[keys] = list_ids
+        index._position_of[keys] = np.arange(len(keys)) - offsets[list_ids]
+        return index
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid of every vector"""
+        result = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_CHUNK):
+            chunk = vectors[start:start + ASSIGN_CHUNK]
+            result[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return result
+
+    def add(self, keys: np.ndarray, vectors: np.ndarray):
+        """Insert (or replace) vectors under the given keys"""
+        keys = np.asarray(keys, dtype=np.int64)
+        if not self.is_trained:
+            self.train(vectors)
+        self.remove(keys)
+        self._reserve_keys(int(keys.max()) + 1 if len(keys) else 0)
+
+        lists = self.assign(vectors)
+        order = np.argsort(lists, kind="stable")
+        boundaries = np.flatnonzero(np.diff(lists[order])) + 1
+        for group in np.split(order, boundaries):
+            if len(group):
+                self._append(int(lists[group[0]]), keys[group], vectors[group])
+
+    def remove(self, keys: np.ndarray):
+        """Delete keys (unknown keys are ignored)"""
+        for key in np.asarray(keys, dtype=np.int64):
+            if key >= len(self._list_of) or self._list_of[key] < 0:
+                continue
+            list_id, position = self._list_of[key], self._position_of[key]
+            last = self._sizes[list_id] - 1
+            self._own(list_id)
+
+            # Swap-remove: move the list's last entry into the freed slot
+            moved = self._keys[list_id][last]
+            self._keys[list_id][position] = moved
+            self._vectors[list_id][position] = self._vectors[list_id][last]
+            self._position_of[moved] = position
+
+            self._sizes[list_id] = last
+            self._list_of[key] = -1
+            self._position_of[key] = -1
+
+    def probe(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Ids of the nprobe lists whose centroids are closest to the query"""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        centroid_scores = self.centroids @ query
+        return np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Every key stored in the probed lists (for exact rescoring by the caller)"""
+        if not self.is_trained:
+            return np.zeros(0, dtype=np.int64)
+        lists = self.probe(query, nprobe)
+        return np.concatenate([self._keys[l][:self._sizes[l]] for l in lists])
+
+    def search(self, query: np.ndarray, top_n: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Keys and approximate scores (inner product) of the top_n vectors, best first"""
+        if not self.is_trained or top_n <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        lists = self.probe(query, nprobe)
+        keys = np.concatenate([self._keys[l][:self._sizes[l]] for l in lists])
+        scores = np.concatenate([self._vectors[l][:self._sizes[l]] @ query for l in lists])
+
+        if len(keys) > top_n:
+            best = np.argpartition(-scores, top_n - 1)[:top_n]
+            keys, scores = keys[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return keys[order], scores[order]
+
+    def _append(self, list_id: int, keys: np.ndarray, vectors: np.ndarray):
+        size = self._sizes[list_id]
+        needed = size + len(keys)
+        if needed > len(self._keys[list_id]):
+            self._own(list_id, max(needed, 2 * len(self._keys[list_id]), 16))
+        else:
+            self._own(list_id)
+
+        self._keys[list_id][size:needed] = keys
+        self._vectors[list_id][size:needed] = vectors
+        self._list_of[keys] = list_id
+        self._position_of[keys] = np.arange(size, needed)
+        self._sizes[list_id] = needed
+
+    def _own(self, list_id: int, capacity: Optional[int] = None):
+        """Give this index a private copy of a list (optionally with a new capacity)"""
+        if list_id in self._owned and capacity is None:
+            return
+        size = self._sizes[list_id]
+        capacity = capacity or len(self._keys[list_id])
+        keys = np.empty(capacity, dtype=np.int64)
+        keys[:size] = self._keys[list_id][:size]
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:size] = self._vectors[list_id][:size]
+        self._keys[list_id], self._vectors[list_id] = keys, vectors
+        self._owned.add(list_id)
+
+    def _reserve_keys(self, count: int):
+        if count <= len(self._list_of):
+            return
+        capacity = max(count, 2 * len(self._list_of))
+        self._list_of = np.concatenate((self._list_of, np.full(capacity - len(self._list_of), -1, dtype=np.int32)))
+        self._position_of = np.concatenate((self._position_of, np.full(capacity - len(self._position_of), -1, dtype=np.int64)))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
@@ -0,0 +1,201 @@
+"""
+Candidate Ranking
+Reverse matching for recruiters: the stored profiles that fit one job best.
+
+Profiles are stored in memory (CandidatePool), like the saved profile. For
+ranking, they are indexed once per pool and catalog version. The indexes map
+skill IDs, semantic terms and preferred locations/roles to profile rows. A
+job is then scored against every profile with array operations, using the
+same formula as calculate_fit_score() and make_decision(). Only the top
+candidates go through the explainer.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import UserProfile
+from app.services.cohort import RANK_MATCH, ValueSet, round_scores
+from app.services.context import ProfileContext
+from app.services.decision import DECISIONS, decision_codes
+from app.services.skill_normalizer import get_skill_normalizer
+from app.services.vector_matcher import COSINE_SATURATION, TfidfIndex
+
+
+class CandidatePool:
+    """Stored profiles by user_id. Updates replace the dict, so readers keep a coherent snapshot."""
+
+    def __init__(self):
+        self.profiles: Dict[str, UserProfile] = {}
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, profiles: List[UserProfile]):
+        with self._lock:
+            stored = dict(self.profiles)
+            for profile in profiles:
+                stored[profile.user_id] = profile
+            self.profiles = stored
+            self.version += 1
+
+    def delete(self, user_ids: List[str]) -> List[str]:
+        """Remove profiles; returns the IDs that were not stored"""
+        with self._lock:
+            stored = dict(self.profiles)
+            not_found = [user_id for user_id in user_ids if stored.pop(user_id, None) is None]
+            self.profiles = stored
+            self.version += 1
+        return not_found
+
+
+class CandidateIndex:
+    """Profile-side inverted indexes and arrays for one (pool, catalog) version"""
+
+    def __init__(self, profiles: List[UserProfile], catalog, matcher):
+        self.profiles = profiles
+        normalizer = get_skill_normalizer()
+        self.tfidf = isinstance(catalog.embeddings, TfidfIndex)
+
+        by_skill: Dict[int, List[int]] = defaultdict(list)
+        by_term: Dict[object, List[int]] = defaultdict(list)  # keyword, or TF-IDF feature
+        term_values: Dict[int, List[float]] = defaultdict(list)
+        by_location: Dict[str, List[int]] = defaultdict(list)
+        by_role: Dict[str, List[int]] = defaultdict(list)
+        self.has_embedding = np.zeros(len(profiles), dtype=bool)
+        self.level_ranks = np.zeros(len(profiles), dtype=np.int8)
+        self.level_is_critical = np.zeros(len(profiles), dtype=bool)
+
+        for row, profile in enumerate(profiles):
+            profile_ctx = ProfileContext(profile, skill_ids=normalizer.canonical_ids(profile.skills, add=False))
+            for skill_id in profile_ctx.skill_ids:
+                by_skill[skill_id].append(row)
+
+            embedding = matcher.create_user_embedding(profile)
+            if self.tfidf:
+                # (feature, value) postings of the TF-IDF profile vectors
+                for feature, value in zip(*embedding):
+                    by_term[int(feature)].append(row)
+                    term_values[int(feature)].append(value)
+                self.has_embedding[row] = len(embedding[0]) > 0
+            else:
+                for term in embedding:
+                    by_term[term].append(row)
+                self.has_embedding[row] = bool(embedding)
+
+            self.level_ranks[row] = profile_ctx.level_rank
+            self.level_is_critical[row] = profile_ctx.level_is_flagged
+            for location in set(profile_ctx.locations_lower):
+                by_location[location].append(row)
+            for role in set(profile_ctx.roles_lower):
+                by_role[role].append(row)
+
+        self.by_skill = {skill_id: np.array(rows, dtype=np.int32) for skill_id, rows in by_skill.items()}
+        self.by_term = {term: np.array(rows, dtype=np.int32) for term, rows in by_term.items()}
+        self.term_values = {feature: np.array(values, dtype=np.float32) for feature, values in term_values.items()}
+        self.locations = ValueSet(sorted(by_location))
+        self.by_location = [np.array(by_location[value], dtype=np.int32) for value in self.locations.values]
+        self.roles = ValueSet(sorted(by_role))
+        self.by_role = [np.array(by_role[value], dtype=np.int32) for value in self.roles.values]
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def _count(self, postings: List[np.ndarray]) -> np.ndarray:
+        """Per profile: how many of the posting lists contain it"""
+        if not postings:
+            return np.zeros(len(self.profiles))
+        return np.bincount(np.concatenate(postings), minlength=len(self.profiles)).astype(np.float64)
+
+    def semantic_scores(self, catalog, matcher, job) -> np.ndarray:
+        """Semantic score of the job for every profile, as rank_jobs computes it"""
+        if self.tfidf:
+            features, values = catalog.embeddings.get(job.job_id) or matcher.create_job_embedding(job)
+            # One column per job feature, in the job's feature order, so the
+            # row sums add the same products in the same order as score_all
+            columns = np.zeros((len(self.profiles), len(features)), dtype=np.float32)
+            for i, feature in enumerate(features):
+                rows = self.by_term.get(int(feature))
+                if rows is not None:
+                    columns[rows, i] = self.term_values[int(feature)]
+            products = (values[None, :] * columns).ravel()
+            segments = np.arange(0, len(products), max(len(features), 1))
+            cosines = np.zeros(len(self.profiles))
+            if len(features) and len(self.profiles):
+                cosines = np.add.reduceat(products.astype(np.float64), segments)
+            scores = 40.0 + 60.0 * np.minimum(1.0, cosines / COSINE_SATURATION)
+        else:
+            job_keywords = matcher.embedding_terms(catalog.embeddings, job)
+            matches = self._count([self.by_term[term] for term in job_keywords if term in self.by_term])
+            scores = np.minimum(100.0, 40 + (matches / max(len(job_keywords), 1) * 60))
+            if not job_keywords:
+                scores[:] = 50.0
+        scores[~self.has_embedding] = 50.0
+        return scores
+
+    def score(self, catalog, matcher, job) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(fit scores, decision codes, semantic scores) of the job for every profile"""
+        priors = catalog.priors[job.job_id]
+        semantic = self.semantic_scores(catalog, matcher, job)
+
+        requirement_count = len(priors.requirements)
+        matched = self._count([self.by_skill[skill_id] for skill_id in priors.requirements_by_id
+                               if skill_id in self.by_skill])
+        overlap = matched / requirement_count if requirement_count else np.zeros(len(self.profiles))
+        experience = RANK_MATCH[self.level_ranks, priors.job_level_rank]
+
+        if priors.is_remote:
+            location = np.full(len(self.profiles), 100.0)
+        else:
+            hits = self.locations.matches([priors.location_lower])
+            location = np.where(self._count([self.by_location[code] for code in np.flatnonzero(hits)]) > 0, 100.0, 30.0)
+        hits = self.roles.matches([priors.title_lower])
+        role = np.where(self._count([self.by_role[code] for code in np.flatnonzero(hits)]) > 0, 100.0, 40.0)
+
+        # Same terms and order as calculate_fit_score
+        fit = semantic * 0.4 + overlap * 100 * 0.3 + experience * 0.2 + ((location + role) / 2) * 0.1
+        fit = round_scores(fit)
+
+        ghost = priors.days_old is not None and priors.days_old > 60
+        flagged = self.level_is_critical | priors.level_is_flagged
+        critical = ghost | (flagged & (priors.job_level_rank - self.level_ranks >= 2))
+        return fit, decision_codes(fit, critical), semantic
+
+
+# Index of the latest pool snapshot, rebuilt when the pool or the catalog changes
+_index_lock = threading.Lock()
+_index_key: Optional[Tuple[int, object]] = None
+_index: Optional[CandidateIndex] = None
+
+
+def get_candidate_index(pool: CandidatePool, catalog, matcher) -> CandidateIndex:
+    global _index_key, _index
+    with _index_lock:
+        profiles, version = pool.profiles, pool.version
+        if _index_key is None or _index_key[0] != version or _index_key[1] is not catalog:
+            _index = CandidateIndex(list(profiles.values()), catalog, matcher)
+            _index_key = (version, catalog)
+            print(f"[SUCCESS] Indexed {len(_index)} candidate profiles (pool v{version})")
+        return _index
+
+
+def rank_candidates(
+    index: CandidateIndex,
+    catalog,
+    matcher,
+    job,
+    top_k: int,
+    decision_filter: Optional[str] = None
+) -> Tuple[List[Tuple[UserProfile, float]], Dict[str, int]]:
+    """
+    The top_k profiles by fit score (earlier stored first on ties) with their
+    semantic scores, and the decision counts over all profiles
+    """
+    fit, codes, semantic = index.score(catalog, matcher, job)
+    decisions = dict(zip(DECISIONS, (int(n) for n in np.bincount(codes, minlength=len(DECISIONS)))))
+
+    rows = np.arange(len(index))
+    if decision_filter in DECISIONS:
+        rows = rows[codes == DECISIONS.index(decision_filter)]
+    order = rows[np.lexsort((rows, -fit[rows]))][:top_k]
+    return [(index.profiles[row], float(semantic[row])) for row in order], decisions
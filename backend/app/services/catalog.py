@@ -0,0 +1,215 @@
+"""
+Job Catalog
+Versioned, immutable snapshots of the jobs and all state derived from them
+"""
+import json
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from app.models import Job
+from app.services.priors import JobPriors, build_job_priors, compute_job_priors, refresh_job_priors
+from app.services.ingest import derive_job_id, ensure_job_ids, validate_job
+from app.services.dedup import DuplicateIndex, build_duplicate_index
+from app.services.job_table import JobRow, JobTable
+from app.services.skill_normalizer import get_skill_normalizer
+
+
+# Larger updates are not kept for replay (see CatalogDelta)
+MAX_DELTA_JOBS = 10000
+
+
+class CatalogDelta(NamedTuple):
+    """How a catalog version was derived from the one before, to derive it again in a worker process"""
+    base: Optional[weakref.ref]  # the previous version (parent process only, not sent)
+    kind: str  # "apply" or "priors"
+    upserts: List[Job]
+    deleted_ids: List[str]
+    now: datetime
+
+
+class JobCatalog:
+    """
+    One consistent version of the job set: the jobs, the job_id map, priors,
+    matcher embeddings and duplicate clusters. A published catalog is never
+    modified - apply() builds the next version next to it, and callers swap
+    the reference, so readers holding the old snapshot keep a coherent view.
+    Jobs are stored by column (JobTable) and handed out as JobRow views.
+    """
+
+    def __init__(self, version: int, jobs: JobTable, priors: Dict[str, JobPriors],
+                 embeddings, duplicate_index: Optional[DuplicateIndex], delta: Optional[CatalogDelta] = None):
+        self.version = version
+        self.jobs = jobs
+        self.jobs_by_id = jobs.by_id  # job_id -> JobRow
+        self.priors = priors
+        self.embeddings = embeddings  # job_id -> matcher embedding
+        self.duplicate_index = duplicate_index
+        self.delta = delta
+        self.updated_at = datetime.now()
+
+    def __getstate__(self):
+        # The delta points back at the previous version: it stays in this process
+        return dict(self.__dict__, delta=None)
+
+    @classmethod
+    def empty(cls) -> "JobCatalog":
+        return cls(0, JobTable.from_jobs([]), {}, {}, None)
+
+    @classmethod
+    def build(cls, jobs: List[Job], matcher, version: int = 1,
+              progress: Optional[Callable[[str], None]] = None) -> "JobCatalog":
+        """Full build from a list of raw jobs; progress(phase) is called as each phase starts"""
+        progress = progress or (lambda phase: None)
+        jobs = ensure_job_ids(jobs)
+
+        # Canonical skill vocabulary over every job skill
+        progress("skills")
+        normalizer = get_skill_normalizer()
+        normalizer.build(skill for job in jobs for skill in job.normalized_skills)
+        print(f"[SUCCESS] Indexed {len(normalizer)} canonical skills")
+
+        # Near-duplicate reposts (sets job.duplicate_of)
+        progress("duplicates")
+        duplicate_index = build_duplicate_index(jobs)
+        duplicate_count = sum(1 for job in jobs if job.duplicate_of)
+        print(f"[SUCCESS] Found {duplicate_count} duplicate postings")
+
+        # From here on the Job models are dropped for the columnar table
+        table = JobTable.from_jobs(jobs)
+        del jobs
+
+        # Profile-independent priors (quality, ghost flags, competition)
+        progress("priors")
+        priors = build_job_priors(table)
+        print(f"[SUCCESS] Computed priors for {len(priors)} jobs")
+
+        # Pre-compute embeddings
+        progress("embeddings")
+        print("Embeddings generation started...")
+        embeddings = matcher.index_jobs(table)
+        print(f"[SUCCESS] Pre-computed embeddings for {len(embeddings)} jobs")
+
+        return cls(version, table, priors, embeddings, duplicate_index)
+
+    @classmethod
+    def attach(cls, version: int, jobs: JobTable, priors: Dict[str, JobPriors], embeddings) -> "JobCatalog":
+        """
+        Catalog around jobs, priors and embeddings published by another process
+        (see services/shared_index.py). Read-only: the loader owns updates,
+        so there is no duplicate index.
+        """
+        return cls(version, jobs, priors, embeddings, None)
+
+    def apply(self, upserts: List[Job], deleted_ids: Iterable[str], matcher,
+              now: Optional[datetime] = None) -> Tuple["JobCatalog", List[str]]:
+        """
+        Next catalog version with `upserts` added/replaced (matched on job_id)
+        and `deleted_ids` removed. Returns the new catalog and the IDs that
+        were not found for deletion.
+        """
+        deleted_ids = list(deleted_ids)
+        # Last occurrence wins when a batch repeats a job_id
+        incoming: Dict[str, Job] = {}
+        for job in upserts:
+            job.job_id = job.job_id or derive_job_id(job)
+            job.duplicate_of = None  # assigned below, never taken from the client
+            incoming[job.job_id] = job
+        upserts = list(incoming.values())
+
+        deleted = {job_id for job_id in deleted_ids if job_id not in incoming}
+        not_found = sorted(job_id for job_id in deleted if job_id not in self.jobs_by_id)
+        deleted -= set(not_found)
+
+        get_skill_normalizer().build(skill for job in upserts for skill in job.normalized_skills)
+
+        now = now or datetime.now()
+        priors = dict(self.priors)
+        for job_id in deleted:
+            priors.pop(job_id, None)
+        for job in upserts:
+            priors[job.job_id] = compute_job_priors(job, now)
+
+        # Each version has its own duplicate index (copy-on-write); deleted and
+        # replaced jobs leave their clusters, which are re-clustered
+        duplicate_index = (self.duplicate_index or DuplicateIndex()).copy()
+        duplicate_index.remove(deleted)
+        duplicate_index.add(upserts)
+        for job in upserts:
+            job.duplicate_of = duplicate_index.duplicate_of(job.job_id)
+
+        # Replacements keep their position, new jobs go to the end
+        extended = self.jobs.extend(upserts)
+        position = {job.job_id: len(self.jobs) + i for i, job in enumerate(upserts)}
+        rows = [position.get(job_id, row) for row, job_id in enumerate(self.jobs.job_ids) if job_id not in deleted]
+        rows.extend(position[job.job_id] for job in upserts if job.job_id not in self.jobs_by_id)
+        jobs = extended.take(rows)
+        # Kept jobs whose cluster changed are stamped with their new canonical
+        stamps = {job_id: duplicate_index.duplicate_of(job_id) for job_id in duplicate_index.changed
+                  if job_id in jobs.row_of and job_id not in incoming}
+        if stamps:
+            jobs = jobs.with_duplicates(stamps)
+
+        embeddings = matcher.update_index(self.embeddings, jobs, upserts, sorted(deleted))
+
+        delta = None
+        if len(upserts) + len(deleted_ids) <= MAX_DELTA_JOBS:
+            delta = CatalogDelta(weakref.ref(self), "apply", upserts, deleted_ids, now)
+        catalog = JobCatalog(self.version + 1, jobs, priors, embeddings, duplicate_index, delta)
+        return catalog, not_found
+
+    def refresh_priors(self, now: Optional[datetime] = None) -> Tuple["JobCatalog", int]:
+        """Next catalog version with refreshed age-based penalties, and the number of ghost jobs"""
+        now = now or datetime.now()
+        priors, ghost_count = refresh_job_priors(self.priors, now)
+        delta = CatalogDelta(weakref.ref(self), "priors", [], [], now)
+        return JobCatalog(self.version + 1, self.jobs, priors, self.embeddings, self.duplicate_index, delta), ghost_count
+
+    def replay(self, delta: CatalogDelta, matcher) -> "JobCatalog":
+        """The version `delta` derived from this one, derived again (e.g. in a worker process)"""
+        if delta.kind == "priors":
+            return self.refresh_priors(delta.now)[0]
+        return self.apply(delta.upserts, delta.deleted_ids, matcher, delta.now)[0]
+
+    def feed_jobs(self, collapse_duplicates: bool) -> Iterable[JobRow]:
+        """Jobs eligible for the feed, optionally without duplicate reposts"""
+        if not collapse_duplicates:
+            return self.jobs
+        # A repost whose original was deleted is shown again
+        return [job for job in self.jobs
+                if not job.duplicate_of or job.duplicate_of not in self.jobs_by_id]
+
+
+def load_dataset(path: Path) -> List[Job]:
+    """Parse a jobs dataset file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Job(**job) for job in json.load(f)]
+
+
+def load_valid_jobs(path: Path) -> List[Job]:
+    """Parse a dataset file that may be edited by hand, dropping invalid jobs"""
+    jobs = load_dataset(path)
+    invalid = [job for job in jobs if validate_job(job)]
+    if invalid:
+        print(f"[WARNING] Skipping {len(invalid)} invalid jobs in dataset")
+        jobs = [job for job in jobs if not validate_job(job)]
+    return jobs
+
+
+def diff_jobs(catalog: JobCatalog, jobs: List[Job]) -> Tuple[List[Job], List[str]]:
+    """Upserts and deletions that turn the catalog's jobs into `jobs` (e.g. a re-read dataset file)"""
+    jobs = ensure_job_ids(jobs)
+    incoming_ids = {job.job_id for job in jobs}
+
+    upserts = []
+    for job in jobs:
+        current = catalog.jobs_by_id.get(job.job_id)
+        if current is None or _content(current) != _content(job):
+            upserts.append(job)
+
+    deleted_ids = [job_id for job_id in catalog.jobs.job_ids if job_id not in incoming_ids]
+    return upserts, deleted_ids
+
+
+def _content(job: Job) -> dict:
+    return job.model_dump(exclude={"duplicate_of"})
@@ -0,0 +1,444 @@
+"""
+Cohort Batch Matching
+Scores many profiles against the whole catalog at once, for career services
+that run recommendations for a cohort instead of one saved profile.
+
+The per-job pipeline (rank_jobs + score_job) is replaced by array operations
+on a profile x job block at a time:
+- semantic: keyword overlap as an incidence-matrix product (keyword
+  matcher), or the TF-IDF dot products of every pair (tfidf matcher)
+- skill overlap: incidence-matrix product over canonical skill IDs
+- experience: lookup in a user rank x job rank table
+- location/role: substring checks once per distinct job location/title
+The results equal calculate_fit_score() and make_decision() per job. Blocks
+are OBLIQO_BATCH_PROFILE_CHUNK profiles x OBLIQO_BATCH_JOB_CHUNK jobs, so
+memory stays bounded, and profile chunks are spread over a process pool.
+Only each profile's top-K jobs go through the full explanation afterwards.
+"""
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+
+from app.models import CohortJobMatch, CohortProfileResult, ExplainabilityBreakdown, UserProfile
+from app.services.context import MatchContext, ProfileContext, build_match_context
+from app.services.decision import DECISIONS, decision_codes, make_decision
+from app.services.explainer import generate_explanation
+from app.services.risks import assess_risks
+from app.services.scoring import EXPERIENCE_LEVELS, _rank_match
+from app.services.simulation import SkillJobIndex, get_skill_index
+from app.services.vector_matcher import COSINE_SATURATION, TfidfIndex, _dense_query
+
+
+# Experience match (0-100) by [user rank, job rank]
+RANK_MATCH = np.array([
+    [_rank_match(user_rank, job_rank) for job_rank in range(max(EXPERIENCE_LEVELS.values()) + 1)]
+    for user_rank in range(max(EXPERIENCE_LEVELS.values()) + 1)
+])
+
+
+class ValueSet:
+    """Distinct strings of one job field, searchable for substring matches both ways"""
+
+    def __init__(self, values: List[str]):
+        self.values = values
+        self.code = {value: i for i, value in enumerate(values)}
+        self.joined = "\0".join(values)
+        self.starts = np.cumsum([0] + [len(value) + 1 for value in values[:-1]])
+        self.lengths = sorted({len(value) for value in values})
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def matches(self, needles: List[str]) -> np.ndarray:
+        """For each value: does any needle contain it, or does it contain any needle"""
+        hits = np.zeros(len(self.values), dtype=bool)
+        for needle in needles:
+            if not needle:
+                hits[:] = True  # "" is in every value
+                continue
+            # needle in value: every occurrence in the joined values
+            positions = [m.start() for m in re.finditer(re.escape(needle), self.joined)]
+            if positions:
+                hits[np.searchsorted(self.starts, positions, side="right") - 1] = True
+            # value in needle: every substring of a length some value has
+            for length in self.lengths:
+                if length > len(needle):
+                    break
+                for start in range(len(needle) - length + 1):
+                    code = self.code.get(needle[start:start + length])
+                    if code is not None:
+                        hits[code] = True
+        return hits
+
+
+class KeywordSemantic:
+    """Keyword matcher similarity for a block: |user ∩ job| / |job| from the term -> rows index"""
+
+    def __init__(self, by_term: Dict[str, np.ndarray], term_counts: np.ndarray):
+        self.by_term = by_term
+        self.term_counts = term_counts
+
+    def match_counts(self, embeddings: List[List[str]], start: int, end: int) -> np.ndarray:
+        """|user keywords ∩ job keywords| for every pair of the block"""
+        vocabulary = sorted({term for keywords in embeddings for term in keywords})
+        users = np.zeros((len(embeddings), len(vocabulary)), dtype=np.float32)
+        column = {term: i for i, term in enumerate(vocabulary)}
+        for i, keywords in enumerate(embeddings):
+            users[i, [column[term] for term in keywords]] = 1
+        jobs = np.zeros((end - start, len(vocabulary)), dtype=np.float32)
+        for term, i in column.items():
+            rows = _rows_in(self.by_term.get(term), start, end)
+            jobs[rows - start, i] = 1
+        return users @ jobs.T
+
+    def scores(self, embeddings: List[List[str]], start: int, end: int) -> np.ndarray:
+        term_counts = self.term_counts[start:end]
+        match_ratio = self.match_counts(embeddings, start, end) / np.maximum(term_counts, 1)
+        scores = np.minimum(100.0, 40 + (match_ratio * 60))
+        scores[:, term_counts == 0] = 50.0
+        scores[[not keywords for keywords in embeddings]] = 50.0
+        return scores
+
+
+class TfidfSemantic:
+    """TF-IDF cosine for a block, on the stored CSR rows of the catalog's jobs"""
+
+    def __init__(self, index: TfidfIndex, rows: np.ndarray):
+        self.indptr = np.asarray(index.indptr)
+        self.indices = np.asarray(index.indices)
+        self.data = np.asarray(index.data)
+        self.rows = rows  # catalog row -> index row
+
+    def scores(self, embeddings: List[Tuple[np.ndarray, np.ndarray]], start: int, end: int) -> np.ndarray:
+        return self.scores_at(embeddings, np.arange(start, end))
+
+    def scores_at(self, embeddings: List[Tuple[np.ndarray, np.ndarray]], catalog_rows: np.ndarray) -> np.ndarray:
+        """Scores of the users against any catalog rows (e.g. a skill's jobs)"""
+        scores = 40.0 + 60.0 * np.minimum(1.0, self.cosines_at(embeddings, catalog_rows) / COSINE_SATURATION)
+        scores[[len(user_vector[0]) == 0 for user_vector in embeddings]] = 50.0
+        return scores
+
+    def cosines_at(self, embeddings: List[Tuple[np.ndarray, np.ndarray]], catalog_rows: np.ndarray) -> np.ndarray:
+        rows = self.rows[catalog_rows]
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        local_indptr = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.arange(local_indptr[-1]) + np.repeat(starts - local_indptr[:-1], lengths)
+        data, features = self.data[positions], self.indices[positions]
+
+        # Same products and row sums as TfidfIndex.score_all, one user per matrix row
+        cosines = np.zeros((len(embeddings), len(rows)))
+        for i, user_vector in enumerate(embeddings):
+            if len(user_vector[0]) and len(positions):
+                products = data * _dense_query(user_vector)[features]
+                cosines[i] = _block_row_sums(local_indptr, products)
+        return cosines
+
+
+def _block_row_sums(indptr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    sums = np.add.reduceat(np.append(values, 0).astype(np.float64), np.minimum(indptr[:-1], len(values)))
+    sums[indptr[1:] == indptr[:-1]] = 0.0
+    return sums
+
+
+def _rows_in(rows: Optional[np.ndarray], start: int, end: int) -> np.ndarray:
+    """The part of a sorted row list inside [start, end)"""
+    if rows is None:
+        return np.zeros(0, dtype=np.int32)
+    return rows[np.searchsorted(rows, start):np.searchsorted(rows, end)]
+
+
+class CohortJobs:
+    """Job-side arrays for one catalog version; pickled once into each worker"""
+
+    def __init__(self, catalog, matcher, skill_index: SkillJobIndex):
+        jobs = catalog.jobs
+        priors = [catalog.priors[job_id] for job_id in jobs.job_ids]
+        self.num_jobs = len(jobs)
+
+        if isinstance(catalog.embeddings, TfidfIndex):
+            rows = np.array([catalog.embeddings.row_of[job_id] for job_id in jobs.job_ids], dtype=np.int64)
+            self.semantic = TfidfSemantic(catalog.embeddings, rows)
+        else:
+            self.semantic = KeywordSemantic(skill_index.by_term, skill_index.term_counts)
+
+        self.by_skill = skill_index.by_skill
+        self.requirement_counts = np.array([len(p.requirements) for p in priors], dtype=np.int32)
+        self.level_ranks = np.array([p.job_level_rank for p in priors], dtype=np.int8)
+        self.level_is_flagged = np.array([p.level_is_flagged for p in priors], dtype=bool)
+        self.is_remote = np.array([bool(p.is_remote) for p in priors])
+
+        self.locations = ValueSet(sorted({p.location_lower for p in priors}))
+        self.location_codes = np.array([self.locations.code[p.location_lower] for p in priors], dtype=np.int32)
+        self.titles = ValueSet(sorted({p.title_lower for p in priors}))
+        self.title_codes = np.array([self.titles.code[p.title_lower] for p in priors], dtype=np.int32)
+
+    def skill_overlap(self, skill_ids: List[List[int]], start: int, end: int) -> np.ndarray:
+        """Distinct matched requirements / requirement count, one row per user"""
+        vocabulary = sorted({skill_id for ids in skill_ids for skill_id in ids})
+        column = {skill_id: i for i, skill_id in enumerate(vocabulary)}
+        users = np.zeros((len(skill_ids), len(vocabulary)), dtype=np.float32)
+        for i, ids in enumerate(skill_ids):
+            users[i, [column[skill_id] for skill_id in ids]] = 1
+        jobs = np.zeros((end - start, len(vocabulary)), dtype=np.float32)
+        for skill_id, i in column.items():
+            jobs[_rows_in(self.by_skill.get(skill_id), start, end) - start, i] = 1
+
+        requirement_counts = self.requirement_counts[start:end]
+        return np.where(requirement_counts > 0, (users @ jobs.T) / np.maximum(requirement_counts, 1), 0)
+
+
+def ghost_flags(catalog) -> np.ndarray:
+    """Per row: posted over 60 days ago (an Avoid risk). Read per run, as the priors refresh ages them."""
+    return np.array([
+        days_old is not None and days_old > 60
+        for days_old in (catalog.priors[job_id].days_old for job_id in catalog.jobs.job_ids)
+    ], dtype=bool)
+
+
+class CohortProfile(NamedTuple):
+    """What the workers need of one profile (computed in the parent)"""
+    embedding: object
+    skill_ids: List[int]
+    level_rank: int
+    level_is_critical: bool  # the level text would make the experience risk an Avoid
+    locations_lower: List[str]
+    roles_lower: List[str]
+
+
+def cohort_profile(profile_ctx: ProfileContext, matcher) -> CohortProfile:
+    return CohortProfile(
+        embedding=matcher.create_user_embedding(profile_ctx.profile),
+        skill_ids=sorted(profile_ctx.skill_ids),
+        level_rank=profile_ctx.level_rank,
+        level_is_critical=profile_ctx.level_is_flagged,
+        locations_lower=profile_ctx.locations_lower,
+        roles_lower=profile_ctx.roles_lower
+    )
+
+
+class ChunkResult(NamedTuple):
+    """Per profile: top-K rows (best first), their fit and semantic scores, decision counts"""
+    rows: List[np.ndarray]
+    fit_scores: List[np.ndarray]
+    semantic_scores: List[np.ndarray]
+    decision_counts: np.ndarray
+
+
+class FitComponents(NamedTuple):
+    """calculate_fit_score's components for a profile x job block"""
+    semantic: np.ndarray
+    overlap: np.ndarray
+    experience: np.ndarray
+    preference: np.ndarray
+
+    def fit_scores(self) -> np.ndarray:
+        # Same terms and order as calculate_fit_score
+        return round_scores(self.semantic * 0.4 + self.overlap * 100 * 0.3
+                            + self.experience * 0.2 + self.preference * 0.1)
+
+
+class ProfileBlock:
+    """Profile-side values of a profile chunk, computed once for all its job blocks"""
+
+    def __init__(self, jobs: CohortJobs, profiles: List[CohortProfile]):
+        self.jobs = jobs
+        self.profiles = profiles
+        self.user_ranks = np.array([p.level_rank for p in profiles])
+        self.level_is_critical = np.array([p.level_is_critical for p in profiles])
+        self.location_hits = [jobs.locations.matches(p.locations_lower) for p in profiles]
+        self.role_hits = [jobs.titles.matches(p.roles_lower) for p in profiles]
+
+    def components(self, start: int, end: int) -> FitComponents:
+        jobs = self.jobs
+        semantic = jobs.semantic.scores([p.embedding for p in self.profiles], start, end)
+        overlap = jobs.skill_overlap([p.skill_ids for p in self.profiles], start, end)
+        experience = RANK_MATCH[self.user_ranks[:, None], jobs.level_ranks[None, start:end]]
+
+        location_codes = jobs.location_codes[start:end]
+        remote = jobs.is_remote[start:end]
+        title_codes = jobs.title_codes[start:end]
+        preference = np.empty((len(self.profiles), end - start))
+        for i in range(len(self.profiles)):
+            location = np.where(remote | self.location_hits[i][location_codes], 100.0, 30.0)
+            role = np.where(self.role_hits[i][title_codes], 100.0, 40.0)
+            preference[i] = (location + role) / 2
+        return FitComponents(semantic, overlap, experience, preference)
+
+    def critical(self, critical: np.ndarray, start: int, end: int) -> np.ndarray:
+        """Matches make_decision() turns into Avoid whatever the fit: ghost jobs and critical level texts"""
+        level_gap = self.jobs.level_ranks[None, start:end] - self.user_ranks[:, None]
+        flagged = self.level_is_critical[:, None] | self.jobs.level_is_flagged[None, start:end]
+        return critical[None, start:end] | (flagged & (level_gap >= 2))
+
+
+def score_profiles(jobs: CohortJobs, profiles: List[CohortProfile], critical: np.ndarray,
+                   eligible: np.ndarray, top_k: int, job_chunk: int) -> ChunkResult:
+    """Fit scores and decisions of the profiles against every job, one block at a time"""
+    count = len(profiles)
+    block = ProfileBlock(jobs, profiles)
+
+    decision_counts = np.zeros((count, len(DECISIONS)), dtype=np.int64)
+    best_rows = [np.zeros(0, dtype=np.int64)] * count
+    best_fit = [np.zeros(0)] * count
+    best_semantic = [np.zeros(0)] * count
+
+    for start in range(0, jobs.num_jobs, job_chunk):
+        end = min(start + job_chunk, jobs.num_jobs)
+        components = block.components(start, end)
+        fit = components.fit_scores()
+        codes = decision_codes(fit, block.critical(critical, start, end))
+
+        in_feed = eligible[start:end]
+        rows = np.arange(start, end)[in_feed]
+        for i in range(count):
+            decision_counts[i] += np.bincount(codes[i, in_feed], minlength=len(DECISIONS))
+            best_rows[i], best_fit[i], best_semantic[i] = _merge_top(
+                best_rows[i], best_fit[i], best_semantic[i],
+                rows, fit[i, in_feed], components.semantic[i, in_feed], top_k
+            )
+
+    return ChunkResult(best_rows, best_fit, best_semantic, decision_counts)
+
+
+def round_scores(scores: np.ndarray) -> np.ndarray:
+    """round(x, 2) as Python does it; np.round differs on values next to a tie"""
+    rounded = np.round(scores, 2)
+    scaled = scores * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(float(x), 2) for x in scores[near_tie]]
+    return rounded
+
+
+def _merge_top(rows, fit, semantic, new_rows, new_fit, new_semantic, top_k):
+    """Best top_k of both sets by fit score, earlier rows first on ties"""
+    rows = np.concatenate((rows, new_rows))
+    fit = np.concatenate((fit, new_fit))
+    semantic = np.concatenate((semantic, new_semantic))
+    order = np.lexsort((rows, -fit))[:top_k]
+    return rows[order], fit[order], semantic[order]
+
+
+def parse_profiles(lines) -> Tuple[List[UserProfile], List[Dict]]:
+    """UserProfiles from JSONL lines, plus {"line", "error"} for each invalid one"""
+    profiles, errors = [], []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            profiles.append(UserProfile.model_validate_json(line))
+        except ValidationError as e:
+            first = e.errors()[0]
+            location = ".".join(str(part) for part in first["loc"]) or "profile"
+            errors.append({"line": number, "error": f"{location}: {first['msg']}"})
+    return profiles, errors
+
+
+# Worker processes: the job-side arrays arrive once, through the initializer
+_worker_state: Dict[str, object] = {}
+
+
+def _init_worker(jobs: CohortJobs, critical: np.ndarray, eligible: np.ndarray, top_k: int, job_chunk: int):
+    _worker_state.update(jobs=jobs, critical=critical, eligible=eligible, top_k=top_k, job_chunk=job_chunk)
+
+
+def _score_in_worker(profiles: List[CohortProfile]) -> ChunkResult:
+    state = _worker_state
+    return score_profiles(state["jobs"], profiles, state["critical"], state["eligible"],
+                          state["top_k"], state["job_chunk"])
+
+
+# Job-side arrays of the latest catalog, rebuilt when the catalog changes
+_jobs_lock = threading.Lock()
+_jobs_catalog = None
+_cohort_jobs: Optional[CohortJobs] = None
+
+
+def get_cohort_jobs(catalog, matcher) -> CohortJobs:
+    global _jobs_catalog, _cohort_jobs
+    with _jobs_lock:
+        if _jobs_catalog is not catalog:
+            _cohort_jobs = CohortJobs(catalog, matcher, get_skill_index(catalog, matcher))
+            _jobs_catalog = catalog
+        return _cohort_jobs
+
+
+def match_cohort(
+    catalog,
+    matcher,
+    profiles: List[UserProfile],
+    top_k: int = 10,
+    collapse_duplicates: bool = False,
+    workers: int = 1,
+    profile_chunk: int = 32,
+    job_chunk: int = 2048
+) -> List[CohortProfileResult]:
+    """Decision counts and top-K matches of every profile, in input order"""
+    jobs = get_cohort_jobs(catalog, matcher)
+    critical = ghost_flags(catalog)
+    if collapse_duplicates:
+        eligible = np.array([not job.duplicate_of or job.duplicate_of not in catalog.jobs_by_id
+                             for job in catalog.jobs], dtype=bool)
+    else:
+        eligible = np.ones(len(catalog.jobs), dtype=bool)
+
+    contexts = [ProfileContext(profile) for profile in profiles]
+    inputs = [cohort_profile(ctx, matcher) for ctx in contexts]
+    chunks = [inputs[i:i + profile_chunk] for i in range(0, len(inputs), profile_chunk)]
+
+    if workers > 1 and len(chunks) > 1:
+        # spawn: safe from a threaded server, and workers only need the arrays
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(jobs, critical, eligible, top_k, job_chunk)
+        ) as pool:
+            results = list(pool.map(_score_in_worker, chunks))
+    else:
+        results = [score_profiles(jobs, chunk, critical, eligible, top_k, job_chunk) for chunk in chunks]
+
+    cohort = []
+    for chunk_result in results:
+        for i in range(len(chunk_result.rows)):
+            profile_ctx = contexts[len(cohort)]
+            top_matches = [
+                summarize_match(catalog, catalog.jobs[int(row)], float(semantic), profile_ctx)
+                for row, semantic in zip(chunk_result.rows[i], chunk_result.semantic_scores[i])
+            ]
+            decisions = dict(zip(DECISIONS, (int(n) for n in chunk_result.decision_counts[i])))
+            cohort.append(CohortProfileResult(
+                user_id=profile_ctx.profile.user_id, decisions=decisions, top_matches=top_matches
+            ))
+    return cohort
+
+
+def explain_match(catalog, job, semantic_score: float,
+                  profile_ctx: ProfileContext) -> Tuple[MatchContext, ExplainabilityBreakdown, str, str]:
+    """(context, explanation, decision, reason) of one top match, from the per-job pipeline"""
+    ctx = build_match_context(profile_ctx, job, semantic_score, catalog.priors.get(job.job_id))
+    risks = assess_risks(ctx, ctx.fit_score)
+    explanation = generate_explanation(profile_ctx.profile, job, ctx.fit_score, ctx.score_breakdown, ctx, risks)
+    decision, decision_reason = make_decision(ctx.fit_score, explanation.missing_skills, risks)
+    return ctx, explanation, decision, decision_reason
+
+
+def summarize_match(catalog, job, semantic_score: float, profile_ctx: ProfileContext) -> CohortJobMatch:
+    """Fit score, decision and skill overlap of one of a profile's top matches"""
+    ctx, explanation, decision, decision_reason = explain_match(catalog, job, semantic_score, profile_ctx)
+    return CohortJobMatch(
+        job_id=job.job_id,
+        title=job.normalized_title,
+        company=job.normalized_company,
+        fit_score=ctx.fit_score,
+        decision=decision,
+        decision_reason=decision_reason,
+        matched_skills=explanation.matched_skills,
+        missing_skills=explanation.missing_skills
+    )
@@ -0,0 +1,87 @@
+"""
+Match Context
+Derived profile/job data computed once and shared by the scoring services
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from app.models import UserProfile, Job
+from app.services.scoring import EXPERIENCE_LEVELS, calculate_fit_score
+from app.services.priors import JobPriors, compute_job_priors
+from app.services.risks import is_flagged_text
+from app.services.skill_normalizer import UNKNOWN_SKILL, get_skill_normalizer
+
+
+# Career goals that signal the user wants to move up
+GROWTH_GOAL_KEYWORDS = ['grow', 'lead', 'senior', 'architect', 'principal', 'advance']
+
+
+class ProfileContext:
+    """Profile-derived values shared by every match in a request"""
+
+    def __init__(
+        self,
+        profile: UserProfile,
+        now: Optional[datetime] = None,
+        skill_ids: Optional[List[int]] = None
+    ):
+        self.profile = profile
+        self.now = now or datetime.now()
+
+        # Canonical skill ID -> original spelling (first position, last spelling wins).
+        # skill_ids are normally computed once when the profile is saved. Skills
+        # outside the job vocabulary can't match a requirement and are left out.
+        if skill_ids is None:
+            skill_ids = get_skill_normalizer().canonical_ids(profile.skills, add=False)
+        self.skills_by_id: Dict[int, str] = {
+            skill_id: skill for skill_id, skill in zip(skill_ids, profile.skills) if skill_id != UNKNOWN_SKILL
+        }
+        self.skill_ids: Set[int] = set(self.skills_by_id)
+
+        self.level_lower = profile.experience_level.lower()
+        self.level_rank = EXPERIENCE_LEVELS.get(self.level_lower, 2)
+        self.level_is_flagged = is_flagged_text(self.level_lower)  # an experience gap would be critical
+
+        self.locations_lower: List[str] = [p.lower() for p in profile.preferred_locations]
+        self.roles_lower: List[str] = [r.lower() for r in profile.preferred_roles]
+
+        goals_lower = profile.career_goals.lower()
+        self.wants_growth = any(keyword in goals_lower for keyword in GROWTH_GOAL_KEYWORDS)
+
+
+class MatchContext:
+    """Per-(profile, job) overlap sets and fit score on top of the job's priors"""
+
+    def __init__(self, profile_ctx: ProfileContext, job: Job, priors: Optional[JobPriors] = None):
+        self.profile_ctx = profile_ctx
+        self.job = job
+        # Job-only data (normalized fields, level rank, age, quality flags)
+        self.priors = priors or compute_job_priors(job, profile_ctx.now)
+
+        # Skill overlap on canonical skill IDs
+        requirements_by_id = self.priors.requirements_by_id
+        user_skills = profile_ctx.skill_ids
+        self.matched_ids: Set[int] = requirements_by_id.keys() & user_skills
+        # Counted over the raw requirement list, duplicates included
+        if self.priors.has_duplicate_requirements:
+            self.missing_count = sum(
+                1 for skill_id in self.priors.requirement_ids if skill_id not in user_skills
+            )
+        else:
+            self.missing_count = len(requirements_by_id) - len(self.matched_ids)
+
+        self.fit_score = 0.0
+        self.score_breakdown: dict = {}
+
+
+def build_match_context(
+    profile_ctx: ProfileContext,
+    job: Job,
+    semantic_score: float,
+    priors: Optional[JobPriors] = None
+) -> MatchContext:
+    """Create the match context and compute its fit score"""
+    ctx = MatchContext(profile_ctx, job, priors)
+    ctx.fit_score, ctx.score_breakdown = calculate_fit_score(
+        profile_ctx.profile, job, semantic_score, ctx
+    )
+    return ctx
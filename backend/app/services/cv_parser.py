@@ -5,12 +5,11 @@ Extracts structured data from PDF and DOCX resumes
 import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from PyPDF2 import PdfReader
-from docx import Document
 
 
 def extract_text_from_pdf(file_path: Path) -> str:
     """Extract text from PDF file"""
+    from PyPDF2 import PdfReader  # deferred: only CV uploads need it
     try:
         reader = PdfReader(str(file_path))
         text = ""
@@ -24,6 +23,7 @@ def extract_text_from_pdf(file_path: Path) -> str:
 
 def extract_text_from_docx(file_path: Path) -> str:
     """Extract text from DOCX file"""
+    from docx import Document  # deferred: only CV uploads need it
     try:
         doc = Document(str(file_path))
         text = "\n".join([para.text for para in doc.paragraphs])
@@ -1,121 +1,199 @@
-from typing import Tuple
+from enum import IntEnum
+from typing import Dict, List, Tuple
+import numpy as np
 from app.models import Job, UserProfile
+from app.services.risks import CRITICAL_RISKS, RiskReport
 
 
-def make_decision(
-    fit_score: float,
-    profile: UserProfile,
-    job: Job,
-    missing_skills: list,
-    risk_factors: list
-) -> Tuple[str, str]:
-    """
-    Determine application recommendation: Apply, Wait, Skip, or Avoid
-    
-    Returns: (decision, reason)
-    """
-    
+# Decisions in index order for decision_codes() and the decision table
+DECISIONS = ["Apply", "Wait", "Skip", "Avoid"]
+
+# Table axes: fit-score band = thresholds reached (<40, 40-60, 60-75, >=75),
+# missing-skill bucket = thresholds reached (0-1, 2-3, 4+ missing skills)
+FIT_BAND_THRESHOLDS = (40, 60, 75)
+MISSING_BUCKET_THRESHOLDS = (2, 4)
+
+
+class Reason(IntEnum):
+    """Which decision_reason message to render"""
+    CRITICAL = 0
+    EXCELLENT_FIT = 1
+    STRONG_FIT = 2
+    GOOD_FIT = 3
+    DECENT_FIT = 4
+    MODERATE_FIT = 5
+    POOR_FIT = 6
+
+
+def _decision_rule(critical: bool, band: int, bucket: int) -> Tuple[int, Reason]:
+    """The decision rules, evaluated once per table cell"""
     # AVOID - Critical red flags
-    if len(risk_factors) > 0:
-        avoid_keywords = ['ghost', 'scam', 'toxic', 'severe mismatch']
-        for risk in risk_factors:
-            if any(keyword in risk.lower() for keyword in avoid_keywords):
-                return "Avoid", f"Critical issues detected: {risk}"
-    
+    if critical:
+        return 3, Reason.CRITICAL
     # APPLY - High fit, ready to apply
-    if fit_score >= 75:
-        if len(missing_skills) <= 1:
-            return "Apply", f"Excellent fit ({fit_score}%)! You meet nearly all requirements."
-        else:
-            return "Apply", f"Strong fit ({fit_score}%) with manageable skill gaps."
-    
+    if band == 3:
+        return 0, Reason.EXCELLENT_FIT if bucket == 0 else Reason.STRONG_FIT
     # WAIT - Good fit but needs preparation
-    if fit_score >= 60:
-        if len(missing_skills) <= 3:
-            return "Wait", f"Good fit ({fit_score}%), but acquire these skills first: {', '.join(missing_skills[:3])}"
-        else:
-            return "Wait", f"Decent fit ({fit_score}%), but significant gaps in {len(missing_skills)} skills."
-    
+    if band == 2:
+        return 1, Reason.GOOD_FIT if bucket < 2 else Reason.DECENT_FIT
     # SKIP - Low fit, better opportunities exist
-    if fit_score >= 40:
-        return "Skip", f"Moderate fit ({fit_score}%), but there are likely better matches for your profile."
-    
+    if band == 1:
+        return 2, Reason.MODERATE_FIT
     # AVOID - Very poor fit
-    return "Avoid", f"Poor fit ({fit_score}%). This role doesn't align with your skills and goals."
+    return 3, Reason.POOR_FIT
+
+
+# Compiled decision table: index critical * 12 + band * 3 + bucket
+DECISION_TABLE: Tuple[Tuple[int, Reason], ...] = tuple(
+    _decision_rule(critical, band, bucket)
+    for critical in (False, True) for band in range(4) for bucket in range(3)
+)
+
+
+def decide(fit_score: float, missing_count: int, risk_flags: int) -> Tuple[int, Reason]:
+    """(index into DECISIONS, reason) from the table - a few integer operations"""
+    band = (fit_score >= 40) + (fit_score >= 60) + (fit_score >= 75)
+    bucket = (missing_count >= 2) + (missing_count >= 4)
+    return DECISION_TABLE[(risk_flags & CRITICAL_RISKS != 0) * 12 + band * 3 + bucket]
+
+
+def render_reason(reason: Reason, fit_score: float, missing_skills: List[str], risks: RiskReport) -> str:
+    """decision_reason text - only for matches that are returned"""
+    if reason == Reason.CRITICAL:
+        return f"Critical issues detected: {risks.critical_message()}"
+    if reason == Reason.EXCELLENT_FIT:
+        return f"Excellent fit ({fit_score}%)! You meet nearly all requirements."
+    if reason == Reason.STRONG_FIT:
+        return f"Strong fit ({fit_score}%) with manageable skill gaps."
+    if reason == Reason.GOOD_FIT:
+        return f"Good fit ({fit_score}%), but acquire these skills first: {', '.join(missing_skills[:3])}"
+    if reason == Reason.DECENT_FIT:
+        return f"Decent fit ({fit_score}%), but significant gaps in {len(missing_skills)} skills."
+    if reason == Reason.MODERATE_FIT:
+        return f"Moderate fit ({fit_score}%), but there are likely better matches for your profile."
+    return f"Poor fit ({fit_score}%). This role doesn't align with your skills and goals."
+
+
+def make_decision(fit_score: float, missing_skills: List[str], risks: RiskReport) -> Tuple[str, str]:
+    """
+    Determine application recommendation: Apply, Wait, Skip, or Avoid
+    
+    Returns: (decision, reason)
+    """
+    code, reason = decide(fit_score, len(missing_skills), risks.flags)
+    return DECISIONS[code], render_reason(reason, fit_score, missing_skills, risks)
+
+
+def decision_codes(fit_scores: np.ndarray, critical: np.ndarray) -> np.ndarray:
+    """
+    make_decision() for a whole array of fit scores: indices into DECISIONS.
+    critical marks the matches with a CRITICAL_RISKS flag.
+    """
+    return np.select(
+        [critical, fit_scores >= 75, fit_scores >= 60, fit_scores >= 40],
+        [3, 0, 1, 2],
+        default=3
+    ).astype(np.int8)
+
 
+def count_decisions(codes: np.ndarray) -> Dict[str, int]:
+    """Number of matches per decision, from an array of decision codes"""
+    return dict(zip(DECISIONS, (int(n) for n in np.bincount(codes, minlength=len(DECISIONS)))))
 
-def estimate_competition(job: Job, fit_score: float) -> str:
+
+def estimate_competition(job: Job, fit_score: float, ctx=None) -> str:
     """
     Estimate competition level for a job
     Returns: Low, Medium, or High
     """
+    if ctx is None:
+        competition_score = job_competition_prior(
+            job.normalized_company.lower(),
+            job.is_remote,
+            (job.experience_required or "").lower(),
+            job.normalized_title.lower()
+        )
+    else:
+        competition_score = ctx.priors.competition_prior
     
+    # Your fit affects competition - if you're a good fit, effective competition is lower
+    if fit_score >= 80:
+        competition_score -= 2
+    elif fit_score < 50:
+        competition_score += 2
+    
+    # Classify
+    if competition_score >= 4:
+        return "High"
+    elif competition_score >= 2:
+        return "Medium"
+    else:
+        return "Low"
+
+
+def job_competition_prior(
+    company_lower: str,
+    is_remote: bool,
+    job_level_lower: str,
+    title_lower: str
+) -> int:
+    """Profile-independent part of the competition score"""
     competition_score = 0
     
     # Popular companies attract more applicants
     top_companies = ['google', 'meta', 'amazon', 'microsoft', 'apple', 'netflix']
-    if any(comp in job.company.lower() for comp in top_companies):
+    if any(comp in company_lower for comp in top_companies):
         competition_score += 3
     
     # Remote jobs are more competitive
-    if job.is_remote:
+    if is_remote:
         competition_score += 2
     
     # Senior roles typically have less competition than mid-level
-    if 'senior' in job.experience_required.lower() or 'lead' in job.experience_required.lower():
+    if 'senior' in job_level_lower or 'lead' in job_level_lower:
         competition_score -= 1
-    elif 'entry' in job.experience_required.lower():
+    elif 'entry' in job_level_lower:
         competition_score += 2
     
     # Generic job titles suggest mass hiring (lower competition per role)
     generic_titles = ['developer', 'engineer', 'analyst']
-    if any(title in job.title.lower() for title in generic_titles):
+    if any(title in title_lower for title in generic_titles):
         competition_score += 1
     
-    # Your fit affects competition - if you're a good fit, effective competition is lower
-    if fit_score >= 80:
-        competition_score -= 2
-    elif fit_score < 50:
-        competition_score += 2
-    
-    # Classify
-    if competition_score >= 4:
-        return "High"
-    elif competition_score >= 2:
-        return "Medium"
-    else:
-        return "Low"
+    return competition_score
+
 
+def offers_growth_title(title_lower: str) -> bool:
+    """Whether the job title itself is a step up (senior/lead/principal)"""
+    return any(keyword in title_lower for keyword in ['senior', 'lead', 'principal'])
 
-def assess_career_impact(job: Job, profile: UserProfile, fit_score: float) -> str:
+
+def assess_career_impact(job: Job, profile: UserProfile, fit_score: float, ctx=None) -> str:
     """
     Assess long-term career impact
     Returns: Positive, Neutral, or Negative
     """
+    if ctx is None:
+        from app.services.context import MatchContext, ProfileContext
+        ctx = MatchContext(ProfileContext(profile), job)
     
     impact_score = 0
     
     # Check if role aligns with career goals
-    goals_lower = profile.career_goals.lower()
-    job_title_lower = job.title.lower()
-    job_desc_lower = job.description.lower()
-    
-    # Positive indicators in goals
-    positive_keywords = ['grow', 'lead', 'senior', 'architect', 'principal', 'advance']
-    if any(keyword in goals_lower for keyword in positive_keywords):
+    if ctx.profile_ctx.wants_growth:
         # Check if job offers growth
-        if any(keyword in job_title_lower for keyword in ['senior', 'lead', 'principal']):
+        if ctx.priors.offers_growth:
             impact_score += 2
     
     # Check for skill growth opportunities
-    new_skills_offered = [req for req in job.requirements if req.lower() not in [s.lower() for s in profile.skills]]
-    if len(new_skills_offered) >= 3:
+    new_skills_offered = ctx.missing_count
+    if new_skills_offered >= 3:
         impact_score += 1  # Good learning opportunity
-    elif len(new_skills_offered) == 0:
+    elif new_skills_offered == 0:
         impact_score -= 1  # No growth
     
     # Repetitive role (same as current level)
-    if profile.experience_level.lower() in job.experience_required.lower():
+    if ctx.profile_ctx.level_lower in ctx.priors.job_level_lower:
         impact_score -= 1  # Lateral move
     
     # Check for career alignment
@@ -0,0 +1,287 @@
+"""
+Duplicate Posting Index
+MinHash signatures over title/description shingles with LSH banding per company
+"""
+import re
+import zlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.models import Job
+
+
+# 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates,
+# candidates are then confirmed against DUPLICATE_THRESHOLD
+NUM_PERM = 64
+NUM_BANDS = 16
+DUPLICATE_THRESHOLD = 0.7
+# Reposts keep (nearly) the same title; same text under a different role isn't a repost
+TITLE_THRESHOLD = 0.5
+SHINGLE_SIZE = 3
+
+# Cap on distinct clusters compared per bucket - keeps huge buckets linear
+MAX_BUCKET_REPRESENTATIVES = 8
+
+_MASK_32 = np.uint64(0xFFFFFFFF)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_SHINGLE_MULTIPLIERS = (np.uint64(0x9E3779B1), np.uint64(0x85EBCA77))
+_TITLE_SALT = 0xC2B2AE3D
+
+
+def title_words(job: Job) -> FrozenSet[str]:
+    """Lowercase word set of the job title"""
+    return frozenset(_WORD_RE.findall(job.normalized_title.lower()))
+
+
+class DuplicateIndex:
+    """
+    Near-duplicate clustering of job postings, built at ingest. Each catalog
+    version gets its own copy(); bucket and cluster lists are shared with
+    the previous version until this one changes them.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, num_bands: int = NUM_BANDS,
+                 threshold: float = DUPLICATE_THRESHOLD, seed: int = 1):
+        if num_perm % num_bands:
+            raise ValueError("num_perm must be a multiple of num_bands")
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows = num_perm // num_bands
+        self.threshold = threshold
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 31 - 1, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, 2 ** 31 - 1, size=num_perm).astype(np.uint64)
+
+        self._word_hashes: Dict[str, int] = {}
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.titles: Dict[str, FrozenSet[str]] = {}
+        self.companies: Dict[str, str] = {}
+        self.buckets: Dict[Tuple[str, int, bytes], List[str]] = {}
+        self.parent: Dict[str, str] = {}  # union-find over job_ids
+        self.order: Dict[str, int] = {}  # ingest order, lowest wins as canonical
+        self.members: Dict[str, List[str]] = {}  # canonical job_id -> cluster, for clusters with duplicates
+        self.changed: Set[str] = set()  # job_ids whose canonical may have changed since copy()
+        self._next_order = 0
+        self._owned: Set[object] = set()  # bucket keys and cluster roots whose lists are private
+
+    def copy(self) -> "DuplicateIndex":
+        """Copy-on-write clone for the next catalog version"""
+        clone = DuplicateIndex.__new__(DuplicateIndex)
+        clone.__dict__.update(self.__dict__)
+        for name in ("signatures", "titles", "companies", "buckets", "parent", "order", "members"):
+            setattr(clone, name, dict(getattr(self, name)))
+        clone.changed = set()
+        clone._owned = set()
+        self._owned = set()
+        return clone
+
+    def signatures_for(self, jobs: List[Job], chunk_size: int = 2000) -> np.ndarray:
+        """MinHash signatures for a batch of jobs, shape (len(jobs), num_perm)"""
+        result = np.empty((len(jobs), self.num_perm), dtype=np.uint32)
+
+        for start in range(0, len(jobs), chunk_size):
+            chunk = jobs[start:start + chunk_size]
+            hashes, offsets = self._shingle_hashes(chunk)
+            for p in range(self.num_perm):
+                # Universal hashing; uint64 overflow wraps, which is fine here
+                permuted = ((self._a[p] * hashes + self._b[p]) % _MERSENNE_PRIME) & _MASK_32
+                result[start:start + len(chunk), p] = np.minimum.reduceat(permuted, offsets)
+
+        return result
+
+    def _shingle_hashes(self, jobs: List[Job]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hashes of every job's shingles, grouped by job, plus each group's offset.
+        Shingles are description word 3-grams and (tagged) title words; duplicates
+        within a job don't matter for MinHash, so they aren't removed.
+        """
+        word_hashes, word_docs = [], []
+        extra_hashes, extra_docs = [], []
+
+        for doc, job in enumerate(jobs):
+            desc_words = _WORD_RE.findall(job.normalized_description.lower())
+            title = [self._word_hash(word) for word in title_words(job)]
+            extra_hashes.extend((h * _TITLE_SALT + 1) & 0xFFFFFFFF for h in title)
+            extra_docs.extend([doc] * len(title))
+
+            desc = [self._word_hash(word) for word in desc_words]
+            if len(desc) < SHINGLE_SIZE:
+                # Too short for 3-grams: use the words themselves
+                extra_hashes.extend(desc)
+                extra_docs.extend([doc] * len(desc))
+            else:
+                word_hashes.extend(desc)
+                word_docs.extend([doc] * len(desc))
+
+        words = np.asarray(word_hashes, dtype=np.uint64)
+        docs = np.asarray(word_docs, dtype=np.int64)
+        if len(words) >= SHINGLE_SIZE:
+            shingles = (words[:-2] * _SHINGLE_MULTIPLIERS[0]
+                        + words[1:-1] * _SHINGLE_MULTIPLIERS[1] + words[2:]) & _MASK_32
+            # Drop 3-grams that straddle two jobs
+            valid = docs[:-2] == docs[2:]
+            shingles, shingle_docs = shingles[valid], docs[:-2][valid]
+        else:
+            shingles, shingle_docs = words[:0], docs[:0]
+
+        # Jobs with no text at all still need one (shared) shingle
+        counts = np.bincount(shingle_docs, minlength=len(jobs))
+        counts += np.bincount(np.asarray(extra_docs, dtype=np.int64), minlength=len(jobs))
+        empty = np.flatnonzero(counts == 0)
+
+        all_hashes = np.concatenate((
+            shingles, np.asarray(extra_hashes, dtype=np.uint64), np.zeros(len(empty), dtype=np.uint64)
+        ))
+        all_docs = np.concatenate((shingle_docs, np.asarray(extra_docs, dtype=np.int64), empty))
+
+        order = np.argsort(all_docs, kind="stable")
+        sizes = np.bincount(all_docs, minlength=len(jobs))
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        return all_hashes[order], offsets
+
+    def _word_hash(self, word: str) -> int:
+        cached = self._word_hashes.get(word)
+        if cached is None:
+            cached = self._word_hashes[word] = zlib.crc32(word.encode("utf-8"))
+        return cached
+
+    def add(self, jobs: List[Job]) -> None:
+        """Add jobs to the index, clustering them with any near-duplicates"""
+        if not jobs:
+            return
+        # A re-added (replaced) job starts a new cluster and counts as newest
+        self.remove([job.job_id for job in jobs if job.job_id in self.parent])
+        signatures = self.signatures_for(jobs)
+
+        for job, signature in zip(jobs, signatures):
+            job_id = job.job_id
+            company = job.normalized_company.lower().strip()
+            self.signatures[job_id] = signature
+            self.titles[job_id] = title_words(job)
+            self.companies[job_id] = company
+            self.parent[job_id] = job_id
+            self.order[job_id] = self._next_order
+            self._next_order += 1
+            self.changed.add(job_id)
+
+            for band_key in self._bucket_keys(job_id):
+                members = self._own_list(self.buckets, band_key, [])
+
+                # Compare against one member per distinct cluster in the bucket
+                seen_roots = set()
+                for other_id in members:
+                    root = self._find(other_id)
+                    if root in seen_roots or root == self._find(job_id):
+                        continue
+                    seen_roots.add(root)
+                    if self.is_duplicate(job_id, other_id):
+                        self._union(job_id, other_id)
+                    if len(seen_roots) >= MAX_BUCKET_REPRESENTATIVES:
+                        break
+                members.append(job_id)
+
+    def remove(self, job_ids: Iterable[str]) -> None:
+        """
+        Drop jobs from the index. Their clusters are re-clustered from the
+        remaining members, so a repost linked only through a removed job
+        is no longer a duplicate.
+        """
+        removed = {job_id for job_id in job_ids if job_id in self.parent}
+        if not removed:
+            return
+        survivors: Set[str] = set()
+        for root in {self._find(job_id) for job_id in removed}:
+            survivors.update(self.members.pop(root, [root]))
+        survivors -= removed
+
+        for job_id in removed:
+            for band_key in self._bucket_keys(job_id):
+                members = [other for other in self.buckets[band_key] if other != job_id]
+                if members:
+                    self.buckets[band_key] = members
+                    self._owned.add(band_key)
+                else:
+                    del self.buckets[band_key]
+            for table in (self.signatures, self.titles, self.companies, self.parent, self.order):
+                del table[job_id]
+        self.changed |= removed
+
+        # Rebuild the affected clusters: pairs are confirmed again in ingest order
+        ordered = sorted(survivors, key=self.order.__getitem__)
+        for job_id in ordered:
+            self.parent[job_id] = job_id
+        for i, job_id in enumerate(ordered):
+            for other_id in ordered[:i]:
+                if self._find(other_id) != self._find(job_id) and self.is_duplicate(job_id, other_id):
+                    self._union(job_id, other_id)
+        self.changed |= survivors
+
+    def similarity(self, job_id: str, other_id: str) -> float:
+        """Estimated Jaccard similarity from MinHash signatures"""
+        return float(np.mean(self.signatures[job_id] == self.signatures[other_id]))
+
+    def is_duplicate(self, job_id: str, other_id: str) -> bool:
+        """Confirm an LSH candidate pair: near-identical text and a matching title"""
+        if self.similarity(job_id, other_id) < self.threshold:
+            return False
+        title, other_title = self.titles[job_id], self.titles[other_id]
+        if not title or not other_title:
+            return title == other_title
+        return len(title & other_title) / len(title | other_title) >= TITLE_THRESHOLD
+
+    def duplicate_of(self, job_id: str) -> Optional[str]:
+        """Canonical job_id of this job's cluster, or None if it is the canonical one"""
+        if job_id not in self.parent:
+            return None
+        root = self._find(job_id)
+        return None if root == job_id else root
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Canonical job_id -> all members in ingest order (only clusters with duplicates)"""
+        return {root: sorted(members, key=self.order.__getitem__) for root, members in self.members.items()}
+
+    def _bucket_keys(self, job_id: str) -> List[Tuple[str, int, bytes]]:
+        signature, company = self.signatures[job_id], self.companies[job_id]
+        return [(company, band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.num_bands)]
+
+    def _own_list(self, table: Dict, key, default: List[str]) -> List[str]:
+        """The list under key, copied first if it may be shared with another version"""
+        if key not in self._owned or key not in table:
+            table[key] = list(table.get(key, default))
+            self._owned.add(key)
+        return table[key]
+
+    def _find(self, job_id: str) -> str:
+        parent = self.parent
+        root = job_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[job_id] != root:
+            parent[job_id], job_id = root, parent[job_id]
+        return root
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        # The earliest ingested posting stays canonical
+        if self.order[root_b] < self.order[root_a]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        absorbed = self.members.pop(root_b, [root_b])
+        self._own_list(self.members, root_a, [root_a]).extend(absorbed)
+        self.changed.update(absorbed)
+
+
+def build_duplicate_index(jobs: List[Job]) -> DuplicateIndex:
+    """Build the index and stamp duplicate_of on every job"""
+    index = DuplicateIndex()
+    index.add(jobs)
+    for job in jobs:
+        job.duplicate_of = index.duplicate_of(job.job_id)
+    index.changed.clear()
+    return index
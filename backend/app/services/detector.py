@@ -1,87 +1,150 @@
 from datetime import datetime, timedelta
-from typing import Tuple
+from enum import IntFlag
+from typing import List, Optional, Tuple
 from app.models import Job
 
 
-def detect_ghost_job(job: Job) -> Tuple[bool, str, int]:
+class QualityFlag(IntFlag):
+    """Red flags of a posting, in the order their messages are listed"""
+    UNKNOWN_DATE = 1
+    OLD_POSTING = 2                # over 30 days
+    VERY_SHORT_DESCRIPTION = 4
+    BRIEF_DESCRIPTION = 8
+    GENERIC_DESCRIPTION = 16
+    UNCLEAR_REQUIREMENTS = 32
+    EXCESSIVE_REQUIREMENTS = 64
+    ANONYMOUS_COMPANY = 128
+    SUSPICIOUS_TITLE = 256
+
+
+_FLAG_MESSAGES = [
+    (QualityFlag.VERY_SHORT_DESCRIPTION, "Very short description"),
+    (QualityFlag.BRIEF_DESCRIPTION, "Brief description"),
+    (QualityFlag.GENERIC_DESCRIPTION, "Overly generic description"),
+    (QualityFlag.UNCLEAR_REQUIREMENTS, "Unclear requirements"),
+    (QualityFlag.EXCESSIVE_REQUIREMENTS, "Excessive requirements (unicorn hunting)"),
+    (QualityFlag.ANONYMOUS_COMPANY, "Anonymous company"),
+    (QualityFlag.SUSPICIOUS_TITLE, "Suspicious job title"),
+]
+
+
+def detect_ghost_job(job: Job, ctx=None) -> Tuple[bool, str, int]:
     """
     Detect if a job is likely a ghost posting
     
     Returns: (is_ghost, warning_message, quality_score)
     """
-    
-    red_flags = []
-    quality_score = 100
-    
+    if ctx is not None:
+        # Precomputed at ingest and kept fresh by the priors sweep
+        priors = ctx.priors
+        return priors.is_ghost, priors.ghost_warning, priors.quality_score
+    
+    static_flags, static_penalty = assess_static_quality(
+        job.normalized_description,
+        job.normalized_skills,
+        job.normalized_company.lower(),
+        job.normalized_title.lower()
+    )
+    days_old = _days_since_posted(job.posted_date, datetime.now())
+    age_flags, age_penalty = assess_posting_age(days_old)
+    
+    quality_score = 100 - age_penalty - static_penalty
+    return quality_score < 50, quality_warning(age_flags | static_flags, days_old, quality_score), quality_score
+
+
+def assess_posting_age(days_old: Optional[int]) -> Tuple[int, int]:
+    """Red flag and quality penalty for the posting's age"""
     # 1. Job age check
-    try:
-        posted = datetime.fromisoformat(job.posted_date)
-        days_old = (datetime.now() - posted).days
-        
-        if days_old > 90:
-            red_flags.append(f"Posted {days_old} days ago")
-            quality_score -= 40
-        elif days_old > 60:
-            red_flags.append(f"Posted {days_old} days ago")
-            quality_score -= 25
-        elif days_old > 30:
-            red_flags.append(f"Posted {days_old} days ago")
-            quality_score -= 10
-    except:
-        red_flags.append("Unknown posting date")
-        quality_score -= 15
+    if days_old is None:
+        return QualityFlag.UNKNOWN_DATE, 15
+    if days_old > 90:
+        return QualityFlag.OLD_POSTING, 40
+    elif days_old > 60:
+        return QualityFlag.OLD_POSTING, 25
+    elif days_old > 30:
+        return QualityFlag.OLD_POSTING, 10
+    return 0, 0
+
+
+def assess_static_quality(
+    description: str,
+    requirements: List[str],
+    company_lower: str,
+    title_lower: str
+) -> Tuple[int, int]:
+    """Red flags and quality penalty that don't change as the posting ages"""
+    flags = 0
+    penalty = 0
     
     # 2. Description quality
-    if len(job.description) < 100:
-        red_flags.append("Very short description")
-        quality_score -= 20
-    elif len(job.description) < 200:
-        red_flags.append("Brief description")
-        quality_score -= 10
+    if len(description) < 100:
+        flags |= QualityFlag.VERY_SHORT_DESCRIPTION
+        penalty += 20
+    elif len(description) < 200:
+        flags |= QualityFlag.BRIEF_DESCRIPTION
+        penalty += 10
     
     # Check for vague language
     vague_phrases = [
         'competitive salary', 'fast-paced environment',
         'self-starter', 'rockstar', 'ninja', 'guru'
     ]
-    desc_lower = job.description.lower()
+    desc_lower = description.lower()
     vague_count = sum(1 for phrase in vague_phrases if phrase in desc_lower)
     
     if vague_count >= 3:
-        red_flags.append("Overly generic description")
-        quality_score -= 15
+        flags |= QualityFlag.GENERIC_DESCRIPTION
+        penalty += 15
     
     # 3. Requirements clarity
-    if len(job.requirements) < 3:
-        red_flags.append("Unclear requirements")
-        quality_score -= 20
-    elif len(job.requirements) > 15:
-        red_flags.append("Excessive requirements (unicorn hunting)")
-        quality_score -= 15
+    if len(requirements) < 3:
+        flags |= QualityFlag.UNCLEAR_REQUIREMENTS
+        penalty += 20
+    elif len(requirements) > 15:
+        flags |= QualityFlag.EXCESSIVE_REQUIREMENTS
+        penalty += 15
     
     # 4. Company information
-    if job.company.lower() in ['confidential', 'stealth', 'undisclosed', 'unknown']:
-        red_flags.append("Anonymous company")
-        quality_score -= 25
+    if company_lower in ['confidential', 'stealth', 'undisclosed', 'unknown']:
+        flags |= QualityFlag.ANONYMOUS_COMPANY
+        penalty += 25
     
     # 5. Suspicious patterns in title
-    title_lower = job.title.lower()
     suspicious_words = ['urgent', 'immediate', 'asap', 'rockstar', 'ninja', 'guru']
     if any(word in title_lower for word in suspicious_words):
-        red_flags.append("Suspicious job title")
-        quality_score -= 10
-    
-    # Determine if ghost job
-    is_ghost = quality_score < 50
+        flags |= QualityFlag.SUSPICIOUS_TITLE
+        penalty += 10
     
-    if is_ghost:
-        warning = f"⚠️ Ghost Job Warning ({quality_score}/100): " + ", ".join(red_flags)
+    return flags, penalty
+
+
+def red_flag_messages(flags: int, days_old: Optional[int]) -> List[str]:
+    """The red flags as listed in the warning (posting age first)"""
+    messages = []
+    if flags & QualityFlag.UNKNOWN_DATE:
+        messages.append("Unknown posting date")
+    elif flags & QualityFlag.OLD_POSTING:
+        messages.append(f"Posted {days_old} days ago")
+    messages.extend(message for flag, message in _FLAG_MESSAGES if flags & flag)
+    return messages
+
+
+def quality_warning(flags: int, days_old: Optional[int], quality_score: int) -> str:
+    """Ghost/low-quality warning text ("" for a good posting) - rendered on demand"""
+    if quality_score < 50:
+        return f"⚠️ Ghost Job Warning ({quality_score}/100): " + ", ".join(red_flag_messages(flags, days_old))
     elif quality_score < 70:
-        warning = f"⚠️ Low Quality ({quality_score}/100): " + ", ".join(red_flags)
-    else:
-        warning = ""
-    
-    return is_ghost, warning, quality_score
+        return f"⚠️ Low Quality ({quality_score}/100): " + ", ".join(red_flag_messages(flags, days_old))
+    return ""
+
+
+def _days_since_posted(posted_date: Optional[str], now: datetime) -> Optional[int]:
+    """Age of the posting in days, or None if the date is missing or invalid"""
+    try:
+        posted = datetime.fromisoformat(posted_date)
+        return (now - posted).days
+    except (TypeError, ValueError):
+        return None
 
 
 def check_duplicate_posting(job: Job, all_jobs: list) -> bool:
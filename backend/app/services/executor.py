@@ -0,0 +1,268 @@
+"""
+Ranking Executor
+Runs CPU-bound ranking and scoring off the event loop, so one heavy feed
+request does not stall uploads, health checks and every other request.
+
+- "thread": a thread pool. Ranking is mostly Python, so it shares the GIL,
+  but the event loop keeps serving between bytecodes
+- "process": long-lived worker processes, each holding a copy of the
+  catalog snapshot and the matcher. When the catalog changes, a worker gets
+  the update (CatalogDelta) to replay, or the new catalog if it does not
+  hold the previous version; it is not restarted. A call for an older
+  snapshot than the workers hold runs on the thread pool. Counters recorded
+  in a worker are sent back with the result; stage timings are not
+- "sharded": feed and stats ranking is scattered over long-lived worker
+  processes that each hold one shard of the job table (services/shards.py)
+  and gathered by a merge on the thread pool; other calls use the thread
+  pool. A new catalog is split again and each worker gets its new shard
+- "inline": on the event loop, as before. A request that asks for a
+  cProfile run (services/profiling.py) runs its work inline whatever the kind
+
+Identical concurrent calls (same key: profile version, dataset version and
+query) are coalesced: the first one runs, the others await its result.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from app.services import matching, metrics, profiling, skill_normalizer
+from app.services.shards import build_shards
+
+EXECUTOR_KINDS = ("thread", "process", "sharded", "inline")
+
+
+class SingleFlight:
+    """In-flight calls by key; all callers of a key share one future (event loop thread only)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def get(self, key: Hashable) -> Optional[asyncio.Future]:
+        return self._calls.get(key)
+
+    async def run(self, key: Hashable, start: Callable[[], "asyncio.Future"]):
+        """Await the call running under `key`, starting it with start() if there is none"""
+        future = self._calls.get(key)
+        # A call from another event loop (e.g. one per test client request) can't be awaited here
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(start())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # A waiter that goes away (client disconnect) must not cancel the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+
+# Process workers: the catalog (or catalog shard) they hold, loaded or replayed by the parent
+_worker_catalog = None
+
+
+def _load_in_worker(catalog, matcher, normalizer):
+    global _worker_catalog
+    _worker_catalog = catalog
+    matching._matcher_instance = matcher
+    # Profile skills resolve against the same vocabulary as in the parent
+    skill_normalizer._normalizer_instance = normalizer
+
+
+def _replay_in_worker(delta):
+    """Derive the parent's next catalog version from the one held here"""
+    global _worker_catalog
+    catalog, _worker_catalog = _worker_catalog, None  # a failed replay leaves no catalog to rank on
+    _worker_catalog = catalog.replay(delta, matching.get_matcher())
+
+
+def _call_in_worker(fn: Callable, args: tuple):
+    """fn's result and the counters it incremented, for the parent process to record"""
+    if _worker_catalog is None:
+        raise RuntimeError("ranking worker has no catalog")
+    before = metrics.counters.snapshot()
+    result = fn(_worker_catalog, *args)
+    after = metrics.counters.snapshot()
+    return result, {key: value - before.get(key, 0) for key, value in after.items() if value != before.get(key, 0)}
+
+
+class _Worker:
+    """
+    One long-lived worker process (a single-process pool, so work can be
+    addressed to it) and the parent's catalog its copy is equal to
+    """
+
+    def __init__(self):
+        self.pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        self.catalog = None  # None until a load, or after a failed one
+        self.pending = 0  # calls submitted and not finished (approximate, for load balancing)
+
+    def load(self, catalog, payload, matcher):
+        """Queue a copy of `payload` (the catalog or its shard) for the worker to rank on"""
+        self._queue(catalog, _load_in_worker, payload, matcher, skill_normalizer.get_skill_normalizer())
+
+    def replay(self, catalog):
+        """Queue the update from the worker's catalog to `catalog` (catalog.delta), replayed there"""
+        self._queue(catalog, _replay_in_worker, catalog.delta._replace(base=None))
+
+    def holds_base_of(self, catalog) -> bool:
+        delta = catalog.delta
+        return self.catalog is not None and delta is not None and delta.base() is self.catalog
+
+    def submit(self, fn: Callable, args: tuple) -> Future:
+        self.pending += 1
+        future = self.pool.submit(_call_in_worker, fn, args)
+        future.add_done_callback(self._finished)
+        return future
+
+    def _queue(self, catalog, fn: Callable, *args):
+        # The worker runs its queue in order: calls submitted after this run on `catalog`
+        future = self.pool.submit(fn, *args)
+        self.catalog = catalog
+        future.add_done_callback(lambda done: self._failed(catalog) if done.exception() else None)
+
+    def _failed(self, catalog):
+        print(f"[WARNING] Ranking worker could not load dataset v{catalog.version}")
+        if self.catalog is catalog:
+            self.catalog = None
+
+    def _finished(self, future: Future):
+        self.pending -= 1
+
+
+class RankingExecutor:
+    """Where ranking work runs; calls are fn(catalog, *args)"""
+
+    def __init__(self, kind: str = "thread", workers: int = 4, shards: int = 1):
+        if kind not in EXECUTOR_KINDS:
+            print(f"[WARNING] Unknown ranking executor '{kind}', using thread")
+            kind = "thread"
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.shards = max(1, shards)
+        self.inflight = SingleFlight()
+        # Work is submitted under the lock, right after the catalog update it
+        # needs, so no other request can move a worker to another catalog in between
+        self._lock = threading.Lock()
+        self._pool: Optional[Executor] = None  # thread pool
+        self._workers: List[_Worker] = []  # "process": interchangeable copies of the catalog
+        self._shard_workers: List[_Worker] = []  # "sharded": one shard each
+        self._shards_catalog = None
+
+    def _thread_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ranking")
+            return self._pool
+
+    def _submit_to_worker(self, catalog, fn: Callable, args: tuple) -> Optional[Future]:
+        """
+        fn(catalog, *args) on the least busy worker process, brought to `catalog`
+        first (delta replay, or a full copy); None for an older catalog than the
+        workers hold (a request still finishing on a replaced snapshot)
+        """
+        with self._lock:
+            if not self._workers:
+                self._workers = [_Worker() for _ in range(self.workers)]
+                print(f"[SUCCESS] Started {self.workers} ranking processes")
+            worker = min(self._workers, key=lambda worker: worker.pending)
+            if worker.catalog is not None and catalog.version < worker.catalog.version:
+                holding = [worker for worker in self._workers if worker.catalog is catalog]
+                if not holding:
+                    return None
+                worker = min(holding, key=lambda worker: worker.pending)
+            if worker.catalog is not catalog:
+                if worker.holds_base_of(catalog):
+                    worker.replay(catalog)
+                else:
+                    worker.load(catalog, catalog, matching.get_matcher())
+            return worker.submit(fn, args)
+
+    def _submit_to_shards(self, catalog, fn: Callable, args: tuple) -> Optional[List[Future]]:
+        """fn(shard, *args) on every shard worker, after sending them the shards of `catalog` if needed"""
+        with self._lock:
+            if self._shards_catalog is not catalog:
+                if self._shards_catalog is not None and catalog.version < self._shards_catalog.version:
+                    return None
+                # The same workers take the new shards: no process is restarted
+                shards = build_shards(catalog, matching.get_matcher(), self.shards)
+                while len(self._shard_workers) < len(shards):
+                    self._shard_workers.append(_Worker())
+                for worker in self._shard_workers[len(shards):]:
+                    worker.pool.shutdown(wait=False)
+                del self._shard_workers[len(shards):]
+                for worker, (shard, matcher) in zip(self._shard_workers, shards):
+                    worker.load(catalog, shard, matcher)
+                self._shards_catalog = catalog
+                print(f"[SUCCESS] Sent {len(shards)} ranking shards (dataset v{catalog.version})")
+            return [worker.submit(fn, args) for worker in self._shard_workers]
+
+    async def run(self, key: Hashable, fn: Callable, catalog, *args):
+        """fn(catalog, *args) on the executor, shared with identical calls in flight"""
+        if profiling.profile_requested():
+            # The request's cProfile run must see the work: here, and not coalesced
+            return fn(catalog, *args)
+        if self.kind == "inline":
+            return await self.inflight.run(key, lambda: _as_coroutine(fn, catalog, args))
+        if self.kind == "process":
+            return await self.inflight.run(key, lambda: self._run_in_process(fn, catalog, args))
+        loop = asyncio.get_running_loop()
+        return await self.inflight.run(
+            key, lambda: loop.run_in_executor(self._thread_pool(), profiling.traced(fn), catalog, *args)
+        )
+
+    async def _run_in_process(self, fn: Callable, catalog, args: tuple):
+        # Sending a catalog or starting a worker pickles and spawns: not on the event loop
+        future = await asyncio.to_thread(self._submit_to_worker, catalog, fn, args)
+        if future is None:
+            return await asyncio.get_running_loop().run_in_executor(self._thread_pool(), fn, catalog, *args)
+        return _record_counts(await asyncio.wrap_future(future))
+
+    async def scatter(self, key: Hashable, fn: Callable, merge: Callable, catalog, *args):
+        """
+        fn(shard, *args) on every shard, then merge(catalog, results, *args) on
+        the thread pool ("sharded" executor only); shared with identical calls in flight
+        """
+        if profiling.profile_requested():
+            return merge(catalog, _rank_shards_here(fn, catalog, self.shards, args), *args)
+        return await self.inflight.run(key, lambda: self._scatter_gather(fn, merge, catalog, args))
+
+    async def _scatter_gather(self, fn: Callable, merge: Callable, catalog, args: tuple):
+        loop = asyncio.get_running_loop()
+        pool = self._thread_pool()
+        # Building and sending shards is CPU work: not on the event loop
+        futures = await asyncio.to_thread(self._submit_to_shards, catalog, fn, args)
+        if futures is None:
+            results = await loop.run_in_executor(pool, _rank_shards_here, fn, catalog, self.shards, args)
+        else:
+            results = [_record_counts(result) for result in await asyncio.gather(*map(asyncio.wrap_future, futures))]
+        return await loop.run_in_executor(pool, profiling.traced(merge), catalog, results, *args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            for worker in self._workers + self._shard_workers:
+                worker.pool.shutdown(wait=False)
+            self._workers, self._shard_workers = [], []
+            self._shards_catalog = None
+
+
+def _record_counts(outcome: Tuple[object, dict]):
+    result, counts = outcome
+    metrics.counters.add(counts)
+    return result
+
+
+def _rank_shards_here(fn: Callable, catalog, count: int, args: tuple) -> list:
+    """fn on every shard of a catalog the shard workers no longer hold, in this thread"""
+    return [fn(shard, *args) for shard, _ in build_shards(catalog, matching.get_matcher(), count)]
+
+
+async def _as_coroutine(fn: Callable, catalog, args: tuple):
+    return fn(catalog, *args)
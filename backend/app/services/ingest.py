@@ -0,0 +1,51 @@
+"""
+Job Ingestion
+Prepares raw job records before they are served
+"""
+import hashlib
+from datetime import datetime
+from typing import List, Set
+from app.models import Job
+
+
+def derive_job_id(job: Job) -> str:
+    """Stable ID for jobs that don't carry one (e.g. Internshala-style records)"""
+    key = job.normalized_link or "|".join([
+        job.normalized_company, job.normalized_title, job.normalized_description
+    ])
+    return "job_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def ensure_job_ids(jobs: List[Job], taken: Set[str] = None) -> List[Job]:
+    """Assign a unique job_id to every job that is missing one"""
+    taken = set(taken or ()) | {job.job_id for job in jobs if job.job_id}
+
+    for job in jobs:
+        if job.job_id:
+            continue
+        job_id = derive_job_id(job)
+        suffix = 1
+        while job_id in taken:
+            suffix += 1
+            job_id = f"{derive_job_id(job)}_{suffix}"
+        job.job_id = job_id
+        taken.add(job_id)
+
+    return jobs
+
+
+def validate_job(job: Job) -> List[str]:
+    """Problems that keep a job out of the catalog (empty list if it is valid)"""
+    errors = []
+    if not (job.JobTitles or job.title or "").strip():
+        errors.append("missing title (JobTitles or title)")
+    if not (job.Company_Name or job.company or "").strip():
+        errors.append("missing company (Company_Name or company)")
+    if job.job_id is not None and not job.job_id.strip():
+        errors.append("job_id must not be blank")
+    if job.posted_date:
+        try:
+            datetime.fromisoformat(job.posted_date)
+        except ValueError:
+            errors.append(f"posted_date is not an ISO date: {job.posted_date!r}")
+    return errors
@@ -0,0 +1,421 @@
+"""
+Job Table
+Columnar, immutable storage for a catalog's jobs. Repeated strings (company,
+title, location, ...) are interned once, skills are ID arrays with offsets,
+and descriptions and links live in contiguous UTF-8 buffers that are decoded
+on access. Iterating yields lightweight JobRow views; Job models are only
+built for the jobs a response actually returns (JobRow.to_job()).
+Tables are published to other processes as plain arrays (export_arrays /
+from_arrays), so a worker can map them instead of rebuilding them.
+"""
+import json
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import Job
+
+# Job fields stored as codes into the string pool (few distinct values)
+INTERNED_FIELDS = ("Company_Name", "JobTitles", "Stipend", "title", "company", "location",
+                   "experience_required", "posted_date", "company_size")
+# Job fields stored in UTF-8 buffers (mostly unique values)
+TEXT_FIELDS = ("Description", "description", "Links")
+
+# Skill encodings: the raw field can be rebuilt from the skill array
+SKILLS_JOINED = 1  # Skills == ", ".join(skills)
+REQUIREMENTS_LIST = 2  # requirements == skills
+
+
+def encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 buffer (uint8) and offsets of a list of strings, for publishing"""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def decode_strings(buffer: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of encode_strings()"""
+    data = buffer.tobytes()
+    bounds = offsets.tolist()
+    return [data[start:end].decode("utf-8") for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+class StringPool:
+    """
+    Append-only interned strings shared by a table and the tables derived
+    from it (a code never changes meaning, so older snapshots stay valid).
+    Strings of deleted jobs are only dropped by a full rebuild.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    @classmethod
+    def from_strings(cls, strings: List[str]) -> "StringPool":
+        pool = cls()
+        pool.strings = strings
+        pool._codes = {value: code for code, value in enumerate(strings)}
+        return pool
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+
+class TextColumn:
+    """
+    Optional strings in one UTF-8 buffer; row i is buffer[offsets[i]:offsets[i + 1]].
+    The buffer is bytes, or a memoryview of a published (memory-mapped) array.
+    """
+
+    __slots__ = ("buffer", "offsets", "present")
+
+    def __init__(self, buffer, offsets: np.ndarray, present: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.present = present
+
+    def __reduce__(self):
+        # A memoryview can't be pickled: worker processes get a copy of the bytes
+        return (TextColumn, (bytes(self.buffer), self.offsets, self.present))
+
+    @classmethod
+    def build(cls, values: List[Optional[str]]) -> "TextColumn":
+        encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+        present = np.fromiter((value is not None for value in values), dtype=bool, count=len(values))
+        return cls(b"".join(encoded), offsets, present)
+
+    def get(self, row: int) -> Optional[str]:
+        if not self.present[row]:
+            return None
+        return str(self.buffer[self.offsets[row]:self.offsets[row + 1]], "utf-8")
+
+    def take(self, rows: np.ndarray) -> "TextColumn":
+        starts, ends = self.offsets[rows], self.offsets[rows + 1]
+        buffer = self.buffer
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        return TextColumn(b"".join([buffer[start:end] for start, end in zip(starts.tolist(), ends.tolist())]),
+                          offsets, self.present[rows])
+
+    def concat(self, other: "TextColumn") -> "TextColumn":
+        return TextColumn(b"".join((self.buffer, other.buffer)),
+                          np.concatenate((self.offsets, self.offsets[-1] + other.offsets[1:])),
+                          np.concatenate((self.present, other.present)))
+
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.nbytes + self.present.nbytes
+
+
+class JobTable:
+    """
+    The jobs of one catalog version, stored by column. Sequence-like:
+    len(), table[row] and iteration return JobRow views in catalog order.
+    """
+
+    def __init__(self, pool: StringPool, job_ids: List[str], interned: Dict[str, np.ndarray],
+                 text: Dict[str, TextColumn], is_remote: np.ndarray, skill_codes: np.ndarray,
+                 skill_offsets: np.ndarray, skill_flags: np.ndarray,
+                 duplicate_of: Dict[int, str], extras: Dict[int, Dict[str, Any]]):
+        self.pool = pool
+        self.job_ids = job_ids
+        self.row_of: Dict[str, int] = {job_id: row for row, job_id in enumerate(job_ids)}
+        self.interned = interned  # field -> int32 pool codes, -1 = None
+        self.text = text
+        self.is_remote = is_remote
+        self.skill_codes = skill_codes  # pool codes of every job's skills, concatenated
+        self.skill_offsets = skill_offsets  # row i: skill_codes[skill_offsets[i]:skill_offsets[i + 1]]
+        self.skill_flags = skill_flags
+        self.duplicate_of = duplicate_of  # sparse: row -> original job_id
+        self.extras = extras  # sparse: row -> raw Skills/requirements that don't fit the flags
+        self.by_id = JobLookup(self)
+        self._rows: Optional[List[JobRow]] = None
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job], pool: Optional[StringPool] = None) -> "JobTable":
+        """Encode Job models (job_id must be set); strings go to `pool` (a new one by default)"""
+        jobs = list(jobs)
+        pool = pool if pool is not None else StringPool()
+        code = pool.code
+
+        interned = {
+            field: np.fromiter((-1 if (value := getattr(job, field)) is None else code(value) for job in jobs),
+                               dtype=np.int32, count=len(jobs))
+            for field in INTERNED_FIELDS
+        }
+        text = {field: TextColumn.build([getattr(job, field) for job in jobs]) for field in TEXT_FIELDS}
+
+        skill_codes: List[int] = []
+        skill_offsets = np.zeros(len(jobs) + 1, dtype=np.int64)
+        skill_flags = np.zeros(len(jobs), dtype=np.int8)
+        extras: Dict[int, Dict[str, Any]] = {}
+        for row, job in enumerate(jobs):
+            skills = job.normalized_skills
+            skill_codes.extend(code(skill) for skill in skills)
+            skill_offsets[row + 1] = len(skill_codes)
+
+            flags = 0
+            if job.Skills is not None:
+                if job.Skills == ", ".join(skills):
+                    flags |= SKILLS_JOINED
+                else:
+                    extras.setdefault(row, {})["Skills"] = job.Skills
+            if job.requirements is not None:
+                if job.requirements == skills:
+                    flags |= REQUIREMENTS_LIST
+                else:
+                    extras.setdefault(row, {})["requirements"] = list(job.requirements)
+            skill_flags[row] = flags
+
+        return cls(
+            pool, [job.job_id for job in jobs], interned, text,
+            np.fromiter((job.is_remote for job in jobs), dtype=bool, count=len(jobs)),
+            np.asarray(skill_codes, dtype=np.int32), skill_offsets, skill_flags,
+            {row: job.duplicate_of for row, job in enumerate(jobs) if job.duplicate_of}, extras,
+        )
+
+    def extend(self, jobs: List[Job]) -> "JobTable":
+        """New table with `jobs` appended (sharing this table's string pool)"""
+        tail = JobTable.from_jobs(jobs, self.pool)
+        offset = len(self)
+        return JobTable(
+            self.pool, self.job_ids + tail.job_ids,
+            {field: np.concatenate((self.interned[field], tail.interned[field])) for field in INTERNED_FIELDS},
+            {field: self.text[field].concat(tail.text[field]) for field in TEXT_FIELDS},
+            np.concatenate((self.is_remote, tail.is_remote)),
+            np.concatenate((self.skill_codes, tail.skill_codes)),
+            np.concatenate((self.skill_offsets, self.skill_offsets[-1] + tail.skill_offsets[1:])),
+            np.concatenate((self.skill_flags, tail.skill_flags)),
+            {**self.duplicate_of, **{row + offset: job_id for row, job_id in tail.duplicate_of.items()}},
+            {**self.extras, **{row + offset: extra for row, extra in tail.extras.items()}},
+        )
+
+    def take(self, rows: List[int]) -> "JobTable":
+        """New table made of the given rows, in that order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) == len(self) and np.array_equal(rows, np.arange(len(self))):
+            return self
+        starts, ends = self.skill_offsets[rows], self.skill_offsets[rows + 1]
+        lengths = ends - starts
+        skill_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=skill_offsets[1:])
+        positions = np.arange(skill_offsets[-1]) + np.repeat(starts - skill_offsets[:-1], lengths)
+
+        new_row = {int(old): new for new, old in enumerate(rows)}
+        return JobTable(
+            self.pool, [self.job_ids[row] for row in rows.tolist()],
+            {field: codes[rows] for field, codes in self.interned.items()},
+            {field: column.take(rows) for field, column in self.text.items()},
+            self.is_remote[rows], self.skill_codes[positions], skill_offsets, self.skill_flags[rows],
+            {new_row[row]: job_id for row, job_id in self.duplicate_of.items() if row in new_row},
+            {new_row[row]: extra for row, extra in self.extras.items() if row in new_row},
+        )
+
+    def with_duplicates(self, stamps: Dict[str, Optional[str]]) -> "JobTable":
+        """New table sharing this one's columns, with duplicate_of set for the given job_ids"""
+        duplicate_of = dict(self.duplicate_of)
+        for job_id, canonical in stamps.items():
+            row = self.row_of[job_id]
+            if canonical:
+                duplicate_of[row] = canonical
+            else:
+                duplicate_of.pop(row, None)
+        return JobTable(
+            self.pool, self.job_ids, self.interned, self.text, self.is_remote, self.skill_codes,
+            self.skill_offsets, self.skill_flags, duplicate_of, self.extras,
+        )
+
+    def export_arrays(self) -> Dict[str, np.ndarray]:
+        """The table as named arrays (see from_arrays); the sparse columns are JSON records"""
+        arrays = {}
+        arrays["pool"], arrays["pool_offsets"] = encode_strings(self.pool.strings)
+        arrays["job_ids"], arrays["job_id_offsets"] = encode_strings(self.job_ids)
+        for field, codes in self.interned.items():
+            arrays[f"interned.{field}"] = codes
+        for field, column in self.text.items():
+            arrays[f"text.{field}"] = np.frombuffer(column.buffer, dtype=np.uint8)
+            arrays[f"text_offsets.{field}"] = column.offsets
+            arrays[f"text_present.{field}"] = column.present
+        arrays.update(is_remote=self.is_remote, skill_codes=self.skill_codes,
+                      skill_offsets=self.skill_offsets, skill_flags=self.skill_flags)
+        sparse = [json.dumps([row, self.duplicate_of.get(row), self.extras.get(row)])
+                  for row in sorted(self.duplicate_of.keys() | self.extras.keys())]
+        arrays["sparse"], arrays["sparse_offsets"] = encode_strings(sparse)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "JobTable":
+        """
+        Table over published arrays (typically read-only memory maps): the
+        columns are used in place, only the strings and job_ids are decoded
+        """
+        duplicate_of, extras = {}, {}
+        for record in decode_strings(arrays["sparse"], arrays["sparse_offsets"]):
+            row, canonical, extra = json.loads(record)
+            if canonical:
+                duplicate_of[row] = canonical
+            if extra:
+                extras[row] = extra
+        return cls(
+            StringPool.from_strings(decode_strings(arrays["pool"], arrays["pool_offsets"])),
+            decode_strings(arrays["job_ids"], arrays["job_id_offsets"]),
+            {field: arrays[f"interned.{field}"] for field in INTERNED_FIELDS},
+            {field: TextColumn(memoryview(arrays[f"text.{field}"]), arrays[f"text_offsets.{field}"],
+                               arrays[f"text_present.{field}"])
+             for field in TEXT_FIELDS},
+            arrays["is_remote"], arrays["skill_codes"], arrays["skill_offsets"], arrays["skill_flags"],
+            duplicate_of, extras,
+        )
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    @property
+    def rows(self) -> List["JobRow"]:
+        """One view per row, created on first use: ranking iterates the table on every request"""
+        if self._rows is None:
+            self._rows = list(map(JobRow, [self] * len(self), range(len(self)), self.job_ids))
+        return self._rows
+
+    def __getitem__(self, row: int) -> "JobRow":
+        return self.rows[row]
+
+    def __iter__(self) -> Iterator["JobRow"]:
+        return iter(self.rows)
+
+    def interned_value(self, field: str, row: int) -> Optional[str]:
+        code = self.interned[field][row]
+        return None if code < 0 else self.pool.strings[code]
+
+    def skills(self, row: int) -> List[str]:
+        strings = self.pool.strings
+        start, end = self.skill_offsets[row], self.skill_offsets[row + 1]
+        return [strings[code] for code in self.skill_codes[start:end].tolist()]
+
+    def value(self, field: str, row: int) -> Any:
+        """One Job field of one row"""
+        if field in self.interned:
+            return self.interned_value(field, row)
+        if field in self.text:
+            return self.text[field].get(row)
+        if field == "job_id":
+            return self.job_ids[row]
+        if field == "is_remote":
+            return bool(self.is_remote[row])
+        if field == "duplicate_of":
+            return self.duplicate_of.get(row)
+        if field == "Skills":
+            if self.skill_flags[row] & SKILLS_JOINED:
+                return ", ".join(self.skills(row))
+            return self.extras.get(row, {}).get("Skills")
+        if field == "requirements":
+            if self.skill_flags[row] & REQUIREMENTS_LIST:
+                return self.skills(row)
+            return self.extras.get(row, {}).get("requirements")
+        raise AttributeError(field)
+
+    def job(self, row: int) -> Job:
+        """Job model for one row (built on every call)"""
+        values = {field: self.value(field, row) for field in Job.model_fields}
+        return Job(**{field: value for field, value in values.items() if value is not None})
+
+    def nbytes(self) -> int:
+        """Approximate size of the columns (numpy arrays and buffers, not the Python objects)"""
+        return (sum(codes.nbytes for codes in self.interned.values())
+                + sum(column.nbytes() for column in self.text.values())
+                + self.is_remote.nbytes + self.skill_codes.nbytes + self.skill_offsets.nbytes
+                + self.skill_flags.nbytes)
+
+
+class JobRow:
+    """
+    Read-only view of one job in a JobTable. Has the Job attributes the
+    matching pipeline reads (job_id, duplicate_of and the normalized_*
+    fields) without building a model; any other attribute is read from the
+    table, and to_job() returns a full Job.
+    """
+
+    __slots__ = ("table", "row", "job_id")
+
+    def __init__(self, table: JobTable, row: int, job_id: str):
+        self.table = table
+        self.row = row
+        self.job_id = job_id
+
+    def __getattr__(self, name: str) -> Any:
+        if name in Job.model_fields:
+            return self.table.value(name, self.row)
+        # Anything else Job offers (model_dump, ...) comes from a built model
+        return getattr(self.to_job(), name)
+
+    def __reduce__(self):
+        # Unpickling must not reach __getattr__ before the slots are set
+        return (JobRow, (self.table, self.row, self.job_id))
+
+    def __repr__(self) -> str:
+        return f"JobRow({self.job_id!r})"
+
+    def to_job(self) -> Job:
+        return self.table.job(self.row)
+
+    @property
+    def duplicate_of(self) -> Optional[str]:
+        return self.table.duplicate_of.get(self.row)
+
+    @property
+    def normalized_title(self) -> str:
+        table, row = self.table, self.row
+        return table.interned_value("JobTitles", row) or table.interned_value("title", row) or "Untitled Position"
+
+    @property
+    def normalized_company(self) -> str:
+        table, row = self.table, self.row
+        return table.interned_value("Company_Name", row) or table.interned_value("company", row) or "Unknown Company"
+
+    @property
+    def normalized_description(self) -> str:
+        text, row = self.table.text, self.row
+        return text["Description"].get(row) or text["description"].get(row) or ""
+
+    @property
+    def normalized_skills(self) -> List[str]:
+        return self.table.skills(self.row)
+
+    @property
+    def normalized_link(self) -> Optional[str]:
+        return self.table.text["Links"].get(self.row)
+
+
+def as_job(job) -> Job:
+    """Job model for a Job or a JobRow"""
+    return job.to_job() if isinstance(job, JobRow) else job
+
+
+class JobLookup(Mapping):
+    """job_id -> JobRow view of a table (what JobCatalog.jobs_by_id used to be as a dict)"""
+
+    def __init__(self, table: JobTable):
+        self._table = table
+
+    def __getitem__(self, job_id: str) -> JobRow:
+        return self._table.rows[self._table.row_of[job_id]]
+
+    def __contains__(self, job_id) -> bool:
+        return job_id in self._table.row_of
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.job_ids)
+
+    def __len__(self) -> int:
+        return len(self._table)
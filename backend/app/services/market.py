@@ -0,0 +1,226 @@
+"""
+Skills to Learn
+Market-wide view of the saved profile's missing skills: how much each one
+is in demand among the jobs, weighted by fit, and how many decisions it
+would upgrade if the profile had it.
+
+Nothing is explained or materialized per job. The fit components of the
+profile against every job come from the cohort arrays (one vectorized
+pass), and every (skill, job) pair of the skill->jobs index is re-scored
+at once with that skill added:
+- the skill overlap gains one matched requirement where the job requires it
+- the semantic score is recomputed where the skill's key is one of the
+  job's terms: one more shared keyword (keyword matcher), or the cosine
+  with the profile's TF-IDF vector plus the skill (tfidf matcher)
+Under the TF-IDF matcher the skill also shrinks every other feature of the
+normalised profile vector, so the pairs of a skill are every job sharing a
+feature with the profile as well. Pairs are aggregated per skill with
+bincounts.
+"""
+import threading
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from app.services.cohort import (
+    CohortJobs, KeywordSemantic, ProfileBlock, cohort_profile, get_cohort_jobs, ghost_flags, round_scores
+)
+from app.services.context import ProfileContext
+from app.services.decision import decision_codes
+from app.services.simulation import get_skill_index
+from app.services.skill_normalizer import get_skill_normalizer
+from app.services.vector_matcher import COSINE_SATURATION
+
+# (skill, job) pairs re-scored at once under the TF-IDF matcher
+TFIDF_CHUNK_PAIRS = 1 << 21
+
+
+class SkillPairs(NamedTuple):
+    """Every (skill, job row) pair the skill can re-score, grouped by skill"""
+    skill_ids: np.ndarray   # skill of each group
+    skill_of: np.ndarray    # group index of each pair
+    rows: np.ndarray
+    requires: np.ndarray    # the job lists the skill (skill overlap)
+    has_term: np.ndarray    # the skill's key is a job keyword (semantic)
+
+
+def build_skill_pairs(skill_index) -> SkillPairs:
+    normalizer = get_skill_normalizer()
+    skill_ids, skill_of, rows, requires, has_term = [], [], [], [], []
+    for group, (skill_id, required_rows) in enumerate(skill_index.by_skill.items()):
+        term_rows = skill_index.by_term.get(normalizer.key(skill_id), np.zeros(0, dtype=np.int32))
+        pair_rows = np.union1d(required_rows, term_rows)
+        skill_ids.append(skill_id)
+        skill_of.append(np.full(len(pair_rows), group, dtype=np.int32))
+        rows.append(pair_rows)
+        requires.append(np.isin(pair_rows, required_rows, assume_unique=True))
+        has_term.append(np.isin(pair_rows, term_rows, assume_unique=True))
+    if not skill_ids:
+        empty = np.zeros(0, dtype=np.int32)
+        return SkillPairs(empty, empty, empty, empty.astype(bool), empty.astype(bool))
+    return SkillPairs(np.array(skill_ids), np.concatenate(skill_of), np.concatenate(rows).astype(np.int64),
+                      np.concatenate(requires), np.concatenate(has_term))
+
+
+# Pairs of the latest catalog, rebuilt when the catalog changes
+_pairs_lock = threading.Lock()
+_pairs_catalog = None
+_pairs: Optional[SkillPairs] = None
+
+
+def get_skill_pairs(catalog, matcher) -> SkillPairs:
+    global _pairs_catalog, _pairs
+    with _pairs_lock:
+        if _pairs_catalog is not catalog:
+            _pairs = build_skill_pairs(get_skill_index(catalog, matcher))
+            _pairs_catalog = catalog
+        return _pairs
+
+
+class SkillDemandRow(NamedTuple):
+    skill_id: int
+    jobs_requiring: int
+    weighted_demand: float
+    to_apply: int
+    to_wait: int
+    upgrades: int
+    average_fit_gain: float
+
+
+def skills_to_learn(catalog, matcher, profile_ctx: ProfileContext, limit: int = 20) -> List[SkillDemandRow]:
+    """
+    The profile's missing skills, ranked by the Apply/Wait decisions they
+    unlock, then by fit-weighted demand
+    """
+    jobs: CohortJobs = get_cohort_jobs(catalog, matcher)
+    pairs = get_skill_pairs(catalog, matcher)
+    profile = cohort_profile(profile_ctx, matcher)
+
+    # The profile against every job: components, fit and decisions
+    block = ProfileBlock(jobs, [profile])
+    components = block.components(0, jobs.num_jobs)
+    fit = components.fit_scores()[0]
+    critical = block.critical(ghost_flags(catalog), 0, jobs.num_jobs)[0]
+    codes = decision_codes(fit, critical)
+
+    # Pairs of skills the profile does not have yet
+    held = np.isin(pairs.skill_ids, list(profile_ctx.skill_ids))
+    keep = ~held[pairs.skill_of]
+    skill_of, rows = pairs.skill_of[keep], pairs.rows[keep]
+    requires, has_term = pairs.requires[keep], pairs.has_term[keep]
+
+    # Re-score each pair with the skill added, then aggregate per skill
+    # (lower decision code = better decision)
+    groups = len(pairs.skill_ids)
+    totals = {name: np.zeros(groups) for name in
+              ("jobs_requiring", "weighted_demand", "to_apply", "to_wait", "upgrades", "fit_gain", "changed")}
+    matched = np.rint(components.overlap[0] * jobs.requirement_counts)
+    if isinstance(jobs.semantic, KeywordSemantic):
+        chunks = [_keyword_pairs(jobs, profile, pairs, skill_of, rows, requires, has_term, components)]
+    else:
+        chunks = _tfidf_pairs(catalog, jobs, matcher, profile_ctx, profile, pairs, skill_of, rows, requires, components)
+    for skill_of, rows, requires, semantic in chunks:
+        requirement_counts = jobs.requirement_counts[rows]
+        overlap = np.where(requirement_counts > 0,
+                           (matched[rows] + requires) / np.maximum(requirement_counts, 1), 0)
+        new_fit = round_scores(semantic * 0.4 + overlap * 100 * 0.3
+                               + components.experience[0][rows] * 0.2 + components.preference[0][rows] * 0.1)
+        new_codes = decision_codes(new_fit, critical[rows])
+        old_codes = codes[rows]
+        count = lambda weights: np.bincount(skill_of, weights=weights, minlength=groups)
+        totals["jobs_requiring"] += count(requires)
+        totals["weighted_demand"] += count(requires * fit[rows] / 100)
+        totals["to_apply"] += count((new_codes == 0) & (old_codes > 0))
+        totals["to_wait"] += count((new_codes == 1) & (old_codes > 1))
+        totals["upgrades"] += count(new_codes < old_codes)
+        totals["fit_gain"] += count(new_fit - fit[rows])
+        totals["changed"] += count(new_fit != fit[rows])
+    jobs_requiring, weighted_demand = totals["jobs_requiring"], totals["weighted_demand"]
+    to_apply, to_wait, upgrades = totals["to_apply"], totals["to_wait"], totals["upgrades"]
+    fit_gain, changed = totals["fit_gain"], totals["changed"]
+
+    candidates = np.flatnonzero(~held & (jobs_requiring > 0))
+    order = candidates[np.lexsort((-weighted_demand[candidates], -(to_apply + to_wait)[candidates]))][:limit]
+    return [
+        SkillDemandRow(
+            skill_id=int(pairs.skill_ids[group]),
+            jobs_requiring=int(jobs_requiring[group]),
+            weighted_demand=round(float(weighted_demand[group]), 2),
+            to_apply=int(to_apply[group]),
+            to_wait=int(to_wait[group]),
+            upgrades=int(upgrades[group]),
+            average_fit_gain=round(float(fit_gain[group] / max(changed[group], 1)), 2)
+        )
+        for group in order
+    ]
+
+
+def _keyword_pairs(jobs, profile, pairs, skill_of, rows, requires, has_term, components):
+    """The pairs with their semantic score: one more shared keyword where the skill's key is new"""
+    normalizer = get_skill_normalizer()
+    user_terms = set(profile.embedding)
+    new_term = np.array([normalizer.key(skill_id) not in user_terms for skill_id in pairs.skill_ids])
+    gains = has_term & new_term[skill_of]
+    term_counts = jobs.semantic.term_counts[rows]
+    match_counts = jobs.semantic.match_counts([profile.embedding], 0, jobs.num_jobs)[0][rows]
+    semantic = np.where(
+        gains, np.minimum(100.0, 40 + ((match_counts + 1) / np.maximum(term_counts, 1) * 60)),
+        components.semantic[0][rows]
+    )
+    return skill_of, rows, requires, semantic
+
+
+def _tfidf_pairs(catalog, jobs, matcher, profile_ctx, profile, pairs, skill_of, rows, requires, components):
+    """
+    Every (skill, job) pair whose fit the skill changes, in chunks of skills.
+    Adding the skill's feature f to the L2-normalised profile vector u
+    rescales every other feature by s = ||u|| / ||u + f|| (before
+    normalisation), so each job sharing any feature with the profile gets
+    the cosine s * cos(u, job); jobs holding f are scored exactly.
+    """
+    index = get_skill_index(catalog, matcher)
+    num_jobs = jobs.num_jobs
+    user_vector = profile.embedding
+    user_terms = matcher.user_terms(profile_ctx.profile)
+    if len(user_vector[0]):
+        cosines = jobs.semantic.cosines_at([user_vector], np.arange(num_jobs))[0]
+        sharing = cosines != 0
+    else:
+        # Every job scores 50 against an empty profile and changes with the skill
+        cosines = np.zeros(num_jobs)
+        sharing = np.ones(num_jobs, dtype=bool)
+    bounds = np.searchsorted(skill_of, np.arange(len(pairs.skill_ids) + 1))
+    chunk = []
+    for group in np.flatnonzero(np.diff(bounds)):
+        skill_id = int(pairs.skill_ids[group])
+        skill_vector = matcher.with_skill(user_terms, skill_id)
+        feature_rows = index.by_feature.lookup(np.array([matcher.skill_feature(skill_id)], dtype=np.int32))
+        pair_rows = rows[bounds[group]:bounds[group + 1]]
+        affected = sharing.copy()
+        affected[pair_rows] = True
+        affected[feature_rows] = True
+        group_rows = np.flatnonzero(affected)
+
+        scale = _rescale(user_vector, skill_vector, matcher.skill_feature(skill_id))
+        semantic = 40.0 + 60.0 * np.minimum(1.0, scale * cosines[group_rows] / COSINE_SATURATION)
+        if len(feature_rows):
+            semantic[np.searchsorted(group_rows, feature_rows)] = jobs.semantic.scores_at([skill_vector], feature_rows)[0]
+        required = pair_rows[requires[bounds[group]:bounds[group + 1]]]
+        chunk.append((np.full(len(group_rows), group), group_rows,
+                      np.isin(group_rows, required, assume_unique=True), semantic))
+        if sum(len(part[1]) for part in chunk) >= TFIDF_CHUNK_PAIRS:
+            yield tuple(np.concatenate(parts) for parts in zip(*chunk))
+            chunk = []
+    if chunk:
+        yield tuple(np.concatenate(parts) for parts in zip(*chunk))
+
+
+def _rescale(user_vector, skill_vector, feature: int) -> float:
+    """Factor of the profile's other features once the skill's feature is added"""
+    user_features, user_values = user_vector
+    others = np.flatnonzero(user_features != feature)
+    if not len(others):
+        return 1.0
+    at = others[0]
+    position = np.searchsorted(skill_vector[0], user_features[at])
+    return float(skill_vector[1][position]) / float(user_values[at])
@@ -1,6 +1,12 @@
 """Lightweight keyword-based job matching (no ML dependencies)"""
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
 from app.models import UserProfile, Job
+from app.services.job_table import JobTable, StringPool, decode_strings, encode_strings
+from app.services.metrics import count_embedding_lookups
+from app.services.skill_normalizer import TrigramIndex, alias_key, get_skill_normalizer, skill_keys
 
 
 class KeywordMatcher:
@@ -8,21 +14,25 @@ class KeywordMatcher:
     
     def __init__(self):
         print("Initializing KeywordMatcher (lightweight mode)...")
+        self._pool_key: Optional[tuple] = None
+        self._pool_index: Optional[TrigramIndex] = None
+        self._pool_skills: List[str] = []
         print("Matcher ready!")
     
     def create_user_embedding(self, profile: UserProfile) -> List[str]:
         """Create a 'pseudo-embedding' (just a list of keywords from profile)"""
         keywords = set()
+        normalizer = get_skill_normalizer()
         
-        # Add skills (lowercase for comparison)
+        # Add skills (canonical keys, so "NodeJS" and "Node.js" compare equal)
         for skill in profile.skills:
-            keywords.add(skill.lower().strip())
+            keywords.add(normalizer.canonical_key(skill))
         
-        # Add preferred roles
+        # Add preferred roles (keyed like job title words)
         for role in profile.preferred_roles:
             for word in role.lower().split():
                 if len(word) > 2:  # Skip small words
-                    keywords.add(word)
+                    keywords.add(alias_key(word) or word)
         
         # Add experience level
         keywords.add(profile.experience_level.lower())
@@ -32,29 +42,68 @@ class KeywordMatcher:
     def create_job_embedding(self, job: Job) -> List[str]:
         """Create a 'pseudo-embedding' (just a list of keywords from job)"""
         keywords = set()
+        normalizer = get_skill_normalizer()
         
         # Handle new Internshala-style fields
         title = job.JobTitles or job.title or ""
-        company = job.Company_Name or job.company or ""
-        skills_str = job.Skills or ""
+        skills = [s for s in (job.Skills or "").split(',') if s.strip()]
         requirements = job.requirements or []
         
-        # Add job title words
+        # Add job title words, keyed like skills so "Node.js" in the title and
+        # in the requirements is one keyword
         for word in title.lower().split():
             if len(word) > 2:
-                keywords.add(word)
-        
-        # Add skills from Skills field (comma separated)
-        if skills_str:
-            for skill in skills_str.split(','):
-                keywords.add(skill.lower().strip())
+                keywords.add(alias_key(word) or word)
         
-        # Add requirements
-        for req in requirements:
-            keywords.add(req.lower().strip())
+        # Add skills from Skills field (comma separated) and requirements
+        for skill_id in normalizer.canonical_ids(skills + requirements):
+            keywords.add(normalizer.key(skill_id))
         
         return list(keywords)
     
+    def index_jobs(self, jobs: List[Job]) -> Dict[str, List[str]]:
+        """Pre-compute embeddings for a job collection, keyed by job_id"""
+        return {job.job_id: self.create_job_embedding(job) for job in jobs}
+    
+    def update_index(self, index: Dict[str, List[str]], jobs: List[Job], upserts: List[Job],
+                     deleted_ids: List[str]) -> Dict[str, List[str]]:
+        """Updated copy of an embedding cache; the original is left untouched"""
+        embeddings = dict(index)
+        for job_id in deleted_ids:
+            embeddings.pop(job_id, None)
+        for job in upserts:
+            embeddings[job.job_id] = self.create_job_embedding(job)
+        return embeddings
+    
+    def export_index(self, index: Dict[str, List[str]], jobs: JobTable) -> Dict[str, np.ndarray]:
+        """Arrays for publishing the keywords: codes into one term list, row i being jobs[i]"""
+        pool = StringPool()
+        codes = [pool.code(term) for job_id in jobs.job_ids for term in index[job_id]]
+        offsets = np.zeros(len(jobs) + 1, dtype=np.int64)
+        np.cumsum([len(index[job_id]) for job_id in jobs.job_ids], out=offsets[1:])
+        terms, term_offsets = encode_strings(pool.strings)
+        return {"terms": terms, "term_offsets": term_offsets,
+                "keyword_codes": np.asarray(codes, dtype=np.int32), "keyword_offsets": offsets}
+    
+    def attach_index(self, arrays: Dict[str, np.ndarray], jobs: JobTable) -> Dict[str, List[str]]:
+        """
+        Embedding cache for jobs loaded from a published snapshot. Keywords are
+        decoded once (ranking reads them per job), sharing the term strings.
+        """
+        terms = decode_strings(arrays["terms"], arrays["term_offsets"])
+        codes = arrays["keyword_codes"].tolist()
+        bounds = arrays["keyword_offsets"].tolist()
+        return {job_id: [terms[code] for code in codes[bounds[row]:bounds[row + 1]]]
+                for row, job_id in enumerate(jobs.job_ids)}
+    
+    def shard_index(self, index: Dict[str, List[str]], jobs: List[Job]) -> Tuple["KeywordMatcher", Dict[str, List[str]]]:
+        """Matcher and embedding cache for a worker that ranks `jobs` only (a catalog shard)"""
+        return self, {job.job_id: index[job.job_id] for job in jobs if job.job_id in index}
+    
+    def embedding_terms(self, index: Dict[str, List[str]], job: Job) -> List[str]:
+        """Terms of a job that profile skills or level can match (what-if simulation)"""
+        return index.get(job.job_id) or self.create_job_embedding(job)
+    
     def calculate_similarity(self, user_keywords: List[str], job_keywords: List[str]) -> float:
         """Calculate Jaccard-like similarity between keyword sets"""
         if not user_keywords or not job_keywords:
@@ -83,6 +132,7 @@ class KeywordMatcher:
         user_keywords = self.create_user_embedding(profile)
         
         job_scores = []
+        misses = 0
         
         for job in jobs:
             job_id = job.job_id or job.Links or f"job_{id(job)}"
@@ -91,44 +141,58 @@ class KeywordMatcher:
                 job_keywords = job_embeddings[job_id]
             else:
                 job_keywords = self.create_job_embedding(job)
+                misses += 1
             
             score = self.calculate_similarity(user_keywords, job_keywords)
             job_scores.append((job, score))
+        count_embedding_lookups(len(jobs), misses)
         
         # Sort by score descending
         job_scores.sort(key=lambda x: x[1], reverse=True)
         return job_scores
     
-    def find_similar_skills(self, skill: str, skill_pool: List[str], top_k: int = 3) -> List[str]:
-        """Find similar skills using simple string matching"""
-        skill_lower = skill.lower()
+    def find_similar_skills(self, skill: str, skill_pool: Optional[List[str]] = None, top_k: int = 3) -> List[str]:
+        """
+        Find similar skills using the trigram index.
+        Without a skill_pool, searches the canonical vocabulary of all job skills.
+        """
+        if skill_pool is None:
+            normalizer = get_skill_normalizer()
+            return [normalizer.name(skill_id) for skill_id in normalizer.similar(skill, top_k)]
+        
+        # Index for an explicit pool, reused while the same pool is passed in
+        pool_key = tuple(skill_pool)
+        if self._pool_key != pool_key:
+            self._pool_index = TrigramIndex()
+            self._pool_skills = []
+            for pool_skill in skill_pool:
+                for key in skill_keys(pool_skill):
+                    self._pool_index.add(key)
+                    self._pool_skills.append(pool_skill)
+            self._pool_key = pool_key
         
-        # Simple matching: skills that contain the same words
         matches = []
-        for pool_skill in skill_pool:
-            pool_lower = pool_skill.lower()
-            
-            # Check for substring match or word overlap
-            if skill_lower in pool_lower or pool_lower in skill_lower:
-                matches.append((pool_skill, 0.8))
-            else:
-                # Word overlap
-                skill_words = set(skill_lower.split())
-                pool_words = set(pool_lower.split())
-                overlap = len(skill_words.intersection(pool_words))
-                if overlap > 0:
-                    matches.append((pool_skill, overlap * 0.3))
-        
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return [m[0] for m in matches[:top_k]]
+        for key in skill_keys(skill):
+            for position, _ in self._pool_index.search(key, top_k * 2):
+                pool_skill = self._pool_skills[position]
+                if pool_skill not in matches:
+                    matches.append(pool_skill)
+        return matches[:top_k]
 
 
 # Global instance
 _matcher_instance = None
 
 def get_matcher() -> KeywordMatcher:
-    """Get or create the global matcher instance"""
+    """Get or create the global matcher instance (OBLIQO_MATCHER selects the implementation)"""
     global _matcher_instance
     if _matcher_instance is None:
-        _matcher_instance = KeywordMatcher()
+        from app.config import MATCHER
+        if MATCHER == "tfidf":
+            from app.services.vector_matcher import TfidfMatcher
+            _matcher_instance = TfidfMatcher()
+        else:
+            if MATCHER != "keyword":
+                print(f"[WARNING] Unknown matcher '{MATCHER}', using keyword matcher")
+            _matcher_instance = KeywordMatcher()
     return _matcher_instance
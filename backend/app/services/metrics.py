@@ -0,0 +1,215 @@
+"""
+Metrics
+Per-stage latency histograms and counters, exposed in Prometheus text format.
+No client library: a histogram is a fixed list of bucket counts, so recording
+an observation is a bisect and two additions.
+"""
+import threading
+import time
+from bisect import bisect_left
+from itertools import cycle, repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.config import METRICS_ENABLED, METRICS_SAMPLE_EVERY
+
+# Seconds; covers per-job stages (microseconds) up to whole feed requests
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a label value"""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series: Dict[str, List[float]] = {}  # label -> bucket counts + [sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, seconds: float):
+        self.observe_many([(label_value, seconds)])
+
+    def observe_many(self, observations: Iterable[Tuple[str, float]]):
+        with self._lock:
+            for label_value, seconds in observations:
+                series = self._series.get(label_value)
+                if series is None:
+                    series = self._series[label_value] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+                series[bisect_left(self.buckets, seconds)] += 1
+                series[-2] += seconds
+                series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for label_value, values in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label}}} {values[-1]}")
+        return lines
+
+
+class Counters:
+    """Monotonic counters, optionally split by one label"""
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], float] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, label: str = ""):
+        key = (name, label)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[Tuple[str, str], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def add(self, values: Dict[Tuple[str, str], float]):
+        """Add counts recorded elsewhere (e.g. in a worker process)"""
+        with self._lock:
+            for key, amount in values.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            values = dict(self._values)
+        for name in sorted({name for name, _ in values} | set(self._help)):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            labelled = sorted((label, value) for (key, label), value in values.items() if key == name)
+            for label, value in labelled or [("", 0)]:
+                lines.append(f"{name}{{{label}}} {value}" if label else f"{name} {value}")
+        return lines
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one unit of work: lap() closes the current
+    stage. A buffered timer keeps its laps until flush(), so timing many
+    jobs in a loop takes the histogram lock once.
+    """
+
+    __slots__ = ("histogram", "last", "pending")
+
+    def __init__(self, histogram: Histogram, buffered: bool = False):
+        self.histogram = histogram
+        self.last = time.perf_counter()
+        self.pending: Optional[List[Tuple[str, float]]] = [] if buffered else None
+
+    def restart(self):
+        self.last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        if self.pending is None:
+            self.histogram.observe(stage, now - self.last)
+        else:
+            self.pending.append((stage, now - self.last))
+        self.last = now
+
+    def flush(self):
+        if self.pending:
+            self.histogram.observe_many(self.pending)
+            self.pending = []
+
+
+class JobSampler:
+    """
+    Per-job timers for a loop over many jobs: iterating yields the shared
+    timer for every METRICS_SAMPLE_EVERY-th job and None otherwise. A feed
+    builds one match per job, so timing every job would cost more than the
+    stages themselves; skipped jobs cost one step of a C iterator.
+    """
+
+    def __init__(self):
+        self.timer = StageTimer(stage_seconds, buffered=True) if METRICS_ENABLED else None
+
+    def __iter__(self) -> Iterator[Optional[StageTimer]]:
+        if self.timer is None:
+            return repeat(None)
+        return cycle([self.timer] + [None] * (METRICS_SAMPLE_EVERY - 1))
+
+    def flush(self):
+        if self.timer:
+            self.timer.flush()
+
+
+stage_seconds = Histogram(
+    "obliqo_stage_seconds",
+    "Latency of one pipeline stage (per request, or per sampled job for job-level stages)",
+    "stage",
+)
+request_seconds = Histogram("obliqo_request_seconds", "Request latency by route", "route")
+counters = Counters()
+counters.describe("obliqo_jobs_scored_total", "Job matches built (fit score, explanation, decision)")
+counters.describe("obliqo_embedding_cache_hits_total", "Jobs scored from precomputed embeddings")
+counters.describe("obliqo_embedding_cache_misses_total", "Jobs whose embedding had to be computed on the fly")
+counters.describe("obliqo_cv_parse_total", "CV parse jobs by result")
+
+def stage_timer() -> Optional[StageTimer]:
+    """Timer for request-level stages, None when metrics are off"""
+    return StageTimer(stage_seconds) if METRICS_ENABLED else None
+
+
+def count(name: str, amount: float = 1, label: str = ""):
+    if METRICS_ENABLED:
+        counters.inc(name, amount, label)
+
+
+def count_embedding_lookups(total: int, misses: int):
+    """Record one ranking pass: `total` jobs, `misses` of them without a precomputed embedding"""
+    count("obliqo_embedding_cache_hits_total", total - misses)
+    if misses:
+        count("obliqo_embedding_cache_misses_total", misses)
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines = stage_seconds.render() + request_seconds.render() + counters.render()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request latency per route template, plus the
+    'serialize' stage - the time between a handler returning (handlers mark
+    scope["handler_done"]) and the response starting.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                handler_done = scope.get("handler_done")
+                if handler_done:
+                    stage_seconds.observe("serialize", now - handler_done)
+                route = scope.get("route")
+                request_seconds.observe(getattr(route, "path", "unmatched"), now - start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,169 @@
+"""
+Job Priors
+Profile-independent job data computed once at ingest
+"""
+import copy
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import Job
+from app.services.scoring import EXPERIENCE_LEVELS
+from app.services.detector import (
+    _days_since_posted, assess_posting_age, assess_static_quality, quality_warning
+)
+from app.services.decision import job_competition_prior, offers_growth_title
+from app.services.job_table import JobTable, StringPool, decode_strings, encode_strings
+from app.services.risks import is_flagged_text
+from app.services.skill_normalizer import get_skill_normalizer
+
+# Published columns (export_job_priors): string fields as pool codes, the rest as numbers.
+# requirements are the job's skills and are read back from the JobTable.
+PRIOR_STRINGS = ("title", "title_lower", "company_lower", "location_lower", "experience_required",
+                 "job_level_lower")
+PRIOR_NUMBERS = {
+    "description_length": np.int32, "is_remote": bool, "job_level_rank": np.int8,
+    "level_is_flagged": bool, "static_quality_flags": np.int32, "static_penalty": np.int32,
+    "competition_prior": np.int32, "offers_growth": bool, "days_old": np.int32,  # -1 = unknown
+    "quality_flags": np.int32, "quality_score": np.int32, "is_ghost": bool,
+}
+
+
+class JobPriors:
+    """Normalized fields, quality/ghost flags and static scoring priors for one job"""
+
+    def __init__(self, job: Job, now: datetime):
+        # Normalized fields (Internshala-style and legacy jobs alike). The
+        # lowercased ones repeat across jobs, so they are interned.
+        self.title = job.normalized_title
+        self.title_lower = sys.intern(self.title.lower())
+        self.company_lower = sys.intern(job.normalized_company.lower())
+        description = job.normalized_description
+        self.description_length = len(description)
+        self.location_lower = sys.intern((job.location or "").lower())
+        self.is_remote = job.is_remote
+        self.experience_required = job.experience_required or ""
+        self.job_level_lower = sys.intern(self.experience_required.lower())
+        self.job_level_rank = EXPERIENCE_LEVELS.get(self.job_level_lower, 2)
+        self.level_is_flagged = is_flagged_text(self.job_level_lower)  # an experience gap would be critical
+
+        # Requirements: raw list, canonical skill IDs and ID -> original spelling
+        self.requirements: List[str] = job.normalized_skills
+        self.requirement_ids: List[int] = get_skill_normalizer().canonical_ids(self.requirements)
+        self.requirements_by_id: Dict[int, str] = dict(zip(self.requirement_ids, self.requirements))
+        self.has_duplicate_requirements = len(self.requirements_by_id) != len(self.requirements)
+
+        # Static quality flags (the age-based part is added by refresh())
+        self.static_quality_flags, self.static_penalty = assess_static_quality(
+            description, self.requirements, self.company_lower, self.title_lower
+        )
+
+        # Static competition / career-impact priors
+        self.competition_prior = job_competition_prior(
+            self.company_lower, self.is_remote, self.job_level_lower, self.title_lower
+        )
+        self.offers_growth = offers_growth_title(self.title_lower)
+
+        self.posted_date = job.posted_date
+        self.days_old: Optional[int] = None
+        self.quality_flags = 0
+        self.quality_score = 100
+        self.is_ghost = False
+        self.refresh(now)
+
+    def refresh(self, now: datetime):
+        """Recompute the age-based penalties for the given reference time"""
+        self.days_old = _days_since_posted(self.posted_date, now)
+
+        age_flags, age_penalty = assess_posting_age(self.days_old)
+        self.quality_flags = age_flags | self.static_quality_flags
+        self.quality_score = 100 - age_penalty - self.static_penalty
+        self.is_ghost = self.quality_score < 50
+
+    def refreshed(self, now: datetime) -> "JobPriors":
+        """Copy with the age-based penalties recomputed (a published copy is never modified)"""
+        priors = copy.copy(self)
+        priors.refresh(now)
+        return priors
+
+    @classmethod
+    def from_values(cls, values: dict, requirements: List[str], requirement_ids: List[int],
+                    posted_date: Optional[str]) -> "JobPriors":
+        """Priors from published values, without recomputing anything"""
+        priors = cls.__new__(cls)
+        priors.__dict__.update(values)
+        priors.requirements = requirements
+        priors.requirement_ids = requirement_ids
+        priors.requirements_by_id = dict(zip(requirement_ids, requirements))
+        priors.has_duplicate_requirements = len(priors.requirements_by_id) != len(requirements)
+        priors.posted_date = posted_date
+        if priors.days_old < 0:
+            priors.days_old = None
+        return priors
+
+    @property
+    def ghost_warning(self) -> str:
+        """Warning text, rendered when a match is returned"""
+        return quality_warning(self.quality_flags, self.days_old, self.quality_score)
+
+
+def compute_job_priors(job: Job, now: Optional[datetime] = None) -> JobPriors:
+    """Compute the priors for a single job"""
+    return JobPriors(job, now or datetime.now())
+
+
+def build_job_priors(jobs: Iterable[Job], now: Optional[datetime] = None) -> Dict[str, JobPriors]:
+    """Compute priors for every job, keyed by job_id"""
+    now = now or datetime.now()
+    return {job.job_id: JobPriors(job, now) for job in jobs}
+
+
+def refresh_job_priors(priors: Dict[str, JobPriors],
+                       now: Optional[datetime] = None) -> Tuple[Dict[str, JobPriors], int]:
+    """Periodic sweep: new priors with refreshed age-based penalties, and the number of ghost jobs"""
+    now = now or datetime.now()
+    refreshed = {job_id: job_priors.refreshed(now) for job_id, job_priors in priors.items()}
+    return refreshed, sum(1 for job_priors in refreshed.values() if job_priors.is_ghost)
+
+
+def export_job_priors(priors: Dict[str, JobPriors], jobs: JobTable) -> Dict[str, np.ndarray]:
+    """The priors as arrays in table row order (see attach_job_priors)"""
+    rows = [priors[job_id] for job_id in jobs.job_ids]
+    pool = StringPool()
+    arrays = {}
+    for field in PRIOR_STRINGS:
+        arrays[field] = np.fromiter((pool.code(getattr(row, field)) for row in rows),
+                                    dtype=np.int32, count=len(rows))
+    arrays["strings"], arrays["string_offsets"] = encode_strings(pool.strings)
+    for field, dtype in PRIOR_NUMBERS.items():
+        values = (getattr(row, field) for row in rows)
+        if field == "days_old":
+            values = (-1 if days_old is None else days_old for days_old in values)
+        arrays[field] = np.fromiter(values, dtype=dtype, count=len(rows))
+    # Same offsets as the table's skill codes
+    arrays["requirement_ids"] = np.fromiter((skill_id for row in rows for skill_id in row.requirement_ids),
+                                            dtype=np.int32)
+    return arrays
+
+
+def attach_job_priors(arrays: Dict[str, np.ndarray], jobs: JobTable) -> Dict[str, JobPriors]:
+    """Priors published by export_job_priors(), keyed by job_id"""
+    strings = decode_strings(arrays["strings"], arrays["string_offsets"])
+    columns = {field: [strings[code] for code in arrays[field].tolist()] for field in PRIOR_STRINGS}
+    columns.update((field, arrays[field].tolist()) for field in PRIOR_NUMBERS)
+    names = list(columns)
+    # Decoded in bulk: per-row reads of mapped arrays are slow
+    pool = jobs.pool.strings
+    skills = [pool[code] for code in jobs.skill_codes.tolist()]
+    posted_dates = [None if code < 0 else pool[code] for code in jobs.interned["posted_date"].tolist()]
+    requirement_ids = arrays["requirement_ids"].tolist()
+    offsets = jobs.skill_offsets.tolist()
+    return {
+        job_id: JobPriors.from_values(
+            dict(zip(names, values)), skills[offsets[row]:offsets[row + 1]],
+            requirement_ids[offsets[row]:offsets[row + 1]], posted_dates[row],
+        )
+        for row, (job_id, *values) in enumerate(zip(jobs.job_ids, *columns.values()))
+    }
@@ -0,0 +1,271 @@
+"""
+Request Profiling
+Opt-in (OBLIQO_PROFILING) profiling of the expensive endpoints. A request can
+ask for a deterministic cProfile run with the X-Obliqo-Profile header or the
+?profile= query flag; other requests run under a low-rate stack sampler and
+are kept only when slower than OBLIQO_PROFILE_SLOW_MS. Captured profiles
+(top-N hot spots) live in a ring buffer served by /debug/profiles.
+
+Work the request hands to the ranking executor is profiled too: a requested
+cProfile run has it run inline, in the profiled thread, and the sampler
+follows it onto the executor's thread (see request_profiler).
+"""
+import cProfile
+import itertools
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.config import (
+    PROFILE_RING_SIZE, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_SLOW_MS, PROFILE_TOP_N
+)
+
+PROFILED_PATHS = {"/api/jobs", "/api/stats", "/api/upload-cv"}
+PROFILE_HEADER = b"x-obliqo-profile"
+
+FunctionKey = Tuple[str, int, str]  # (file, first line, function name)
+
+# Server/middleware plumbing: on every stack, so it would crowd out the hot spots
+PLUMBING = ("starlette", "anyio", "asyncio", "uvicorn", "concurrent", "threading", "threading.py",
+            "contextlib.py", "metrics.py", "profiling.py")
+
+recent_profiles: deque = deque(maxlen=PROFILE_RING_SIZE)
+_profile_ids = itertools.count(1)
+
+# The profiler of the request being handled (cProfile.Profile or SamplingProfiler)
+request_profiler: ContextVar = ContextVar("request_profiler", default=None)
+
+
+def profile_requested() -> bool:
+    """The current request asked for a cProfile run: its executor work should run inline"""
+    return isinstance(request_profiler.get(), cProfile.Profile)
+
+
+def traced(fn: Callable) -> Callable:
+    """fn, sampled by the current request's sampler while it runs on another thread"""
+    sampler = request_profiler.get()
+    if not isinstance(sampler, SamplingProfiler):
+        return fn
+
+    def run(*args):
+        thread_id = threading.get_ident()
+        sampler.follow(thread_id)
+        try:
+            return fn(*args)
+        finally:
+            sampler.unfollow(thread_id)
+    return run
+
+
+def _is_plumbing(key: FunctionKey) -> bool:
+    return any(part in PLUMBING for part in Path(key[0]).parts)
+
+
+def _label(key: FunctionKey) -> str:
+    filename, line, name = key
+    path = Path(filename)
+    # Keep app paths relative and library paths short
+    short = "/".join(path.parts[-3:]) if len(path.parts) > 3 else filename
+    return f"{short}:{line}({name})"
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack every interval from a helper thread, plus the
+    threads it follows (executor work of the request). Cheap enough to run on
+    every profiled request; attribution is approximate and includes whatever
+    else that thread runs (other coroutines on the loop). Stacks are cut at
+    stop_code (the middleware frame), so only the request's own frames are
+    counted.
+    """
+
+    def __init__(self, thread_id: int, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS, stop_code=None):
+        self.thread_id = thread_id
+        self.followed: Counter = Counter()  # other thread -> calls of the request running there
+        self.interval = interval_ms / 1000
+        self.stop_code = stop_code
+        self.samples = 0
+        self.cumulative: Counter = Counter()
+        self.own: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def follow(self, thread_id: int):
+        self.followed[thread_id] += 1
+
+    def unfollow(self, thread_id: int):
+        self.followed[thread_id] -= 1
+        if self.followed[thread_id] <= 0:
+            del self.followed[thread_id]
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id not in frames:
+                return
+            self.samples += 1
+            seen = set()
+            for thread_id in [self.thread_id] + list(self.followed):
+                frame = frames.get(thread_id)
+                leaf = True
+                while frame is not None and frame.f_code is not self.stop_code:
+                    code = frame.f_code
+                    key = (code.co_filename, code.co_firstlineno, code.co_name)
+                    if leaf:
+                        self.own[key] += 1
+                        leaf = False
+                    if key not in seen:
+                        self.cumulative[key] += 1
+                        seen.add(key)
+                    frame = frame.f_back
+
+    def top(self, duration_ms: float, n: int = PROFILE_TOP_N) -> List[Dict]:
+        """
+        Hot spots with times estimated as their share of samples x duration.
+        (The sampler only runs when the busy thread releases the GIL, so
+        counting samples x interval would under-report.)
+        """
+        ms_per_sample = duration_ms / max(1, self.samples)
+        return [
+            {
+                "function": _label(key),
+                "samples": samples,
+                "cumulative_ms": round(samples * ms_per_sample, 1),
+                "self_ms": round(self.own[key] * ms_per_sample, 1),
+            }
+            for key, samples in self.cumulative.most_common()
+            if not _is_plumbing(key)
+        ][:n]
+
+
+def cprofile_top(profiler: cProfile.Profile, n: int = PROFILE_TOP_N) -> List[Dict]:
+    """Top-n functions by cumulative time from a finished cProfile run"""
+    stats = pstats.Stats(profiler).stats
+    ranked = sorted(
+        (item for item in stats.items() if not _is_plumbing(item[0])),
+        key=lambda item: item[1][3], reverse=True
+    )[:n]
+    return [
+        {
+            "function": _label(key),
+            "calls": calls,
+            "cumulative_ms": round(cumulative * 1000, 3),
+            "self_ms": round(own * 1000, 3),
+        }
+        for key, (_, calls, own, cumulative, _) in ranked
+    ]
+
+
+def requested_mode(scope) -> Optional[str]:
+    """'cprofile' when the request asks to be profiled, else None"""
+    for name, value in scope.get("headers", []):
+        if name == PROFILE_HEADER and value.strip().lower() not in (b"", b"0", b"false"):
+            return "cprofile"
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if query.get("profile", ["0"])[-1].lower() not in ("", "0", "false"):
+        return "cprofile"
+    return None
+
+
+def store_profile(scope, mode: str, trigger: str, duration_ms: float, status: int,
+                  top: List[Dict], profile_id: Optional[int] = None) -> int:
+    """Add a captured profile to the ring buffer (the oldest one drops out)"""
+    profile_id = profile_id or next(_profile_ids)
+    recent_profiles.append({
+        "id": profile_id,
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": scope.get("query_string", b"").decode("latin-1"),
+        "status": status,
+        "duration_ms": round(duration_ms, 1),
+        "mode": mode,
+        "trigger": trigger,
+        "captured_at": datetime.now().isoformat(timespec="seconds"),
+        "top": top,
+    })
+    return profile_id
+
+
+def get_profile(profile_id: int) -> Optional[Dict]:
+    for profile in recent_profiles:
+        if profile["id"] == profile_id:
+            return profile
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware for PROFILED_PATHS. Explicitly requested profiles get an
+    X-Obliqo-Profile-Id response header pointing at /debug/profiles/{id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in PROFILED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        mode = requested_mode(scope)
+        if mode is None and PROFILE_SLOW_MS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = next(_profile_ids) if mode else None
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if profile_id is not None:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-obliqo-profile-id", str(profile_id).encode())
+                    ]
+            await send(message)
+
+        start = time.perf_counter()
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            token = request_profiler.set(profiler)
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+                request_profiler.reset(token)
+                duration_ms = (time.perf_counter() - start) * 1000
+                store_profile(scope, "cprofile", "requested", duration_ms, status,
+                              cprofile_top(profiler), profile_id)
+            return
+
+        sampler = SamplingProfiler(threading.get_ident(), stop_code=ProfilingMiddleware.__call__.__code__)
+        token = request_profiler.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            request_profiler.reset(token)
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= PROFILE_SLOW_MS:
+                store_profile(scope, "sampling", "slow", duration_ms, status, sampler.top(duration_ms))
+                print(f"[WARNING] Slow request {scope['method']} {scope['path']} "
+                      f"({duration_ms:.0f} ms), profile stored")
+
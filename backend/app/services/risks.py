@@ -0,0 +1,102 @@
+"""
+Risk Factors
+Structured risks of a (profile, job) match: bit flags plus the few numbers
+and texts their messages need. Decisions read the flags only; the
+human-readable messages are rendered for the matches that are returned.
+"""
+from enum import IntFlag
+from typing import List, NamedTuple, Optional
+
+# A level text containing any of these makes an experience gap an Avoid
+AVOID_KEYWORDS = ['ghost', 'scam', 'toxic', 'severe mismatch']
+
+
+class Risk(IntFlag):
+    STALE_POSTING = 1        # posted 31-60 days ago
+    GHOST_POSTING = 2        # posted over 60 days ago
+    VAGUE_DESCRIPTION = 4    # description under 100 characters
+    SKILL_GAPS = 8           # more than 5 missing skills
+    EXPERIENCE_GAP = 16      # job level 2+ ranks above the profile's
+    POOR_FIT = 32            # fit score under 40
+    STEP_DOWN = 64           # job level 2+ ranks below the profile's
+    FLAGGED_LEVEL = 128      # experience gap whose level texts contain an AVOID_KEYWORD
+
+
+# Risks that make a job an Avoid whatever the fit score
+CRITICAL_RISKS = Risk.GHOST_POSTING | Risk.FLAGGED_LEVEL
+
+
+def is_flagged_text(text_lower: str) -> bool:
+    return any(keyword in text_lower for keyword in AVOID_KEYWORDS)
+
+
+class RiskReport(NamedTuple):
+    """Risk flags of one match and the values their messages show"""
+    flags: int
+    days_old: Optional[int] = None
+    missing_count: int = 0
+    experience_required: str = ""
+    experience_level: str = ""
+
+    @property
+    def critical(self) -> bool:
+        return bool(self.flags & CRITICAL_RISKS)
+
+    def messages(self) -> List[str]:
+        """The risk factors as shown to the user"""
+        flags = self.flags
+        messages = []
+        if flags & Risk.GHOST_POSTING:
+            messages.append(f"⚠️ Job posted {self.days_old} days ago - may be a ghost job")
+        elif flags & Risk.STALE_POSTING:
+            messages.append(f"⚠️ Job posted {self.days_old} days ago - verify if still active")
+        if flags & Risk.VAGUE_DESCRIPTION:
+            messages.append("⚠️ Vague job description - may indicate low-quality posting")
+        if flags & Risk.SKILL_GAPS:
+            messages.append(f"🚨 Significant skill gaps ({self.missing_count} missing skills)")
+        if flags & Risk.EXPERIENCE_GAP:
+            messages.append(f"⚠️ Job requires {self.experience_required} but you're {self.experience_level}")
+        if flags & Risk.POOR_FIT:
+            messages.append("🚨 Poor overall fit - not aligned with your profile")
+        if flags & Risk.STEP_DOWN:
+            messages.append("⚠️ This may be a step down from your current level")
+        return messages
+
+    def critical_message(self) -> str:
+        """The first message behind an Avoid, in message order"""
+        if self.flags & Risk.GHOST_POSTING:
+            return RiskReport(Risk.GHOST_POSTING, days_old=self.days_old).messages()[0]
+        return RiskReport(Risk.EXPERIENCE_GAP, experience_required=self.experience_required,
+                          experience_level=self.experience_level).messages()[0]
+
+
+def assess_risks(ctx, fit_score: float) -> RiskReport:
+    """Risk flags of a match (ctx: MatchContext) - a few comparisons, no text"""
+    priors = ctx.priors
+    profile_ctx = ctx.profile_ctx
+    flags = 0
+
+    days_old = priors.days_old
+    if days_old is not None:
+        if days_old > 60:
+            flags |= Risk.GHOST_POSTING
+        elif days_old > 30:
+            flags |= Risk.STALE_POSTING
+    if priors.description_length < 100:
+        flags |= Risk.VAGUE_DESCRIPTION
+    if ctx.missing_count > 5:
+        flags |= Risk.SKILL_GAPS
+
+    user_level = profile_ctx.level_rank
+    job_level = priors.job_level_rank
+    if job_level - user_level >= 2:
+        flags |= Risk.EXPERIENCE_GAP
+        if priors.level_is_flagged or profile_ctx.level_is_flagged:
+            flags |= Risk.FLAGGED_LEVEL
+    if fit_score < 40:
+        flags |= Risk.POOR_FIT
+    if user_level > job_level + 1:
+        flags |= Risk.STEP_DOWN
+
+    return RiskReport(flags, days_old, ctx.missing_count, priors.experience_required,
+                      profile_ctx.profile.experience_level)
@@ -2,10 +2,21 @@ from typing import Tuple
 from app.models import UserProfile, Job
 
 
+# Experience level ranks shared by scoring and the explainer
+EXPERIENCE_LEVELS = {
+    'entry': 1,
+    'mid': 2,
+    'senior': 3,
+    'lead': 4,
+    'staff': 5
+}
+
+
 def calculate_fit_score(
     profile: UserProfile,
     job: Job,
-    semantic_score: float
+    semantic_score: float,
+    ctx=None
 ) -> Tuple[float, dict]:
     """
     Calculate comprehensive fit score combining multiple factors
@@ -15,26 +26,30 @@ def calculate_fit_score(
     - Skill overlap: 30%
     - Experience alignment: 20%
     - Location/preference match: 10%
+
+    ctx is an optional MatchContext carrying the precomputed overlap sets.
     """
+    if ctx is None:
+        from app.services.context import ProfileContext, MatchContext
+        ctx = MatchContext(ProfileContext(profile), job)
+    profile_ctx = ctx.profile_ctx
+    priors = ctx.priors
     
     # 1. Semantic similarity (already 0-100)
     semantic_component = semantic_score * 0.4
     
     # 2. Skill overlap
-    user_skills_lower = [s.lower() for s in profile.skills]
-    job_requirements_lower = [r.lower() for r in job.requirements]
-    
-    matched_skills = set(user_skills_lower) & set(job_requirements_lower)
-    skill_overlap_ratio = len(matched_skills) / len(job_requirements_lower) if job_requirements_lower else 0
+    requirement_count = len(priors.requirements)
+    skill_overlap_ratio = len(ctx.matched_ids) / requirement_count if requirement_count else 0
     skill_component = skill_overlap_ratio * 100 * 0.3
     
     # 3. Experience alignment
-    experience_match = calculate_experience_match(profile.experience_level, job.experience_required)
+    experience_match = _rank_match(profile_ctx.level_rank, priors.job_level_rank)
     experience_component = experience_match * 0.2
     
     # 4. Location/preference match
-    location_match = calculate_location_match(profile.preferred_locations, job.location, job.is_remote)
-    role_match = calculate_role_match(profile.preferred_roles, job.title)
+    location_match = _location_match(profile_ctx.locations_lower, priors.location_lower, priors.is_remote)
+    role_match = _role_match(profile_ctx.roles_lower, priors.title_lower)
     preference_component = ((location_match + role_match) / 2) * 0.1
     
     # Total score
@@ -60,17 +75,12 @@ def calculate_fit_score(
 
 def calculate_experience_match(user_level: str, job_level: str) -> float:
     """Calculate experience level alignment (0-100)"""
-    levels = {
-        'entry': 1,
-        'mid': 2,
-        'senior': 3,
-        'lead': 4,
-        'staff': 5
-    }
-    
-    user_rank = levels.get(user_level.lower(), 2)
-    job_rank = levels.get(job_level.lower(), 2)
-    
+    user_rank = EXPERIENCE_LEVELS.get(user_level.lower(), 2)
+    job_rank = EXPERIENCE_LEVELS.get((job_level or "").lower(), 2)
+    return _rank_match(user_rank, job_rank)
+
+
+def _rank_match(user_rank: int, job_rank: int) -> float:
     # Perfect match
     if user_rank == job_rank:
         return 100.0
@@ -89,12 +99,18 @@ def calculate_experience_match(user_level: str, job_level: str) -> float:
 
 def calculate_location_match(preferred_locations: list, job_location: str, is_remote: bool) -> float:
     """Calculate location match (0-100)"""
+    return _location_match(
+        [pref.lower() for pref in preferred_locations], (job_location or "").lower(), is_remote
+    )
+
+
+def _location_match(preferred_lower: list, job_loc_lower: str, is_remote: bool) -> float:
     if is_remote:
         return 100.0
     
-    job_loc_lower = job_location.lower()
-    for pref in preferred_locations:
-        if pref.lower() in job_loc_lower or job_loc_lower in pref.lower():
+    # An empty job location is contained in any preferred location
+    for pref_lower in preferred_lower:
+        if pref_lower in job_loc_lower or job_loc_lower in pref_lower:
             return 100.0
     
     return 30.0  # Not a perfect match but not a dealbreaker
@@ -102,10 +118,11 @@ def calculate_location_match(preferred_locations: list, job_location: str, is_re
 
 def calculate_role_match(preferred_roles: list, job_title: str) -> float:
     """Calculate role preference match (0-100)"""
-    job_title_lower = job_title.lower()
-    
-    for role in preferred_roles:
-        role_lower = role.lower()
+    return _role_match([role.lower() for role in preferred_roles], (job_title or "").lower())
+
+
+def _role_match(roles_lower: list, job_title_lower: str) -> float:
+    for role_lower in roles_lower:
         # Check for substring match
         if role_lower in job_title_lower or job_title_lower in role_lower:
             return 100.0
@@ -0,0 +1,101 @@
+"""
+Catalog Shards
+Scatter-gather ranking (ranking executor "sharded"). The job table is split
+into contiguous shards, each held by a long-lived worker process. A shard
+ranks and scores its own jobs for a profile and sends back compact columns
+(feed position, semantic score and decision code of every job) plus its
+first top_k matches in full. The coordinator merges the columns into the
+feed order, which is the single-process order: semantic score descending,
+feed order on ties. A match outside every shard's top_k is scored again
+when a page shows it.
+"""
+from collections.abc import Sequence
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from app.services.catalog import JobCatalog
+
+
+class CatalogShard:
+    """A contiguous range of catalog rows, as a catalog of its own"""
+
+    def __init__(self, catalog: JobCatalog, positions: Dict[bool, np.ndarray]):
+        self.catalog = catalog
+        # collapse_duplicates -> feed position of each shard row in the full feed (-1 = not shown)
+        self.positions = positions
+
+    def feed_jobs(self, collapse_duplicates: bool):
+        """The shard's part of catalog.feed_jobs(), in feed order"""
+        if not collapse_duplicates:
+            return self.catalog.jobs
+        positions = self.positions[True]
+        return [job for job in self.catalog.jobs if positions[job.row] >= 0]
+
+
+def build_shards(catalog: JobCatalog, matcher, count: int) -> List[Tuple[CatalogShard, object]]:
+    """Split the catalog into `count` shards of consecutive rows, each with the matcher its worker uses"""
+    jobs = catalog.jobs
+    num_jobs = len(jobs)
+    # Feed positions with duplicates collapsed depend on the whole catalog: computed here
+    shown = np.zeros(num_jobs, dtype=bool)
+    shown[[job.row for job in catalog.feed_jobs(True)]] = True
+    positions = {False: np.arange(num_jobs), True: np.where(shown, np.cumsum(shown) - 1, -1)}
+
+    bounds = np.linspace(0, num_jobs, max(1, min(count, num_jobs)) + 1).astype(np.int64)
+    shards = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        table = jobs.take(np.arange(start, end))
+        shard_matcher, embeddings = matcher.shard_index(catalog.embeddings, table)
+        priors = {job_id: catalog.priors[job_id] for job_id in table.job_ids if job_id in catalog.priors}
+        shard_catalog = JobCatalog(catalog.version, table, priors, embeddings, None)
+        shards.append((CatalogShard(shard_catalog, {collapse: p[start:end] for collapse, p in positions.items()}),
+                       shard_matcher))
+    return shards
+
+
+class ShardRanking(NamedTuple):
+    """What a shard sends back for one profile, in the shard's ranked order"""
+    positions: np.ndarray        # feed position of each job
+    semantic_scores: np.ndarray
+    codes: np.ndarray            # decision codes (indices into DECISIONS)
+    top: list                    # the first top_k scored matches, with job IDs instead of rows
+
+
+def merge_rankings(rankings: List[ShardRanking]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[int, object]]:
+    """(positions, semantic scores, decision codes) in feed order, and the shards' top matches by position"""
+    positions = np.concatenate([ranking.positions for ranking in rankings])
+    semantic_scores = np.concatenate([ranking.semantic_scores for ranking in rankings])
+    codes = np.concatenate([ranking.codes for ranking in rankings])
+    # Same order as one stable sort of the whole feed by semantic score
+    order = np.lexsort((positions, -semantic_scores))
+    top = {int(position): match for ranking in rankings for position, match in zip(ranking.positions, ranking.top)}
+    return positions[order], semantic_scores[order], codes[order], top
+
+
+class RankedMatches(Sequence):
+    """
+    The merged feed as a sequence of scored matches. Matches the shards sent
+    in full are kept; any other is scored by score(job, semantic_score)
+    when first read, and kept from then on.
+    """
+
+    def __init__(self, jobs, positions: np.ndarray, semantic_scores: np.ndarray,
+                 top: Dict[int, object], score: Callable):
+        self.jobs = jobs  # the feed jobs, in feed order
+        self.positions = positions
+        self.semantic_scores = semantic_scores
+        self._score = score
+        self._scored = {position: match._replace(job=jobs[position]) for position, match in top.items()}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        position = int(self.positions[index])
+        match = self._scored.get(position)
+        if match is None:
+            match = self._scored[position] = self._score(self.jobs[position], float(self.semantic_scores[index]))
+        return match
@@ -0,0 +1,212 @@
+"""
+Shared Job Index
+Publishes catalog snapshots as memory-mapped files so several uvicorn workers
+can serve one copy of the job data. A single loader process (app/loader.py)
+writes; workers only read.
+
+Layout of the shared directory (put it on tmpfs, e.g. /dev/shm/obliqo):
+    generation          int64 counter of the current snapshot (memory-mapped)
+    gen-000042/         one snapshot: manifest.json, vocabulary.json and the
+                        job table, priors and matcher arrays (table.*.npy,
+                        priors.*.npy, matcher.*.npy)
+    requests/, results/ bulk updates submitted by workers, answered by the loader
+
+Workers map the arrays read-only and use them in place; only strings (pool,
+job_ids, keywords) and the priors objects are decoded. Nothing is re-parsed
+or recomputed.
+"""
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models import Job, UserProfile
+from app.services.catalog import JobCatalog
+from app.services.job_table import JobTable
+from app.services.priors import attach_job_priors, export_job_priors
+from app.services.skill_normalizer import get_skill_normalizer
+
+GENERATION_FILE = "generation"
+MANIFEST_FILE = "manifest.json"
+VOCABULARY_FILE = "vocabulary.json"
+PROFILE_FILE = "profile.json"
+# Array groups of a snapshot, saved as <group>.<name>.npy
+ARRAY_GROUPS = ("table", "priors", "matcher")
+
+
+def _snapshot_dir(root: Path, generation: int) -> Path:
+    return root / f"gen-{generation:06d}"
+
+
+def _open_counter(root: Path, mode: str) -> np.memmap:
+    return np.memmap(root / GENERATION_FILE, dtype=np.int64, mode=mode, shape=(1,))
+
+
+def _save_arrays(path: Path, group: str, arrays: Dict[str, np.ndarray]) -> List[str]:
+    for name, array in arrays.items():
+        np.save(path / f"{group}.{name}.npy", np.ascontiguousarray(array))
+    return sorted(arrays)
+
+
+def _load_arrays(path: Path, group: str, names: List[str]) -> Dict[str, np.ndarray]:
+    return {name: np.load(path / f"{group}.{name}.npy", mmap_mode="r") for name in names}
+
+
+def _write_json(path: Path, payload: dict):
+    """Write atomically: readers see the old file or the complete new one"""
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+class SharedIndexPublisher:
+    """Loader side: writes snapshots and bumps the generation counter"""
+
+    def __init__(self, root: Path, keep: int = 2):
+        self.root = Path(root)
+        self.keep = keep  # snapshots kept on disk for workers still switching over
+        for name in ("requests", "results"):
+            (self.root / name).mkdir(parents=True, exist_ok=True)
+        # Reuse an existing counter so a restarted loader keeps generations
+        # monotonic (workers only switch when the number changes)
+        if not (self.root / GENERATION_FILE).exists():
+            _open_counter(self.root, "w+").flush()
+        self._counter = _open_counter(self.root, "r+")
+
+    def generation(self) -> int:
+        return int(self._counter[0])
+
+    def publish(self, catalog: JobCatalog, matcher) -> int:
+        """Write the catalog as snapshot number catalog.version and make it current"""
+        generation = catalog.version
+        tmp = self.root / f".gen-{generation:06d}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+
+        # Skill IDs in the priors refer to this vocabulary
+        _write_json(tmp / VOCABULARY_FILE, get_skill_normalizer().export_vocabulary())
+        groups = {
+            "table": catalog.jobs.export_arrays(),
+            "priors": export_job_priors(catalog.priors, catalog.jobs),
+            "matcher": matcher.export_index(catalog.embeddings, catalog.jobs),
+        }
+        _write_json(tmp / MANIFEST_FILE, {
+            "generation": generation,
+            "jobs": len(catalog.jobs),
+            "matcher": type(matcher).__name__,
+            "arrays": {group: _save_arrays(tmp, group, arrays) for group, arrays in groups.items()},
+            "created_at": time.time(),
+        })
+
+        # The snapshot is complete before the counter points at it
+        os.replace(tmp, _snapshot_dir(self.root, generation))
+        self._counter[0] = generation
+        self._counter.flush()
+        self._prune(generation)
+        return generation
+
+    def pending_updates(self) -> List[Tuple[str, dict]]:
+        """Bulk updates submitted by workers, oldest first"""
+        paths = sorted((self.root / "requests").glob("*.json"), key=lambda p: p.stat().st_mtime)
+        updates = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                updates.append((path.stem, json.load(f)))
+            path.unlink()
+        return updates
+
+    def complete_update(self, request_id: str, result: dict):
+        _write_json(self.root / "results" / f"{request_id}.json", result)
+
+    def _prune(self, generation: int):
+        for path in self.root.glob("gen-*"):
+            if int(path.name[4:]) <= generation - self.keep:
+                # Workers that already mapped these files keep them until they let go
+                shutil.rmtree(path, ignore_errors=True)
+
+
+class SharedIndexReader:
+    """Worker side: maps the current snapshot read-only"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._counter: Optional[np.memmap] = None
+
+    def generation(self) -> int:
+        """Current snapshot number, 0 until the loader has published one"""
+        if self._counter is None:
+            if not (self.root / GENERATION_FILE).exists():
+                return 0
+            self._counter = _open_counter(self.root, "r")
+        return int(self._counter[0])
+
+    def load(self, matcher, retries: int = 3) -> JobCatalog:
+        """Catalog for the current snapshot; its arrays stay memory-mapped"""
+        for attempt in range(retries):
+            generation = self.generation()
+            try:
+                return self._load(generation, matcher)
+            except FileNotFoundError:
+                # Pruned between reading the counter and opening it: a newer one exists
+                if attempt == retries - 1:
+                    raise
+
+    def _load(self, generation: int, matcher) -> JobCatalog:
+        path = _snapshot_dir(self.root, generation)
+        with open(path / MANIFEST_FILE, encoding="utf-8") as f:
+            manifest = json.load(f)
+        arrays = {group: _load_arrays(path, group, manifest["arrays"][group]) for group in ARRAY_GROUPS}
+        with open(path / VOCABULARY_FILE, encoding="utf-8") as f:
+            get_skill_normalizer().attach_vocabulary(json.load(f))
+
+        jobs = JobTable.from_arrays(arrays["table"])
+        priors = attach_job_priors(arrays["priors"], jobs)
+        if manifest["matcher"] == type(matcher).__name__:
+            embeddings = matcher.attach_index(arrays["matcher"], jobs)
+        else:
+            print(f"[WARNING] Shared index was built by {manifest['matcher']}, "
+                  f"re-indexing with {type(matcher).__name__}")
+            embeddings = matcher.index_jobs(jobs)
+        return JobCatalog.attach(generation, jobs, priors, embeddings)
+
+    def save_profile(self, profile: UserProfile):
+        """Share the saved profile with the other workers"""
+        _write_json(self.root / PROFILE_FILE, profile.model_dump(mode="json"))
+
+    def load_profile(self, since: float) -> Optional[Tuple[float, UserProfile]]:
+        """(mtime, profile) when the shared profile changed after `since`"""
+        path = self.root / PROFILE_FILE
+        try:
+            mtime = path.stat().st_mtime
+            if mtime <= since:
+                return None
+            with open(path, encoding="utf-8") as f:
+                return mtime, UserProfile(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def submit_update(self, upserts: List[Job], deleted_ids: List[str]) -> str:
+        """Queue a bulk update for the loader; returns the request ID"""
+        request_id = uuid.uuid4().hex
+        _write_json(self.root / "requests" / f"{request_id}.json", {
+            "upserts": [job.model_dump(mode="json") for job in upserts],
+            "deleted_ids": list(deleted_ids),
+        })
+        return request_id
+
+    def update_result(self, request_id: str) -> Optional[Dict]:
+        """The loader's answer to a submitted update, None while it is pending"""
+        path = self.root / "results" / f"{request_id}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        path.unlink()
+        return result
@@ -0,0 +1,181 @@
+"""
+What-if Simulation
+Which jobs a hypothetical profile change (skills added/removed, another
+experience level) can re-score, so only those are scored again.
+
+A job's fit score depends on the profile's skills through the skill overlap
+(its requirement IDs) and the semantic score (the terms of its embedding),
+and on the experience level through the level-rank match. The inverted
+indexes below map each of those to catalog rows.
+
+With the TF-IDF matcher the profile vector is L2-normalized: a skill change
+rescales every weight of the profile, so every job sharing any feature with
+the profile before or after the change is re-scored, not only the jobs with
+the changed skill's term.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from app.models import UserProfile
+from app.services.context import ProfileContext
+from app.services.scoring import _rank_match
+from app.services.skill_normalizer import get_skill_normalizer
+from app.services.vector_matcher import TfidfIndex
+
+
+class FeatureRows:
+    """Hashed TF-IDF feature -> catalog rows (the job matrix by column)"""
+
+    def __init__(self, features: np.ndarray, indptr: np.ndarray, rows: np.ndarray):
+        self.features = features  # sorted distinct features
+        self.indptr = indptr  # feature i: rows[indptr[i]:indptr[i + 1]]
+        self.rows = rows
+
+    @classmethod
+    def build(cls, index: TfidfIndex, job_ids: List[str]) -> "FeatureRows":
+        matrix_rows = np.fromiter((index.row_of[job_id] for job_id in job_ids), dtype=np.int64, count=len(job_ids))
+        starts, ends = index.indptr[matrix_rows], index.indptr[matrix_rows + 1]
+        lengths = ends - starts
+        local_indptr = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.arange(local_indptr[-1]) + np.repeat(starts - local_indptr[:-1], lengths)
+        features = np.asarray(index.indices)[positions]
+        rows = np.repeat(np.arange(len(job_ids), dtype=np.int32), lengths)
+
+        order = np.argsort(features, kind="stable")
+        features, rows = features[order], rows[order]
+        distinct, firsts = np.unique(features, return_index=True)
+        return cls(distinct, np.append(firsts, len(features)), rows)
+
+    def lookup(self, features: np.ndarray) -> np.ndarray:
+        """Sorted, distinct rows holding any of the features"""
+        at = np.searchsorted(self.features, features)
+        found = at[(at < len(self.features)) & (self.features[np.minimum(at, len(self.features) - 1)] == features)]
+        if not len(found):
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate([self.rows[self.indptr[i]:self.indptr[i + 1]] for i in found]))
+
+
+class SkillJobIndex:
+    """Skill ID, embedding term, TF-IDF feature and job level rank -> catalog rows (one catalog version)"""
+
+    def __init__(self, by_skill: Dict[int, np.ndarray], by_term: Dict[str, np.ndarray],
+                 by_level: Dict[int, np.ndarray], term_counts: np.ndarray,
+                 by_feature: Optional[FeatureRows] = None):
+        self.by_skill = by_skill
+        self.by_term = by_term
+        self.by_level = by_level
+        self.term_counts = term_counts  # distinct embedding terms per row
+        self.by_feature = by_feature  # TF-IDF matcher only
+        self.num_rows = len(term_counts)
+
+    @classmethod
+    def build(cls, catalog, matcher) -> "SkillJobIndex":
+        by_skill: Dict[int, List[int]] = defaultdict(list)
+        by_term: Dict[str, List[int]] = defaultdict(list)
+        by_level: Dict[int, List[int]] = defaultdict(list)
+        term_counts = np.zeros(len(catalog.jobs), dtype=np.int32)
+        for row, job in enumerate(catalog.jobs):
+            priors = catalog.priors[job.job_id]
+            for skill_id in set(priors.requirement_ids):
+                by_skill[skill_id].append(row)
+            terms = set(matcher.embedding_terms(catalog.embeddings, job))
+            for term in terms:
+                by_term[term].append(row)
+            term_counts[row] = len(terms)
+            by_level[priors.job_level_rank].append(row)
+        by_feature = None
+        if isinstance(catalog.embeddings, TfidfIndex):
+            by_feature = FeatureRows.build(catalog.embeddings, catalog.jobs.job_ids)
+        return cls(_as_arrays(by_skill), _as_arrays(by_term), _as_arrays(by_level), term_counts, by_feature)
+
+    def rows(self, skill_ids: Iterable[int] = (), terms: Iterable[str] = (),
+             level_ranks: Iterable[int] = ()) -> np.ndarray:
+        """Sorted, distinct rows listed under any of the keys"""
+        empty = np.zeros(0, dtype=np.int32)
+        parts = [self.by_skill.get(skill_id, empty) for skill_id in skill_ids]
+        parts += [self.by_term.get(term, empty) for term in terms]
+        parts += [self.by_level.get(rank, empty) for rank in level_ranks]
+        if not parts:
+            return empty
+        return np.unique(np.concatenate(parts))
+
+
+def _as_arrays(index: Dict) -> Dict:
+    return {key: np.array(rows, dtype=np.int32) for key, rows in index.items()}
+
+
+# Built on the first simulation against each catalog version
+_index_lock = threading.Lock()
+_index_catalog = None
+_index: Optional[SkillJobIndex] = None
+
+
+def get_skill_index(catalog, matcher) -> SkillJobIndex:
+    """Index for this catalog snapshot, built once and reused until the catalog changes"""
+    global _index_catalog, _index
+    with _index_lock:
+        if _index_catalog is not catalog:
+            _index = SkillJobIndex.build(catalog, matcher)
+            _index_catalog = catalog
+            print(f"[SUCCESS] Indexed the jobs of {len(_index.by_skill)} skills (dataset v{catalog.version})")
+        return _index
+
+
+def hypothetical_profile(
+    profile: UserProfile,
+    add_skills: List[str],
+    remove_skills: List[str],
+    experience_level: Optional[str] = None
+) -> UserProfile:
+    """
+    Copy of the profile with the changes applied. Skills are compared on
+    canonical keys, so removing "nodejs" drops "Node.js"; skills already held
+    are not added twice.
+    """
+    normalizer = get_skill_normalizer()
+    removed = {normalizer.canonical_key(skill) for skill in remove_skills}
+    skills = [skill for skill in profile.skills if normalizer.canonical_key(skill) not in removed]
+    held = {normalizer.canonical_key(skill) for skill in skills}
+    for skill in add_skills:
+        key = normalizer.canonical_key(skill)
+        if key not in held and key not in removed:
+            skills.append(skill)
+            held.add(key)
+
+    update = {"skills": skills}
+    if experience_level:
+        update["experience_level"] = experience_level
+    return profile.model_copy(update=update)
+
+
+def affected_rows(index: SkillJobIndex, before: ProfileContext, after: ProfileContext, matcher) -> np.ndarray:
+    """Rows whose fit score can differ between the two profiles"""
+    normalizer = get_skill_normalizer()
+    changed_ids: Set[int] = before.skill_ids ^ after.skill_ids
+    # Skills outside the vocabulary have no ID but are still profile terms
+    terms = ({normalizer.canonical_key(skill) for skill in before.profile.skills}
+             ^ {normalizer.canonical_key(skill) for skill in after.profile.skills})
+
+    level_ranks: List[int] = []
+    if before.level_lower != after.level_lower:
+        # The level is also a profile keyword for the keyword matcher
+        terms.update((before.level_lower, after.level_lower))
+        level_ranks = [
+            rank for rank in index.by_level
+            if _rank_match(before.level_rank, rank) != _rank_match(after.level_rank, rank)
+        ]
+    rows = index.rows(changed_ids, terms, level_ranks)
+
+    if index.by_feature is not None:
+        before_features, before_values = matcher.create_user_embedding(before.profile)
+        after_features, after_values = matcher.create_user_embedding(after.profile)
+        if np.array_equal(before_features, after_features) and np.array_equal(before_values, after_values):
+            return rows
+        if not len(before_features) or not len(after_features):
+            # An empty profile vector scores every job 50, any other one scores them by cosine
+            return np.arange(index.num_rows, dtype=np.int32)
+        rows = np.union1d(rows, index.by_feature.lookup(np.union1d(before_features, after_features)))
+    return rows
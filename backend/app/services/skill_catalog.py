@@ -0,0 +1,205 @@
+"""
+Skill Learning Catalog
+Load-once lookup of learning estimates and resources for missing skills
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.models import SkillGap
+
+
+# Optional data file that extends (or overrides) the built-in catalog.
+# Format: [{"skill": "rust", "importance": "Medium", "learning_time": "2-3 months",
+#           "resources": ["The Rust Book"], "aliases": ["rustlang"]}, ...]
+SKILL_CATALOG_PATH = Path(__file__).parent.parent.parent / "data" / "skill_catalog.json"
+
+# Upper bound on memoized catalog lookups (one per distinct normalized skill)
+SKILL_GAP_CACHE_SIZE = 2048
+
+# Built-in catalog: skill -> (importance, learning time, resources, aliases)
+DEFAULT_SKILL_CATALOG = {
+    # Programming languages
+    'python': ('High', '2-3 months', ['Codecademy Python', 'Python.org Tutorial'], ['py']),
+    'javascript': ('High', '2-3 months', ['freeCodeCamp', 'JavaScript.info'], ['js', 'es6']),
+    'java': ('High', '3-4 months', ['Oracle Java Tutorials', 'Coursera Java'], []),
+    'typescript': ('Medium', '1-2 weeks', ['TypeScript Handbook', 'TypeScript Course'], ['ts']),
+
+    # Frameworks
+    'react': ('High', '1-2 months', ['React Docs', 'freeCodeCamp React'], ['react.js', 'reactjs']),
+    'node.js': ('High', '1-2 months', ['Node.js Docs', 'NodeSchool'], ['nodejs', 'node']),
+    'django': ('Medium', '3-4 weeks', ['Django Tutorial', 'Django for Beginners'], []),
+    'fastapi': ('Medium', '1-2 weeks', ['FastAPI Docs', 'FastAPI Tutorial'], []),
+
+    # Tools & Platforms
+    'docker': ('Medium', '2-3 weeks', ['Docker Getting Started', 'Docker Tutorial'], []),
+    'kubernetes': ('High', '1-2 months', ['Kubernetes Docs', 'Kubernetes Course'], ['k8s']),
+    'aws': ('High', '2-3 months', ['AWS Free Tier', 'AWS Training'], ['amazon web services']),
+    'git': ('Low', '1 week', ['Git Tutorial', 'Pro Git Book'], []),
+
+    # Databases
+    'sql': ('High', '3-4 weeks', ['SQLBolt', 'Mode Analytics SQL'], []),
+    'mongodb': ('Medium', '2-3 weeks', ['MongoDB University', 'MongoDB Docs'], ['mongo']),
+    'postgresql': ('Medium', '2-3 weeks', ['PostgreSQL Tutorial', 'PG Exercises'], ['postgres']),
+
+    # AI/ML
+    'machine learning': ('High', '3-6 months', ['Andrew Ng ML Course', 'fast.ai'], ['ml']),
+    'deep learning': ('High', '3-6 months', ['Deep Learning Specialization', 'fast.ai'], ['dl']),
+    'nlp': ('High', '2-3 months', ['NLP Course', 'Hugging Face Course'], ['natural language processing']),
+}
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SkillCatalog:
+    """Skill learning catalog with exact/alias lookup and a substring index"""
+
+    def __init__(self, entries: Dict[str, Tuple[str, str, List[str], List[str]]]):
+        # Category order matters: substring matches resolve to the first category
+        self.categories: List[str] = []
+        self.details: Dict[str, Tuple[str, str, List[str]]] = {}
+        self.exact: Dict[str, str] = {}
+
+        for skill, (importance, learning_time, resources, aliases) in entries.items():
+            category = skill.lower().strip()
+            if category not in self.details:
+                self.categories.append(category)
+            self.details[category] = (importance, learning_time, list(resources))
+            self.exact[category] = category
+            for alias in aliases:
+                self.exact.setdefault(alias.lower().strip(), category)
+
+        # Substring index: trigram -> positions of categories containing it.
+        # A category can only be a substring of a query (or vice versa) if
+        # one trigram set contains the other, so candidates are verified
+        # against a handful of entries instead of the whole catalog.
+        self._category_trigrams: List[Set[str]] = []
+        self._trigram_index: Dict[str, Set[int]] = {}
+        for position, category in enumerate(self.categories):
+            grams = _trigrams(category)
+            self._category_trigrams.append(grams)
+            for gram in grams:
+                self._trigram_index.setdefault(gram, set()).add(position)
+
+    def lookup(self, skill: str) -> Optional[str]:
+        """Return the catalog category for a skill, or None if unknown"""
+        skill_lower = skill.lower().strip()
+        if not skill_lower:
+            return None
+
+        category = self.exact.get(skill_lower)
+        if category is not None:
+            return category
+
+        return self._substring_lookup(skill_lower)
+
+    def _substring_lookup(self, skill_lower: str) -> Optional[str]:
+        query_grams = _trigrams(skill_lower)
+
+        if not query_grams:
+            # Too short to index - fall back to a scan
+            candidates = range(len(self.categories))
+        else:
+            # Categories sharing every trigram of the query (query in category)
+            shared = None
+            for gram in query_grams:
+                positions = self._trigram_index.get(gram, set())
+                shared = positions if shared is None else shared & positions
+                if not shared:
+                    break
+            candidates = set(shared or ())
+
+            # Categories whose trigrams all appear in the query (category in query)
+            hit_counts: Dict[int, int] = {}
+            for gram in query_grams:
+                for position in self._trigram_index.get(gram, ()):
+                    hit_counts[position] = hit_counts.get(position, 0) + 1
+            for position, hits in hit_counts.items():
+                if hits == len(self._category_trigrams[position]):
+                    candidates.add(position)
+
+            # Categories shorter than a trigram are never indexed
+            for position, grams in enumerate(self._category_trigrams):
+                if not grams:
+                    candidates.add(position)
+
+        for position in sorted(candidates):
+            category = self.categories[position]
+            if category in skill_lower or skill_lower in category:
+                return category
+        return None
+
+    def details_for(self, category: str) -> Tuple[str, str, List[str]]:
+        return self.details[category]
+
+
+def load_skill_catalog(path: Path = SKILL_CATALOG_PATH) -> SkillCatalog:
+    """Build the catalog from the built-in entries plus the optional data file"""
+    entries = dict(DEFAULT_SKILL_CATALOG)
+
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                extra = json.load(f)
+            for item in extra:
+                entries[item['skill'].lower().strip()] = (
+                    item.get('importance', 'Medium'),
+                    item.get('learning_time', '2-4 weeks'),
+                    item.get('resources', []),
+                    item.get('aliases', []),
+                )
+            print(f"[SUCCESS] Loaded {len(extra)} skill catalog entries from {path.name}")
+        except Exception as e:
+            print(f"[WARNING] Could not load skill catalog file: {e}")
+
+    return SkillCatalog(entries)
+
+
+# Global instance
+_catalog_instance = None
+
+def get_skill_catalog() -> SkillCatalog:
+    """Get or create the global skill catalog"""
+    global _catalog_instance
+    if _catalog_instance is None:
+        _catalog_instance = load_skill_catalog()
+    return _catalog_instance
+
+
+@lru_cache(maxsize=SKILL_GAP_CACHE_SIZE)
+def _skill_gap_details(skill_key: str) -> Optional[Tuple[str, str, Tuple[str, ...]]]:
+    """(importance, learning time, resources) of a normalized skill, None if not in the catalog"""
+    catalog = get_skill_catalog()
+    category = catalog.lookup(skill_key)
+    if category is None:
+        return None
+    importance, time, resources = catalog.details_for(category)
+    return importance, time, tuple(resources)
+
+
+def get_skill_gap(skill: str) -> SkillGap:
+    """
+    Return the SkillGap for a missing skill.
+    The catalog lookup is memoized per normalized skill ("Python", "python "
+    share one entry); every call gets its own SkillGap.
+    """
+    details = _skill_gap_details(skill.lower().strip())
+
+    if details:
+        importance, time, resources = details
+        resources = list(resources)
+    else:
+        # Default for unknown skills
+        importance = 'Medium'
+        time = '2-4 weeks'
+        resources = [f'Search "{skill}" courses on Coursera', f'YouTube "{skill}" tutorials']
+
+    return SkillGap(
+        skill=skill,
+        importance=importance,
+        estimated_learning_time=time,
+        resources=resources
+    )
@@ -0,0 +1,299 @@
+"""
+Skill Normalizer
+Maps raw skill strings ("Node.js", "NodeJS", "node") onto canonical skill IDs
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Normalized key -> canonical key, for spellings no string rule can merge
+SKILL_ALIASES = {
+    'node': 'nodejs',
+    'reactjs': 'react',
+    'expressjs': 'express',
+    'vue': 'vuejs',
+    'nextjs': 'next',
+    'js': 'javascript',
+    'es6': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'golang': 'go',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'amazonwebservices': 'aws',
+    'amazonwebserver': 'aws',
+    'googlecloudplatform': 'gcp',
+    'googlecloud': 'gcp',
+    'ml': 'machinelearning',
+    'dl': 'deeplearning',
+    'ai': 'artificialintelligence',
+    'naturallanguageprocessing': 'nlp',
+    'rest': 'restapi',
+    'restful': 'restapi',
+    'restfulapi': 'restapi',
+    'restapis': 'restapi',
+    'apis': 'api',
+    'html5': 'html',
+    'css3': 'css',
+    'msexcel': 'excel',
+    'microsoftexcel': 'excel',
+    'scikit': 'scikitlearn',
+    'sklearn': 'scikitlearn',
+}
+
+# Fuzzy (trigram) matches must be at least this similar, and only for longer keys
+FUZZY_THRESHOLD = 0.8
+FUZZY_MIN_LENGTH = 5
+
+_PAREN_RE = re.compile(r"^(.*?)\s*\(([^)]*)\)\s*$")
+_VERSION_RE = re.compile(r"\s+v?\d+(\.\d+)*$")
+_KEY_STRIP_RE = re.compile(r"[^a-z0-9+#]")
+_GENERIC_SUFFIXES = (' programming', ' language')
+
+# Skill ID of profile skills outside the vocabulary; never equal to a job skill's ID
+UNKNOWN_SKILL = -1
+
+
+def normalize_key(raw: str) -> str:
+    """Lowercase, drop version numbers, generic suffixes and punctuation"""
+    text = raw.lower().strip()
+    text = _VERSION_RE.sub("", text)
+    for suffix in _GENERIC_SUFFIXES:
+        if text.endswith(suffix) and len(text) > len(suffix):
+            text = text[:-len(suffix)]
+    return _KEY_STRIP_RE.sub("", text)
+
+
+def alias_key(raw: str) -> str:
+    """normalize_key() folded through the alias table ("Node.js" and "node" -> "nodejs")"""
+    key = normalize_key(raw)
+    return SKILL_ALIASES.get(key, key)
+
+
+def skill_keys(raw: str) -> List[str]:
+    """
+    All keys a raw skill should answer to. "Amazon Web Services (AWS)"
+    yields both the name and the abbreviation; other parentheticals
+    ("English Proficiency (Spoken)") stay part of the key.
+    """
+    match = _PAREN_RE.match(raw.strip())
+    if match:
+        name, inner = match.group(1), match.group(2).strip()
+        if inner and len(inner) <= 6 and inner.replace('.', '').isupper():
+            return [key for key in (normalize_key(name), normalize_key(inner)) if key]
+    key = normalize_key(raw)
+    return [key] if key else []
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Character-trigram postings for fuzzy lookup over a set of keys"""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.grams: List[Set[str]] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    def add(self, key: str) -> int:
+        position = len(self.keys)
+        grams = _trigrams(key)
+        self.keys.append(key)
+        self.grams.append(grams)
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(position)
+        return position
+
+    def search(self, key: str, top_k: int = 3, min_score: float = 0.0) -> List[Tuple[int, float]]:
+        """(position, Jaccard score) of the most similar keys"""
+        grams = _trigrams(key)
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for position in self.postings.get(gram, ()):
+                overlap[position] = overlap.get(position, 0) + 1
+
+        scored = []
+        for position, shared in overlap.items():
+            score = shared / (len(grams) + len(self.grams[position]) - shared)
+            if score >= min_score:
+                scored.append((position, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:top_k]
+
+
+class SkillNormalizer:
+    """Canonical skill vocabulary with an alias table and a trigram index"""
+
+    def __init__(self):
+        self.names: List[str] = []  # skill ID -> display name
+        self.canonical_keys: List[str] = []  # skill ID -> canonical key
+        self.id_by_key: Dict[str, int] = {}
+        self.trigrams = TrigramIndex()
+        self._trigram_ids: List[int] = []  # trigram position -> skill ID
+        self._memo: Dict[str, int] = {}  # raw string -> skill ID
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getstate__(self):
+        # Sent to worker processes with the catalog; the lock stays behind
+        state = dict(self.__dict__)
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def build(self, raw_skills: Iterable[str]) -> None:
+        """
+        Add a vocabulary (e.g. every job skill). Vocabulary strings are merged
+        by key and alias only - fuzzy matching is reserved for lookups of
+        strings from outside the vocabulary, such as profile skills.
+        """
+        unique = dict.fromkeys(s.strip() for s in raw_skills if s and s.strip())
+        with self._lock:
+            for raw in unique:
+                skill_id = self._resolve(raw, fuzzy=False)
+                if skill_id is None:
+                    skill_id = self._create(raw)
+                self._memo[raw] = skill_id
+
+    def export_vocabulary(self) -> Dict[str, object]:
+        """Names in skill ID order and the raw string -> ID memo (see attach_vocabulary)"""
+        with self._lock:
+            return {"names": list(self.names), "memo": dict(self._memo)}
+
+    def attach_vocabulary(self, vocabulary: Dict[str, object]) -> None:
+        """
+        Take over a vocabulary exported by another process, so skill IDs agree
+        with the priors it published. IDs are only appended, so a vocabulary
+        that already holds an older export is extended in place.
+        """
+        names = vocabulary["names"]
+        with self._lock:
+            if self.names != names[:len(self.names)]:
+                print("[WARNING] Skill vocabulary differs from the published one, replacing it")
+                self.names, self.canonical_keys, self.id_by_key = [], [], {}
+                self.trigrams, self._trigram_ids, self._memo = TrigramIndex(), [], {}
+            # Names are stripped raw strings: creating them again yields the same keys and IDs
+            for raw in names[len(self.names):]:
+                self._create(raw)
+            self._memo.update(vocabulary["memo"])
+
+    def canonical_id(self, raw: str, add: bool = True) -> Optional[int]:
+        """
+        Skill ID for a raw string; unknown skills get a new ID unless add=False.
+        Only the catalog (job skills) should add - profile skills are looked up.
+        """
+        skill_id = self._memo.get(raw)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._resolve(raw, fuzzy=True)
+            if skill_id is None:
+                if not add:
+                    return None
+                skill_id = self._create(raw)
+            self._memo[raw] = skill_id
+        return skill_id
+
+    def canonical_ids(self, raw_skills: Iterable[str], add: bool = True) -> List[int]:
+        """
+        Skill IDs for a list of raw strings (same order, one per input). With
+        add=False, strings outside the vocabulary get UNKNOWN_SKILL.
+        """
+        memo = self._memo
+        ids = []
+        for raw in raw_skills:
+            skill_id = memo.get(raw)
+            if skill_id is None:
+                skill_id = self.canonical_id(raw, add)
+            ids.append(UNKNOWN_SKILL if skill_id is None else skill_id)
+        return ids
+
+    def canonical_key(self, raw: str) -> str:
+        """Canonical key of a raw string, whether or not it is in the vocabulary"""
+        skill_id = self.canonical_id(raw, add=False)
+        if skill_id is not None:
+            return self.canonical_keys[skill_id]
+        return _new_canonical_key(raw)
+
+    def name(self, skill_id: int) -> str:
+        return self.names[skill_id]
+
+    def key(self, skill_id: int) -> str:
+        return self.canonical_keys[skill_id]
+
+    def similar(self, raw: str, top_k: int = 3) -> List[int]:
+        """Skill IDs most similar to a raw string (trigram Jaccard)"""
+        skill_id = self.canonical_id(raw, add=False)
+        results = [skill_id] if skill_id is not None else []
+        for key in skill_keys(raw):
+            for position, _ in self.trigrams.search(key, top_k + 1):
+                candidate = self._trigram_ids[position]
+                if candidate not in results:
+                    results.append(candidate)
+        return results[:top_k]
+
+    def _resolve(self, raw: str, fuzzy: bool) -> Optional[int]:
+        keys = skill_keys(raw)
+        for key in keys:
+            for candidate in (key, SKILL_ALIASES.get(key)):
+                if candidate is None:
+                    continue
+                if candidate in self.id_by_key:
+                    return self.id_by_key[candidate]
+                # Plurals: "REST APIs" vs "REST API"
+                if len(candidate) > 4:
+                    for variant in (candidate[:-1] if candidate.endswith('s') else None,
+                                    candidate + 's'):
+                        if variant and variant in self.id_by_key:
+                            return self.id_by_key[variant]
+
+        if fuzzy:
+            for key in keys:
+                if len(key) < FUZZY_MIN_LENGTH:
+                    continue
+                matches = self.trigrams.search(key, 1, FUZZY_THRESHOLD)
+                if matches:
+                    return self._trigram_ids[matches[0][0]]
+        return None
+
+    def _create(self, raw: str) -> int:
+        keys = skill_keys(raw) or [raw.lower().strip()]
+        canonical = _new_canonical_key(raw)
+
+        skill_id = len(self.names)
+        self.names.append(raw.strip())
+        self.canonical_keys.append(canonical)
+        for key in [canonical] + keys:
+            if key not in self.id_by_key:
+                self.id_by_key[key] = skill_id
+                self.trigrams.add(key)
+                self._trigram_ids.append(skill_id)
+        return skill_id
+
+
+def _new_canonical_key(raw: str) -> str:
+    """Canonical key a new vocabulary entry for the raw string gets"""
+    keys = skill_keys(raw) or [raw.lower().strip()]
+    return SKILL_ALIASES.get(keys[0], keys[0])
+
+
+# Global instance
+_normalizer_instance = None
+
+def get_skill_normalizer() -> SkillNormalizer:
+    """Get or create the global skill normalizer"""
+    global _normalizer_instance
+    if _normalizer_instance is None:
+        _normalizer_instance = SkillNormalizer()
+    return _normalizer_instance
@@ -0,0 +1,488 @@
+"""
+Vector Job Matching
+Feature-hashed TF-IDF vectors over the full job and profile text (offline, NumPy only)
+"""
+import copy
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import ANN_CANDIDATES, ANN_MIN_JOBS, ANN_NPROBE
+from app.models import UserProfile, Job
+from app.services.ann import CountSketch, IVFIndex
+from app.services.job_table import JobTable
+from app.services.metrics import count_embedding_lookups
+from app.services.matching import KeywordMatcher
+from app.services.skill_normalizer import get_skill_normalizer
+
+
+# 2^18 hashed features: collisions are rare at this vocabulary size
+NUM_FEATURES = 1 << 18
+
+# Title/skill terms count this many times a free-text occurrence (before the sublinear TF)
+TITLE_WEIGHT = 3.0
+SKILL_WEIGHT = 3.0
+
+# Cosine similarity at which the semantic score saturates at 100
+COSINE_SATURATION = 0.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.js)?")
+_STOPWORDS = frozenset("""
+    a an and are as at be been but by can for from has have i in into is it its
+    my of on or our so such that the their them they this to was we were will
+    with you your who what when where which while about also more most other
+    over than then there these those through very work working job role team
+""".split())
+
+# (feature indices, L2-normalized values) of one document
+SparseVector = Tuple[np.ndarray, np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters"""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+_feature_cache: Dict[str, int] = {}
+
+
+def _feature(token: str) -> int:
+    feature = _feature_cache.get(token)
+    if feature is None:
+        feature = _feature_cache[token] = zlib.crc32(token.encode("utf-8")) & (NUM_FEATURES - 1)
+    return feature
+
+
+class TfidfIndex:
+    """
+    Snapshot of the indexed jobs: L2-normalized CSR rows, the row <-> job_id
+    maps and the optional ANN index. A published index is never modified;
+    TfidfMatcher.update_index() returns a new one that shares the unchanged
+    parts (copy-on-write). Also serves as the job_id -> vector embedding cache.
+    """
+
+    def __init__(self, idf: np.ndarray, job_ids: List[Optional[str]], indptr: np.ndarray,
+                 indices: np.ndarray, data: np.ndarray, row_of: Dict[str, int],
+                 ann: Optional[IVFIndex] = None, sketch: Optional[CountSketch] = None,
+                 catalog_jobs: Optional[JobTable] = None):
+        self.idf = idf
+        self.job_ids = job_ids  # matrix row -> job_id (None for deleted rows)
+        self.row_of = row_of  # job_id -> live matrix row
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.ann = ann
+        self.sketch = sketch
+        # The job list this index was built for, so rank_jobs can skip filtering
+        self.catalog_jobs = catalog_jobs
+
+    @classmethod
+    def empty(cls) -> "TfidfIndex":
+        return cls(np.ones(NUM_FEATURES, dtype=np.float32), [], np.zeros(1, dtype=np.int64),
+                   np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32), {})
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def __len__(self) -> int:
+        return len(self.row_of)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self.row_of
+
+    def __getitem__(self, job_id: str) -> SparseVector:
+        return self.row_vector(self.row_of[job_id])
+
+    def get(self, job_id: str, default=None):
+        row = self.row_of.get(job_id)
+        return default if row is None else self.row_vector(row)
+
+    def row_vector(self, row: int) -> SparseVector:
+        """View of one stored job vector"""
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def score_all(self, user_vector: SparseVector) -> np.ndarray:
+        """Cosine similarity of the user vector with every matrix row (CSR mat-vec)"""
+        return _row_sums(self.indptr, self.data * _dense_query(user_vector)[self.indices])
+
+    def score_rows(self, user_vector: SparseVector, rows: np.ndarray) -> np.ndarray:
+        """Exact cosine similarity of the user vector with the given rows only"""
+        query = _dense_query(user_vector)
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        local_indptr = np.concatenate(([0], np.cumsum(lengths)))
+        # Positions of every stored value of the selected rows
+        positions = np.arange(local_indptr[-1]) + np.repeat(starts - local_indptr[:-1], lengths)
+        return _row_sums(local_indptr, self.data[positions] * query[self.indices[positions]])
+
+    def candidate_rows(self, user_vector: SparseVector, nprobe: Optional[int] = None) -> np.ndarray:
+        """Matrix rows in the IVF lists closest to a user vector"""
+        return self.ann.candidates(self.sketch.project(*user_vector), nprobe)
+
+    def top_rows(self, user_vector: SparseVector, top_n: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """ANN retrieval plus exact rescoring: (rows, cosines) of the best top_n, best first"""
+        rows = self.candidate_rows(user_vector, nprobe)
+        cosines = self.score_rows(user_vector, rows)
+        if len(rows) > top_n:
+            best = np.argpartition(-cosines, top_n - 1)[:top_n]
+            rows, cosines = rows[best], cosines[best]
+        order = np.argsort(-cosines, kind="stable")
+        return rows[order], cosines[order]
+
+
+class TfidfMatcher(KeywordMatcher):
+    """
+    Job matching on hashed TF-IDF vectors. Job vectors are kept as rows of an
+    L2-normalized CSR matrix, so ranking a profile is one sparse mat-vec product.
+    On large catalogs an IVF index picks the jobs that lead the ranking: the
+    best ANN_CANDIDATES of the closest clusters, best first. Every other job
+    follows them, and every job keeps its exact score, so decisions, counts
+    and stats are the same as with an exact scan; only the order can differ.
+    """
+
+    # Rebuild the matrix once more than this share of its rows are deleted
+    MAX_DEAD_ROW_SHARE = 0.5
+
+    def __init__(self, ann_candidates: int = ANN_CANDIDATES, ann_min_jobs: int = ANN_MIN_JOBS,
+                 ann_nprobe: int = ANN_NPROBE):
+        super().__init__()
+        self.ann_candidates = ann_candidates
+        self.ann_min_jobs = ann_min_jobs
+        self.ann_nprobe = ann_nprobe
+        self.index = TfidfIndex.empty()  # latest published index
+
+    def index_jobs(self, jobs: List[Job]) -> TfidfIndex:
+        """Fit IDF on the jobs and build a fresh index"""
+        counts = [self._job_counts(job) for job in jobs]
+
+        document_frequency = np.zeros(NUM_FEATURES, dtype=np.float64)
+        for features, _ in counts:
+            document_frequency[features] += 1
+        # Smoothed IDF, as in scikit-learn
+        idf = (np.log((1 + len(jobs)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        vectors = [_weigh(features, values, idf) for features, values in counts]
+        self.index = self._build_index(idf, [job.job_id for job in jobs], vectors, jobs)
+        return self.index
+
+    def update_index(self, index: TfidfIndex, jobs: List[Job], upserts: List[Job],
+                     deleted_ids: List[str]) -> TfidfIndex:
+        """
+        New index with `upserts` added or replaced and `deleted_ids` removed;
+        `index` itself is left untouched. `jobs` is the updated job list.
+        IDF stays as fitted at the last full build.
+        """
+        gone = set(deleted_ids) | {job.job_id for job in upserts}
+        dead_rows = sorted(index.row_of[job_id] for job_id in gone if job_id in index.row_of)
+        vectors = [_weigh(*self._job_counts(job), index.idf) for job in upserts]
+
+        dead_share = (index.num_rows - len(index.row_of) + len(dead_rows)) / max(index.num_rows + len(upserts), 1)
+        if dead_share > self.MAX_DEAD_ROW_SHARE:
+            # Compact: rebuild from live rows, reusing the stored vectors
+            live_rows = [row for job_id, row in index.row_of.items() if job_id not in gone]
+            self.index = self._build_index(
+                index.idf,
+                [index.job_ids[row] for row in live_rows] + [job.job_id for job in upserts],
+                [index.row_vector(row) for row in live_rows] + vectors,
+                jobs, index.sketch
+            )
+            return self.index
+
+        lengths = np.fromiter((len(features) for features, _ in vectors), dtype=np.int64, count=len(vectors))
+        indptr = np.concatenate((index.indptr, index.indptr[-1] + np.cumsum(lengths)))
+        indices = np.concatenate([index.indices] + [features for features, _ in vectors])
+        data = np.concatenate([index.data] + [values for _, values in vectors])
+
+        job_ids = list(index.job_ids)
+        row_of = dict(index.row_of)
+        for row in dead_rows:
+            del row_of[job_ids[row]]
+            job_ids[row] = None
+        new_rows = np.arange(index.num_rows, index.num_rows + len(upserts))
+        for row, job in zip(new_rows, upserts):
+            job_ids.append(job.job_id)
+            row_of[job.job_id] = int(row)
+
+        ann, sketch = index.ann, index.sketch
+        if ann is not None:
+            ann = ann.copy()
+            ann.remove(np.asarray(dead_rows, dtype=np.int64))
+            if len(upserts):
+                new_indptr = indptr[index.num_rows:] - indptr[index.num_rows]
+                lo = indptr[index.num_rows]
+                ann.add(new_rows, sketch.project_rows(new_indptr, indices[lo:], data[lo:]))
+
+        self.index = TfidfIndex(index.idf, job_ids, indptr, indices, data, row_of, ann, sketch, jobs)
+        if ann is None:
+            self._build_ann(self.index)
+        return self.index
+
+    def export_index(self, index: TfidfIndex, jobs: List[Job]) -> Dict[str, np.ndarray]:
+        """Arrays for publishing the index, compacted so that row i is jobs[i]"""
+        rows = np.fromiter((index.row_of[job.job_id] for job in jobs), dtype=np.int64, count=len(jobs))
+        starts, ends = index.indptr[rows], index.indptr[rows + 1]
+        lengths = ends - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.arange(indptr[-1]) + np.repeat(starts - indptr[:-1], lengths)
+
+        arrays = {
+            "idf": index.idf,
+            "indptr": indptr,
+            "indices": index.indices[positions],
+            "data": index.data[positions],
+        }
+        if index.ann is not None:
+            key_map = np.full(index.num_rows, -1, dtype=np.int64)
+            key_map[rows] = np.arange(len(rows))
+            arrays.update(index.ann.export(key_map))
+        return arrays
+
+    def attach_index(self, arrays: Dict[str, np.ndarray], jobs: JobTable) -> TfidfIndex:
+        """Index over published arrays (typically read-only memory maps), without copying them"""
+        ann = None
+        if "ann_centroids" in arrays:
+            ann = IVFIndex.from_arrays(arrays, self.ann_nprobe)
+        job_ids = [job.job_id for job in jobs]
+        self.index = TfidfIndex(
+            arrays["idf"], job_ids, arrays["indptr"], arrays["indices"], arrays["data"],
+            {job_id: row for row, job_id in enumerate(job_ids)},
+            ann=ann, sketch=CountSketch(NUM_FEATURES) if ann is not None else None,
+            catalog_jobs=jobs,
+        )
+        return self.index
+
+    def shard_index(self, index: TfidfIndex, jobs: JobTable) -> Tuple["TfidfMatcher", TfidfIndex]:
+        """
+        Matcher and index for a worker that ranks `jobs` only (a catalog shard):
+        their rows, with the IDF of the full index, so scores are unchanged.
+        Exact scan - a shard is small enough not to need the ANN index.
+        """
+        job_ids = [job.job_id for job in jobs if job.job_id in index.row_of]
+        rows = np.fromiter((index.row_of[job_id] for job_id in job_ids), dtype=np.int64, count=len(job_ids))
+        starts, ends = index.indptr[rows], index.indptr[rows + 1]
+        lengths = ends - starts
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        positions = np.arange(indptr[-1]) + np.repeat(starts - indptr[:-1], lengths)
+
+        shard = TfidfIndex(
+            index.idf, job_ids, indptr, index.indices[positions], index.data[positions],
+            {job_id: row for row, job_id in enumerate(job_ids)}, catalog_jobs=jobs,
+        )
+        matcher = copy.copy(self)
+        matcher.index = shard
+        return matcher, shard
+
+    def _build_index(self, idf: np.ndarray, row_job_ids: List[str], vectors: List[SparseVector],
+                     catalog_jobs: JobTable, sketch: Optional[CountSketch] = None) -> TfidfIndex:
+        lengths = np.fromiter((len(features) for features, _ in vectors), dtype=np.int64, count=len(vectors))
+        index = TfidfIndex(
+            idf, row_job_ids,
+            np.concatenate(([0], np.cumsum(lengths))),
+            np.concatenate([f for f, _ in vectors] or [np.zeros(0, dtype=np.int32)]),
+            np.concatenate([v for _, v in vectors] or [np.zeros(0, dtype=np.float32)]),
+            {job_id: row for row, job_id in enumerate(row_job_ids)},
+            sketch=sketch, catalog_jobs=catalog_jobs,
+        )
+        self._build_ann(index)
+        return index
+
+    def _build_ann(self, index: TfidfIndex):
+        """Build the IVF index over a not-yet-published index when ANN retrieval is enabled"""
+        if self.ann_candidates <= 0 or len(index) < max(self.ann_min_jobs, 1):
+            return
+        index.sketch = index.sketch or CountSketch(NUM_FEATURES)
+        rows = np.fromiter(index.row_of.values(), dtype=np.int64, count=len(index.row_of))
+        sketches = index.sketch.project_rows(index.indptr, index.indices, index.data)
+        index.ann = IVFIndex(nprobe=self.ann_nprobe)
+        index.ann.add(rows, sketches[rows])
+        print(f"[SUCCESS] Built ANN index ({index.ann.nlist} lists, nprobe={self.ann_nprobe})")
+
+    def create_user_embedding(self, profile: UserProfile) -> SparseVector:
+        """Weighted TF-IDF vector over the whole profile"""
+        return self.terms_embedding(self.user_terms(profile))
+
+    def user_terms(self, profile: UserProfile) -> Dict[str, float]:
+        """Weighted term counts of the profile, before hashing and TF-IDF"""
+        texts = [profile.about_me or "", profile.resume_text or "", profile.career_goals or ""]
+        for project in profile.projects:
+            texts.extend([project.title, project.description, " ".join(project.technologies)])
+        for experience in profile.work_experience:
+            texts.extend([experience.position, experience.description, " ".join(experience.skills_used)])
+            texts.extend(experience.responsibilities)
+        for course in profile.courses:
+            texts.extend(course.skills_learned)
+        for certification in profile.certifications:
+            texts.append(certification.name)
+        terms = Counter(tokenize(" ".join(texts)))
+
+        normalizer = get_skill_normalizer()
+        for skill in profile.skills:
+            _add_terms(terms, [normalizer.canonical_key(skill)], SKILL_WEIGHT)
+        for role in profile.preferred_roles:
+            _add_terms(terms, tokenize(role), TITLE_WEIGHT)
+        return terms
+
+    def terms_embedding(self, terms: Dict[str, float]) -> SparseVector:
+        return _weigh(*_hash_terms(terms), self.index.idf)
+
+    def with_skill(self, terms: Dict[str, float], skill_id: int) -> SparseVector:
+        """Embedding of the profile terms with one more skill"""
+        terms = dict(terms)
+        _add_terms(terms, [get_skill_normalizer().key(skill_id)], SKILL_WEIGHT)
+        return self.terms_embedding(terms)
+
+    def skill_feature(self, skill_id: int) -> int:
+        """Hashed feature of a skill's key (the one with_skill changes)"""
+        return _feature(get_skill_normalizer().key(skill_id))
+
+    def create_job_embedding(self, job: Job) -> SparseVector:
+        """TF-IDF vector of one job (stored row if the job is indexed)"""
+        vector = self.index.get(job.job_id)
+        if vector is not None:
+            return vector
+        return _weigh(*self._job_counts(job), self.index.idf)
+
+    def embedding_terms(self, index: TfidfIndex, job: Job) -> List[str]:
+        """Tokens and skill keys of a job, before hashing (what-if simulation)"""
+        normalizer = get_skill_normalizer()
+        terms = set(tokenize(job.normalized_description))
+        terms.update(tokenize(job.normalized_title))
+        terms.update(normalizer.key(skill_id) for skill_id in normalizer.canonical_ids(job.normalized_skills))
+        return list(terms)
+
+    def calculate_similarity(self, user_vector: SparseVector, job_vector: SparseVector) -> float:
+        """Cosine similarity of two vectors, on the same 40-100 scale as KeywordMatcher"""
+        user_features, user_values = user_vector
+        job_features, job_values = job_vector
+        if len(user_features) == 0 or len(job_features) == 0:
+            return 50.0
+
+        _, user_pos, job_pos = np.intersect1d(user_features, job_features, assume_unique=True, return_indices=True)
+        cosine = float(np.dot(user_values[user_pos], job_values[job_pos]))
+        return _cosine_to_score(cosine)
+
+    def rank_jobs(self, profile: UserProfile, jobs: List[Job], job_embeddings: TfidfIndex = None) -> List[Tuple[Job, float]]:
+        """Rank jobs by TF-IDF cosine similarity to the user profile"""
+        index = job_embeddings if isinstance(job_embeddings, TfidfIndex) else self.index
+        user_vector = self.create_user_embedding(profile)
+        if len(user_vector[0]) == 0:
+            return [(job, 50.0) for job in jobs]
+
+        if index.ann is not None:
+            return self._rank_candidates(index, user_vector, jobs)
+
+        cosines = index.score_all(user_vector)
+        job_scores = []
+        misses = 0
+        for job in jobs:
+            row = index.row_of.get(job.job_id)
+            if row is not None:
+                score = _cosine_to_score(cosines[row])
+            else:
+                score = self.calculate_similarity(user_vector, self.create_job_embedding(job))
+                misses += 1
+            job_scores.append((job, score))
+        count_embedding_lookups(len(jobs), misses)
+
+        job_scores.sort(key=lambda x: x[1], reverse=True)
+        return job_scores
+
+    def _rank_candidates(self, index: TfidfIndex, user_vector: SparseVector, jobs: List[Job]) -> List[Tuple[Job, float]]:
+        """
+        ANN retrieval picks the candidates in `jobs` that come first, best first.
+        The other jobs follow, best first; every job gets its exact score.
+        """
+        if jobs is index.catalog_jobs and isinstance(jobs, JobTable):
+            allowed = None
+            lookup = jobs.by_id
+        else:
+            allowed = lookup = {job.job_id: job for job in jobs}
+
+        rows = index.candidate_rows(user_vector)
+        if allowed is not None and len(rows):
+            rows = rows[[index.job_ids[row] in allowed for row in rows]]
+
+        cosines = index.score_all(user_vector)
+        if len(rows) > self.ann_candidates:
+            rows = rows[np.argpartition(-cosines[rows], self.ann_candidates - 1)[:self.ann_candidates]]
+        rows = rows[np.argsort(-cosines[rows], kind="stable")]
+        head = [(lookup[index.job_ids[row]], _cosine_to_score(cosines[row])) for row in rows]
+
+        leading = {index.job_ids[row] for row in rows}
+        tail = []
+        misses = 0
+        for job in jobs:
+            if job.job_id in leading:
+                continue
+            row = index.row_of.get(job.job_id)
+            if row is not None:
+                score = _cosine_to_score(cosines[row])
+            else:
+                score = self.calculate_similarity(user_vector, self.create_job_embedding(job))
+                misses += 1
+            tail.append((job, score))
+        tail.sort(key=lambda x: x[1], reverse=True)
+        count_embedding_lookups(len(jobs), misses)
+        return head + tail
+
+    def _job_counts(self, job: Job) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed, field-weighted term counts of a job"""
+        terms = Counter(tokenize(job.normalized_description))
+        normalizer = get_skill_normalizer()
+        _add_terms(terms, tokenize(job.normalized_title), TITLE_WEIGHT)
+        for skill_id in normalizer.canonical_ids(job.normalized_skills):
+            _add_terms(terms, [normalizer.key(skill_id)], SKILL_WEIGHT)
+        return _hash_terms(terms)
+
+
+def _weigh(features: np.ndarray, counts: np.ndarray, idf: np.ndarray) -> SparseVector:
+    """Sublinear TF x IDF, L2-normalized"""
+    values = (1 + np.log(counts)).astype(np.float32) * idf[features]
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values /= norm
+    return features, values
+
+
+def _dense_query(user_vector: SparseVector) -> np.ndarray:
+    user_features, user_values = user_vector
+    query = np.zeros(NUM_FEATURES, dtype=np.float32)
+    query[user_features] = user_values
+    return query
+
+
+def _add_terms(terms: Dict[str, float], tokens: List[str], weight: float):
+    for token in tokens:
+        terms[token] = terms.get(token, 0.0) + weight
+
+
+def _hash_terms(terms: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted unique feature indices and summed counts"""
+    if not terms:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    features = np.fromiter((_feature(token) for token in terms), dtype=np.int32, count=len(terms))
+    weights = np.fromiter(terms.values(), dtype=np.float32, count=len(terms))
+    unique, inverse = np.unique(features, return_inverse=True)
+    return unique.astype(np.int32), np.bincount(inverse, weights=weights).astype(np.float32)
+
+
+def _row_sums(indptr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Per-row sums of CSR-ordered values (empty rows sum to 0)"""
+    num_rows = len(indptr) - 1
+    if num_rows == 0:
+        return np.zeros(0, dtype=np.float64)
+    sums = np.add.reduceat(np.append(values, 0).astype(np.float64), np.minimum(indptr[:-1], len(values)))
+    sums[indptr[1:] == indptr[:-1]] = 0.0
+    return sums
+
+
+def _cosine_to_score(cosine: float) -> float:
+    return 40.0 + 60.0 * min(1.0, float(cosine) / COSINE_SATURATION)
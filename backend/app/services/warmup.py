@@ -0,0 +1,61 @@
+"""
+Startup Warmup
+Progress of the background task that loads and indexes the jobs after the
+server starts. The process answers liveness checks (/healthz) from the first
+moment; /readyz and the job endpoints wait for ready.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+# In order; JobCatalog.build reports skills..embeddings
+WARMUP_PHASES = ["starting", "matcher", "dataset", "skills", "duplicates", "priors", "embeddings", "ready"]
+
+
+class WarmupProgress:
+    """Current phase, time spent per finished phase, and the outcome"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.phase = "starting"
+        self.phase_started = time.perf_counter()
+        self.completed: List[Dict] = []
+        self.jobs_total = 0
+        self.ready_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()  # phases are reported from a worker thread
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def advance(self, phase: str):
+        """Close the current phase and start `phase`"""
+        with self._lock:
+            now = time.perf_counter()
+            self.completed.append({"phase": self.phase, "seconds": round(now - self.phase_started, 3)})
+            self.phase = phase
+            self.phase_started = now
+
+    def finish(self):
+        self.advance("ready")
+        self.ready_at = time.time()
+        print(f"[SUCCESS] Warmup finished in {self.ready_at - self.started_at:.1f}s")
+
+    def fail(self, error: Exception):
+        with self._lock:
+            self.error = f"{type(error).__name__}: {error}"
+        print(f"[WARNING] Warmup failed during '{self.phase}': {self.error}")
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            step = WARMUP_PHASES.index(self.phase) if self.phase in WARMUP_PHASES else 0
+            return {
+                "ready": self.ready,
+                "phase": self.phase,
+                "progress": round(step / (len(WARMUP_PHASES) - 1), 2),
+                "jobs_total": self.jobs_total,
+                "elapsed_seconds": round((self.ready_at or time.time()) - self.started_at, 3),
+                "completed_phases": list(self.completed),
+                "error": self.error,
+            }
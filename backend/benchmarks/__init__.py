@@ -0,0 +1 @@
+# Obliqo Benchmarks
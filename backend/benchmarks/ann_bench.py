@@ -0,0 +1,133 @@
+"""
+ANN retrieval vs. exact scan for the tfidf matcher: recall@50 and p95 latency
+
+Job vectors are drawn from a synthetic topic model and written straight into
+the matcher's CSR arrays (building a million pydantic Jobs would dominate the run).
+
+Usage (from backend/):
+    python -m benchmarks.ann_bench --sizes 100000 1000000 --nprobe 4 8 16 32
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.vector_matcher import NUM_FEATURES, TfidfIndex, TfidfMatcher, _row_sums, _weigh
+
+VOCABULARY = 50000
+TOPICS = 400
+TOPIC_WORDS = 300
+TOKENS_PER_JOB = 60
+TOKENS_PER_PROFILE = 40
+# Token mix: the primary topic (the role), a secondary topic and background words
+PRIMARY_SHARE = 0.65
+SECONDARY_SHARE = 0.15
+TOP_K = 50
+
+
+def _zipf_ranks(rng: np.random.RandomState, size: int, n: int) -> np.ndarray:
+    """Ranks in [0, n) with Zipf-like (1/rank) frequencies"""
+    weights = 1.0 / np.arange(1, n + 1)
+    cdf = np.cumsum(weights) / weights.sum()
+    return np.minimum(np.searchsorted(cdf, rng.random_sample(size)), n - 1)
+
+
+class TopicModel:
+    """Documents mix a primary and a secondary topic with Zipf-distributed background words"""
+
+    def __init__(self, seed: int = 11):
+        rng = np.random.RandomState(seed)
+        words = rng.choice(NUM_FEATURES, VOCABULARY, replace=False).astype(np.int32)
+        self.words = words
+        self.topic_words = words[rng.randint(0, VOCABULARY, size=(TOPICS, TOPIC_WORDS))]
+
+    def documents(self, rng: np.random.RandomState, count: int, tokens: int):
+        """Raw CSR term counts (indptr, features, counts) for `count` documents"""
+        topics = rng.randint(0, TOPICS, size=(count, 2))
+        doc = np.repeat(np.arange(count), tokens)
+        mix = rng.random_sample(count * tokens)
+        which = topics[doc, (mix >= PRIMARY_SHARE).astype(np.int64)]
+        features = self.topic_words[which, _zipf_ranks(rng, count * tokens, TOPIC_WORDS)]
+        background = mix >= PRIMARY_SHARE + SECONDARY_SHARE
+        features[background] = self.words[_zipf_ranks(rng, int(background.sum()), VOCABULARY)]
+
+        keys, counts = np.unique(doc.astype(np.int64) * NUM_FEATURES + features, return_counts=True)
+        lengths = np.bincount(keys // NUM_FEATURES, minlength=count)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        return indptr, (keys % NUM_FEATURES).astype(np.int32), counts.astype(np.float32)
+
+
+def build_matcher(size: int, nprobe: int, chunk: int = 100000) -> TfidfMatcher:
+    model = TopicModel()
+    rng = np.random.RandomState(size)
+    parts = [model.documents(rng, min(chunk, size - start), TOKENS_PER_JOB)
+             for start in range(0, size, chunk)]
+
+    indptr = [np.zeros(1, dtype=np.int64)]
+    for part_indptr, _, _ in parts:
+        indptr.append(part_indptr[1:] + indptr[-1][-1])
+    indptr = np.concatenate(indptr)
+    indices = np.concatenate([features for _, features, _ in parts])
+    counts = np.concatenate([counts for _, _, counts in parts])
+
+    matcher = TfidfMatcher(ann_candidates=TOP_K, ann_min_jobs=1, ann_nprobe=nprobe)
+    document_frequency = np.bincount(indices, minlength=NUM_FEATURES)
+    idf = (np.log((1 + size) / (1 + document_frequency)) + 1).astype(np.float32)
+    data = (1 + np.log(counts)) * idf[indices]
+    data /= np.sqrt(np.repeat(_row_sums(indptr, data * data), np.diff(indptr))).astype(np.float32)
+    matcher.index = TfidfIndex(idf, [None] * size, indptr, indices, data.astype(np.float32),
+                               {f"job_{row}": row for row in range(size)})
+    return matcher
+
+
+def profile_vectors(index: TfidfIndex, count: int):
+    indptr, features, counts = TopicModel().documents(np.random.RandomState(99), count, TOKENS_PER_PROFILE)
+    return [_weigh(features[indptr[i]:indptr[i + 1]], counts[indptr[i]:indptr[i + 1]], index.idf)
+            for i in range(count)]
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def run(size: int, nprobes, queries: int):
+    start = time.perf_counter()
+    matcher = build_matcher(size, nprobes[0])
+    matrix_seconds = time.perf_counter() - start
+    index = matcher.index
+    start = time.perf_counter()
+    matcher._build_ann(index)
+    ann_seconds = time.perf_counter() - start
+    print(f"{size:>8} jobs: matrix {matrix_seconds:6.1f}s, ANN build {ann_seconds:6.1f}s "
+          f"({index.ann.nlist} lists)")
+
+    profiles = profile_vectors(index, queries)
+    exact_top, exact_times = [], []
+    for vector in profiles:
+        start = time.perf_counter()
+        cosines = index.score_all(vector)
+        top = np.argpartition(-cosines, TOP_K - 1)[:TOP_K]
+        exact_times.append(time.perf_counter() - start)
+        exact_top.append(set(top.tolist()))
+    print(f"          exact scan:  p50 {percentile_ms(exact_times, 50):7.2f} ms  "
+          f"p95 {percentile_ms(exact_times, 95):7.2f} ms")
+
+    for nprobe in nprobes:
+        recalls, times = [], []
+        for vector, truth in zip(profiles, exact_top):
+            start = time.perf_counter()
+            rows, _ = index.top_rows(vector, TOP_K, nprobe)
+            times.append(time.perf_counter() - start)
+            recalls.append(len(truth.intersection(rows.tolist())) / TOP_K)
+        print(f"          nprobe={nprobe:<4} recall@{TOP_K} {np.mean(recalls):.3f}  "
+              f"p50 {percentile_ms(times, 50):7.2f} ms  p95 {percentile_ms(times, 95):7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.nprobe, args.queries)
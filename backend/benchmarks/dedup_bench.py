@@ -0,0 +1,67 @@
+"""
+Duplicate index timings on synthetic catalogs with known reposts
+
+Usage (from backend/):
+    python -m benchmarks.dedup_bench --sizes 10000 100000
+"""
+import argparse
+import random
+import time
+
+from app.models import Job
+from app.services.dedup import DuplicateIndex
+
+WORDS = (
+    "build maintain design develop test deploy monitor analyze improve support "
+    "web mobile backend frontend data cloud api service platform dashboard "
+    "python javascript react node sql docker aws kubernetes pipeline model "
+    "team customer product feature report research content marketing sales"
+).split()
+ROLES = ["Web Development", "Data Science", "Marketing", "Content Writing",
+         "Machine Learning", "Graphic Design", "Business Development", "Android App Development"]
+SUFFIXES = ["Intern", "Intern (Remote)", "Intern (Part time)"]
+
+
+def synthetic_jobs(count: int, repost_rate: float = 0.1, seed: int = 7):
+    """Random postings plus lightly edited reposts of earlier ones"""
+    rng = random.Random(seed)
+    companies = [f"Company {i}" for i in range(max(1, count // 20))]
+    jobs, reposts = [], 0
+
+    for i in range(count):
+        if jobs and rng.random() < repost_rate:
+            source = jobs[rng.randrange(len(jobs))]
+            words = source.Description.split()
+            # Small edit: swap a couple of words
+            for _ in range(2):
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+            jobs.append(Job(job_id=f"job_{i}", Company_Name=source.Company_Name,
+                            JobTitles=source.JobTitles, Description=" ".join(words)))
+            reposts += 1
+        else:
+            description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 140)))
+            jobs.append(Job(job_id=f"job_{i}", Company_Name=rng.choice(companies),
+                            JobTitles=f"{rng.choice(ROLES)} {rng.choice(SUFFIXES)}",
+                            Description=description))
+    return jobs, reposts
+
+
+def run(size: int):
+    jobs, reposts = synthetic_jobs(size)
+    index = DuplicateIndex()
+
+    start = time.perf_counter()
+    index.add(jobs)
+    elapsed = time.perf_counter() - start
+
+    found = sum(1 for job in jobs if index.duplicate_of(job.job_id))
+    print(f"{size:>8} jobs: {elapsed:7.2f}s  ({elapsed / size * 1e6:6.1f} us/job)  "
+          f"reposts planted={reposts} flagged={found}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size)
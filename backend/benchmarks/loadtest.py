@@ -0,0 +1,269 @@
+"""
+Load test: one app.main:app instance under increasing numbers of concurrent clients
+
+Starts uvicorn locally on a synthetic dataset of --size jobs (or --dataset),
+then runs closed-loop async clients at each --concurrency level for
+--duration seconds. Every client picks its next request from a weighted mix
+of profile saves, feed pages, job details, stats and CV uploads (the sample
+CVs in backend/uploads). Reports requests, errors, throughput and
+p50/p95/p99 latency per endpoint and level, as JSON and as a markdown table
+to diff across releases.
+
+Server settings come from the environment, as for a normal run, e.g.
+OBLIQO_RANKING_EXECUTOR=sharded python -m benchmarks.loadtest ...
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --size 10000 --concurrency 1 4 16 64 --duration 20
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000   # an already running server
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_jobs, synthetic_profiles
+
+BACKEND_DIR = Path(__file__).parent.parent
+SAMPLE_CV_DIR = BACKEND_DIR / "uploads"
+CV_TYPES = {".pdf": "application/pdf", ".doc": "application/msword",
+            ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
+
+ENDPOINTS = ["profile_save", "feed", "detail", "stats", "upload_cv"]
+DEFAULT_MIX = "profile_save=5,feed=50,detail=25,stats=15,upload_cv=5"
+PROFILES = 20
+FEED_PAGES = 5  # feed requests ask for one of the first FEED_PAGES pages
+FILTER_SHARE = 0.25  # ...and this share of them filter on a decision
+DECISIONS = ["Apply", "Wait", "Skip", "Avoid"]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint '{name.strip()}' in --mix (expected {', '.join(ENDPOINTS)})")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(dataset: Path, upload_dir: Path, port: int, log_path: Path) -> subprocess.Popen:
+    env = dict(os.environ, OBLIQO_DATASET_PATH=str(dataset), OBLIQO_UPLOAD_DIR=str(upload_dir))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=open(log_path, "wb"), stderr=subprocess.STDOUT
+    )
+
+
+async def wait_ready(client, server: Optional[subprocess.Popen], timeout: float):
+    """Poll /readyz until the catalog is loaded"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"Server exited with status {server.returncode}")
+        try:
+            response = await client.get("/readyz")
+            if response.status_code == 200:
+                return response.json()
+        except Exception:
+            pass  # not listening yet
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"Server not ready after {timeout:.0f}s")
+
+
+class Workload:
+    """What the clients send: profiles, sample CVs and the job IDs seen in feeds"""
+
+    def __init__(self, weights: Dict[str, float], seed: int):
+        self.names = list(weights)
+        self.weights = list(weights.values())
+        self.profiles = [profile.model_dump(mode="json") for profile in synthetic_profiles(PROFILES, seed)]
+        self.cvs = [(path.name, path.read_bytes(), CV_TYPES[path.suffix.lower()])
+                    for path in sorted(SAMPLE_CV_DIR.iterdir()) if path.suffix.lower() in CV_TYPES]
+        if not self.cvs and "upload_cv" in self.names:
+            print(f"[WARNING] No sample CVs in {SAMPLE_CV_DIR}, skipping upload_cv")
+            index = self.names.index("upload_cv")
+            del self.names[index], self.weights[index]
+        self.job_ids: List[str] = []
+
+    def remember_jobs(self, response):
+        if response.status_code == 200 and len(self.job_ids) < 1000:
+            self.job_ids.extend(match["job"]["job_id"] for match in response.json()["jobs"])
+
+    async def send(self, client, name: str, rng: random.Random):
+        if name == "profile_save":
+            return await client.post("/api/profile", json=rng.choice(self.profiles))
+        if name == "feed":
+            params = {"page": rng.randint(1, FEED_PAGES)}
+            if rng.random() < FILTER_SHARE:
+                params["decision_filter"] = rng.choice(DECISIONS)
+            response = await client.get("/api/jobs", params=params)
+            self.remember_jobs(response)
+            return response
+        if name == "detail":
+            return await client.get(f"/api/jobs/{rng.choice(self.job_ids)}")
+        if name == "stats":
+            return await client.get("/api/stats")
+        filename, content, content_type = rng.choice(self.cvs)
+        return await client.post("/api/upload-cv", files={"file": (filename, content, content_type)})
+
+
+async def run_level(base_url: str, workload: Workload, concurrency: int, duration: float,
+                    timeout: float, seed: int) -> Dict[str, List[Tuple[float, bool]]]:
+    """(latency, ok) of every request per endpoint, with `concurrency` clients for `duration` seconds"""
+    import httpx
+
+    samples: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in workload.names}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+
+        async def client_loop(rng: random.Random):
+            while time.perf_counter() < deadline:
+                name = rng.choices(workload.names, workload.weights)[0]
+                start = time.perf_counter()
+                try:
+                    response = await workload.send(client, name, rng)
+                    ok = response.status_code < 400
+                except Exception:
+                    ok = False
+                samples[name].append((time.perf_counter() - start, ok))
+
+        await asyncio.gather(*(client_loop(random.Random(seed * 1000 + i)) for i in range(concurrency)))
+    return samples
+
+
+def summarize(samples: List[Tuple[float, bool]], duration: float) -> Dict:
+    latencies = [latency * 1000 for latency, ok in samples if ok]
+    row = {
+        "requests": len(samples),
+        "errors": len(samples) - len(latencies),
+        "throughput_rps": round(len(latencies) / duration, 2),
+    }
+    for q in (50, 95, 99):
+        row[f"p{q}_ms"] = round(float(np.percentile(latencies, q)), 1) if latencies else None
+    return row
+
+
+def markdown(report: Dict) -> str:
+    lines = [
+        f"Load test: {report['jobs']} jobs, {report['duration_seconds']:.0f}s per level, mix {report['mix']}",
+        "",
+        "| concurrency | endpoint | requests | errors | req/s | p50 ms | p95 ms | p99 ms |",
+        "|---:|---|---:|---:|---:|---:|---:|---:|",
+    ]
+    for level in report["levels"]:
+        for name, row in level["endpoints"].items():
+            cells = [level["concurrency"], name, row["requests"], row["errors"], row["throughput_rps"],
+                     row["p50_ms"], row["p95_ms"], row["p99_ms"]]
+            lines.append("| " + " | ".join("-" if cell is None else str(cell) for cell in cells) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+async def run(args, base_url: str, server: Optional[subprocess.Popen]) -> Dict:
+    import httpx
+
+    weights = parse_mix(args.mix)
+    workload = Workload(weights, args.seed)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+        status = await wait_ready(client, server, args.ready_timeout)
+        # A profile and some job IDs to ask details for
+        (await client.post("/api/profile", json=workload.profiles[0])).raise_for_status()
+        response = await client.get("/api/jobs", params={"page_size": 100})
+        response.raise_for_status()
+        workload.remember_jobs(response)
+    print(f"Server ready: {status['jobs_loaded']} jobs")
+
+    report = {
+        "jobs": status["jobs_loaded"],
+        "duration_seconds": args.duration,
+        "mix": ",".join(f"{name}={weight:g}" for name, weight in weights.items()),
+        "git": git_revision(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in sorted(os.environ.items()) if key.startswith("OBLIQO_")},
+        "levels": [],
+    }
+    for concurrency in args.concurrency:
+        samples = await run_level(base_url, workload, concurrency, args.duration, args.timeout, args.seed)
+        endpoints = {name: summarize(samples[name], args.duration) for name in workload.names}
+        endpoints["all"] = summarize([sample for name in workload.names for sample in samples[name]], args.duration)
+        report["levels"].append({"concurrency": concurrency, "endpoints": endpoints})
+        total = endpoints["all"]
+        print(f"  concurrency {concurrency:>4}: {total['throughput_rps']:8.1f} req/s  "
+              f"p50 {total['p50_ms']} ms  p99 {total['p99_ms']} ms  errors {total['errors']}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10000, help="synthetic jobs to serve")
+    parser.add_argument("--dataset", help="serve this dataset file instead of synthetic jobs")
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per request, seconds")
+    parser.add_argument("--ready-timeout", type=float, default=600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/loadtest.json")
+    parser.add_argument("--markdown", default="benchmarks/loadtest.md")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="obliqo-loadtest-") as workdir:
+        server = None
+        base_url = args.url
+        if base_url is None:
+            dataset = Path(args.dataset) if args.dataset else Path(workdir) / "jobs.json"
+            if not args.dataset:
+                jobs = synthetic_jobs(args.size, args.seed)
+                dataset.write_text(json.dumps([job.model_dump(mode="json") for job in jobs]))
+            port = free_port()
+            log_path = Path(workdir) / "server.log"
+            server = start_server(dataset, Path(workdir) / "uploads", port, log_path)
+            base_url = f"http://127.0.0.1:{port}"
+        try:
+            report = asyncio.run(run(args, base_url, server))
+        except BaseException:
+            if server is not None:
+                print(f"Server log:\n{log_path.read_text(errors='replace')[-4000:]}")
+            raise
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    Path(args.markdown).write_text(markdown(report))
+    print(f"Results: {args.output}, {args.markdown}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Memory report: bytes per job of the catalog's job storage, measured with
+tracemalloc on synthetic jobs
+
+Compares the jobs held as a list of Job models (the previous storage) with
+the columnar JobTable, and shows the per-job priors next to them. Each
+number is what stays allocated after the structure is built and garbage is
+collected, so the table includes the interned strings it keeps alive.
+
+Usage (from backend/):
+    python -m benchmarks.memory --size 100000
+    python -m benchmarks.memory --size 100000 --output benchmarks/memory.json
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+from benchmarks.synthetic import synthetic_jobs
+
+
+def traced(fn: Callable[[], object]) -> Tuple[object, int, float]:
+    """(result, bytes still allocated by fn once it returned, seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained, seconds
+
+
+def run(size: int, seed: int) -> Dict[str, Dict]:
+    from app.services.job_table import JobTable
+    from app.services.priors import build_job_priors
+    from app.services.skill_normalizer import get_skill_normalizer
+
+    results = {}
+
+    def record(name: str, retained: int, seconds: float):
+        results[name] = {"bytes_per_job": round(retained / size), "total_mb": round(retained / 2**20, 1),
+                         "build_seconds": round(seconds, 2)}
+        print(f"{name:<28}{retained / size:>10.0f} B/job{retained / 2**20:>10.1f} MB{seconds:>8.1f}s")
+
+    print(f"{'':<28}{'per job':>16}{'total':>13}{'build':>9}")
+    jobs, retained, seconds = traced(lambda: synthetic_jobs(size, seed))
+    record("job_models", retained, seconds)
+    del jobs
+
+    # Built from freshly generated jobs that are dropped afterwards, as in
+    # JobCatalog.build; the first iteration creates the row views
+    table, retained, seconds = traced(lambda: JobTable.from_jobs(synthetic_jobs(size, seed)))
+    _, views, _ = traced(lambda: table.rows)
+    record("job_table", retained + views, seconds)
+    results["job_table"]["columns_bytes_per_job"] = round(table.nbytes() / size)
+    results["job_table"]["row_views_bytes_per_job"] = round(views / size)
+
+    get_skill_normalizer().build(skill for job in table for skill in job.normalized_skills)
+    _, retained, seconds = traced(lambda: build_job_priors(table))
+    record("priors", retained, seconds)
+
+    saved = results["job_models"]["bytes_per_job"] - results["job_table"]["bytes_per_job"]
+    print(f"\nJob storage: {saved} B/job less "
+          f"({saved / results['job_models']['bytes_per_job']:.0%}), "
+          f"{saved * size / 2**20:.0f} MB at {size} jobs")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    print(f"Measuring {args.size} jobs")
+    results = run(args.size, args.seed)
+    if args.output:
+        Path(args.output).write_text(json.dumps({"size": args.size, "seed": args.seed, "results": results}, indent=2) + "\n")
+        print(f"[SUCCESS] Wrote results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
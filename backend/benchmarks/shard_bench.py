@@ -0,0 +1,92 @@
+"""
+Sharded scatter-gather ranking: feed/stats latency and scaling efficiency per shard count
+
+Ranks and scores the whole synthetic catalog for a series of profiles, once
+in-process (the "thread" executor's work) and then on the "sharded"
+executor with each shard count. Efficiency is the speedup over 1 shard
+divided by the shard count; counts above the number of CPUs can't scale.
+
+Usage (from backend/):
+    python -m benchmarks.shard_bench --size 100000 --shards 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_jobs, synthetic_profiles
+
+
+async def time_sharded(executor, catalog, contexts, rank_feed_shard, merge_feed_shards):
+    # Start the workers (each unpickles its shard) and warm them up
+    await executor.scatter(("warmup",), rank_feed_shard, merge_feed_shards, catalog, contexts[0], False)
+    samples = []
+    for i, profile_ctx in enumerate(contexts):
+        start = time.perf_counter()
+        await executor.scatter(("bench", i), rank_feed_shard, merge_feed_shards, catalog, profile_ctx, False)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--profiles", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    from app import main as app_main
+    from app.services.catalog import JobCatalog
+    from app.services.context import ProfileContext
+    from app.services.executor import RankingExecutor
+    from app.services.matching import get_matcher
+
+    catalog = JobCatalog.build(synthetic_jobs(args.size, args.seed), get_matcher())
+    contexts = [ProfileContext(profile) for profile in synthetic_profiles(args.profiles, args.seed)]
+    print(f"{args.size} jobs, {args.profiles} profiles, {os.cpu_count()} CPUs")
+
+    samples = []
+    for profile_ctx in contexts:
+        start = time.perf_counter()
+        app_main.compute_feed_snapshot(catalog, profile_ctx, False)
+        samples.append(time.perf_counter() - start)
+    in_process = float(np.median(samples))
+    print(f"  in-process        p50 {in_process * 1000:8.1f} ms")
+
+    p50s = {}
+    for count in sorted(set(args.shards)):
+        executor = RankingExecutor("sharded", shards=count)
+        try:
+            samples = asyncio.run(time_sharded(
+                executor, catalog, contexts, app_main.rank_feed_shard, app_main.merge_feed_shards
+            ))
+        finally:
+            executor.shutdown()
+        p50s[count] = (float(np.median(samples)), float(np.percentile(samples, 95)))
+
+    # Scaling relative to one shard (or to the in-process run when 1 isn't measured)
+    baseline = p50s[1][0] if 1 in p50s else in_process
+    results = {"size": args.size, "cpus": os.cpu_count(), "in_process_ms": round(in_process * 1000, 1), "shards": {}}
+    for count, (p50, p95) in p50s.items():
+        speedup = baseline / p50
+        results["shards"][count] = {
+            "p50_ms": round(p50 * 1000, 1),
+            "p95_ms": round(p95 * 1000, 1),
+            "speedup": round(speedup, 2),
+            "efficiency": round(speedup / count, 2),
+        }
+        print(f"  {count:>2} shard(s)       p50 {p50 * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  "
+              f"speedup {speedup:5.2f}x  efficiency {speedup / count:6.1%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmark suite: hot paths of the matching pipeline on synthetic catalogs
+
+Measures rank_jobs, calculate_fit_score, generate_explanation and
+create_job_match per catalog size, parse_cv on generated PDF/DOCX CVs, and
+GET /api/jobs end to end through an in-process ASGI client. Writes the
+results as JSON and, given a baseline, fails on regressions.
+
+Usage (from backend/):
+    python -m benchmarks.suite --sizes 1000 10000
+    python -m benchmarks.suite --sizes 1000 10000 --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 1000 10000 --save-baseline benchmarks/baseline.json
+
+Sizes up to 1000000 work, but building a 1M-job catalog needs several GB of RAM.
+Timings depend on the machine: compare against a baseline recorded on the same one.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_jobs, synthetic_profiles, write_cv_docx, write_cv_pdf
+
+PROFILES = 8
+SAMPLE_JOBS = 200  # per-job functions are timed over this many jobs per round
+DEFAULT_THRESHOLD = 0.2
+
+
+def measure(fn: Callable[[], object], per_round: int = 1, min_rounds: int = 3,
+            min_seconds: float = 1.0, max_rounds: int = 200) -> Dict:
+    """Run fn until both min_rounds and min_seconds are reached; ms per operation"""
+    gc.collect()
+    fn()  # warm-up (lazy imports, caches)
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_rounds and (len(samples) < min_rounds or time.perf_counter() - started < min_seconds):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000 / per_round)
+    return summarize(samples)
+
+
+def summarize(samples: List[float]) -> Dict:
+    return {
+        "median_ms": round(float(np.median(samples)), 4),
+        "p95_ms": round(float(np.percentile(samples, 95)), 4),
+        "min_ms": round(float(np.min(samples)), 4),
+        "rounds": len(samples),
+    }
+
+
+def wanted(name: str, only: List[str]) -> bool:
+    return not only or any(name.startswith(prefix) for prefix in only)
+
+
+def run_size(size: int, seed: int, only: List[str]) -> Dict[str, Dict]:
+    from app import main
+    from app.services.catalog import JobCatalog
+    from app.services.context import build_match_context
+    from app.services.explainer import generate_explanation
+    from app.services.matching import get_matcher
+    from app.services.scoring import calculate_fit_score
+
+    matcher = get_matcher()
+    jobs = synthetic_jobs(size, seed)
+    profiles = synthetic_profiles(PROFILES, seed)
+    start = time.perf_counter()
+    catalog = JobCatalog.build(jobs, matcher)
+    print(f"  catalog build: {time.perf_counter() - start:.1f}s")
+    main.job_catalog = catalog
+    if not main.warmup.ready:
+        main.warmup.finish()  # the catalog is built here, not by the startup task
+
+    results = {}
+    rotation = iter(range(1 << 62))
+
+    def next_profile():
+        return profiles[next(rotation) % len(profiles)]
+
+    if wanted("rank_jobs", only):
+        results[f"rank_jobs[{size}]"] = measure(
+            lambda: matcher.rank_jobs(next_profile(), catalog.jobs, catalog.embeddings)
+        )
+
+    # Per-job functions, separately for each job format
+    profile = profiles[0]
+    asyncio.run(main.save_profile(profile))
+    profile_ctx = main.current_profile_context()
+    formats = {
+        "legacy": [job for job in jobs if job.title][:SAMPLE_JOBS],
+        "internshala": [job for job in jobs if job.JobTitles][:SAMPLE_JOBS],
+    }
+    for name, sample in formats.items():
+        scores = {job.job_id: score for job, score in matcher.rank_jobs(profile, sample, catalog.embeddings)}
+        contexts = [build_match_context(profile_ctx, job, scores[job.job_id], catalog.priors[job.job_id])
+                    for job in sample]
+
+        if wanted("calculate_fit_score", only):
+            def fit_scores():
+                for ctx in contexts:
+                    calculate_fit_score(profile, ctx.job, scores[ctx.job.job_id], ctx)
+            results[f"calculate_fit_score[{name},{size}]"] = measure(fit_scores, per_round=len(sample))
+
+        if wanted("generate_explanation", only):
+            def explanations():
+                for ctx in contexts:
+                    generate_explanation(profile, ctx.job, ctx.fit_score, ctx.score_breakdown, ctx)
+            results[f"generate_explanation[{name},{size}]"] = measure(explanations, per_round=len(sample))
+
+        if wanted("create_job_match", only):
+            def job_matches():
+                for job in sample:
+                    main.create_job_match(job, scores[job.job_id], profile_ctx, catalog)
+            results[f"create_job_match[{name},{size}]"] = measure(job_matches, per_round=len(sample))
+
+    if wanted("api_jobs", only):
+        results[f"api_jobs[{size}]"] = asyncio.run(measure_api(main.app, profiles))
+
+    return results
+
+
+async def measure_api(app, profiles) -> Dict:
+    """GET /api/jobs through the ASGI app in-process (no sockets, no server)"""
+    import httpx
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.post("/api/profile", json=profiles[0].model_dump(mode="json"))
+
+        async def feed():
+            response = await client.get("/api/jobs", params={"page": 1, "page_size": 20})
+            response.raise_for_status()
+
+        await feed()
+        samples = []
+        started = time.perf_counter()
+        while len(samples) < 3 or (time.perf_counter() - started < 1.0 and len(samples) < 200):
+            start = time.perf_counter()
+            await feed()
+            samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def run_parse_cv(seed: int) -> Dict[str, Dict]:
+    from app.services.cv_parser import parse_cv
+
+    profile = synthetic_profiles(1, seed)[0]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, write in (("pdf", write_cv_pdf), ("docx", write_cv_docx)):
+            path = write(Path(tmp) / f"cv.{name}", profile)
+            results[f"parse_cv[{name}]"] = measure(lambda: parse_cv(path))
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print a comparison table; returns the names of regressed benchmarks"""
+    regressions = []
+    print(f"\n{'benchmark':<48}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in results["results"].items():
+        previous = baseline["results"].get(name)
+        if not previous:
+            print(f"{name:<48}{'-':>12}{result['median_ms']:>10.3f}ms{'new':>9}")
+            continue
+        change = result["median_ms"] / previous["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48}{previous['median_ms']:>10.3f}ms{result['median_ms']:>10.3f}ms{change:>+8.0%}{flag}")
+    return regressions
+
+
+def environment() -> Dict:
+    from app.config import MATCHER
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "matcher": MATCHER,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", default=[], help="benchmark name prefixes to run")
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--baseline", help="fail when a median is slower than this run's by more than --threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", help="also write the results here")
+    args = parser.parse_args()
+
+    results = {}
+    if wanted("parse_cv", args.only):
+        results.update(run_parse_cv(args.seed))
+    for size in args.sizes:
+        print(f"Benchmarking {size} jobs")
+        results.update(run_size(size, args.seed, args.only))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "seed": args.seed,
+        "sizes": args.sizes,
+        "environment": environment(),
+        "results": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        Path(path).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"[SUCCESS] Wrote {len(results)} results to {args.output}")
+    if not args.baseline:
+        print(f"\n{'benchmark':<48}{'median':>12}{'p95':>12}")
+        for name, result in results.items():
+            print(f"{name:<48}{result['median_ms']:>10.3f}ms{result['p95_ms']:>10.3f}ms")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get("environment") != report["environment"]:
+            print("[WARNING] Baseline was recorded in a different environment")
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
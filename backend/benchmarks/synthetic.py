@@ -0,0 +1,220 @@
+"""
+Deterministic synthetic data for benchmarks: user profiles, jobs in both
+the legacy and the Internshala format, and CV files for the parser.
+
+The same (count, seed) always produces the same records, so timings from
+different commits are measured on identical input.
+"""
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from app.models import Job, UserProfile
+
+# Fixed reference date so posting ages don't drift between runs
+REFERENCE_DATE = datetime(2026, 1, 1)
+
+SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "PostgreSQL",
+    "MongoDB", "Docker", "Kubernetes", "AWS", "GCP", "Java", "Spring Boot", "Go",
+    "C++", "Machine Learning", "Deep Learning", "TensorFlow", "PyTorch", "Pandas",
+    "NumPy", "Data Analysis", "Excel", "Tableau", "Power BI", "HTML", "CSS",
+    "Figma", "Git", "REST APIs", "GraphQL", "FastAPI", "Django", "Flask", "Linux",
+    "Android", "Kotlin", "Swift", "Flutter", "SEO", "Content Writing",
+    "Digital Marketing", "Social Media Marketing", "Communication", "Sales",
+    "Adobe Photoshop", "Illustrator", "Video Editing", "Statistics",
+]
+# Alternate spellings that the skill normalizer folds together
+SKILL_VARIANTS = {"JavaScript": "JS", "Node.js": "NodeJS", "PostgreSQL": "Postgres",
+                  "Machine Learning": "ML", "Kubernetes": "k8s"}
+ROLES = {
+    "Frontend Engineer": ["JavaScript", "TypeScript", "React", "HTML", "CSS", "Git"],
+    "Backend Engineer": ["Python", "SQL", "PostgreSQL", "Docker", "REST APIs", "FastAPI"],
+    "Full Stack Developer": ["JavaScript", "React", "Node.js", "MongoDB", "SQL", "Git"],
+    "Data Scientist": ["Python", "Machine Learning", "Pandas", "NumPy", "Statistics", "SQL"],
+    "Data Analyst": ["Excel", "SQL", "Tableau", "Power BI", "Data Analysis", "Statistics"],
+    "ML Engineer": ["Python", "PyTorch", "TensorFlow", "Deep Learning", "Docker", "AWS"],
+    "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "Linux", "Git", "GCP"],
+    "Android Developer": ["Android", "Kotlin", "Java", "Git", "REST APIs", "Flutter"],
+    "Marketing Associate": ["Digital Marketing", "SEO", "Social Media Marketing", "Content Writing", "Communication"],
+    "Graphic Designer": ["Figma", "Adobe Photoshop", "Illustrator", "Video Editing", "Communication"],
+}
+LEVELS = ["Entry", "Mid", "Senior", "Lead"]
+LOCATIONS = ["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai",
+             "San Francisco, CA", "New York, NY", "Remote", "London"]
+COMPANY_SIZES = ["1-10", "11-50", "51-200", "200-500", "500-1000", "1000+"]
+WORDS = (
+    "build maintain design develop test deploy monitor analyze improve support "
+    "scalable reliable web mobile backend frontend data cloud service platform "
+    "dashboard pipeline model team customer product feature report research "
+    "growth users performance quality collaborate ship own fast learning"
+).split()
+
+
+def _sentence(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(count)).capitalize() + "."
+
+
+def _role_skills(rng: random.Random, role: str, extra: int) -> List[str]:
+    skills = ROLES[role][:rng.randint(3, len(ROLES[role]))] + rng.sample(SKILLS, extra)
+    skills = [SKILL_VARIANTS.get(skill, skill) if rng.random() < 0.2 else skill for skill in skills]
+    return list(dict.fromkeys(skills))
+
+
+def _description(rng: random.Random, role: str, skills: List[str]) -> str:
+    sentences = [f"We are hiring a {role} to work with {', '.join(skills[:3])}."]
+    sentences += [_sentence(rng, rng.randint(8, 16)) for _ in range(rng.randint(3, 7))]
+    return " ".join(sentences)
+
+
+def legacy_job(rng: random.Random, index: int) -> Job:
+    """Job in the original format (title/company/requirements list)"""
+    role = rng.choice(list(ROLES))
+    level = rng.choice(LEVELS)
+    skills = _role_skills(rng, role, rng.randint(0, 3))
+    return Job(
+        job_id=f"legacy_{index}",
+        title=f"{level} {role}" if level != "Entry" else f"Junior {role}",
+        company=f"Company {rng.randrange(max(1, index // 10 + 1))}",
+        description=_description(rng, role, skills),
+        requirements=skills,
+        location=rng.choice(LOCATIONS),
+        experience_required=level,
+        posted_date=(REFERENCE_DATE - timedelta(days=rng.randint(0, 120))).isoformat(),
+        company_size=rng.choice(COMPANY_SIZES),
+        is_remote=rng.random() < 0.3,
+    )
+
+
+def internshala_job(rng: random.Random, index: int) -> Job:
+    """Job in the Internshala scrape format (comma-separated Skills, no date)"""
+    role = rng.choice(list(ROLES))
+    skills = _role_skills(rng, role, rng.randint(0, 2))
+    return Job(
+        job_id=f"internshala_{index}",
+        Company_Name=f"Startup {rng.randrange(max(1, index // 10 + 1))}",
+        JobTitles=f"{role} Intern" + rng.choice(["", " (Remote)", " (Part time)"]),
+        Skills=", ".join(skills),
+        Description=_description(rng, role, skills),
+        Stipend=f"₹ {rng.choice([5, 8, 10, 15, 20, 25])},000 /month",
+        Links=f"https://internshala.com/internship/detail/{index}",
+    )
+
+
+def synthetic_jobs(count: int, seed: int = 0, internshala_share: float = 0.5) -> List[Job]:
+    """`count` jobs mixing both formats"""
+    rng = random.Random(seed)
+    return [
+        internshala_job(rng, i) if rng.random() < internshala_share else legacy_job(rng, i)
+        for i in range(count)
+    ]
+
+
+def synthetic_profiles(count: int, seed: int = 0) -> List[UserProfile]:
+    """`count` complete user profiles across roles and experience levels"""
+    rng = random.Random(seed + 1000003)
+    profiles = []
+    for i in range(count):
+        roles = rng.sample(list(ROLES), 2)
+        level = rng.choice(LEVELS)
+        skills = list(dict.fromkeys(_role_skills(rng, roles[0], 3) + _role_skills(rng, roles[1], 1)))
+        years = {"Entry": 0, "Mid": 3, "Senior": 6, "Lead": 10}[level] + rng.randint(0, 2)
+        profiles.append(UserProfile(
+            user_id=f"user_{i}",
+            personal_info={
+                "full_name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "phone_number": f"+91 98{i % 10**8:08d}",
+                "address": rng.choice(LOCATIONS),
+            },
+            about_me=f"{level} {roles[0]} interested in {roles[1]}. " + _sentence(rng, 20),
+            social_profiles={"github": f"https://github.com/user{i}"},
+            resume_text=" ".join(_sentence(rng, 15) for _ in range(4)),
+            skills=skills,
+            experience_years=years,
+            experience_level=level,
+            preferred_roles=roles,
+            preferred_locations=rng.sample(LOCATIONS, 2),
+            career_goals=rng.choice(["Grow into a senior role", "Learn new technologies",
+                                     "Lead a team", "Build products people love"]),
+            projects=[{
+                "id": f"p{i}_{n}",
+                "title": f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}",
+                "description": _sentence(rng, 18),
+                "technologies": rng.sample(skills, min(3, len(skills))),
+            } for n in range(rng.randint(1, 3))],
+            work_experience=[{
+                "id": f"w{i}",
+                "company": f"Company {rng.randrange(1000)}",
+                "position": roles[0],
+                "duration": f"{max(1, years)} years",
+                "skills_used": skills[:4],
+                "description": _sentence(rng, 25),
+            }] if years else [],
+            work_preferences={"work_mode": rng.choice(["Any", "Remote", "On-site"])},
+        ))
+    return profiles
+
+
+def cv_lines(profile: UserProfile) -> List[str]:
+    """Plain-text CV content for a profile"""
+    lines = [
+        profile.personal_info.full_name,
+        f"{profile.personal_info.email} | {profile.personal_info.phone_number}",
+        profile.social_profiles.github or "",
+        "",
+        "SUMMARY",
+        profile.about_me or "",
+        "",
+        "SKILLS",
+        ", ".join(profile.skills),
+        "",
+        "EXPERIENCE",
+        f"{profile.experience_years} years of experience",
+    ]
+    for work in profile.work_experience:
+        lines += [f"{work.position} at {work.company} ({work.duration})", work.description]
+    lines += ["", "PROJECTS"]
+    for project in profile.projects:
+        lines += [project.title, project.description]
+    return lines
+
+
+def write_cv_docx(path: Path, profile: UserProfile) -> Path:
+    from docx import Document
+    document = Document()
+    for line in cv_lines(profile):
+        document.add_paragraph(line)
+    document.save(str(path))
+    return path
+
+
+def write_cv_pdf(path: Path, profile: UserProfile) -> Path:
+    """Minimal single-page text PDF (no PDF-writing dependency needed)"""
+    def escape(text: str) -> str:
+        text = text.encode("latin-1", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    body = "\n".join(f"({escape(line)}) Tj T*" for line in cv_lines(profile))
+    stream = f"BT /F1 10 Tf 14 TL 50 780 Td\n{body}\nET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(pdf))
+    return path
@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.catalog import JobCatalog
+from app.services.matching import get_matcher
+from benchmarks.synthetic import synthetic_jobs, synthetic_profiles
+
+
+@pytest.fixture(scope="session")
+def matcher():
+    return get_matcher()
+
+
+@pytest.fixture(scope="session")
+def jobs():
+    """Synthetic jobs; every 7th legacy job has no location"""
+    jobs = synthetic_jobs(400, seed=3)
+    return [job.model_copy(update={"location": ""}) if job.location and i % 7 == 0 else job
+            for i, job in enumerate(jobs)]
+
+
+@pytest.fixture(scope="session")
+def catalog(jobs, matcher):
+    return JobCatalog.build(jobs, matcher)
+
+
+@pytest.fixture(scope="session")
+def profiles():
+    profiles = synthetic_profiles(12, seed=3)
+    profiles[0] = profiles[0].model_copy(update={"preferred_locations": []})
+    profiles[1] = profiles[1].model_copy(update={"preferred_roles": [], "experience_level": "scam lord"})
+    return profiles
+
+
+@pytest.fixture
+def client(catalog, monkeypatch):
+    """The app serving the synthetic catalog (startup, and so the dataset load, is skipped)"""
+    from fastapi.testclient import TestClient
+    from app import main
+
+    monkeypatch.setattr(main, "job_catalog", catalog)
+    main.warmup.finish()
+    main.feed_cache.clear()
+    return TestClient(main.app)
+
+
+@pytest.fixture(params=["keyword", "tfidf"])
+def matcher_client(request, jobs, monkeypatch):
+    """The app serving the synthetic catalog, indexed by each matcher in turn"""
+    from fastapi.testclient import TestClient
+    from app import main
+    from app.services import matching
+    from app.services.vector_matcher import TfidfMatcher
+
+    matcher = TfidfMatcher() if request.param == "tfidf" else matching.KeywordMatcher()
+    monkeypatch.setattr(matching, "_matcher_instance", matcher)
+    monkeypatch.setattr(main, "job_catalog", JobCatalog.build(jobs, matcher))
+    main.warmup.finish()
+    main.feed_cache.clear()
+    return TestClient(main.app)
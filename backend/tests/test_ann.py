@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from app.services.ann import CountSketch, IVFIndex
+from app.services.vector_matcher import TfidfMatcher
+
+
+def unit_vectors(count: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    vectors = np.random.RandomState(seed).randn(count, dim).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_sketch_rows_match_single_projection():
+    sketch = CountSketch(1000, dim=32)
+    indptr = np.array([0, 3, 3, 5])
+    indices = np.array([1, 7, 999, 4, 7], dtype=np.int32)
+    data = np.array([0.5, 0.5, 0.7, 0.6, 0.8], dtype=np.float32)
+    rows = sketch.project_rows(indptr, indices, data)
+    for row in (0, 2):
+        start, end = indptr[row], indptr[row + 1]
+        np.testing.assert_allclose(rows[row], sketch.project(indices[start:end], data[start:end]), rtol=1e-6)
+    assert not rows[1].any()
+
+
+def test_ivf_add_remove_and_copy():
+    vectors = unit_vectors(400)
+    index = IVFIndex(dim=16, nprobe=2)
+    index.add(np.arange(400), vectors)
+    assert len(index) == 400
+    assert sorted(index.candidates(vectors[0], nprobe=index.nlist)) == list(range(400))
+    assert 7 in index.candidates(vectors[7])
+
+    copy = index.copy()
+    copy.remove(np.array([7, 8, 10000]))
+    copy.add(np.array([400]), vectors[:1])
+    assert len(copy) == 399 and len(index) == 400
+    assert 7 not in copy.candidates(vectors[7], nprobe=copy.nlist)
+    assert 400 not in index.candidates(vectors[0], nprobe=index.nlist)
+
+
+def test_ivf_search_with_every_list_is_exact():
+    vectors = unit_vectors(300, seed=1)
+    index = IVFIndex(dim=16)
+    index.add(np.arange(300), vectors)
+    query = unit_vectors(1, seed=2)[0]
+    keys, _ = index.search(query, 10, nprobe=index.nlist)
+    assert list(keys) == list(np.argsort(-(vectors @ query), kind="stable")[:10])
+
+
+def test_ann_ranking_returns_every_job(catalog, jobs, profiles):
+    exact = TfidfMatcher(ann_candidates=0)
+    exact_index = exact.index_jobs(jobs)
+    ann = TfidfMatcher(ann_candidates=25, ann_min_jobs=1, ann_nprobe=1000)
+    ann_index = ann.index_jobs(jobs)
+    assert ann_index.ann is not None
+
+    for profile in profiles[:3]:
+        expected = exact.rank_jobs(profile, jobs, exact_index)
+        ranked = ann.rank_jobs(profile, jobs, ann_index)
+        assert len(ranked) == len(jobs)
+        # Probing every list: the same ranking as the exact scan
+        assert [score for _, score in ranked] == pytest.approx([score for _, score in expected])
+
+
+def test_ann_only_changes_the_order(catalog, jobs, profiles):
+    exact = TfidfMatcher(ann_candidates=0)
+    exact_index = exact.index_jobs(jobs)
+    ann = TfidfMatcher(ann_candidates=25, ann_min_jobs=1, ann_nprobe=1)
+    ann_index = ann.index_jobs(jobs)
+
+    for profile in profiles[:3]:
+        expected = {job.job_id: score for job, score in exact.rank_jobs(profile, jobs, exact_index)}
+        ranked = ann.rank_jobs(profile, jobs, ann_index)
+        # Exact scores for every job, the ANN candidates first, then the rest, each best first
+        assert {job.job_id: score for job, score in ranked} == pytest.approx(expected)
+        head, tail = [score for _, score in ranked[:25]], [score for _, score in ranked[25:]]
+        assert head == sorted(head, reverse=True) and tail == sorted(tail, reverse=True)
+        candidates = ann_index.candidate_rows(ann.create_user_embedding(profile))
+        assert {job.job_id for job, _ in ranked[:25]} <= {ann_index.job_ids[row] for row in candidates}
@@ -0,0 +1,39 @@
+from benchmarks.suite import compare, measure, wanted
+from benchmarks.synthetic import cv_lines, synthetic_jobs, synthetic_profiles
+
+
+def test_synthetic_data_is_deterministic():
+    assert synthetic_jobs(50, seed=7) == synthetic_jobs(50, seed=7)
+    assert synthetic_profiles(5, seed=7) == synthetic_profiles(5, seed=7)
+    assert synthetic_jobs(50, seed=7) != synthetic_jobs(50, seed=8)
+    # Growing the count keeps the earlier records
+    assert synthetic_jobs(80, seed=7)[:50] == synthetic_jobs(50, seed=7)
+
+
+def test_synthetic_data_mixes_formats():
+    jobs = synthetic_jobs(200)
+    assert {job.job_id.split("_")[0] for job in jobs} == {"legacy", "internshala"}
+    assert all(job.normalized_skills for job in jobs)
+    profile = synthetic_profiles(1)[0]
+    assert any(profile.personal_info.full_name in line for line in cv_lines(profile))
+
+
+def test_measure_reports_rounds():
+    calls = []
+    result = measure(lambda: calls.append(1), min_rounds=5, min_seconds=0)
+    assert result["rounds"] == 5 and len(calls) == 6  # plus the warm-up
+    assert result["min_ms"] <= result["median_ms"] <= result["p95_ms"]
+
+
+def test_compare_flags_regressions_over_the_threshold():
+    def report(**medians):
+        return {"results": {name: {"median_ms": ms} for name, ms in medians.items()}}
+    baseline = report(feed=10.0, stats=10.0, detail=10.0)
+    current = report(feed=12.5, stats=11.0, detail=5.0, upload=1.0)
+    assert compare(current, baseline, threshold=0.2) == ["feed"]
+
+
+def test_only_selects_by_prefix():
+    assert wanted("feed[1000]", [])
+    assert wanted("feed[1000]", ["feed", "stats"])
+    assert not wanted("stats[1000]", ["feed"])
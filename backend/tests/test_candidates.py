@@ -0,0 +1,41 @@
+import asyncio
+
+from app import main
+from app.services.candidates import CandidatePool
+from app.services.context import ProfileContext
+
+
+def test_candidates_ranked_by_fit_off_the_event_loop(client, catalog, profiles, monkeypatch):
+    monkeypatch.setattr(main, "candidate_pool", CandidatePool())
+    lines = "\n".join(profile.model_dump_json() for profile in profiles)
+    assert client.post("/api/candidates", content=lines).json()["total_candidates"] == len(profiles)
+    
+    loops = []
+    rank_candidates = main.rank_candidates
+    
+    def recording(*args):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return rank_candidates(*args)
+    
+    monkeypatch.setattr(main, "rank_candidates", recording)
+    job = catalog.jobs[5]
+    response = client.get(f"/api/jobs/{job.job_id}/candidates", params={"top_k": 5}).json()
+    assert loops == [None]
+    
+    # Same fits as scoring each profile against the job, best first, earlier stored first on ties
+    semantic = {
+        profile.user_id: dict((ranked.job_id, score) for ranked, score in main.get_matcher().rank_jobs(
+            profile, catalog.jobs, catalog.embeddings
+        ))[job.job_id]
+        for profile in profiles
+    }
+    fits = [
+        (main.score_job(job, semantic[profile.user_id], ProfileContext(profile), catalog).fit_score, -i, profile.user_id)
+        for i, profile in enumerate(profiles)
+    ]
+    expected = [(user_id, fit) for fit, _, user_id in sorted(fits, reverse=True)[:5]]
+    assert [(c["user_id"], c["fit_score"]) for c in response["candidates"]] == expected
+    assert sum(response["decisions"].values()) == response["total_candidates"] == len(profiles)
@@ -0,0 +1,67 @@
+from app.models import Job
+from app.services.catalog import JobCatalog
+from app.services.dedup import build_duplicate_index
+from app.services.matching import KeywordMatcher
+
+DESCRIPTION = ("We are hiring a backend engineer to build and maintain scalable web services in Python. "
+               "You will design data pipelines, deploy to the cloud, monitor performance and collaborate "
+               "with product and design on new features for our customers.")
+OTHER = "Own our sales pipeline, meet enterprise customers across the region and report growth every quarter."
+
+
+def job(job_id: str, description: str = DESCRIPTION, company: str = "Acme", title: str = "Backend Engineer") -> Job:
+    return Job(job_id=job_id, title=title, company=company, description=description, requirements=["Python"])
+
+
+def duplicates(catalog: JobCatalog):
+    return {job.job_id: job.duplicate_of for job in catalog.jobs}
+
+
+def build(*jobs: Job) -> JobCatalog:
+    return JobCatalog.build(list(jobs), KeywordMatcher())
+
+
+def test_apply_leaves_the_previous_version_alone():
+    old = build(job("a"), job("b"), job("c", OTHER, title="Sales Lead"))
+    before = duplicates(old), old.duplicate_index.clusters(), dict(old.duplicate_index.parent)
+
+    new, not_found = old.apply([job("d"), job("c", DESCRIPTION)], ["b", "missing"], KeywordMatcher())
+    assert not_found == ["missing"]
+    assert duplicates(new) == {"a": None, "c": "a", "d": "a"}
+    assert (duplicates(old), old.duplicate_index.clusters(), dict(old.duplicate_index.parent)) == before
+    assert new.duplicate_index is not old.duplicate_index
+
+
+def test_deleted_jobs_leave_the_index():
+    old = build(job("a"), job("b"), job("c"))
+    new, _ = old.apply([], ["a"], KeywordMatcher())
+    index = new.duplicate_index
+    assert "a" not in index.parent and "a" not in index.signatures
+    assert all("a" not in members for members in index.buckets.values())
+    # The earliest remaining repost becomes canonical
+    assert duplicates(new) == {"b": None, "c": "b"}
+    assert index.clusters() == {"b": ["b", "c"]}
+
+
+def test_replaced_canonical_restamps_its_reposts():
+    old = build(job("a"), job("b"), job("c"))
+    new, _ = old.apply([job("a", OTHER, title="Sales Lead")], [], KeywordMatcher())
+    assert duplicates(new) == {"a": None, "b": None, "c": "b"}
+    assert duplicates(old) == {"a": None, "b": "a", "c": "a"}
+
+    # Replacing it back joins the cluster again, as its newest posting
+    newer, _ = new.apply([job("a")], [], KeywordMatcher())
+    assert duplicates(newer) == {"a": "b", "b": None, "c": "b"}
+
+
+def test_apply_clusters_like_a_fresh_build(jobs):
+    reposts = [j.model_copy(update={"job_id": f"{j.job_id}_repost"}) for j in jobs[:300:6]]
+    old = build(*[j.model_copy() for j in jobs[:300] + reposts[:25]])
+    deleted = [j.job_id for j in jobs[:300:4]]
+    new, _ = old.apply([j.model_copy() for j in jobs[300:] + reposts[25:]], deleted, KeywordMatcher())
+
+    fresh = [j.model_copy() for j in jobs[:300] + reposts[:25] + jobs[300:] + reposts[25:] if j.job_id not in deleted]
+    build_duplicate_index(fresh)
+    expected = {j.job_id: j.duplicate_of for j in fresh}
+    assert sum(1 for canonical in expected.values() if canonical) > 20
+    assert duplicates(new) == expected
@@ -0,0 +1,40 @@
+from app import main
+from app.services.cohort import match_cohort, parse_profiles
+from app.services.context import ProfileContext
+
+
+def test_cohort_matches_scoring_each_profile(catalog, matcher, profiles):
+    for collapse_duplicates in (False, True):
+        cohort = match_cohort(catalog, matcher, profiles, top_k=15, collapse_duplicates=collapse_duplicates,
+                              profile_chunk=5, job_chunk=97)
+        assert [result.user_id for result in cohort] == [profile.user_id for profile in profiles]
+        for profile, result in zip(profiles, cohort):
+            profile_ctx = ProfileContext(profile)
+            ranked = matcher.rank_jobs(profile, catalog.feed_jobs(collapse_duplicates), catalog.embeddings)
+            scored = [main.score_job(job, semantic, profile_ctx, catalog) for job, semantic in ranked]
+            
+            decisions = dict.fromkeys(result.decisions, 0)
+            for match in scored:
+                decisions[match.decision] += 1
+            assert result.decisions == decisions
+            
+            fits = sorted((match.fit_score for match in scored), reverse=True)[:15]
+            assert [match.fit_score for match in result.top_matches] == fits
+            by_id = {match.job.job_id: match for match in scored}
+            for match in result.top_matches:
+                assert (match.fit_score, match.decision) == (by_id[match.job_id].fit_score, by_id[match.job_id].decision)
+
+
+def test_parse_profiles_reports_bad_lines(profiles):
+    lines = [profiles[0].model_dump_json(), "", "{not json", '{"skills": []}', profiles[1].model_dump_json()]
+    parsed, errors = parse_profiles(lines)
+    assert parsed == profiles[:2]
+    assert [error["line"] for error in errors] == [3, 4]
+
+
+def test_batch_endpoint(client, profiles):
+    body = "\n".join(profile.model_dump_json() for profile in profiles[:3]) + "\n{oops"
+    response = client.post("/api/batch/match", params={"top_k": 2}, content=body).json()
+    assert [result["user_id"] for result in response["profiles"]] == [profile.user_id for profile in profiles[:3]]
+    assert all(len(result["top_matches"]) == 2 for result in response["profiles"])
+    assert response["errors"][0]["line"] == 4
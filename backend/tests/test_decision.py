@@ -0,0 +1,66 @@
+import itertools
+
+import numpy as np
+
+from app.services.decision import DECISIONS, decide, decision_codes, make_decision
+from app.services.risks import AVOID_KEYWORDS, CRITICAL_RISKS, Risk, RiskReport
+
+
+def text_decision(fit_score, missing_skills, risk_factors):
+    """make_decision() as it was before the table: risk texts scanned for keywords"""
+    for risk in risk_factors:
+        if any(keyword in risk.lower() for keyword in AVOID_KEYWORDS):
+            return "Avoid", f"Critical issues detected: {risk}"
+    if fit_score >= 75:
+        if len(missing_skills) <= 1:
+            return "Apply", f"Excellent fit ({fit_score}%)! You meet nearly all requirements."
+        return "Apply", f"Strong fit ({fit_score}%) with manageable skill gaps."
+    if fit_score >= 60:
+        if len(missing_skills) <= 3:
+            return "Wait", f"Good fit ({fit_score}%), but acquire these skills first: {', '.join(missing_skills[:3])}"
+        return "Wait", f"Decent fit ({fit_score}%), but significant gaps in {len(missing_skills)} skills."
+    if fit_score >= 40:
+        return "Skip", f"Moderate fit ({fit_score}%), but there are likely better matches for your profile."
+    return "Avoid", f"Poor fit ({fit_score}%). This role doesn't align with your skills and goals."
+
+
+def risk_reports():
+    """Every consistent combination of flags"""
+    for flags in range(256):
+        if flags & Risk.GHOST_POSTING and flags & Risk.STALE_POSTING:
+            continue
+        if flags & Risk.FLAGGED_LEVEL and not flags & Risk.EXPERIENCE_GAP:
+            continue
+        days_old = 75 if flags & Risk.GHOST_POSTING else 45 if flags & Risk.STALE_POSTING else None
+        required = "Toxic Lead" if flags & Risk.FLAGGED_LEVEL else "Lead"
+        yield RiskReport(flags, days_old, 6, required, "Entry")
+
+
+FIT_SCORES = [0, 12.5, 39.9, 40, 52.3, 59.9, 60, 67.1, 74.9, 75, 88.8, 100]
+
+
+def test_table_matches_the_text_rules():
+    for risks, fit_score, missing in itertools.product(risk_reports(), FIT_SCORES, range(7)):
+        missing_skills = [f"skill{i}" for i in range(missing)]
+        expected = text_decision(fit_score, missing_skills, risks.messages())
+        assert make_decision(fit_score, missing_skills, risks) == expected, (risks, fit_score, missing)
+
+
+def test_decision_codes_match_decide():
+    fits = np.array(FIT_SCORES * 2)
+    critical = np.array([False] * len(FIT_SCORES) + [True] * len(FIT_SCORES))
+    codes = decision_codes(fits, critical)
+    assert codes.tolist() == [
+        decide(fit, 0, CRITICAL_RISKS if is_critical else 0)[0] for fit, is_critical in zip(fits.tolist(), critical)
+    ]
+    assert [DECISIONS[code] for code in codes[:3]] == ["Avoid"] * 3
+
+
+def test_critical_message_and_flags():
+    ghost = RiskReport(Risk.GHOST_POSTING | Risk.VAGUE_DESCRIPTION, days_old=90)
+    assert ghost.critical
+    assert ghost.critical_message() == ghost.messages()[0] == "⚠️ Job posted 90 days ago - may be a ghost job"
+    gap = RiskReport(Risk.EXPERIENCE_GAP | Risk.FLAGGED_LEVEL, experience_required="Scam Senior",
+                     experience_level="Entry")
+    assert gap.critical and gap.critical_message() == "⚠️ Job requires Scam Senior but you're Entry"
+    assert not RiskReport(Risk.EXPERIENCE_GAP | Risk.STALE_POSTING, days_old=40).critical
@@ -0,0 +1,45 @@
+import pytest
+
+from app.models import Job
+from app.services.dedup import DuplicateIndex, build_duplicate_index
+
+DESCRIPTION = ("We are hiring a backend engineer to build and maintain scalable web services in Python. "
+               "You will design data pipelines, deploy to the cloud, monitor performance and collaborate "
+               "with product and design on new features for our customers.")
+
+
+def job(job_id: str, title: str = "Backend Engineer", company: str = "Acme", description: str = DESCRIPTION) -> Job:
+    return Job(job_id=job_id, title=title, company=company, description=description, requirements=["Python"])
+
+
+def test_reposts_cluster_under_the_earliest_posting():
+    jobs = [job("a"), job("b", description=DESCRIPTION + " Apply today!"), job("c", title="Senior Backend Engineer")]
+    index = build_duplicate_index(jobs)
+    assert [j.duplicate_of for j in jobs] == [None, "a", "a"]
+    assert index.clusters() == {"a": ["a", "b", "c"]}
+
+
+def test_other_companies_and_roles_are_not_duplicates():
+    jobs = [job("a"), job("b", company="Globex"), job("c", title="Marketing Associate"),
+            job("d", description="Sell our product to enterprise customers across the region every quarter.")]
+    build_duplicate_index(jobs)
+    assert [j.duplicate_of for j in jobs] == [None, None, None, None]
+
+
+def test_similarity_estimates_jaccard():
+    index = DuplicateIndex(num_perm=256, num_bands=64)
+    index.add([job("a"), job("b"), job("c", description="Completely different text about a sales role in Mumbai.")])
+    assert index.similarity("a", "b") == 1.0
+    assert index.similarity("a", "c") < 0.2
+
+
+def test_jobs_without_text_get_a_signature():
+    index = DuplicateIndex()
+    index.add([job("a", title="", description=""), job("b", title="", description="")])
+    assert index.duplicate_of("b") == "a"
+    assert index.duplicate_of("unknown") is None
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        DuplicateIndex(num_perm=64, num_bands=10)
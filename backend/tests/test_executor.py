@@ -0,0 +1,130 @@
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+
+from app.services import metrics
+from app.services.executor import RankingExecutor, SingleFlight
+
+
+def job_count(catalog, extra):
+    metrics.count("obliqo_jobs_scored_total", len(catalog.jobs))
+    return len(catalog.jobs) + extra
+
+
+def test_single_flight_coalesces_identical_calls():
+    async def scenario():
+        flight, started = SingleFlight(), []
+        
+        async def start(value):
+            started.append(value)
+            await asyncio.sleep(0.01)
+            return value
+        
+        results = await asyncio.gather(
+            flight.run("a", lambda: start(1)), flight.run("a", lambda: start(2)), flight.run("b", lambda: start(3))
+        )
+        return results, started, len(flight)
+    
+    results, started, inflight = asyncio.run(scenario())
+    assert results == [1, 1, 3] and started == [1, 3]
+    assert inflight == 0  # finished calls are forgotten
+
+
+def test_cancelled_waiter_does_not_cancel_the_call():
+    async def scenario():
+        flight = SingleFlight()
+        
+        async def start():
+            await asyncio.sleep(0.02)
+            return "done"
+        
+        first = asyncio.ensure_future(flight.run("key", start))
+        second = asyncio.ensure_future(flight.run("key", start))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+    
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_thread_executor_runs_off_the_event_loop(catalog):
+    executor = RankingExecutor("thread", workers=2)
+    
+    def where(catalog):
+        return threading.current_thread().name
+    
+    async def scenario():
+        return await executor.run(("where",), where, catalog), await executor.run(("count",), job_count, catalog, 1)
+    
+    try:
+        thread, result = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert thread.startswith("ranking") and result == len(catalog.jobs) + 1
+
+
+def test_unknown_kind_falls_back_to_threads():
+    assert RankingExecutor("gpu").kind == "thread"
+
+
+def test_process_executor_sends_counters_back(catalog):
+    executor = RankingExecutor("process", workers=1)
+    key = ("obliqo_jobs_scored_total", "")
+    before = metrics.counters.snapshot().get(key, 0)
+    try:
+        result = asyncio.run(executor.run(("count",), job_count, catalog, 2))
+    finally:
+        executor.shutdown()
+    assert result == len(catalog.jobs) + 2
+    if metrics.METRICS_ENABLED:
+        assert metrics.counters.snapshot()[key] - before == len(catalog.jobs)
+
+
+def catalog_state(catalog):
+    """What a worker's copy of the catalog must agree on, and the process holding it"""
+    days_old = sorted((job_id, priors.days_old, priors.quality_score) for job_id, priors in catalog.priors.items())
+    # Keyword embeddings come from sets: their order differs between processes
+    embeddings = [str(sorted(embedding) if isinstance(embedding, list) else embedding)
+                  for embedding in map(catalog.embeddings.__getitem__, catalog.jobs.job_ids)]
+    return os.getpid(), catalog.version, list(catalog.jobs.job_ids), days_old, embeddings
+
+
+def test_process_workers_follow_catalog_updates_without_restarting(catalog, jobs, matcher):
+    reposts = [job.model_copy(update={"job_id": None, "Links": f"https://example.com/moved/{i}"})
+               for i, job in enumerate(jobs[:5])]
+    updated, _ = catalog.apply(reposts, [jobs[7].job_id, jobs[8].job_id], matcher)
+    refreshed, _ = updated.refresh_priors(datetime.now() + timedelta(days=90))
+    executor = RankingExecutor("process", workers=1)
+    
+    async def scenario():
+        return [await executor.run(("state", version.version), catalog_state, version)
+                for version in (catalog, updated, refreshed, catalog)]
+    
+    try:
+        states = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    pids = [state[0] for state in states]
+    # One worker took both updates; the replaced snapshot ran on the thread pool
+    assert pids[0] == pids[1] == pids[2] != os.getpid() and pids[3] == os.getpid()
+    for state, version in zip(states, (catalog, updated, refreshed, catalog)):
+        assert state[1:] == catalog_state(version)[1:]
+
+
+def test_process_calls_across_catalog_swaps_never_hit_a_closed_pool(catalog, jobs, matcher):
+    versions = [catalog]
+    for i in range(3):
+        repost = jobs[i].model_copy(update={"job_id": None, "Links": f"https://example.com/swap/{i}"})
+        versions.append(versions[-1].apply([repost], [], matcher)[0])
+    executor = RankingExecutor("process", workers=2)
+    
+    async def scenario():
+        calls = [executor.run(("count", i), job_count, versions[i % len(versions)], 0) for i in range(24)]
+        return await asyncio.gather(*calls)
+    
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert results == [len(versions[i % len(versions)].jobs) for i in range(24)]
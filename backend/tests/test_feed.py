@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app import main
+
+
+def stream_events(client, **params):
+    response = client.get("/api/jobs/stream", params=params)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_sends_the_first_matches_best_first(client, profiles):
+    client.post("/api/profile", json=profiles[4].model_dump(mode="json"))
+    main.feed_cache.clear()
+    events = stream_events(client, top_k=10, chunk_size=50)
+    assert events[0]["event"] == "meta" and events[-1]["event"] == "end"
+    matches = [event["data"] for event in events[1:-1]]
+    assert len(matches) == events[0]["data"]["total_count"] == events[-1]["data"]["sent"]
+    
+    # The first top_k of the feed, best fit first, then the rest in feed order
+    feed = client.get("/api/jobs", params={"page_size": len(matches)}).json()["jobs"]
+    assert [match["fit_score"] for match in matches[:10]] == \
+        sorted((match["fit_score"] for match in feed[:10]), reverse=True)
+    assert {match["job"]["job_id"] for match in matches[:10]} == {match["job"]["job_id"] for match in feed[:10]}
+    assert matches[10:] == feed[10:]
+    assert {match["job"]["job_id"]: match for match in matches} == {match["job"]["job_id"]: match for match in feed}
+    
+    # Served from the cache the same way
+    assert [event["data"] for event in stream_events(client, top_k=10, chunk_size=50)[1:-1]] == matches
+
+
+def test_stream_filter_and_limit(client, profiles):
+    client.post("/api/profile", json=profiles[5].model_dump(mode="json"))
+    feed = client.get("/api/jobs", params={"page_size": 1000, "decision_filter": "Skip"}).json()["jobs"]
+    main.feed_cache.clear()
+    events = stream_events(client, format="ndjson", top_k=3, limit=5, decision_filter="Skip")
+    matches = [event["data"] for event in events if event["event"] == "match"]
+    assert len(matches) == min(5, len(feed))
+    assert all(match["decision"] == "Skip" for match in matches)
+    assert matches[:3] == sorted(feed[:3], key=lambda match: -match["fit_score"])
+    assert matches[3:] == feed[3:5]
+    assert events[-1]["data"]["scored"] < events[0]["data"]["total_count"]
+
+
+def test_stream_sends_the_top_matches_before_scoring_the_tail(client, profiles, monkeypatch):
+    scored = []
+    score_job = main.score_job
+    monkeypatch.setattr(main, "score_job", lambda *args: scored.append(args[0]) or score_job(*args))
+    main.set_current_profile(profiles[6])  # no precompute
+    
+    async def first_events(count):
+        response = await main.stream_job_feed(
+            format="ndjson", top_k=5, chunk_size=50, limit=None, decision_filter=None, collapse_duplicates=False
+        )
+        events = []
+        async for chunk in response.body_iterator:
+            events.extend(json.loads(line) for line in chunk.splitlines())
+            if len(events) >= count:
+                return events, len(scored)
+    
+    events, scored_count = asyncio.run(first_events(6))
+    assert [event["event"] for event in events] == ["meta"] + ["match"] * 5
+    assert scored_count == 5 < events[0]["data"]["total_count"]
+
+
+async def _run(fn, *args):
+    return fn(*args)
+
+
+def test_job_details_are_scored_on_the_executor(client, profiles, monkeypatch):
+    client.post("/api/profile", json=profiles[7].model_dump(mode="json"))
+    job_ids = [job.job_id for job in main.job_catalog.jobs[:3]]
+    expected = {job_id: client.get(f"/api/jobs/{job_id}").json() for job_id in job_ids}
+    
+    calls = []
+    monkeypatch.setattr(main.ranking_executor, "run", lambda key, fn, *args: calls.append(fn) or _run(fn, *args))
+    response = client.post("/api/jobs/details", json={"job_ids": job_ids + ["missing", job_ids[0]]})
+    assert calls == [main.compute_job_details]
+    results = response.json()["results"]
+    assert [result["job_id"] for result in results] == job_ids + ["missing", job_ids[0]]
+    assert [result["match"] for result in results if result["found"]] == [expected[job_id] for job_id in job_ids + [job_ids[0]]]
+    assert results[3] == {"job_id": "missing", "found": False, "match": None, "detail": "Job not found"}
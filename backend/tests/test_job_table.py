@@ -0,0 +1,84 @@
+import pickle
+
+import numpy as np
+
+from app import main
+from app.models import Job
+from app.services.context import ProfileContext
+from app.services.job_table import JobRow, JobTable, StringPool
+
+ODD_JOBS = [
+    Job(job_id="a", Company_Name="Ünïcode GmbH", JobTitles="Data Engineer", Skills="Python,  SQL ,Spark",
+        Description="Builds pipelines — naïvely fast ✓", Stipend="10k", Links="https://example.com/a"),
+    Job(job_id="b", title="Backend Dev", company="Acme", description="", requirements=["Go", "Docker"],
+        location="Berlin", experience_required="Mid", posted_date="2024-01-02", is_remote=True),
+    Job(job_id="c", Skills="", requirements=["Rust"], duplicate_of="b"),
+    Job(job_id="d", Skills="Java, Kotlin", requirements=["Android"]),
+    Job(job_id="e"),
+]
+
+
+def test_rows_round_trip_byte_identical(catalog, jobs):
+    # Building the catalog assigned the job IDs
+    all_jobs = ODD_JOBS + jobs
+    table = JobTable.from_jobs(all_jobs)
+    assert len(table) == len(all_jobs)
+    for row, job in enumerate(all_jobs):
+        assert table.job(row).model_dump_json() == job.model_dump_json()
+        view = table[row]
+        assert view.normalized_title == job.normalized_title
+        assert view.normalized_company == job.normalized_company
+        assert view.normalized_description == job.normalized_description
+        assert view.normalized_skills == job.normalized_skills
+        assert view.duplicate_of == job.duplicate_of
+        assert view.location == job.location
+
+
+def test_strings_are_interned_once():
+    pool = StringPool()
+    table = JobTable.from_jobs([Job(job_id=str(i), company="Acme", location="Remote") for i in range(50)], pool)
+    assert len(pool) == 2
+    assert table.interned["company"].tolist() == [pool.code("Acme")] * 50
+
+
+def test_extend_take_and_duplicates_keep_rows():
+    table = JobTable.from_jobs(ODD_JOBS[:3])
+    extended = table.extend(ODD_JOBS[3:])
+    assert extended.pool is table.pool and len(table) == 3
+    assert [extended.job(row) for row in range(len(extended))] == ODD_JOBS
+    
+    taken = extended.take([4, 2, 0])
+    assert taken.job_ids == ["e", "c", "a"]
+    assert [taken.job(row) for row in range(3)] == [ODD_JOBS[4], ODD_JOBS[2], ODD_JOBS[0]]
+    assert taken.by_id["c"].duplicate_of == "b"
+    
+    stamped = taken.with_duplicates({"c": None, "e": "a"})
+    assert stamped.by_id["c"].duplicate_of is None and stamped.by_id["e"].duplicate_of == "a"
+    assert taken.by_id["c"].duplicate_of == "b"  # the older table is unchanged
+
+
+def test_row_pickles_with_its_table():
+    row = JobTable.from_jobs(ODD_JOBS)[1]
+    copy = pickle.loads(pickle.dumps(row))
+    assert isinstance(copy, JobRow) and copy.to_job() == ODD_JOBS[1]
+
+
+def test_published_arrays_round_trip(tmp_path):
+    for name, array in JobTable.from_jobs(ODD_JOBS).export_arrays().items():
+        np.save(tmp_path / f"{name}.npy", array)
+    arrays = {path.name[:-4]: np.load(path, mmap_mode="r") for path in tmp_path.glob("*.npy")}
+    table = JobTable.from_arrays(arrays)
+    assert [table.job(row) for row in range(len(table))] == ODD_JOBS
+    # Derived tables and pickled rows copy out of the mapped buffers
+    assert [job.to_job() for job in table.extend([Job(job_id="f")]).take([5, 0])] == [Job(job_id="f"), ODD_JOBS[0]]
+    assert pickle.loads(pickle.dumps(table[0])).to_job() == ODD_JOBS[0]
+
+
+def test_matches_from_rows_are_byte_identical(catalog, jobs, profiles):
+    profile_ctx = ProfileContext(profiles[3])
+    by_id = {job.job_id: job for job in jobs if job.job_id}
+    for row in catalog.jobs[:40]:
+        job = by_id[row.job_id].model_copy(update={"duplicate_of": row.duplicate_of})
+        from_row = main.create_job_match(row, 70.0, profile_ctx, catalog)
+        from_model = main.create_job_match(job, 70.0, profile_ctx, catalog)
+        assert from_row.model_dump_json() == from_model.model_dump_json()
@@ -0,0 +1,47 @@
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from app import main
+from benchmarks.loadtest import Workload, markdown, parse_mix, summarize
+
+
+def test_parse_mix():
+    assert parse_mix("feed=3, stats=1") == {"feed": 3.0, "stats": 1.0}
+    with pytest.raises(SystemExit):
+        parse_mix("feed=1,search=2")
+
+
+def test_summarize_excludes_errors_from_latency():
+    samples = [(i / 1000, True) for i in range(1, 101)] + [(5.0, False)] * 4
+    row = summarize(samples, duration=10)
+    assert (row["requests"], row["errors"], row["throughput_rps"]) == (104, 4, 10.0)
+    assert row["p50_ms"] == 50.5 and row["p99_ms"] == 99.0
+    assert summarize([(1.0, False)], duration=1)["p95_ms"] is None
+
+
+def test_markdown_has_a_row_per_level_and_endpoint():
+    row = summarize([(0.01, True)], 1)
+    report = {"jobs": 10, "duration_seconds": 1, "mix": "feed=1",
+              "levels": [{"concurrency": c, "endpoints": {"feed": row, "all": row}} for c in (1, 4)]}
+    lines = markdown(report).splitlines()
+    assert len(lines) == 4 + 4
+    assert lines[-1].startswith("| 4 | all | 1 | 0 |")
+
+
+def test_workload_requests_succeed(client):
+    workload = Workload(parse_mix("profile_save=1,feed=1,detail=1,stats=1"), seed=0)
+    
+    async def scenario():
+        rng = random.Random(0)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            statuses = {}
+            for name in ["profile_save", "feed", "detail", "stats"]:
+                statuses[name] = (await workload.send(http, name, rng)).status_code
+            return statuses
+    
+    assert asyncio.run(scenario()) == {"profile_save": 200, "feed": 200, "detail": 200, "stats": 200}
+    assert workload.job_ids  # the feed's jobs are used for details
@@ -0,0 +1,29 @@
+import pytest
+
+DECISIONS = ["Apply", "Wait", "Skip", "Avoid"]
+
+
+def test_skills_to_learn_match_simulating_each_skill(matcher_client, profiles):
+    client = matcher_client
+    profile = profiles[2].model_dump(mode="json")
+    client.post("/api/profile", json=profile)
+    skills = client.get("/api/skills/to-learn", params={"limit": 12}).json()["skills"]
+    assert skills
+    
+    held = {skill.lower() for skill in profile["skills"]}
+    assert not any(row["skill"].lower() in held for row in skills)
+    unlocked = [row["to_apply"] + row["to_wait"] for row in skills]
+    assert unlocked == sorted(unlocked, reverse=True)
+    
+    for row in skills:
+        simulation = client.post("/api/simulate", json={"add_skills": [row["skill"]], "limit": 500}).json()
+        changes = simulation["fit_deltas"]
+        assert len(changes) < 500
+        before = [DECISIONS.index(change["decision_before"]) for change in changes]
+        after = [DECISIONS.index(change["decision_after"]) for change in changes]
+        assert simulation["newly_qualifying_count"] == row["to_apply"], row["skill"]
+        assert sum(new == 1 and old > 1 for old, new in zip(before, after)) == row["to_wait"], row["skill"]
+        assert sum(new < old for old, new in zip(before, after)) == row["upgrades"], row["skill"]
+        gains = [change["fit_delta"] for change in changes]
+        assert row["average_fit_gain"] == pytest.approx(sum(gains) / max(len(gains), 1), abs=0.01), row["skill"]
+        assert row["jobs_requiring"] > 0
@@ -0,0 +1,48 @@
+from app.services import metrics
+from app.services.metrics import Counters, Histogram, StageTimer
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test", "stage", buckets=(0.1, 1.0))
+    histogram.observe_many([("rank", 0.05), ("rank", 0.5), ("rank", 5.0), ("score", 0.1)])
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="rank",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="rank",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="rank",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="rank"} 3' in lines
+    assert 'test_seconds_bucket{stage="score",le="0.1"} 1' in lines  # upper bounds are inclusive
+
+
+def test_counters_with_labels():
+    counters = Counters()
+    counters.describe("parsed_total", "Parsed")
+    counters.describe("idle_total", "Never incremented")
+    counters.inc("parsed_total", label='result="ok"')
+    counters.add({("parsed_total", 'result="ok"'): 2, ("parsed_total", 'result="error"'): 1})
+    lines = counters.render()
+    assert 'parsed_total{result="ok"} 3' in lines
+    assert 'parsed_total{result="error"} 1' in lines
+    assert "idle_total 0" in lines
+
+
+def test_buffered_timer_records_on_flush():
+    histogram = Histogram("timer_seconds", "Test", "stage")
+    timer = StageTimer(histogram, buffered=True)
+    timer.lap("a")
+    timer.lap("b")
+    assert histogram.render()[2:] == []
+    timer.flush()
+    assert 'timer_seconds_count{stage="a"} 1' in histogram.render()
+
+
+def test_metrics_endpoint(client, profiles):
+    client.post("/api/profile", json=profiles[3].model_dump(mode="json"))
+    assert client.get("/api/jobs").status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'obliqo_request_seconds_count{route="/api/jobs"}' in text
+    assert 'obliqo_stage_seconds_count{stage="rank"}' in text
+    assert "obliqo_jobs_scored_total" in text
+    assert metrics.render().startswith("# HELP")
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import httpx
+
+from app import main
+
+
+def test_profile_save_precomputes_the_feed(client, profiles, monkeypatch):
+    computed = []
+    compute_feed_snapshot = main.compute_feed_snapshot
+    
+    def recording(catalog, profile_ctx, *args):
+        computed.append(profile_ctx.profile.user_id)
+        return compute_feed_snapshot(catalog, profile_ctx, *args)
+    
+    monkeypatch.setattr(main, "compute_feed_snapshot", recording)
+    
+    # The same user saved twice, with another skill set the second time
+    saved = [profiles[9], profiles[9].model_copy(update={"skills": profiles[10].skills})]
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            results = []
+            for profile in saved:
+                await http.post("/api/profile", json=profile.model_dump(mode="json"))
+                while main.precompute_tasks:
+                    await asyncio.sleep(0.01)
+                results.append((await http.get("/api/jobs")).json())
+            return results
+    
+    feeds = asyncio.run(scenario())
+    # One computation per save; the GETs were served from the cache
+    assert computed == [profiles[9].user_id] * 2
+    assert [key[1] for key in main.feed_cache] == [main.current_profile_version]  # the older version was superseded
+    assert feeds[0] != feeds[1]
+    
+    main.feed_cache.clear()
+    assert client.get("/api/jobs").json() == feeds[1]
+    assert len(computed) == 3
+
+
+def test_get_during_the_precompute_waits_for_it(client, profiles, monkeypatch):
+    computed, started, release = [], threading.Event(), threading.Event()
+    compute_feed_snapshot = main.compute_feed_snapshot
+    
+    def blocking(*args):
+        computed.append(args[1].profile.user_id)
+        started.set()
+        assert release.wait(5)
+        return compute_feed_snapshot(*args)
+    
+    monkeypatch.setattr(main, "compute_feed_snapshot", blocking)
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            await http.post("/api/profile", json=profiles[11].model_dump(mode="json"))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            feed = asyncio.create_task(http.get("/api/jobs"))
+            await asyncio.sleep(0.05)
+            assert not feed.done()
+            running = sum(1 for key in main.ranking_executor.inflight._calls if key[:2] == ("feed", profiles[11].user_id))
+            release.set()
+            return running, (await feed).json()
+    
+    running, feed = asyncio.run(scenario())
+    assert running == 1
+    assert computed == [profiles[11].user_id]
+    assert feed["total_count"] == len(main.job_catalog.jobs)
+    assert client.get("/api/jobs").json() == feed
+    assert len(computed) == 1
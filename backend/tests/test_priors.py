@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+from app import main
+from app.services.context import MatchContext, ProfileContext
+from app.services.decision import assess_career_impact, estimate_competition
+from app.services.detector import detect_ghost_job
+from app.services.priors import build_job_priors, refresh_job_priors
+
+
+def test_job_checks_without_context_match_priors(catalog, jobs, profiles):
+    for profile in profiles[:4]:
+        profile_ctx = ProfileContext(profile)
+        for job in jobs[:60]:
+            ctx = MatchContext(profile_ctx, job)
+            for fit_score in (30.0, 55.0, 85.0):
+                assert assess_career_impact(job, profile, fit_score) == \
+                    assess_career_impact(job, profile, fit_score, ctx)
+                assert estimate_competition(job, fit_score) == estimate_competition(job, fit_score, ctx)
+            assert detect_ghost_job(job) == detect_ghost_job(job, ctx)
+
+
+def test_refresh_recomputes_posting_age(jobs):
+    job = next(job for job in jobs if job.posted_date)
+    posted = datetime.fromisoformat(job.posted_date)
+    priors = build_job_priors([job], now=posted + timedelta(days=1))
+    job_priors = priors[job.job_id]
+    assert job_priors.days_old == 1
+    fresh_score = job_priors.quality_score
+
+    refreshed, _ = refresh_job_priors(priors, now=posted + timedelta(days=100))
+    assert refreshed[job.job_id].days_old == 100
+    assert refreshed[job.job_id].quality_score == fresh_score - 40
+    # Published priors are never modified
+    assert job_priors.days_old == 1 and job_priors.quality_score == fresh_score
+
+
+def test_priors_refresh_publishes_a_new_catalog_version(client, profiles):
+    client.post("/api/profile", json=profiles[3].model_dump(mode="json"))
+    before = client.get("/api/jobs").json()
+    old_catalog = main.job_catalog
+    old_priors = dict(old_catalog.priors)
+    
+    later = datetime.now() + timedelta(days=400)
+    catalog, ghost_count = main.refresh_catalog_priors(later)
+    assert main.job_catalog is catalog and catalog.version == old_catalog.version + 1
+    assert catalog.jobs is old_catalog.jobs and catalog.embeddings is old_catalog.embeddings
+    assert ghost_count == sum(1 for job_priors in catalog.priors.values() if job_priors.is_ghost)
+    
+    # The old snapshot keeps its own priors
+    assert all(old_catalog.priors[job_id] is job_priors for job_id, job_priors in old_priors.items())
+    assert any(catalog.priors[job_id].days_old != job_priors.days_old for job_id, job_priors in old_priors.items())
+    
+    # Cached feeds of the old version are not served
+    after = client.get("/api/jobs").json()
+    assert after != before
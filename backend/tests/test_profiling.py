@@ -0,0 +1,78 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services import profiling
+from app.services.executor import RankingExecutor
+
+executor = RankingExecutor("thread", workers=1)
+
+
+def busy_loop(catalog=None) -> int:
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+def busy_app() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/stats")
+    async def stats():
+        return {"total": busy_loop()}
+
+    @app.get("/api/jobs")
+    async def jobs():
+        return {"total": await executor.run(("busy",), busy_loop, None)}
+
+    @app.get("/other")
+    def other():
+        return {}
+
+    app.add_middleware(profiling.ProfilingMiddleware)
+    return TestClient(app)
+
+
+def test_requested_mode():
+    assert profiling.requested_mode({"headers": [(b"x-obliqo-profile", b"1")]}) == "cprofile"
+    assert profiling.requested_mode({"headers": [(b"x-obliqo-profile", b"false")]}) is None
+    assert profiling.requested_mode({"query_string": b"page=2&profile=true"}) == "cprofile"
+    assert profiling.requested_mode({"query_string": b"profile=0"}) is None
+
+
+def test_requested_profile_is_stored_and_linked():
+    response = busy_app().get("/api/stats", headers={"X-Obliqo-Profile": "1"})
+    profile = profiling.get_profile(int(response.headers["x-obliqo-profile-id"]))
+    assert profile["mode"] == "cprofile" and profile["trigger"] == "requested"
+    assert profile["status"] == 200 and profile["duration_ms"] >= 50
+    assert any("busy_loop" in entry["function"] for entry in profile["top"])
+    assert not any(profiling._is_plumbing((entry["function"], 0, "")) for entry in profile["top"])
+
+
+def test_slow_requests_are_sampled(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_SLOW_MS", 10)
+    client = busy_app()
+    count = len(profiling.recent_profiles)
+    assert "x-obliqo-profile-id" not in client.get("/api/stats").headers
+    assert len(profiling.recent_profiles) == count + 1
+    assert profiling.recent_profiles[-1]["trigger"] == "slow"
+
+    client.get("/other")
+    assert len(profiling.recent_profiles) == count + 1
+
+
+def test_executor_work_is_in_the_profile(monkeypatch):
+    client = busy_app()
+    response = client.get("/api/jobs", headers={"X-Obliqo-Profile": "1"})
+    profile = profiling.get_profile(int(response.headers["x-obliqo-profile-id"]))
+    assert any("busy_loop" in entry["function"] for entry in profile["top"])
+
+    # Sampled requests keep the executor: the sampler follows the work onto its thread
+    monkeypatch.setattr(profiling, "PROFILE_SLOW_MS", 10)
+    client.get("/api/jobs")
+    profile = profiling.recent_profiles[-1]
+    assert profile["trigger"] == "slow"
+    assert any("busy_loop" in entry["function"] for entry in profile["top"])
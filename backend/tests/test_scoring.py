@@ -0,0 +1,60 @@
+import numpy as np
+
+from app import main
+from app.services.candidates import CandidateIndex
+from app.services.cohort import ProfileBlock, cohort_profile, get_cohort_jobs
+from app.services.context import ProfileContext
+from app.services.decision import DECISIONS
+from app.services.scoring import calculate_location_match
+
+
+def baseline_location_match(preferred_locations: list, job_location: str, is_remote: bool) -> float:
+    """calculate_location_match before the lowered-value fast path"""
+    if is_remote:
+        return 100.0
+    job_loc_lower = job_location.lower()
+    for pref in preferred_locations:
+        if pref.lower() in job_loc_lower or job_loc_lower in pref.lower():
+            return 100.0
+    return 30.0
+
+
+def test_location_match_matches_baseline():
+    preferences = [[], ["Bangalore"], ["Remote", "Mumbai"], ["new york"], [""]]
+    locations = ["", "Bangalore", "Mumbai, India", "New York, NY", "york", "Delhi"]
+    for preferred in preferences:
+        for location in locations:
+            for is_remote in (False, True):
+                assert calculate_location_match(preferred, location, is_remote) == \
+                    baseline_location_match(preferred, location, is_remote), (preferred, location, is_remote)
+
+
+def test_empty_job_location_matches_any_preference():
+    assert calculate_location_match(["Pune"], "", False) == 100.0
+    assert calculate_location_match([], "", False) == 30.0
+
+
+def reference_scores(catalog, matcher, profile):
+    profile_ctx = ProfileContext(profile)
+    semantic = {job.job_id: score for job, score in matcher.rank_jobs(profile, catalog.jobs, catalog.embeddings)}
+    return [main.score_job(job, semantic[job.job_id], profile_ctx, catalog) for job in catalog.jobs]
+
+
+def test_cohort_fit_matches_score_job(catalog, matcher, profiles):
+    jobs = get_cohort_jobs(catalog, matcher)
+    block = ProfileBlock(jobs, [cohort_profile(ProfileContext(profile), matcher) for profile in profiles])
+    fit = block.components(0, jobs.num_jobs).fit_scores()
+    for i, profile in enumerate(profiles):
+        expected = [scored.fit_score for scored in reference_scores(catalog, matcher, profile)]
+        np.testing.assert_allclose(fit[i], expected, err_msg=profile.user_id)
+
+
+def test_candidate_fit_matches_score_job(catalog, matcher, profiles):
+    index = CandidateIndex(profiles, catalog, matcher)
+    reference = {profile.user_id: reference_scores(catalog, matcher, profile) for profile in profiles}
+    for row in [i for i, job in enumerate(catalog.jobs) if not job.location][:5] + [1, 2, 3]:
+        job = catalog.jobs[row]
+        fit, codes, _ = index.score(catalog, matcher, job)
+        expected = [reference[profile.user_id][row] for profile in profiles]
+        np.testing.assert_allclose(fit, [scored.fit_score for scored in expected], err_msg=job.job_id)
+        assert [DECISIONS[code] for code in codes] == [scored.decision for scored in expected]
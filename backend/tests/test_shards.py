@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app import main
+from app.services import matching
+from app.services.catalog import JobCatalog
+from app.services.context import ProfileContext
+from app.services.executor import RankingExecutor
+from app.services.shards import build_shards
+from benchmarks.synthetic import synthetic_jobs
+
+
+@pytest.fixture(scope="module")
+def repost_catalog(matcher):
+    """Synthetic jobs plus a repost of every 9th one"""
+    jobs = synthetic_jobs(300, seed=5)
+    jobs += [job.model_copy(update={"job_id": None, "Links": f"https://example.com/repost/{i}"}) for i, job in enumerate(jobs[::9])]
+    return JobCatalog.build(jobs, matcher)
+
+
+def dump(snapshot, catalog):
+    matches = [match.to_match(snapshot.profile_ctx, catalog).model_dump_json() for match in snapshot.matches]
+    first_page = [match.model_dump_json() for match in snapshot.first_page]
+    return matches, first_page, snapshot.decisions, snapshot.total_jobs, snapshot.codes.tolist()
+
+
+def test_merged_shards_equal_the_single_process_feed(repost_catalog, matcher, profiles, monkeypatch):
+    catalog = repost_catalog
+    assert any(job.duplicate_of for job in catalog.jobs)
+    shards = build_shards(catalog, matcher, 3)
+    for profile in profiles[:4]:
+        profile_ctx = ProfileContext(profile)
+        for collapse_duplicates in (False, True):
+            rankings = []
+            for shard, shard_matcher in shards:
+                # What each shard's worker process does with its own matcher
+                monkeypatch.setattr(matching, "_matcher_instance", shard_matcher)
+                rankings.append(main.rank_feed_shard(shard, profile_ctx, collapse_duplicates))
+            monkeypatch.setattr(matching, "_matcher_instance", matcher)
+            merged = main.merge_feed_shards(catalog, rankings, profile_ctx, collapse_duplicates)
+            expected = main.compute_feed_snapshot(catalog, profile_ctx, collapse_duplicates)
+            assert dump(merged, catalog) == dump(expected, catalog)
+
+
+def test_sharded_executor_scatters_to_worker_processes(repost_catalog, profiles):
+    catalog = repost_catalog
+    profile_ctx = ProfileContext(profiles[5])
+    executor = RankingExecutor("sharded", workers=1, shards=2)
+    try:
+        merged = asyncio.run(executor.scatter(
+            ("feed",), main.rank_feed_shard, main.merge_feed_shards, catalog, profile_ctx, True
+        ))
+    finally:
+        executor.shutdown()
+    assert dump(merged, catalog) == dump(main.compute_feed_snapshot(catalog, profile_ctx, True), catalog)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from app.services.catalog import JobCatalog
+from app.services.job_table import JobTable
+from app.services.matching import KeywordMatcher
+from app.services.priors import JobPriors
+from app.services.shared_index import SharedIndexPublisher, SharedIndexReader
+from app.services.vector_matcher import TfidfMatcher
+
+
+def ranking(matcher, catalog, profile):
+    return [(job.job_id, score) for job, score in matcher.rank_jobs(profile, catalog.jobs, catalog.embeddings)]
+
+
+def test_reader_sees_the_published_catalog(tmp_path, jobs, profiles):
+    matcher = TfidfMatcher(ann_candidates=0)
+    catalog = JobCatalog.build([job.model_copy() for job in jobs[:150]], matcher)
+    reader = SharedIndexReader(tmp_path)
+    publisher = SharedIndexPublisher(tmp_path)
+    assert reader.generation() == 0
+
+    publisher.publish(catalog, matcher)
+    shared = reader.load(TfidfMatcher(ann_candidates=0))
+    assert shared.version == catalog.version == reader.generation()
+    assert [job.to_job() for job in shared.jobs] == [job.to_job() for job in catalog.jobs]
+    for profile in profiles[:3]:
+        assert ranking(matcher, shared, profile) == ranking(matcher, catalog, profile)
+
+
+@pytest.mark.parametrize("matcher_class", [KeywordMatcher, lambda: TfidfMatcher(ann_candidates=0)])
+def test_reader_maps_the_published_columns_without_rebuilding(tmp_path, jobs, profiles, matcher_class, monkeypatch):
+    matcher = matcher_class()
+    raw = [job.model_copy() for job in jobs[:150]]
+    raw[3] = raw[3].model_copy(update={"requirements": ["Odd One"]})  # stored as an extra
+    catalog = JobCatalog.build(raw, matcher)
+    catalog, _ = catalog.apply([], [catalog.jobs[1].job_id], matcher)
+    catalog = JobCatalog(catalog.version, catalog.jobs.with_duplicates({catalog.jobs[5].job_id: catalog.jobs[0].job_id}),
+                         catalog.priors, catalog.embeddings, None)
+    SharedIndexPublisher(tmp_path).publish(catalog, matcher)
+
+    def rebuilt(*args, **kwargs):
+        raise AssertionError("the worker rebuilt published state")
+    worker_matcher = matcher_class()
+    monkeypatch.setattr(JobTable, "from_jobs", rebuilt)
+    monkeypatch.setattr(JobPriors, "__init__", rebuilt)
+    monkeypatch.setattr(worker_matcher, "index_jobs", rebuilt)
+    monkeypatch.setattr(worker_matcher, "create_job_embedding", rebuilt)
+    shared = SharedIndexReader(tmp_path).load(worker_matcher)
+
+    assert isinstance(shared.jobs.skill_codes, np.memmap)
+    assert [job.to_job() for job in shared.jobs] == [job.to_job() for job in catalog.jobs]
+    assert {job_id: vars(priors) for job_id, priors in shared.priors.items()} == \
+        {job_id: vars(priors) for job_id, priors in catalog.priors.items()}
+    if isinstance(catalog.embeddings, dict):  # keywords
+        assert shared.embeddings == catalog.embeddings
+    monkeypatch.undo()
+    for profile in profiles[:3]:
+        assert ranking(worker_matcher, shared, profile) == ranking(matcher, catalog, profile)
+
+
+def test_loaded_snapshot_outlives_newer_generations(tmp_path, jobs, profiles):
+    matcher = TfidfMatcher(ann_candidates=0)
+    catalog = JobCatalog.build([job.model_copy() for job in jobs[:100]], matcher)
+    publisher = SharedIndexPublisher(tmp_path, keep=1)
+    publisher.publish(catalog, matcher)
+
+    worker_matcher = TfidfMatcher(ann_candidates=0)
+    shared = SharedIndexReader(tmp_path).load(worker_matcher)
+    expected = ranking(worker_matcher, shared, profiles[0])
+
+    # The loader publishes (and prunes) newer versions while the worker still holds the old one
+    for _ in range(2):
+        catalog, _ = catalog.apply([], [catalog.jobs[0].job_id], matcher)
+        publisher.publish(catalog, matcher)
+    assert not (tmp_path / "gen-000001").exists()
+    assert len(shared.jobs) == 100
+    assert ranking(worker_matcher, shared, profiles[0]) == expected
+
+    latest = SharedIndexReader(tmp_path).load(TfidfMatcher(ann_candidates=0))
+    assert latest.version == 3 and len(latest.jobs) == 98
+
+
+def test_update_requests_round_trip(tmp_path, jobs):
+    publisher = SharedIndexPublisher(tmp_path)
+    reader = SharedIndexReader(tmp_path)
+    request_id = reader.submit_update(jobs[:2], ["gone"])
+    assert reader.update_result(request_id) is None
+
+    [(pending_id, update)] = publisher.pending_updates()
+    assert pending_id == request_id
+    assert [job["job_id"] for job in update["upserts"]] == [jobs[0].job_id, jobs[1].job_id]
+    assert update["deleted_ids"] == ["gone"]
+    assert publisher.pending_updates() == []
+
+    publisher.complete_update(request_id, {"version": 2})
+    assert reader.update_result(request_id) == {"version": 2}
+    assert reader.update_result(request_id) is None
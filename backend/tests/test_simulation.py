@@ -0,0 +1,38 @@
+from app import main
+
+
+def test_simulation_matches_saving_the_profile(matcher_client, profiles):
+    client = matcher_client
+    profile = profiles[2].model_dump(mode="json")
+    cases = [
+        {"add_skills": ["Docker", "Kubernetes"]},
+        {"remove_skills": profile["skills"][:1], "experience_level": "Senior"},
+        {"add_skills": ["Rust"], "collapse_duplicates": True},
+    ]
+    for case in cases:
+        collapse = case.get("collapse_duplicates", False)
+        client.post("/api/profile", json=profile)
+        before = client.get("/api/stats", params={"collapse_duplicates": collapse}).json()["decisions"]
+        simulation = client.post("/api/simulate", json=case).json()
+        assert client.get("/api/profile").json()["skills"] == profile["skills"]
+        
+        client.post("/api/profile", json=dict(
+            profile, skills=simulation["skills"], experience_level=simulation["experience_level"]
+        ))
+        after = client.get("/api/stats", params={"collapse_duplicates": collapse}).json()["decisions"]
+        assert simulation["decision_changes"] == {decision: after[decision] - before[decision] for decision in before}
+
+
+def test_simulation_is_scored_on_the_executor(client, profiles, monkeypatch):
+    calls = []
+    
+    async def run(key, fn, *args):
+        calls.append(fn)
+        return fn(*args)
+    
+    monkeypatch.setattr(main.ranking_executor, "run", run)
+    client.post("/api/profile", json=profiles[8].model_dump(mode="json"))
+    calls.clear()
+    response = client.post("/api/simulate", json={"add_skills": ["Terraform"]})
+    assert response.status_code == 200
+    assert calls == [main.compute_simulation]
@@ -0,0 +1,48 @@
+from app.services.skill_catalog import DEFAULT_SKILL_CATALOG, SkillCatalog, get_skill_catalog, get_skill_gap
+
+
+def scan_lookup(catalog: SkillCatalog, skill: str):
+    """Lookup by scanning every category, as before the substring index"""
+    skill_lower = skill.lower().strip()
+    if not skill_lower:
+        return None
+    if skill_lower in catalog.exact:
+        return catalog.exact[skill_lower]
+    for category in catalog.categories:
+        if category in skill_lower or skill_lower in category:
+            return category
+    return None
+
+
+def test_substring_index_matches_scan():
+    catalog = SkillCatalog(dict(DEFAULT_SKILL_CATALOG, **{"c": ("Low", "1 week", [], []), "go": ("Medium", "1 month", [], [])}))
+    queries = ["Python", " react.js ", "ReactJS Native", "advanced sql queries", "postgres", "Docker Compose",
+               "learning", "machine", "k8s", "js", "node", "Go", "c", "rust", "", "aws lambda", "no such skill"]
+    for query in queries:
+        assert catalog.lookup(query) == scan_lookup(catalog, query), query
+
+
+def test_skill_gap_cached_per_normalized_skill():
+    gaps = [get_skill_gap(skill) for skill in ("Python", "python ", "PYTHON")]
+    assert [gap.skill for gap in gaps] == ["Python", "python ", "PYTHON"]
+    assert {(gap.importance, gap.estimated_learning_time, tuple(gap.resources)) for gap in gaps} == {
+        ("High", "2-3 months", ("Codecademy Python", "Python.org Tutorial"))
+    }
+
+
+def test_skill_gap_is_not_shared():
+    first = get_skill_gap("docker")
+    first.resources.append("changed")
+    first.importance = "Low"
+    second = get_skill_gap("docker")
+    assert second is not first
+    assert second.importance == "Medium"
+    assert "changed" not in second.resources
+    assert "changed" not in get_skill_catalog().details_for("docker")[2]
+
+
+def test_unknown_skill_gets_defaults_with_its_name():
+    gap = get_skill_gap("Quantum Basketweaving")
+    assert gap.importance == "Medium"
+    assert gap.resources == ['Search "Quantum Basketweaving" courses on Coursera',
+                             'YouTube "Quantum Basketweaving" tutorials']
@@ -0,0 +1,97 @@
+import pickle
+
+from app import main
+from app.models import Job
+from app.services.context import ProfileContext
+from app.services.matching import KeywordMatcher, get_matcher
+from app.services.skill_normalizer import UNKNOWN_SKILL, SkillNormalizer, get_skill_normalizer, skill_keys
+
+
+def normalizer_with(*skills) -> SkillNormalizer:
+    normalizer = SkillNormalizer()
+    normalizer.build(skills)
+    return normalizer
+
+
+def test_spellings_share_an_id():
+    normalizer = normalizer_with("Node.js", "Amazon Web Services (AWS)", "REST APIs", "PostgreSQL", "Python")
+    assert len(normalizer) == 5
+    for a, b in [("Node.js", "NodeJS"), ("Node.js", "node"), ("Amazon Web Services (AWS)", "aws"),
+                 ("REST APIs", "REST API"), ("PostgreSQL", "Postgres"), ("Python", "Python 3.11"),
+                 ("Python", "python programming")]:
+        assert normalizer.canonical_id(a) == normalizer.canonical_id(b), (a, b)
+    assert normalizer.key(normalizer.canonical_id("NODE.JS")) == "nodejs"
+
+
+def test_parenthetical_abbreviations_only():
+    assert skill_keys("Amazon Web Services (AWS)") == ["amazonwebservices", "aws"]
+    assert skill_keys("English Proficiency (Spoken)") == ["englishproficiencyspoken"]
+
+
+def test_fuzzy_lookup_is_for_outside_strings():
+    normalizer = normalizer_with("TensorFlow", "Kubernetes")
+    assert normalizer.canonical_id("Tensorflows", add=False) == normalizer.canonical_id("TensorFlow")
+    # A vocabulary build never merges fuzzily
+    normalizer.build(["Tensorflowz"])
+    assert len(normalizer) == 3
+
+
+def test_lookups_without_add_leave_the_vocabulary_alone():
+    normalizer = normalizer_with("Python", "SQL")
+    assert normalizer.canonical_id("Basket Weaving", add=False) is None
+    assert normalizer.canonical_ids(["sql", "Basket Weaving", "Origami"], add=False) == \
+        [normalizer.canonical_id("SQL"), UNKNOWN_SKILL, UNKNOWN_SKILL]
+    assert normalizer.canonical_key("Basket Weaving") == "basketweaving"
+    assert normalizer.canonical_key("py") == "python"
+    assert len(normalizer) == 2
+    assert normalizer.canonical_ids(["Origami"]) == [2]
+
+
+def test_profile_skills_do_not_grow_the_vocabulary(catalog, profiles):
+    normalizer = get_skill_normalizer()
+    size = len(normalizer)
+    profile = profiles[2].model_copy(update={"skills": profiles[2].skills + ["Basket Weaving", "Origami"]})
+    profile_ctx = ProfileContext(profile)
+    main.set_current_profile(profile)
+    KeywordMatcher().create_user_embedding(profile)
+    assert len(normalizer) == size
+    assert UNKNOWN_SKILL not in profile_ctx.skill_ids
+    assert set(profile_ctx.skills_by_id.values()) <= set(profiles[2].skills)
+
+
+def test_normalizer_pickles():
+    normalizer = normalizer_with("Node.js", "Docker")
+    copy = pickle.loads(pickle.dumps(normalizer))
+    assert copy.canonical_id("nodejs") == normalizer.canonical_id("node")
+    assert copy.canonical_ids(["Go"]) == [2]
+
+
+def test_attached_vocabulary_keeps_the_ids():
+    published = normalizer_with("Node.js", "Amazon Web Services (AWS)", "REST APIs", "Python")
+    published.canonical_ids(["Go"])
+    worker = normalizer_with("Node.js")
+    worker.attach_vocabulary(published.export_vocabulary())
+    assert worker.names == published.names and worker.id_by_key == published.id_by_key
+    for raw in ["node", "aws", "REST API", "Go", "Pythons"]:
+        assert worker.canonical_id(raw, add=False) == published.canonical_id(raw, add=False), raw
+    # A later, larger export only appends
+    published.build(["Docker"])
+    worker.attach_vocabulary(published.export_vocabulary())
+    assert worker.canonical_id("docker", add=False) == published.canonical_id("Docker") == 5
+
+
+def test_job_keywords_count_title_and_skill_once(catalog):
+    job = Job(job_id="kw", title="Node.js Developer", company="Acme", description="",
+              requirements=["Node.js", "Vue.js", "JS"])
+    assert sorted(KeywordMatcher().create_job_embedding(job)) == ["developer", "javascript", "nodejs", "vuejs"]
+
+
+def test_saved_profile_picks_up_new_job_skills(catalog, profiles):
+    profile = profiles[4].model_copy(update={"skills": profiles[4].skills + ["Zig Programming"]})
+    main.set_current_profile(profile)
+    assert len(main.current_profile_context().skill_ids) == len(profiles[4].skills)
+
+    job = Job(job_id="zig", title="Systems Engineer", company="Acme", description="", requirements=["Zig"])
+    catalog.apply([job], [], get_matcher())
+    profile_ctx = main.current_profile_context()
+    assert get_skill_normalizer().canonical_id("Zig", add=False) in profile_ctx.skill_ids
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from app.services.job_table import JobTable
+from app.services.vector_matcher import TfidfMatcher, tokenize
+
+
+@pytest.fixture(scope="module")
+def tfidf(catalog, jobs):
+    matcher = TfidfMatcher(ann_candidates=0)
+    return matcher, matcher.index_jobs(jobs)
+
+
+def scores(matcher, profile, jobs, index):
+    return {job.job_id: score for job, score in matcher.rank_jobs(profile, jobs, index)}
+
+
+def test_tokenize():
+    assert tokenize("We use Node.js and C++ with the REST API, a lot.") == ["use", "node.js", "c++", "rest", "api", "lot"]
+
+
+def test_matrix_scores_match_pairwise_similarity(tfidf, jobs, profiles):
+    matcher, index = tfidf
+    for profile in profiles[:4]:
+        user_vector = matcher.create_user_embedding(profile)
+        ranked = scores(matcher, profile, jobs, index)
+        for job in jobs[:50]:
+            assert ranked[job.job_id] == pytest.approx(matcher.calculate_similarity(user_vector, index[job.job_id]))
+
+
+def test_update_index_is_copy_on_write(tfidf, jobs, profiles):
+    matcher, index = tfidf
+    before = {profile.user_id: scores(matcher, profile, jobs, index) for profile in profiles[:3]}
+    arrays = (index.indptr.copy(), index.indices.copy(), index.data.copy(), dict(index.row_of))
+
+    changed = jobs[5].model_copy(update={"description": "Completely rewritten posting about Kubernetes and Go."})
+    deleted = jobs[6].job_id
+    remaining = [changed if job.job_id == changed.job_id else job for job in jobs if job.job_id != deleted]
+    updated = matcher.update_index(index, remaining, [changed], [deleted])
+
+    # The published index is untouched
+    for old, new in zip(arrays, (index.indptr, index.indices, index.data, index.row_of)):
+        assert np.array_equal(old, new) if isinstance(old, np.ndarray) else old == new
+    assert before == {profile.user_id: scores(matcher, profile, jobs, index) for profile in profiles[:3]}
+
+    # The new one scores like vectors weighed with the same IDF
+    assert deleted not in updated and changed.job_id in updated
+    for profile in profiles[:3]:
+        ranked = scores(matcher, profile, remaining, updated)
+        user_vector = matcher.create_user_embedding(profile)
+        expected = matcher.calculate_similarity(user_vector, matcher.create_job_embedding(changed))
+        assert ranked[changed.job_id] == pytest.approx(expected)
+        assert {job_id: score for job_id, score in ranked.items() if job_id != changed.job_id} == \
+            {job_id: score for job_id, score in before[profile.user_id].items()
+             if job_id not in (changed.job_id, deleted)}
+
+
+def test_compaction_keeps_scores(tfidf, jobs, profiles):
+    matcher, index = tfidf
+    kept = jobs[:len(jobs) // 3]
+    compacted = matcher.update_index(index, kept, [], [job.job_id for job in jobs[len(kept):]])
+    assert compacted.num_rows == len(kept)
+    for profile in profiles[:3]:
+        full = scores(matcher, profile, jobs, index)
+        assert scores(matcher, profile, kept, compacted) == pytest.approx({job.job_id: full[job.job_id] for job in kept})
+
+
+def test_export_attach_and_shard_keep_scores(tfidf, jobs, profiles):
+    matcher, index = tfidf
+    table = JobTable.from_jobs(jobs)
+    attached = matcher.attach_index(matcher.export_index(index, jobs), table)
+    shard_matcher, shard = matcher.shard_index(index, table.take(np.arange(100, 200)))
+    for profile in profiles[:3]:
+        full = scores(matcher, profile, jobs, index)
+        assert scores(matcher, profile, table, attached) == pytest.approx(full)
+        sharded = scores(shard_matcher, profile, shard.catalog_jobs, shard)
+        assert sharded == pytest.approx({job.job_id: full[job.job_id] for job in jobs[100:200]})
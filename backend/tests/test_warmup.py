@@ -0,0 +1,45 @@
+import asyncio
+
+from app import main
+from app.services.warmup import WARMUP_PHASES, WarmupProgress
+
+
+def test_progress_through_the_phases():
+    warmup = WarmupProgress()
+    warmup.advance("matcher")
+    warmup.advance("dataset")
+    status = warmup.to_dict()
+    assert not status["ready"] and status["phase"] == "dataset"
+    assert status["progress"] == round(2 / (len(WARMUP_PHASES) - 1), 2)
+    assert [phase["phase"] for phase in status["completed_phases"]] == ["starting", "matcher"]
+    
+    warmup.finish()
+    status = warmup.to_dict()
+    assert status["ready"] and status["progress"] == 1.0 and status["phase"] == "ready"
+
+
+def test_job_endpoints_wait_for_ready(client, monkeypatch):
+    monkeypatch.setattr(main, "warmup", WarmupProgress())
+    main.warmup.advance("embeddings")
+    assert client.get("/healthz").status_code == 200
+    readyz = client.get("/readyz")
+    assert readyz.status_code == 503 and readyz.json()["phase"] == "embeddings"
+    jobs = client.get("/api/jobs")
+    assert jobs.status_code == 503 and jobs.headers["Retry-After"] == "5"
+    
+    main.warmup.finish()
+    assert client.get("/readyz").status_code == 200
+
+
+def test_failed_warmup_is_reported(client, monkeypatch):
+    monkeypatch.setattr(main, "warmup", WarmupProgress())
+    
+    def build_initial_catalog():
+        main.warmup.advance("dataset")
+        raise ValueError("bad dataset")
+    
+    monkeypatch.setattr(main, "build_initial_catalog", build_initial_catalog)
+    asyncio.run(main.run_warmup())
+    status = client.get("/readyz").json()
+    assert not status["ready"] and status["error"] == "ValueError: bad dataset"
+    assert client.get("/api/jobs").json()["detail"] == "Job index failed to load"
@@ -30,25 +30,36 @@ export default function JobsDashboard() {
     const [filter, setFilter] = useState<string>('');
 
     useEffect(() => {
-        loadJobs();
+        // A new filter cancels the stream that is still running for the old one
+        const controller = new AbortController();
+        loadJobs(controller.signal);
         loadStats();
+        return () => controller.abort();
     }, [filter]);
 
-    const loadJobs = async () => {
+    const loadJobs = async (signal: AbortSignal) => {
         setLoading(true);
         setError('');
+        setJobs([]);
         try {
-            const response = await api.getJobFeed(1, 50, filter || undefined);
-            // Sort jobs by fit_score in descending order
-            const sortedJobs = [...response.jobs].sort((a, b) => b.fit_score - a.fit_score);
-            setJobs(sortedJobs);
-            if (response.jobs.length > 0 && !selectedJob) {
-                setSelectedJob(response.jobs[0]);
-            }
+            // Cards render as soon as the best matches arrive instead of
+            // after the whole feed has been scored
+            await api.streamJobFeed({
+                limit: 50,
+                decisionFilter: filter || undefined,
+                signal,
+                onMatches: (matches) => {
+                    // Keep jobs sorted by fit_score in descending order
+                    setJobs(prev => [...prev, ...matches].sort((a, b) => b.fit_score - a.fit_score));
+                    setSelectedJob(prev => prev || matches[0]);
+                    setLoading(false);
+                },
+            });
         } catch (err: any) {
+            if (err.name === 'AbortError') return;
             setError(err.message || 'Failed to load jobs. Please create a profile first.');
         } finally {
-            setLoading(false);
+            if (!signal.aborted) setLoading(false);
         }
     };
 
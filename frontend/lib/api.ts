@@ -175,6 +175,9 @@ export interface Job {
     posted_date?: string;
     company_size?: string;
     is_remote?: boolean;
+
+    // Set when this posting is a near-duplicate repost of another job
+    duplicate_of?: string | null;
 }
 
 export interface SkillGap {
@@ -209,6 +212,83 @@ export interface JobFeedResponse {
     page_size: number;
 }
 
+export interface JobDetailResult {
+    job_id: string;
+    found: boolean;
+    match: JobMatch | null;
+    detail: string | null;
+}
+
+export interface JobDetailsResponse {
+    results: JobDetailResult[];
+    dataset_version: number;
+}
+
+export interface SimulationRequest {
+    add_skills?: string[];
+    remove_skills?: string[];
+    experience_level?: string;
+    collapse_duplicates?: boolean;
+    limit?: number;
+}
+
+export interface SimulatedJob {
+    job_id: string;
+    title: string;
+    company: string;
+    fit_before: number;
+    fit_after: number;
+    fit_delta: number;
+    decision_before: string;
+    decision_after: string;
+}
+
+export interface SimulationResponse {
+    skills: string[];
+    experience_level: string;
+    affected_jobs: number;
+    total_jobs: number;
+    decision_changes: Record<string, number>;
+    newly_qualifying_count: number;
+    newly_qualifying: SimulatedJob[];
+    fit_deltas: SimulatedJob[];
+    dataset_version: number;
+}
+
+export interface SkillDemand {
+    skill: string;
+    jobs_requiring: number;
+    weighted_demand: number;
+    to_apply: number;
+    to_wait: number;
+    upgrades: number;
+    average_fit_gain: number;
+    importance: string;
+    estimated_learning_time: string;
+}
+
+export interface SkillsToLearnResponse {
+    total_jobs: number;
+    skills: SkillDemand[];
+    dataset_version: number;
+}
+
+export interface JobFeedStreamMeta {
+    total_count: number;
+    dataset_version: number;
+}
+
+export interface JobFeedStreamOptions {
+    topK?: number;
+    limit?: number;
+    decisionFilter?: string;
+    collapseDuplicates?: boolean;
+    signal?: AbortSignal;
+    onMeta?: (meta: JobFeedStreamMeta) => void;
+    // Called once per received network chunk with the matches it contained
+    onMatches: (matches: JobMatch[]) => void;
+}
+
 export interface StatsResponse {
     total_jobs: number;
     decisions: {
@@ -265,7 +345,8 @@ class ApiClient {
     async getJobFeed(
         page: number = 1,
         pageSize: number = 20,
-        decisionFilter?: string
+        decisionFilter?: string,
+        collapseDuplicates: boolean = false
     ): Promise<JobFeedResponse> {
         const params = new URLSearchParams({
             page: page.toString(),
@@ -276,13 +357,86 @@ class ApiClient {
             params.append('decision_filter', decisionFilter);
         }
 
+        if (collapseDuplicates) {
+            params.append('collapse_duplicates', 'true');
+        }
+
         return this.request<JobFeedResponse>(`/api/jobs?${params}`);
     }
 
+    // Streaming feed: best matches arrive first, the rest follow progressively.
+    // Resolves with the number of matches received once the stream ends.
+    async streamJobFeed(options: JobFeedStreamOptions): Promise<number> {
+        const params = new URLSearchParams({ format: 'ndjson' });
+        if (options.topK) params.append('top_k', options.topK.toString());
+        if (options.limit) params.append('limit', options.limit.toString());
+        if (options.decisionFilter) params.append('decision_filter', options.decisionFilter);
+        if (options.collapseDuplicates) params.append('collapse_duplicates', 'true');
+
+        const response = await fetch(`${this.baseUrl}/api/jobs/stream?${params}`, {
+            signal: options.signal,
+        });
+        if (!response.ok || !response.body) {
+            const error = await response.json().catch(() => ({ detail: response.statusText }));
+            throw new Error(error.detail || 'API request failed');
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let received = 0;
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            // Complete lines only; a partial last line waits for the next chunk
+            const lines = buffer.split('\n');
+            buffer = lines.pop() || '';
+            const matches: JobMatch[] = [];
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const event = JSON.parse(line);
+                if (event.event === 'match') {
+                    matches.push(event.data as JobMatch);
+                } else if (event.event === 'meta') {
+                    options.onMeta?.(event.data as JobFeedStreamMeta);
+                }
+            }
+            if (matches.length > 0) {
+                received += matches.length;
+                options.onMatches(matches);
+            }
+        }
+        return received;
+    }
+
     async getJobDetail(jobId: string): Promise<JobMatch> {
         return this.request<JobMatch>(`/api/jobs/${jobId}`);
     }
 
+    // Several jobs in one round trip; results come back in the order of jobIds
+    async getJobDetails(jobIds: string[]): Promise<JobDetailsResponse> {
+        return this.request<JobDetailsResponse>('/api/jobs/details', {
+            method: 'POST',
+            body: JSON.stringify({ job_ids: jobIds }),
+        });
+    }
+
+    // What-if: feed changes for hypothetical skills/level, profile left as is
+    async simulateProfileChange(changes: SimulationRequest): Promise<SimulationResponse> {
+        return this.request<SimulationResponse>('/api/simulate', {
+            method: 'POST',
+            body: JSON.stringify(changes),
+        });
+    }
+
+    // Missing skills ranked by the decisions they would upgrade across all jobs
+    async getSkillsToLearn(limit: number = 20): Promise<SkillsToLearnResponse> {
+        return this.request<SkillsToLearnResponse>(`/api/skills/to-learn?limit=${limit}`);
+    }
+
     // Stats endpoint
     async getStats(): Promise<StatsResponse> {
         return this.request<StatsResponse>('/api/stats');